@@ -1,5 +1,6 @@
 from encadeador.adapters.orm import registry
-from sqlalchemy import create_engine  # type: ignore
+from sqlalchemy import create_engine, inspect, text  # type: ignore
+from sqlalchemy.engine import Engine  # type: ignore
 from sqlalchemy.orm import sessionmaker  # type: ignore
 from encadeador.adapters.orm.util import start_mappers
 from encadeador.utils.log import Log
@@ -15,12 +16,46 @@ def start_db():
     Log.log().info(f"Inicializando DB em {SQLITE_URL}")
     engine = create_engine(SQLITE_URL)
     registry.metadata.create_all(engine)
+    atualiza_db(engine)
     start_mappers()
 
 
+def atualiza_db(engine: Engine):
+    """
+    Acrescenta às tabelas de um estudo já existente as colunas e
+    índices criados em versões posteriores, que o `create_all` não
+    altera. As novas colunas são sempre opcionais.
+    """
+    inspetor = inspect(engine)
+    with engine.begin() as conexao:
+        for tabela in registry.metadata.sorted_tables:
+            existentes = {c["name"] for c in inspetor.get_columns(tabela.name)}
+            for coluna in tabela.columns:
+                if coluna.name in existentes:
+                    continue
+                Log.log().info(f"Acrescentando {tabela.name}.{coluna.name}")
+                tipo = coluna.type.compile(dialect=engine.dialect)
+                conexao.execute(
+                    text(
+                        f"ALTER TABLE {tabela.name}"
+                        + f" ADD COLUMN {coluna.name} {tipo}"
+                    )
+                )
+            for indice in tabela.indexes:
+                indice.create(conexao, checkfirst=True)
+
+
 def default_session_factory() -> sessionmaker:
     return sessionmaker(
         bind=create_engine(
             sqlite_url(),
         )
     )
+
+
+def readonly_session_factory(caminho: str) -> sessionmaker:
+    # O modo somente leitura não cria o arquivo nem bloqueia a
+    # escrita pelo encadeador em execução.
+    return sessionmaker(
+        bind=create_engine(f"sqlite:///file:{caminho}?mode=ro&uri=true")
+    )
@@ -0,0 +1,20 @@
+from encadeador.adapters.orm import registry
+from sqlalchemy import (  # type: ignore
+    Table,
+    Column,
+    Integer,
+    ForeignKey,
+    String,
+    DateTime,
+)
+
+tabela_etapas_preparacao = Table(
+    "etapas_preparacao",
+    registry.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("nome", String(255), nullable=False),
+    Column("id_caso", ForeignKey("casos.id"), nullable=False, index=True),
+    Column("assinatura_entrada", String(64)),
+    Column("assinatura_saida", String(64)),
+    Column("instante", DateTime),
+)
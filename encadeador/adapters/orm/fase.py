@@ -0,0 +1,23 @@
+from encadeador.adapters.orm import registry
+from sqlalchemy import (  # type: ignore
+    Table,
+    Column,
+    Integer,
+    ForeignKey,
+    String,
+    Float,
+    Boolean,
+    DateTime,
+)
+
+tabela_fases = Table(
+    "fases",
+    registry.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("nome", String(255), nullable=False, index=True),
+    Column("instante_inicio", DateTime),
+    Column("instante_fim", DateTime),
+    Column("duracao", Float),
+    Column("sucesso", Boolean),
+    Column("id_caso", ForeignKey("casos.id"), nullable=True, index=True),
+)
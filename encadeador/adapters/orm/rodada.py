@@ -25,4 +25,5 @@ tabela_rodadas = Table(
     Column("nome_programa", String(255)),
     Column("versao_programa", String(255)),
     Column("id_caso", ForeignKey("casos.id")),
+    Column("instante_entrada_estado", DateTime),
 )
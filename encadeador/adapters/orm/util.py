@@ -3,13 +3,19 @@ from encadeador.adapters.orm import registry
 from encadeador.adapters.orm.rodada import tabela_rodadas
 from encadeador.adapters.orm.caso import tabela_casos
 from encadeador.adapters.orm.estudo import tabela_estudos
+from encadeador.adapters.orm.fase import tabela_fases
+from encadeador.adapters.orm.etapapreparacao import tabela_etapas_preparacao
 
 from encadeador.modelos.rodada import Rodada
 from encadeador.modelos.caso import Caso
 from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.fase import Fase
+from encadeador.modelos.etapapreparacao import EtapaPreparacao
 
 
 def start_mappers():
+    registry.map_imperatively(Fase, tabela_fases)
+    registry.map_imperatively(EtapaPreparacao, tabela_etapas_preparacao)
     rodada_mapper = registry.map_imperatively(Rodada, tabela_rodadas)
     caso_mapper = registry.map_imperatively(
         Caso,
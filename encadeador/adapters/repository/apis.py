@@ -1,68 +1,157 @@
-import aiohttp
-from typing import List, Union, Optional
+from typing import List, Set, Tuple, Union, Optional, TYPE_CHECKING
 from os.path import join
 import json
 import asyncio
 import io
-import ast
-import pandas as pd  # type: ignore
+import time
+import uuid
 
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.internal.resiliencia import (
+    ClienteResiliente,
+    PoliticaResiliencia,
+)
 from encadeador.modelos.run import Run
 from encadeador.modelos.chainingresult import ChainingResult
 from encadeador.modelos.flexibilizationresult import FlexibilizationResult
-from encadeador.modelos.reservoirrule import ReservoirRule
+from encadeador.modelos.indiceregrasreservatorios import (
+    JanelaRegrasReservatorios,
+)
 from encadeador.modelos.reservoirgrouprule import ReservoirGroupRule
 from encadeador.modelos.caso import Caso
 from encadeador.utils.log import Log
+from encadeador.utils.fases import mede_fase
 from encadeador.utils.url import base62_encode
+from encadeador.utils.jsonparser import carrega_modelos, serializa
+
+if TYPE_CHECKING:
+    import aiohttp
+    import pandas as pd  # type: ignore
+
+
+def sessao() -> "aiohttp.ClientSession":
+    """
+    Cria uma sessão HTTP. O aiohttp é importado somente na primeira
+    requisição, para não atrasar a inicialização da aplicação.
+    """
+    import aiohttp
+
+    return aiohttp.ClientSession()
+
+
+def politica_model_api() -> PoliticaResiliencia:
+    atraso_hedge = Configuracoes().atraso_hedge_leitura_rodadas
+    return PoliticaResiliencia(
+        Configuracoes().tentativas_requisicoes,
+        _atraso_hedge=atraso_hedge if atraso_hedge > 0 else None,
+    )
+
+
+def politica_servicos() -> PoliticaResiliencia:
+    return PoliticaResiliencia(Configuracoes().tentativas_requisicoes)
+
+
+async def post_json(
+    session: "aiohttp.ClientSession", url: str, req: dict
+) -> Tuple[int, bytes]:
+    """
+    Envia uma requisição POST com corpo JSON, registrando o tamanho
+    do corpo e o tempo até a resposta. O corpo não é registrado, pois
+    pode conter o conjunto completo de regras de reservatórios.
+    """
+    corpo = serializa(req)
+    identificador = f" (rulesId {req['rulesId']})" if "rulesId" in req else ""
+    Log.log().info(f"Requisição: [{url}] {len(corpo)} bytes{identificador}")
+    inicio = time.perf_counter()
+    async with session.post(
+        url, data=corpo, headers={"Content-Type": "application/json"}
+    ) as r:
+        status = r.status
+        conteudo = await r.read()
+    Log.log().info(
+        f"Resposta: [{url}] {status} - {time.perf_counter() - inicio:.3f} s"
+    )
+    return status, conteudo
 
 
 class ModelAPIRepository:
+    @staticmethod
+    def _cliente() -> ClienteResiliente:
+        return ClienteResiliente.servico("model_api", politica_model_api)
+
+    # As leituras das rodadas, repetidas a cada monitoramento, não
+    # são registradas como fases. A espera da rodada é registrada
+    # pelos estados em que permanece.
     @staticmethod
     async def list_runs() -> Union[List[Run], HTTPResponse]:
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().model_api + "runs/"
-            async with session.get(url) as r:
-                if r.status != 200:
-                    return HTTPResponse(code=r.status, detail=await r.text())
-                else:
-                    jobData = await r.text()
-                    return [Run.parse_raw(j) for j in jobData]
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().model_api + "runs/"
+                async with session.get(url) as r:
+                    if r.status != 200:
+                        return HTTPResponse(
+                            code=r.status, detail=await r.text()
+                        )
+                    else:
+                        return carrega_modelos(await r.read(), Run)
+
+        return await ModelAPIRepository._cliente().executa(chamada)
 
     @staticmethod
     async def read_run(runId: int) -> Union[Run, HTTPResponse]:
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().model_api + "runs/" + str(runId)
-            async with session.get(url) as r:
-                if r.status != 200:
-                    return HTTPResponse(code=r.status, detail=await r.text())
-                else:
-                    jobData = await r.text()
-                    return Run.parse_raw(jobData)
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().model_api + "runs/" + str(runId)
+                async with session.get(url) as r:
+                    if r.status != 200:
+                        return HTTPResponse(
+                            code=r.status, detail=await r.text()
+                        )
+                    else:
+                        jobData = await r.text()
+                        return Run.parse_raw(jobData)
+
+        return await ModelAPIRepository._cliente().executa(chamada, hedge=True)
 
     @staticmethod
+    @mede_fase("api_modelos_cria_rodada")
     async def create_run(run: Run) -> Union[int, HTTPResponse]:
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().model_api + "runs/"
-            async with session.post(url, json=json.loads(run.json())) as r:
-                if r.status != 201:
-                    return HTTPResponse(code=r.status, detail=await r.text())
-                else:
-                    rundata = await r.json()
-                    return rundata["runId"]
+        # A chave de idempotência é a mesma em todas as tentativas,
+        # de modo que o serviço não cria rodadas duplicadas.
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().model_api + "runs/"
+                async with session.post(
+                    url, json=json.loads(run.json()), headers=headers
+                ) as r:
+                    if r.status != 201:
+                        return HTTPResponse(
+                            code=r.status, detail=await r.text()
+                        )
+                    else:
+                        rundata = await r.json()
+                        return rundata["runId"]
+
+        return await ModelAPIRepository._cliente().executa(chamada)
 
     @staticmethod
+    @mede_fase("api_modelos_deleta_rodada")
     async def delete_run(runId: int) -> HTTPResponse:
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().model_api + "runs/" + str(runId)
-            async with session.delete(url) as r:
-                return HTTPResponse(code=r.status, detail=await r.text())
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().model_api + "runs/" + str(runId)
+                async with session.delete(url) as r:
+                    return HTTPResponse(code=r.status, detail=await r.text())
+
+        return await ModelAPIRepository._cliente().executa(chamada)
 
 
 class EncadeadorAPIRepository:
     @staticmethod
+    @mede_fase("api_encadeador")
     async def encadeia(
         casos_anteriores: List[Caso], caso_destino: Caso, variavel: str
     ) -> Union[List[ChainingResult], HTTPResponse]:
@@ -90,22 +179,26 @@ class EncadeadorAPIRepository:
             },
             "variable": variavel,
         }
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().encadeador_service
-            Log.log().info(f"Requisição: [{url}] {req}")
-            async with session.post(url, json=req) as r:
-                if r.status != 200:
-                    return HTTPResponse(code=r.status, detail=await r.text())
+
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().encadeador_service
+                status, conteudo = await post_json(session, url, req)
+                if status != 200:
+                    return HTTPResponse(code=status, detail=conteudo.decode())
                 else:
-                    chainData = ast.literal_eval(await r.text())
-                    return [
-                        ChainingResult.parse_raw(json.dumps(j))
-                        for j in chainData["result"]
-                    ]
+                    return carrega_modelos(conteudo, ChainingResult, "result")
+
+        # O encadeamento sobrescreve os mesmos valores no caso de
+        # destino, podendo ser repetido.
+        return await ClienteResiliente.servico(
+            "encadeador", politica_servicos
+        ).executa(chamada)
 
 
 class FlexibilizadorAPIRepository:
     @staticmethod
+    @mede_fase("api_flexibilizador")
     async def flexibiliza(
         caso: Caso,
     ) -> Union[List[FlexibilizationResult], HTTPResponse]:
@@ -118,26 +211,40 @@ class FlexibilizadorAPIRepository:
             ),
             "program": caso.programa.value,
         }
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().flexibilizador_service
-            Log.log().info(f"Requisição: [{url}] {req}")
-            async with session.post(url, json=req) as r:
-                if r.status != 200:
-                    return HTTPResponse(code=r.status, detail=await r.text())
-                else:
-                    flexData = json.loads(await r.text())
-                    return [
-                        FlexibilizationResult.parse_raw(json.dumps(j))
-                        for j in flexData["result"]
-                    ]
+
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().flexibilizador_service
+                Log.log().info(f"Requisição: [{url}] {req}")
+                async with session.post(url, json=req) as r:
+                    if r.status != 200:
+                        return HTTPResponse(
+                            code=r.status, detail=await r.text()
+                        )
+                    else:
+                        return carrega_modelos(
+                            await r.read(), FlexibilizationResult, "result"
+                        )
+
+        # Cada flexibilização altera o deck novamente, portanto
+        # não é repetida.
+        return await ClienteResiliente.servico(
+            "flexibilizador", politica_servicos
+        ).executa(chamada, idempotente=False)
 
 
 class RegrasReservatoriosAPIRepository:
+    # Conjuntos de regras já enviados ao serviço, se ele os mantém
+    # em cache. Se um conjunto for enviado novamente, somente o seu
+    # identificador é incluído na requisição.
+    _conjuntos_enviados: Set[str] = set()
+
     @staticmethod
+    @mede_fase("api_regras_reservatorios")
     async def aplica_regras(
         casos_anteriores: List[Caso],
         caso_destino: Caso,
-        regras: List[ReservoirRule],
+        regras: JanelaRegrasReservatorios,
     ) -> Union[List[ReservoirGroupRule], HTTPResponse]:
         req = {
             "sources": [
@@ -161,31 +268,62 @@ class RegrasReservatoriosAPIRepository:
                 ),
                 "program": caso_destino.programa.value,
             },
-            "rules": [json.loads(r.json()) for r in regras],
         }
-        async with aiohttp.ClientSession() as session:
-            url = Configuracoes().regras_reservatorios_service
-            Log.log().info(f"Requisição: [{url}] {req}")
-            async with session.post(url, json=req) as r:
-                if r.status != 200:
-                    return HTTPResponse(code=r.status, detail=await r.text())
-                else:
-                    ruleData = json.loads(await r.text())
-                    return [
-                        ReservoirGroupRule.parse_raw(json.dumps(j))
-                        for j in ruleData["result"]
-                    ]
+        cache = Configuracoes().cache_regras_reservatorios
+        if cache:
+            req["rulesId"] = regras.identificador
+        enviados = RegrasReservatoriosAPIRepository._conjuntos_enviados
+        cliente = ClienteResiliente.servico(
+            "regras_reservatorios", politica_servicos
+        )
+
+        async def chamada():
+            async with sessao() as session:
+                url = Configuracoes().regras_reservatorios_service
+                status, conteudo = await post_json(session, url, req)
+                return RegrasReservatoriosAPIRepository.__resposta(
+                    status, conteudo
+                )
+
+        if cache and regras.identificador in enviados:
+            res = await cliente.executa(chamada)
+            # Qualquer recusa, e não só a do conjunto desconhecido,
+            # é repetida com as regras completas
+            if not (isinstance(res, HTTPResponse) and 400 <= res.code < 500):
+                return res
+            Log.log().info(
+                f"Conjunto de regras {regras.identificador} recusado"
+                + f" pelo serviço [{res.code}]. Enviando regras."
+            )
+            enviados.discard(regras.identificador)
+        req["rules"] = regras.payload
+        res = await cliente.executa(chamada)
+        if cache and not isinstance(res, HTTPResponse):
+            enviados.add(regras.identificador)
+        return res
+
+    @staticmethod
+    def __resposta(
+        status: int, conteudo: bytes
+    ) -> Union[List[ReservoirGroupRule], HTTPResponse]:
+        if status != 200:
+            return HTTPResponse(code=status, detail=conteudo.decode())
+        else:
+            return carrega_modelos(conteudo, ReservoirGroupRule, "result")
 
 
 class ResultAPIRepository:
     @staticmethod
+    @mede_fase("api_resultados")
     async def resultados_1o_estagio_casos(
         casos: List[Caso],
         variavel: str,
         filtros: dict = {"estagio": 1, "preprocessing": "FULL"},
-    ) -> Optional[pd.DataFrame]:
+    ) -> "Optional[pd.DataFrame]":
+        import pandas as pd  # type: ignore
+
         valid_dfs: List[pd.DataFrame] = []
-        async with aiohttp.ClientSession() as session:
+        async with sessao() as session:
             ret: List[Optional[pd.DataFrame]] = await asyncio.gather(
                 *[
                     ResultAPIRepository.resultados_caso(
@@ -213,15 +351,25 @@ class ResultAPIRepository:
     @classmethod
     async def resultados_caso(
         cls,
-        session: aiohttp.ClientSession,
+        session: "aiohttp.ClientSession",
         case_path: str,
         desired_data: str,
         filters: dict,
-    ) -> Optional[pd.DataFrame]:
+    ) -> "Optional[pd.DataFrame]":
+        import pandas as pd  # type: ignore
+
         identifier = base62_encode(case_path)
         url = f"{Configuracoes().result_api}/{identifier}/{desired_data}"
-        async with session.get(url, params=filters) as r:
-            if r.status != 200:
-                return None
-            else:
-                return pd.read_parquet(io.BytesIO(await r.content.read()))
+
+        async def chamada():
+            async with session.get(url, params=filters) as r:
+                if r.status != 200:
+                    return HTTPResponse(code=r.status, detail=await r.text())
+                else:
+                    conteudo = await r.content.read()
+                    return pd.read_parquet(io.BytesIO(conteudo))
+
+        res = await ClienteResiliente.servico(
+            "resultados", politica_servicos
+        ).executa(chamada)
+        return None if isinstance(res, HTTPResponse) else res
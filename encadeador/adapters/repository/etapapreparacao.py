@@ -0,0 +1,119 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.orm import Session  # type: ignore
+from typing import List, Dict, Optional, Type
+from pathlib import Path
+from os.path import exists
+from os import makedirs
+from json import dump, load
+from datetime import datetime
+
+from encadeador.modelos.etapapreparacao import EtapaPreparacao
+
+
+class AbstractEtapaPreparacaoRepository(ABC):
+    @abstractmethod
+    def create(self, etapa: EtapaPreparacao):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self) -> List[EtapaPreparacao]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_by_caso(self, id_caso: int) -> List[EtapaPreparacao]:
+        raise NotImplementedError
+
+    def read_last_by_caso(
+        self, id_caso: int, nome: str
+    ) -> Optional[EtapaPreparacao]:
+        etapas = [e for e in self.list_by_caso(id_caso) if e.nome == nome]
+        return max(etapas, key=lambda e: e.id, default=None)
+
+
+class SQLEtapaPreparacaoRepository(AbstractEtapaPreparacaoRepository):
+    def __init__(self, session: Session):
+        self.__session = session
+
+    def create(self, etapa: EtapaPreparacao):
+        return self.__session.add(etapa)
+
+    def list(self) -> List[EtapaPreparacao]:
+        statement = select(EtapaPreparacao)
+        return [e[0] for e in self.__session.execute(statement).all()]
+
+    def list_by_caso(self, id_caso: int) -> List[EtapaPreparacao]:
+        statement = select(EtapaPreparacao).where(
+            EtapaPreparacao.id_caso == id_caso  # type: ignore
+        )
+        return [e[0] for e in self.__session.execute(statement).all()]
+
+
+class JSONEtapaPreparacaoRepository(AbstractEtapaPreparacaoRepository):
+    def __init__(self, path: str):
+        self.__path = Path(path) / "etapas_preparacao.json"
+
+    @staticmethod
+    def __to_json(etapa: EtapaPreparacao) -> dict:
+        return {
+            "id": etapa.id,
+            "nome": etapa.nome,
+            "id_caso": etapa.id_caso,
+            "assinatura_entrada": etapa.assinatura_entrada,
+            "assinatura_saida": etapa.assinatura_saida,
+            "instante": etapa.instante.isoformat(),
+        }
+
+    @staticmethod
+    def __from_json(etapa_data: dict) -> EtapaPreparacao:
+        etapa = EtapaPreparacao(
+            etapa_data["nome"],
+            etapa_data["id_caso"],
+            etapa_data["assinatura_entrada"],
+            etapa_data["assinatura_saida"],
+            datetime.fromisoformat(etapa_data["instante"]),
+        )
+        etapa.id = etapa_data["id"]
+        return etapa
+
+    def __create_directory_if_not_exists(self):
+        if not exists(self.__path):
+            if not exists(self.__path.parent):
+                makedirs(self.__path.parent)
+            with open(self.__path, "w") as file:
+                file.write("[]")
+
+    def __read_file(self) -> List[EtapaPreparacao]:
+        self.__create_directory_if_not_exists()
+        with open(self.__path, "r") as file:
+            return [
+                JSONEtapaPreparacaoRepository.__from_json(e)
+                for e in load(file)
+            ]
+
+    def __write_file(self, etapas: List[EtapaPreparacao]):
+        self.__create_directory_if_not_exists()
+        with open(self.__path, "w") as file:
+            dump(
+                [JSONEtapaPreparacaoRepository.__to_json(e) for e in etapas],
+                file,
+            )
+
+    def create(self, etapa: EtapaPreparacao):
+        existing = self.__read_file()
+        etapa.id = max([e.id for e in existing], default=0) + 1
+        self.__write_file(existing + [etapa])
+
+    def list(self) -> List[EtapaPreparacao]:
+        return self.__read_file()
+
+    def list_by_caso(self, id_caso: int) -> List[EtapaPreparacao]:
+        return [e for e in self.__read_file() if e.id_caso == id_caso]
+
+
+def factory(kind: str, *args, **kwargs) -> AbstractEtapaPreparacaoRepository:
+    mappings: Dict[str, Type[AbstractEtapaPreparacaoRepository]] = {
+        "SQL": SQLEtapaPreparacaoRepository,
+        "JSON": JSONEtapaPreparacaoRepository,
+    }
+    return mappings[kind](*args, **kwargs)
@@ -0,0 +1,159 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import func, select  # type: ignore
+from sqlalchemy.orm import Session  # type: ignore
+from typing import List, Dict, Optional, Tuple, Type
+from pathlib import Path
+from os.path import exists
+from os import makedirs
+from json import dump, load
+from datetime import datetime
+
+from encadeador.modelos.fase import Fase
+
+
+class AbstractFaseRepository(ABC):
+    @abstractmethod
+    def create(self, fase: Fase):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self) -> List[Fase]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_by_caso(self, id_caso: int) -> List[Fase]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_after(self, id: int) -> List[Fase]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def total_by_caso(self) -> List[Tuple[int, str, float]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def max_duracao(self, nome: str) -> Optional[float]:
+        raise NotImplementedError
+
+
+class SQLFaseRepository(AbstractFaseRepository):
+    def __init__(self, session: Session):
+        self.__session = session
+
+    def create(self, fase: Fase):
+        return self.__session.add(fase)
+
+    def list(self) -> List[Fase]:
+        statement = select(Fase)
+        return [f[0] for f in self.__session.execute(statement).all()]
+
+    def list_by_caso(self, id_caso: int) -> List[Fase]:
+        statement = select(Fase).where(Fase.id_caso == id_caso)  # type: ignore
+        return [f[0] for f in self.__session.execute(statement).all()]
+
+    def list_after(self, id: int) -> List[Fase]:
+        statement = (
+            select(Fase).where(Fase.id > id).order_by(Fase.id)  # type: ignore
+        )
+        return [f[0] for f in self.__session.execute(statement).all()]
+
+    def total_by_caso(self) -> List[Tuple[int, str, float]]:
+        statement = (
+            select(Fase.id_caso, Fase.nome, func.sum(Fase.duracao))  # type: ignore
+            .where(Fase.id_caso.is_not(None))  # type: ignore
+            .group_by(Fase.id_caso, Fase.nome)  # type: ignore
+        )
+        return [
+            (int(c), str(n), float(d))
+            for c, n, d in self.__session.execute(statement).all()
+        ]
+
+    def max_duracao(self, nome: str) -> Optional[float]:
+        statement = select(func.max(Fase.duracao)).where(
+            Fase.nome == nome  # type: ignore
+        )
+        return self.__session.execute(statement).scalar()
+
+
+class JSONFaseRepository(AbstractFaseRepository):
+    def __init__(self, path: str):
+        self.__path = Path(path) / "fases.json"
+
+    @staticmethod
+    def __to_json(fase: Fase) -> dict:
+        return {
+            "id": fase.id,
+            "nome": fase.nome,
+            "instante_inicio": fase.instante_inicio.isoformat(),
+            "instante_fim": fase.instante_fim.isoformat(),
+            "duracao": fase.duracao,
+            "sucesso": fase.sucesso,
+            "id_caso": fase.id_caso,
+        }
+
+    @staticmethod
+    def __from_json(fase_data: dict) -> Fase:
+        fase = Fase(
+            fase_data["nome"],
+            datetime.fromisoformat(fase_data["instante_inicio"]),
+            datetime.fromisoformat(fase_data["instante_fim"]),
+            fase_data["duracao"],
+            fase_data["sucesso"],
+            fase_data["id_caso"],
+        )
+        fase.id = fase_data["id"]
+        return fase
+
+    def __create_directory_if_not_exists(self):
+        if not exists(self.__path):
+            if not exists(self.__path.parent):
+                makedirs(self.__path.parent)
+            with open(self.__path, "w") as file:
+                file.write("[]")
+
+    def __read_file(self) -> List[Fase]:
+        self.__create_directory_if_not_exists()
+        with open(self.__path, "r") as file:
+            return [JSONFaseRepository.__from_json(f) for f in load(file)]
+
+    def __write_file(self, fases: List[Fase]):
+        self.__create_directory_if_not_exists()
+        with open(self.__path, "w") as file:
+            dump([JSONFaseRepository.__to_json(f) for f in fases], file)
+
+    def create(self, fase: Fase):
+        existing = self.__read_file()
+        fase.id = max([f.id for f in existing], default=0) + 1
+        self.__write_file(existing + [fase])
+
+    def list(self) -> List[Fase]:
+        return self.__read_file()
+
+    def list_by_caso(self, id_caso: int) -> List[Fase]:
+        return [f for f in self.__read_file() if f.id_caso == id_caso]
+
+    def list_after(self, id: int) -> List[Fase]:
+        return [f for f in self.__read_file() if f.id > id]
+
+    def total_by_caso(self) -> List[Tuple[int, str, float]]:
+        totais: Dict[Tuple[int, str], float] = {}
+        for f in self.__read_file():
+            if f.id_caso is not None:
+                chave = (f.id_caso, f.nome)
+                totais[chave] = totais.get(chave, 0.0) + f.duracao
+        return [(c, n, d) for (c, n), d in totais.items()]
+
+    def max_duracao(self, nome: str) -> Optional[float]:
+        return max(
+            [f.duracao for f in self.__read_file() if f.nome == nome],
+            default=None,
+        )
+
+
+def factory(kind: str, *args, **kwargs) -> AbstractFaseRepository:
+    mappings: Dict[str, Type[AbstractFaseRepository]] = {
+        "SQL": SQLFaseRepository,
+        "JSON": JSONFaseRepository,
+    }
+    return mappings[kind](*args, **kwargs)
@@ -62,6 +62,7 @@ class SQLRodadaRepository(AbstractRodadaRepository):
                     "instante_inicio_execucao": rodada.instante_inicio_execucao,
                     "instante_fim_execucao": rodada.instante_fim_execucao,
                     "estado": rodada.estado,
+                    "instante_entrada_estado": rodada.instante_entrada_estado,
                 }
             )
         )
@@ -89,6 +90,9 @@ class JSONRodadaRepository(AbstractRodadaRepository):
         fim_exec = None
         if rodada.instante_fim_execucao is not None:
             fim_exec = rodada.instante_fim_execucao.isoformat()
+        entrada = None
+        if rodada.instante_entrada_estado is not None:
+            entrada = rodada.instante_entrada_estado.isoformat()
         return {
             "id": rodada.id,
             "nome": rodada.nome,
@@ -101,22 +105,32 @@ class JSONRodadaRepository(AbstractRodadaRepository):
             "nome_programa": rodada.nome_programa,
             "versao_programa": rodada.versao_programa,
             "id_caso": rodada.id_caso,
+            "instante_entrada_estado": entrada,
         }
 
     @staticmethod
     def __from_json(rodada_data: dict) -> Rodada:
+        fim_exec = None
+        if rodada_data["instante_fim_execucao"] is not None:
+            fim_exec = datetime.fromisoformat(
+                rodada_data["instante_fim_execucao"]
+            )
         rodada = Rodada(
             rodada_data["nome"],
             RunStatus.factory(rodada_data["estado"]),
             rodada_data["id_job"],
             rodada_data["caminho"],
             datetime.fromisoformat(rodada_data["instante_inicio_execucao"]),
-            datetime.fromisoformat(rodada_data["instante_fim_execucao"]),
+            fim_exec,
             rodada_data["numero_processadores"],
             rodada_data["nome_programa"],
             rodada_data["versao_programa"],
             rodada_data["id_caso"],
         )
+        if rodada_data.get("instante_entrada_estado") is not None:
+            rodada.instante_entrada_estado = datetime.fromisoformat(
+                rodada_data["instante_entrada_estado"]
+            )
         rodada.id = rodada_data["id"]
         return rodada
 
@@ -1,36 +1,42 @@
 from abc import ABC, abstractmethod
-import pandas as pd  # type: ignore
-from typing import Dict, Type
+from typing import Dict, Type, TYPE_CHECKING
 from encadeador.utils.log import Log
 
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
 
 class AbstractSynthesisRepository(ABC):
     def __init__(self) -> None:
         super().__init__()
 
     @abstractmethod
-    def read(self, filename: str) -> pd.DataFrame:
+    def read(self, filename: str) -> "pd.DataFrame":
         pass
 
     @abstractmethod
-    def write(self, df: pd.DataFrame, filename: str) -> bool:
+    def write(self, df: "pd.DataFrame", filename: str) -> bool:
         pass
 
 
 class ParquetSynthesisRepository(AbstractSynthesisRepository):
-    def read(self, filename: str) -> pd.DataFrame:
+    def read(self, filename: str) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         return pd.read_parquet(filename + ".parquet.gzip")
 
-    def write(self, df: pd.DataFrame, filename: str) -> bool:
+    def write(self, df: "pd.DataFrame", filename: str) -> bool:
         df.to_parquet(filename + ".parquet.gzip", compression="gzip")
         return True
 
 
 class CSVSynthesisRepository(AbstractSynthesisRepository):
-    def read(self, filename: str) -> pd.DataFrame:
+    def read(self, filename: str) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         return pd.read_csv(filename + ".csv")
 
-    def write(self, df: pd.DataFrame, filename: str) -> bool:
+    def write(self, df: "pd.DataFrame", filename: str) -> bool:
         df.to_csv(filename + ".csv", index=False)
         return True
 
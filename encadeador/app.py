@@ -1,16 +1,28 @@
 import asyncio
+import signal
+from os.path import join
 from typing import Callable, Dict
 
 from encadeador.services.unitofwork.rodada import factory as rodada_uow_factory
 from encadeador.services.unitofwork.caso import factory as caso_uow_factory
 from encadeador.services.unitofwork.estudo import factory as estudo_uow_factory
+from encadeador.services.unitofwork.fase import factory as fase_uow_factory
+from encadeador.services.unitofwork.etapapreparacao import (
+    factory as etapa_uow_factory,
+)
 
 from encadeador.controladores.leitorarquivos import LeitorArquivos
 from encadeador.controladores.monitorestudo import MonitorEstudo
+from encadeador.controladores.filasintese import FilaSintese
+from encadeador.controladores.sintetizador import encerra_processos
+from encadeador.internal.perfilador import Perfilador
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
 from encadeador.modelos.transicaoestudo import TransicaoEstudo
 from encadeador.utils.log import Log
 
-
 # TODO - Aqui pode ser o lugar para ocorrer DI no futuro
 # Uma maneira prática de fazer DI nessa versão é editar
 # os singletons. Se precisar de multithreading, tem que pensar
@@ -24,13 +36,22 @@ ESTUDO_ID = 1
 class App:
     def __init__(self) -> None:
         self._lista_casos = LeitorArquivos.carrega_lista_casos()
-        self._regras_reservatorio = (
+        self._regras_reservatorio = IndiceRegrasReservatorios(
             LeitorArquivos.carrega_regras_reservatorios()
         )
         self._regras_inviabilidades = (
             LeitorArquivos.carrega_regras_inviabilidades()
         )
         self._executando = False
+        self._fila_sintese = FilaSintese(
+            ESTUDO_ID, estudo_uow_factory(UOW_KIND)
+        )
+        self._perfilador = Perfilador(
+            join(
+                Configuracoes().caminho_base_estudo,
+                Configuracoes().diretorio_sintese,
+            )
+        )
 
     async def callback_evento(self, evento: TransicaoEstudo):
         """
@@ -74,6 +95,10 @@ class App:
 
     def __finaliza(self, codigo: int):
         Log.log().info("Finalizando Encadeador")
+        self._perfilador.encerra()
+        # O atexit não é executado quando o App roda em um processo
+        # filho, que aguardaria os processos das sínteses para sempre
+        encerra_processos()
         exit(codigo)
 
     async def inicializa(self):
@@ -82,14 +107,44 @@ class App:
             estudo_uow_factory(UOW_KIND),
             caso_uow_factory(UOW_KIND),
             rodada_uow_factory(UOW_KIND),
+            fase_uow_factory(UOW_KIND),
+            etapa_uow_factory(UOW_KIND),
             self._lista_casos,
             self._regras_reservatorio,
             self._regras_inviabilidades,
+            self._fila_sintese,
         )
         self._monitor.observa(self.callback_evento)
         await self._monitor.prepara()
 
+    def __alterna_perfilador(self):
+        self._perfilador.alterna(
+            Configuracoes().duracao_perfilador,
+            Configuracoes().modo_perfilador,
+        )
+
     async def executa(self):
+        self._fila_sintese.inicia()
+        if Configuracoes().porta_metricas > 0:
+            # O servidor de métricas importa o aiohttp.web
+            from encadeador.controladores.servidormetricas import (
+                ServidorMetricas,
+            )
+
+            self._servidor_metricas = ServidorMetricas(
+                Configuracoes().porta_metricas,
+                caso_uow_factory(UOW_KIND),
+                rodada_uow_factory(UOW_KIND),
+                self._fila_sintese,
+                self._perfilador,
+            )
+            await self._servidor_metricas.inicia()
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGUSR1, self.__alterna_perfilador
+            )
+        if Configuracoes().perfila_inicio:
+            self.__alterna_perfilador()
         while True:
             await asyncio.sleep(INTERVALO_POLL)
             Log.log().debug("Tentando monitorar...")
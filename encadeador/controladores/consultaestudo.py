@@ -0,0 +1,234 @@
+from collections import Counter, defaultdict
+from os.path import isfile, join
+from typing import Dict, List, Optional
+
+from config import readonly_session_factory
+from encadeador.adapters.repository.caso import (
+    AbstractCasoRepository,
+    JSONCasoRepository,
+    SQLCasoRepository,
+)
+from encadeador.adapters.repository.fase import (
+    AbstractFaseRepository,
+    JSONFaseRepository,
+    SQLFaseRepository,
+)
+from encadeador.adapters.repository.rodada import (
+    AbstractRodadaRepository,
+    JSONRodadaRepository,
+    SQLRodadaRepository,
+)
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.rodada import Rodada
+
+ARQUIVO_DB = "data.db"
+# Arquivos alterados pelo encadeador ao atualizar cada armazenamento
+ARQUIVOS_ARMAZENAMENTO = {
+    "SQL": [ARQUIVO_DB],
+    "JSON": ["casos.json", "rodadas.json", "fases.json"],
+}
+
+
+def formata_tabela(colunas: List[str], linhas: List[List[object]]) -> str:
+    """
+    Formata as linhas como uma tabela de largura fixa, com os
+    números alinhados à direita.
+    """
+    textos = [["-" if v is None else str(v) for v in li] for li in linhas]
+    larguras = [
+        max([len(c)] + [len(li[i]) for li in textos])
+        for i, c in enumerate(colunas)
+    ]
+
+    def formata(valores: List[str], numericos: List[bool]) -> str:
+        return "  ".join(
+            v.rjust(w) if n else v.ljust(w)
+            for v, w, n in zip(valores, larguras, numericos)
+        ).rstrip()
+
+    saida = [formata(colunas, [False] * len(colunas))]
+    for li, textos_li in zip(linhas, textos):
+        numericos = [isinstance(v, (int, float)) for v in li]
+        saida.append(formata(textos_li, numericos))
+    return "\n".join(saida)
+
+
+def milissegundos(segundos: float) -> int:
+    return int(round(1000 * segundos))
+
+
+class ConsultaEstudo:
+    """
+    Consultas somente leitura ao estado de um estudo, feitas
+    diretamente nos repositórios, sem ler os decks ou acessar os
+    serviços externos. O banco SQLite é aberto em modo somente
+    leitura, de modo que pode ser consultado durante a execução.
+    """
+
+    def __init__(self, armazenamento: str, caminho: str):
+        if armazenamento not in ARQUIVOS_ARMAZENAMENTO:
+            raise ValueError(f"Armazenamento inválido: {armazenamento}")
+        self._armazenamento = armazenamento
+        self._caminho = caminho
+
+    @property
+    def arquivos(self) -> List[str]:
+        """
+        Nomes dos arquivos cuja alteração indica uma atualização do
+        estado do estudo.
+        """
+        return ARQUIVOS_ARMAZENAMENTO[self._armazenamento]
+
+    @property
+    def existe(self) -> bool:
+        return any(isfile(join(self._caminho, a)) for a in self.arquivos)
+
+    def __enter__(self) -> "ConsultaEstudo":
+        if self._armazenamento == "SQL":
+            self._session = readonly_session_factory(
+                join(self._caminho, ARQUIVO_DB)
+            )()
+            self._casos: AbstractCasoRepository = SQLCasoRepository(
+                self._session
+            )
+            self._rodadas: AbstractRodadaRepository = SQLRodadaRepository(
+                self._session
+            )
+            self._fases: AbstractFaseRepository = SQLFaseRepository(
+                self._session
+            )
+        else:
+            self._session = None
+            self._casos = JSONCasoRepository(self._caminho)
+            self._rodadas = JSONRodadaRepository(self._caminho)
+            self._fases = JSONFaseRepository(self._caminho)
+        return self
+
+    def __exit__(self, *args):
+        if self._session is not None:
+            self._session.close()
+
+    def __casos(self, id_caso: Optional[int]) -> List[Caso]:
+        casos = sorted(self._casos.list(), key=lambda c: c.id)
+        if id_caso is not None:
+            casos = [c for c in casos if c.id == id_caso]
+        return casos
+
+    def __rodadas_por_caso(self) -> Dict[int, List[Rodada]]:
+        rodadas: Dict[int, List[Rodada]] = defaultdict(list)
+        for r in self._rodadas.list():
+            rodadas[r.id_caso].append(r)
+        for lista in rodadas.values():
+            lista.sort(key=lambda r: r.id)
+        return rodadas
+
+    def __tabela_fases(self, id_caso: Optional[int]) -> str:
+        fases = (
+            self._fases.list()
+            if id_caso is None
+            else self._fases.list_by_caso(id_caso)
+        )
+        duracoes: Dict[str, List[float]] = defaultdict(list)
+        for f in fases:
+            duracoes[f.nome].append(f.duracao)
+        linhas: List[List[object]] = [
+            [
+                nome,
+                len(d),
+                milissegundos(sum(d)),
+                milissegundos(sum(d) / len(d)),
+                milissegundos(max(d)),
+            ]
+            for nome, d in sorted(duracoes.items(), key=lambda it: -sum(it[1]))
+        ]
+        return formata_tabela(
+            ["FASE", "N", "TOTAL_MS", "MEDIA_MS", "MAXIMO_MS"], linhas
+        )
+
+    def status(self, id_caso: Optional[int] = None) -> str:
+        """
+        Estado de cada caso, com a rodada atual e o número de
+        flexibilizações, seguido dos tempos das fases.
+        """
+        casos = self.__casos(id_caso)
+        rodadas = self.__rodadas_por_caso()
+        contagem = Counter(c.estado for c in casos)
+        resumo = ", ".join(
+            f"{e.value} {contagem[e]}" for e in EstadoCaso if contagem[e] > 0
+        )
+        linhas: List[List[object]] = []
+        for c in casos:
+            rodadas_caso = rodadas.get(c.id, [])
+            atual = rodadas_caso[-1] if len(rodadas_caso) > 0 else None
+            linhas.append(
+                [
+                    c.id,
+                    c.nome,
+                    c.programa.value,
+                    c.estado.value,
+                    atual.id_job if atual is not None else None,
+                    atual.estado.value if atual is not None else None,
+                    c.numero_flexibilizacoes,
+                ]
+            )
+        return "\n\n".join(
+            [
+                f"Casos: {len(casos)} ({resumo})",
+                formata_tabela(
+                    [
+                        "ID",
+                        "CASO",
+                        "PROGRAMA",
+                        "ESTADO",
+                        "RODADA",
+                        "ESTADO_RODADA",
+                        "FLEXIBILIZACOES",
+                    ],
+                    linhas,
+                ),
+                self.__tabela_fases(id_caso),
+            ]
+        )
+
+    def rodadas(
+        self, id_caso: Optional[int] = None, ativas: bool = False
+    ) -> str:
+        """
+        Rodadas do estudo, ou de um caso, com a duração da execução.
+        """
+        nomes_casos = {c.id: c.nome for c in self._casos.list()}
+        linhas: List[List[object]] = []
+        for id_caso_rodada, rodadas_caso in sorted(
+            self.__rodadas_por_caso().items()
+        ):
+            if id_caso is not None and id_caso_rodada != id_caso:
+                continue
+            for r in rodadas_caso:
+                if ativas and not r.ativa:
+                    continue
+                linhas.append(
+                    [
+                        r.id,
+                        nomes_casos.get(r.id_caso),
+                        r.id_job,
+                        r.estado.value,
+                        r.instante_inicio_execucao.isoformat(
+                            sep=" ", timespec="seconds"
+                        ),
+                        milissegundos(r.tempo_execucao),
+                        r.numero_processadores,
+                    ]
+                )
+        return formata_tabela(
+            [
+                "ID",
+                "CASO",
+                "JOB",
+                "ESTADO",
+                "INICIO",
+                "DURACAO_MS",
+                "PROCESSADORES",
+            ],
+            linhas,
+        )
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Dict, List, Union
+
+from encadeador.adapters.repository.apis import EncadeadorAPIRepository
+from encadeador.domain.programs import ProgramRules, ALL_FILES
+from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.chainingresult import ChainingResult
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.utils.log import Log
+
+
+class ExecutorEncadeamento:
+    """
+    Realiza o encadeamento das variáveis de um caso. As variáveis
+    que escrevem nos mesmos arquivos do deck são encadeadas em
+    sequência, enquanto os grupos independentes são encadeados
+    de forma concorrente. O conflito é avaliado por arquivo, e não
+    pelos registros alterados, pois o serviço de encadeamento
+    reescreve o arquivo inteiro.
+    """
+
+    def __init__(self, caso: Caso, casos_anteriores: List[Caso]):
+        self._caso = caso
+        self._casos_anteriores = casos_anteriores
+
+    def agrupa(self, variaveis: List[str]) -> List[List[str]]:
+        """
+        Agrupa as variáveis que escrevem em algum arquivo em comum,
+        mantendo a ordem em que foram informadas.
+        """
+        grupos: List[List[str]] = []
+        arquivos_grupos: List[set] = []
+        for v in variaveis:
+            arquivos = set(
+                ProgramRules.chaining_variable_files(self._caso.programa, v)
+            )
+            conflitantes = [
+                i
+                for i, a in enumerate(arquivos_grupos)
+                if ALL_FILES in arquivos
+                or ALL_FILES in a
+                or len(arquivos & a) > 0
+            ]
+            # A variável une todos os grupos com os quais conflita
+            grupo = [v]
+            for i in reversed(conflitantes):
+                grupo = grupos.pop(i) + grupo
+                arquivos |= arquivos_grupos.pop(i)
+            posicao = conflitantes[0] if len(conflitantes) > 0 else None
+            if posicao is None:
+                grupos.append(grupo)
+                arquivos_grupos.append(arquivos)
+            else:
+                grupos.insert(posicao, grupo)
+                arquivos_grupos.insert(posicao, arquivos)
+        for g in grupos:
+            g.sort(key=variaveis.index)
+        return grupos
+
+    async def __encadeia_grupo(
+        self,
+        grupo: List[str],
+        tarefas: asyncio.Semaphore,
+        resultados: Dict[str, Union[List[ChainingResult], HTTPResponse]],
+    ):
+        async with tarefas:
+            for v in grupo:
+                resultados[v] = await EncadeadorAPIRepository.encadeia(
+                    ProgramRules.chaining_sources(self._casos_anteriores, v),
+                    self._caso,
+                    v,
+                )
+
+    async def encadeia(self, variaveis: List[str]) -> bool:
+        variaveis = [v for v in variaveis if len(v) > 0]
+        grupos = self.agrupa(variaveis)
+        tarefas = asyncio.Semaphore(Configuracoes().tarefas_encadeamento)
+        resultados: Dict[str, Union[List[ChainingResult], HTTPResponse]] = {}
+        await asyncio.gather(
+            *[self.__encadeia_grupo(g, tarefas, resultados) for g in grupos]
+        )
+        sucesso = True
+        for v in variaveis:
+            chain_reponse = resultados[v]
+            if isinstance(chain_reponse, HTTPResponse):
+                Log.log().warning(
+                    "Erro no encadeamento:"
+                    + f" [{chain_reponse.code}] {chain_reponse.detail}"
+                )
+                sucesso = False
+            else:
+                Log.log().info(f"Encadeamento de {v}:")
+                for chain in chain_reponse:
+                    Log.log().info(str(chain))
+        return sucesso
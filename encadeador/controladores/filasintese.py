@@ -0,0 +1,115 @@
+import asyncio
+from json import dump, load
+from os.path import exists, join
+from typing import Optional, Set
+
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.services.unitofwork.estudo import AbstractEstudoUnitOfWork
+import encadeador.services.handlers.estudo as handlers
+import encadeador.domain.commands as commands
+from encadeador.utils.contexto import CASO_ATUAL
+from encadeador.utils.log import Log
+
+ARQUIVO_PENDENTES = "sintese_pendente.json"
+
+
+class FilaSintese:
+    """
+    Responsável pela síntese dos resultados dos casos concluídos
+    em segundo plano, fora do caminho crítico da execução do estudo.
+    Os casos que aguardam síntese são persistidos, de modo que a
+    síntese é retomada se o encadeador for reiniciado.
+    """
+
+    def __init__(self, _estudo_id: int, estudo_uow: AbstractEstudoUnitOfWork):
+        self._estudo_id = _estudo_id
+        # A fila usa uma unidade de trabalho exclusiva, pois mantém a
+        # sessão aberta enquanto aguarda as requisições de resultados.
+        self._estudo_uow = estudo_uow
+        self._tarefa: Optional[asyncio.Task] = None
+        self._pendentes: Set[int] = self.__le_pendentes()
+
+    @property
+    def _caminho_pendentes(self) -> str:
+        return join(Configuracoes().caminho_base_estudo, ARQUIVO_PENDENTES)
+
+    def __le_pendentes(self) -> Set[int]:
+        if not exists(self._caminho_pendentes):
+            return set()
+        with open(self._caminho_pendentes, "r") as arq:
+            return set(load(arq))
+
+    def __escreve_pendentes(self):
+        with open(self._caminho_pendentes, "w") as arq:
+            dump(sorted(self._pendentes), arq)
+
+    @property
+    def pendentes(self) -> int:
+        """
+        Número de casos concluídos que aguardam a síntese.
+        """
+        return len(self._pendentes)
+
+    @property
+    def executando(self) -> bool:
+        return self._tarefa is not None and not self._tarefa.done()
+
+    def inicia(self):
+        """
+        Retoma a síntese dos casos pendentes de uma execução anterior.
+        Deve ser chamado com o loop de eventos em execução.
+        """
+        if self.pendentes > 0:
+            Log.log().info(f"Síntese: {self.pendentes} casos pendentes")
+            self.__garante_tarefa()
+
+    def solicita(self, id_caso: int):
+        """
+        Adiciona um caso concluído à fila de síntese sem aguardar
+        a realização da síntese.
+        """
+        self._pendentes.add(id_caso)
+        self.__escreve_pendentes()
+        Log.log().info(f"Síntese: {self.pendentes} casos pendentes")
+        self.__garante_tarefa()
+
+    async def aguarda(self):
+        """
+        Aguarda até que não existam casos com síntese pendente.
+        """
+        if self.executando:
+            await asyncio.shield(self._tarefa)  # type: ignore
+        if self.pendentes > 0:
+            # Uma falha anterior interrompeu a fila: tenta novamente
+            self.__garante_tarefa()
+            await asyncio.shield(self._tarefa)  # type: ignore
+        if self.pendentes > 0:
+            Log.log().warning(
+                f"Síntese: {self.pendentes} casos não sintetizados"
+            )
+
+    def __garante_tarefa(self):
+        if not self.executando:
+            self._tarefa = asyncio.get_running_loop().create_task(
+                self.__executa()
+            )
+
+    async def __executa(self):
+        # A tarefa é criada no contexto do caso que solicitou a síntese,
+        # mas atende a todos os casos pendentes.
+        CASO_ATUAL.set(None)
+        # Os casos que concluírem durante uma síntese são atendidos na
+        # iteração seguinte, pois a síntese é incremental.
+        while self.pendentes > 0:
+            atendidos = set(self._pendentes)
+            comando = commands.SintetizaEstudo(self._estudo_id)
+            try:
+                await handlers.sintetiza_resultados(comando, self._estudo_uow)
+            except Exception as e:
+                Log.log().error(
+                    f"Síntese: erro na síntese dos resultados: {e}"
+                )
+                return
+            self._pendentes -= atendidos
+            self.__escreve_pendentes()
+            Log.log().info(f"Síntese: {self.pendentes} casos pendentes")
@@ -5,7 +5,9 @@ from os import listdir
 from encadeador.utils.log import Log
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.regrainviabilidade import RegraInviabilidade
-from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.tabelaregrasreservatorios import (
+    TabelaRegrasReservatorios,
+)
 
 
 class LeitorArquivos:
@@ -39,14 +41,16 @@ class LeitorArquivos:
         return lista_casos
 
     @staticmethod
-    def carrega_regras_reservatorios() -> List[RegraReservatorio]:
+    def carrega_regras_reservatorios() -> TabelaRegrasReservatorios:
         arq_regras_reserv = (
             Configuracoes().arquivo_regras_operacao_reservatorios
         )
-        regras_reserv: List[RegraReservatorio] = []
+        regras_reserv = TabelaRegrasReservatorios.vazia()
         try:
             if arq_regras_reserv is not None:
-                regras_reserv = RegraReservatorio.from_csv(arq_regras_reserv)
+                regras_reserv = TabelaRegrasReservatorios.from_csv(
+                    arq_regras_reserv
+                )
         except FileNotFoundError:
             Log.log().warning(
                 "Arquivo de regras de reservatórios não encontrado"
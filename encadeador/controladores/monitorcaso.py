@@ -1,19 +1,30 @@
-from typing import Dict, List, Callable
+import time
+from typing import Dict, Callable, Optional
 from encadeador.services.unitofwork.rodada import AbstractRodadaRepository
 from encadeador.services.unitofwork.caso import AbstractCasoUnitOfWork
+from encadeador.services.unitofwork.fase import AbstractFaseUnitOfWork
+from encadeador.services.unitofwork.etapapreparacao import (
+    AbstractEtapaPreparacaoUnitOfWork,
+)
 from os.path import join
 from os import makedirs
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.estadocaso import EstadoCaso
-from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
 from encadeador.modelos.transicaocaso import TransicaoCaso
 from encadeador.utils.log import Log
 from encadeador.utils.event import Event
+from encadeador.utils.contexto import atribui_caso
+from encadeador.utils.fases import fase
 from encadeador.adapters.repository.synthesis import (
     factory as synthesis_factory,
 )
 import encadeador.domain.commands as commands
 import encadeador.services.handlers.caso as handlers
+import encadeador.services.handlers.fase as fase_handlers
+import encadeador.services.handlers.rodada as rodada_handlers
 
 
 class MonitorCaso:
@@ -29,12 +40,21 @@ class MonitorCaso:
         _caso_id: int,
         caso_uow: AbstractCasoUnitOfWork,
         rodada_uow: AbstractRodadaRepository,
+        fase_uow: AbstractFaseUnitOfWork,
+        etapa_uow: AbstractEtapaPreparacaoUnitOfWork,
     ):
         self._caso_id = _caso_id
         self._rodada_id = None
         self._caso_uow = caso_uow
         self._rodada_uow = rodada_uow
+        self._fase_uow = fase_uow
+        self._etapa_uow = etapa_uow
         self._transicao_caso = Event()
+        self._instante_submissao: Optional[float] = None
+
+    @property
+    def id_caso(self) -> int:
+        return self._caso_id
 
     async def callback_evento(self, evento: TransicaoCaso):
         """
@@ -46,7 +66,8 @@ class MonitorCaso:
         :param evento: O evento ocorrido com o job ou caso
         :type evento: Union[TransicaoCaso]
         """
-        await self._regras()[evento]()
+        with atribui_caso(self._caso_id):
+            await self._regras()[evento]()
 
     def _regras(
         self,
@@ -74,6 +95,12 @@ class MonitorCaso:
             (TransicaoCaso.ERRO_DADOS): self._handler_erro_dados,
             (TransicaoCaso.ERRO_CONVERGENCIA): self._handler_erro_convergencia,
             (TransicaoCaso.NAO_CONVERGIU): self._handler_nao_convergiu,
+            (
+                TransicaoCaso.RESSUBMISSAO_SOLICITADA
+            ): self._handler_ressubmissao_solicitada,
+            (
+                TransicaoCaso.PROCESSADORES_INDISPONIVEIS
+            ): self._handler_processadores_indisponiveis,
             (TransicaoCaso.ERRO_MAX_FLEX): self._handler_erro_max_flex,
             (
                 TransicaoCaso.FLEXIBILIZACAO_SUCESSO
@@ -89,18 +116,25 @@ class MonitorCaso:
     async def inicializa(self):
         """
         Realiza a inicialização do caso, lidando com identificação e
-        extração de arquivos.
+        extração de arquivos. Se o caso já estava em execução, o
+        monitoramento da rodada é retomado, sem nova preparação
+        ou submissão.
         """
         comando = commands.InicializaCaso(self._caso_id)
-        if (
-            handlers.inicializa(comando, self._caso_uow, self._rodada_uow)
-            is not None
-        ):
+        caso, id_rodada = await handlers.inicializa(
+            comando, self._caso_uow, self._rodada_uow
+        )
+        if caso is None:
+            return
+        if id_rodada is not None:
+            self._rodada_id = id_rodada
+            await self.callback_evento(TransicaoCaso.INICIO_EXECUCAO_SUCESSO)
+        else:
             await self.callback_evento(TransicaoCaso.INICIALIZADO)
 
     async def prepara(
         self,
-        regras_operacao_reservatorios: List[RegraReservatorio],
+        regras_operacao_reservatorios: IndiceRegrasReservatorios,
     ):
         """
         Realiza a preparação dos arquivos para adequação às
@@ -111,7 +145,7 @@ class MonitorCaso:
         comando = commands.PreparaCaso(
             self._caso_id, regras_operacao_reservatorios
         )
-        if await handlers.prepara(comando, self._caso_uow):
+        if await handlers.prepara(comando, self._caso_uow, self._etapa_uow):
             await self.callback_evento(TransicaoCaso.PREPARA_EXECUCAO_SUCESSO)
         else:
             await self.callback_evento(TransicaoCaso.PREPARA_EXECUCAO_ERRO)
@@ -134,20 +168,31 @@ class MonitorCaso:
         if isinstance(res, int):
             self._rodada_id = res
             await self.callback_evento(TransicaoCaso.INICIO_EXECUCAO_SUCESSO)
+        elif isinstance(res, TransicaoCaso):
+            await self.callback_evento(res)
         else:
             await self.callback_evento(TransicaoCaso.INICIO_EXECUCAO_ERRO)
 
     async def monitora(self):
         """
         Realiza o monitoramento do estado do caso e também do
-        job associado.
+        job associado. Um caso aguardando ressubmissão ou processadores
+        é submetido novamente quando termina a espera.
         """
+        if self._instante_submissao is not None:
+            if time.monotonic() < self._instante_submissao:
+                return
+            self._instante_submissao = None
+            await self.callback_evento(
+                TransicaoCaso.INICIO_EXECUCAO_SOLICITADA
+            )
+            return
         if self._rodada_id is None:
             Log.log().info("Não existe rodada ativa para o caso")
             return
         comando = commands.MonitoraCaso(self._caso_id, self._rodada_id)
         transicao = await handlers.monitora(
-            comando, self._caso_uow, self._rodada_uow
+            comando, self._caso_uow, self._rodada_uow, self._fase_uow
         )
         if transicao is not None:
             await self.callback_evento(transicao)
@@ -248,6 +293,48 @@ class MonitorCaso:
             handlers.atualiza(comando, self._caso_uow)
             await self.callback_evento(TransicaoCaso.ERRO)
 
+    async def _handler_ressubmissao_solicitada(self):
+        comando_cancela = commands.CancelaRodada(self._rodada_id)
+        if not await rodada_handlers.cancela(
+            comando_cancela, self._rodada_uow
+        ):
+            # O cancelamento é tentado novamente no próximo
+            # monitoramento, se a rodada continuar parada
+            return
+        self._rodada_id = None
+        maximo = Configuracoes().maximo_ressubmissoes
+        # A rodada cancelada já conta como interrompida
+        ressubmissoes = handlers.conta_ressubmissoes(
+            commands.ContaRessubmissoes(self._caso_id), self._caso_uow
+        )
+        if ressubmissoes > maximo:
+            Log.log().info(
+                f"Caso {self._caso_id}: máximo de ressubmissões atingido"
+            )
+            comando = commands.AtualizaCaso(
+                self._caso_id, EstadoCaso.ERRO_EXECUCAO
+            )
+            handlers.atualiza(comando, self._caso_uow)
+            await self.callback_evento(TransicaoCaso.ERRO)
+            return
+        atraso = Configuracoes().atraso_ressubmissao * 2 ** (ressubmissoes - 1)
+        Log.log().info(
+            f"Caso {self._caso_id}: ressubmissão {ressubmissoes}"
+            + f" de {maximo} em {atraso:.0f} s"
+        )
+        self._instante_submissao = time.monotonic() + atraso
+        comando = commands.AtualizaCaso(
+            self._caso_id, EstadoCaso.INICIANDO_EXECUCAO
+        )
+        handlers.atualiza(comando, self._caso_uow)
+
+    async def _handler_processadores_indisponiveis(self):
+        Log.log().info(
+            f"Caso {self._caso_id}: aguardando processadores disponíveis"
+        )
+        # A submissão é tentada novamente no próximo monitoramento
+        self._instante_submissao = time.monotonic()
+
     async def _handler_erro_max_flex(self):
         Log.log().info(
             f"Caso {self._caso_id}: máximo de flexibilizações atingido"
@@ -297,14 +384,41 @@ class MonitorCaso:
         await self._transicao_caso(TransicaoCaso.ERRO)
 
     async def __sintetiza_casos_rodadas(self):
-        df_casos, df_rodadas = await handlers.sintetiza_casos_rodadas(
-            self._caso_uow, self._rodada_uow
-        )
-        caminho_sintese = join(
-            Configuracoes().caminho_base_estudo,
-            Configuracoes().diretorio_sintese,
-        )
-        makedirs(caminho_sintese, exist_ok=True)
-        sintetizador = synthesis_factory(Configuracoes().formato_sintese)
-        sintetizador.write(df_casos, join(caminho_sintese, "CASOS"))
-        sintetizador.write(df_rodadas, join(caminho_sintese, "RODADAS"))
+        import pandas as pd  # type: ignore
+
+        # As fases medidas até aqui são persistidas antes da síntese
+        fase_handlers.registra(self._fase_uow)
+        with fase("sintese_casos", self._caso_id):
+            caminho_sintese = join(
+                Configuracoes().caminho_base_estudo,
+                Configuracoes().diretorio_sintese,
+            )
+            makedirs(caminho_sintese, exist_ok=True)
+            sintetizador = synthesis_factory(Configuracoes().formato_sintese)
+            # Somente as fases registradas após a última já sintetizada
+            # são lidas e acrescentadas à síntese
+            caminho_fases = join(caminho_sintese, "FASES")
+            try:
+                df_fases_atual = sintetizador.read(caminho_fases)
+            except FileNotFoundError:
+                df_fases_atual = None
+            ultima = (
+                int(df_fases_atual["id"].max())
+                if df_fases_atual is not None and len(df_fases_atual) > 0
+                else 0
+            )
+            (
+                df_casos,
+                df_rodadas,
+                df_fases,
+            ) = await handlers.sintetiza_casos_rodadas(
+                self._caso_uow, self._rodada_uow, self._fase_uow, ultima
+            )
+            sintetizador.write(df_casos, join(caminho_sintese, "CASOS"))
+            sintetizador.write(df_rodadas, join(caminho_sintese, "RODADAS"))
+            if df_fases_atual is None or len(df_fases) > 0:
+                if df_fases_atual is not None:
+                    df_fases = pd.concat(
+                        [df_fases_atual, df_fases], ignore_index=True
+                    )
+                sintetizador.write(df_fases, caminho_fases)
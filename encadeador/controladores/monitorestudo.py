@@ -1,16 +1,24 @@
-from typing import Dict, List, Union, Callable
+from functools import partial
+from typing import Dict, List, Callable
 from os.path import join
 from os import makedirs
 from encadeador.modelos.configuracoes import Configuracoes
-from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
 from encadeador.modelos.regrainviabilidade import RegraInviabilidade
 from encadeador.modelos.estadoestudo import EstadoEstudo
 from encadeador.modelos.transicaocaso import TransicaoCaso
 from encadeador.modelos.transicaoestudo import TransicaoEstudo
 from encadeador.controladores.monitorcaso import MonitorCaso
+from encadeador.controladores.filasintese import FilaSintese
 from encadeador.services.unitofwork.rodada import AbstractRodadaRepository
 from encadeador.services.unitofwork.caso import AbstractCasoUnitOfWork
 from encadeador.services.unitofwork.estudo import AbstractEstudoUnitOfWork
+from encadeador.services.unitofwork.fase import AbstractFaseUnitOfWork
+from encadeador.services.unitofwork.etapapreparacao import (
+    AbstractEtapaPreparacaoUnitOfWork,
+)
 import encadeador.services.handlers.estudo as handlers
 
 import encadeador.domain.commands as commands
@@ -35,40 +43,59 @@ class MonitorEstudo:
         estudo_uow: AbstractEstudoUnitOfWork,
         caso_uow: AbstractCasoUnitOfWork,
         rodada_uow: AbstractRodadaRepository,
+        fase_uow: AbstractFaseUnitOfWork,
+        etapa_uow: AbstractEtapaPreparacaoUnitOfWork,
         diretorios_casos: List[str],
-        regras_reservatorios: List[RegraReservatorio],
+        regras_reservatorios: IndiceRegrasReservatorios,
         regras_inviabilidades: List[RegraInviabilidade],
+        fila_sintese: FilaSintese,
     ):
         self._estudo_id = _estudo_id
         self._estudo_uow = estudo_uow
         self._caso_uow = caso_uow
         self._rodada_uow = rodada_uow
+        self._fase_uow = fase_uow
+        self._etapa_uow = etapa_uow
         self._diretorios_casos = diretorios_casos
         self._regras_reservatorios = regras_reservatorios
         self._regras_inviabilidades = regras_inviabilidades
-        self._monitor_atual: MonitorCaso = None  # type: ignore
+        self._fila_sintese = fila_sintese
+        self._monitores: Dict[int, MonitorCaso] = {}
+        self._interrompido = False
         self._transicao_estudo = Event()
 
-    async def callback_evento(
-        self, evento: Union[TransicaoCaso, TransicaoEstudo]
-    ):
+    async def callback_evento(self, evento: TransicaoEstudo):
         """
         Esta função é usada para implementar o Observer Pattern.
-        Quando chamada, significa que ocorreu algo com o caso
+        Quando chamada, significa que ocorreu algo com o estudo
         e deve reagir atualizando os campos
         adequados nos objetos.
 
-        :param evento: O evento ocorrido com o caso ou o estudo
-        :type evento: Union[TransicaoCaso, TransicaoEstudo]
+        :param evento: O evento ocorrido com o estudo
+        :type evento: TransicaoEstudo
         """
         await self._regras()[evento]()
 
+    async def callback_evento_caso(
+        self, monitor: MonitorCaso, evento: TransicaoCaso
+    ):
+        """
+        Reage a um evento ocorrido com um dos casos em execução,
+        identificado pelo seu monitor.
+
+        :param monitor: O monitor do caso
+        :type monitor: MonitorCaso
+        :param evento: O evento ocorrido com o caso
+        :type evento: TransicaoCaso
+        """
+        await self._regras_caso()[evento](monitor)
+
     def observa(self, f: Callable):
         self._transicao_estudo.append(f)
 
     def _regras(
         self,
-    ) -> Dict[Union[TransicaoEstudo, TransicaoCaso], Callable]:
+    ) -> Dict[TransicaoEstudo, Callable]:
         return {
             (
                 TransicaoEstudo.PREPARA_EXECUCAO_SOLICITADA
@@ -93,6 +120,12 @@ class MonitorEstudo:
             ): self._handler_inicio_proximo_caso,
             (TransicaoEstudo.CONCLUIDO): self._handler_concluido,
             (TransicaoEstudo.ERRO): self._handler_erro,
+        }
+
+    def _regras_caso(
+        self,
+    ) -> Dict[TransicaoCaso, Callable]:
+        return {
             (TransicaoCaso.INICIALIZADO): self._handler_inicializado_caso,
             (
                 TransicaoCaso.PREPARA_EXECUCAO_SOLICITADA
@@ -122,43 +155,58 @@ class MonitorEstudo:
         """
         await self.callback_evento(TransicaoEstudo.INICIO_EXECUCAO_SOLICITADA)
 
-    def __existe_proximo_caso(self) -> bool:
-        with self._estudo_uow:
-            estudo = self._estudo_uow.estudos.read(self._estudo_id)
-            if estudo is None:
-                Log.log().error("Erro ao acessar estudo")
-                return False
-            else:
-                return estudo.proximo_caso is not None
-
-    async def __inicializa_proximo_caso(self):
+    async def __inicia_casos_prontos(self):
         """
-        Inicia a execução do proximo caso, isto é, a preparação dos
+        Inicia a execução dos casos cujas dependências já foram
+        concluídas, até o limite de casos simultâneos, começando
+        pelos casos do caminho crítico. Isto é, a preparação dos
         arquivos para adequação às necessidades do estudo
         encadeado e o encadeamento das variáveis selecionadas.
+        O estudo é concluído quando não restam casos em execução
+        nem prontos para iniciar.
         """
-        with self._estudo_uow:
-            estudo = self._estudo_uow.estudos.read(self._estudo_id)
-            proximo_caso = estudo.proximo_caso
-            nome = proximo_caso.nome
-            id_caso = proximo_caso.id
-        if proximo_caso is not None:
-            await self.__sintetiza_estudo()
+        comando = commands.EscalonaEstudo(
+            self._estudo_id,
+            list(self._monitores.keys()),
+            Configuracoes().casos_simultaneos,
+        )
+        prontos = handlers.escalona(
+            comando, self._estudo_uow, self._rodada_uow
+        )
+        if prontos is None:
+            await self.callback_evento(TransicaoEstudo.ERRO)
+            return
+        if len(prontos) == 0:
+            if len(self._monitores) == 0:
+                await self.callback_evento(TransicaoEstudo.CONCLUIDO)
+            return
+        await self.__sintetiza_estudo()
+        for id_caso, nome in prontos:
+            if self._interrompido:
+                return
             Log.log().info(f"Estudo - Próximo caso: {nome}")
-            self._monitor_atual = MonitorCaso(
-                id_caso, self._caso_uow, self._rodada_uow
+            monitor = MonitorCaso(
+                id_caso,
+                self._caso_uow,
+                self._rodada_uow,
+                self._fase_uow,
+                self._etapa_uow,
             )
-            self._monitor_atual.observa(self.callback_evento)
-            await self._monitor_atual.inicializa()
+            self._monitores[id_caso] = monitor
+            monitor.observa(partial(self.callback_evento_caso, monitor))
+            await monitor.inicializa()
 
     async def monitora(self):
         """
-        Realiza o monitoramento do estado do estudo e também do
-        caso atual em execução.
+        Realiza o monitoramento do estado do estudo e também dos
+        casos em execução.
         """
         Log.log().debug("Monitorando - estudo...")
-        comando = commands.MonitoraEstudo(self._estudo_id)
-        await handlers.monitora(comando, self._monitor_atual)
+        for monitor in list(self._monitores.values()):
+            if self._interrompido:
+                return
+            comando = commands.MonitoraEstudo(monitor.id_caso)
+            await handlers.monitora(comando, monitor)
 
     async def _handler_prepara_execucao_solicitada(self):
         Log.log().info("Estudo: preparando execução")
@@ -223,49 +271,58 @@ class MonitorEstudo:
             self._estudo_id, EstadoEstudo.CONCLUIDO
         )
         handlers.atualiza(comando, self._estudo_uow)
-        command = commands.SintetizaEstudo(self._estudo_id)
-        await handlers.sintetiza_resultados(command, self._estudo_uow)
+        Log.log().info("Estudo: aguardando síntese dos resultados")
+        await self._fila_sintese.aguarda()
         await self._transicao_estudo(TransicaoEstudo.CONCLUIDO)
 
     async def _handler_erro(self):
         Log.log().info("Estudo: erro.")
+        self._interrompido = True
         comando = commands.AtualizaEstudo(self._estudo_id, EstadoEstudo.ERRO)
         handlers.atualiza(comando, self._estudo_uow)
         await self.__sintetiza_estudo()
         await self._transicao_estudo(TransicaoEstudo.ERRO)
 
-    async def _handler_inicializado_caso(self):
+    async def _handler_inicializado_caso(self, monitor: MonitorCaso):
         Log.log().debug("Estudo: caso inicializado")
-        await self._monitor_atual.prepara(self._regras_reservatorios)
+        await monitor.prepara(self._regras_reservatorios)
 
     async def _handler_inicio_proximo_caso(self):
-        if self.__existe_proximo_caso():
-            await self.__inicializa_proximo_caso()
-        else:
-            await self.callback_evento(TransicaoEstudo.CONCLUIDO)
+        await self.__inicia_casos_prontos()
 
-    async def _handler_prepara_execucao_solicitada_caso(self):
+    async def _handler_prepara_execucao_solicitada_caso(
+        self, monitor: MonitorCaso
+    ):
         Log.log().debug("Estudo: preparação da execução do caso solicitada")
 
-    async def _handler_prepara_execucao_sucesso_caso(self):
+    async def _handler_prepara_execucao_sucesso_caso(
+        self, monitor: MonitorCaso
+    ):
         Log.log().debug(
             "Estudo: caso preparado com sucesso. Iniciando execução."
         )
-        await self._monitor_atual.inicia_execucao()
+        await monitor.inicia_execucao()
 
-    async def _handler_inicio_execucao_solicitada_caso(self):
+    async def _handler_inicio_execucao_solicitada_caso(
+        self, monitor: MonitorCaso
+    ):
         Log.log().debug("Estudo: início da execução do caso solicitada")
 
-    async def _handler_inicio_execucao_sucesso_caso(self):
+    async def _handler_inicio_execucao_sucesso_caso(
+        self, monitor: MonitorCaso
+    ):
         Log.log().info("Estudo: iniciando novo caso")
 
-    async def _handler_concluido_caso(self):
-        command = commands.SintetizaEstudo(self._estudo_id)
-        await handlers.sintetiza_resultados(command, self._estudo_uow)
+    async def _handler_concluido_caso(self, monitor: MonitorCaso):
+        # A síntese dos resultados não bloqueia o início dos próximos
+        # casos, que dependem somente da conclusão deste
+        self._fila_sintese.solicita(monitor.id_caso)
+        self._monitores.pop(monitor.id_caso, None)
         await self.callback_evento(TransicaoEstudo.INICIO_PROXIMO_CASO)
 
-    async def _handler_erro_caso(self):
+    async def _handler_erro_caso(self, monitor: MonitorCaso):
         Log.log().error("Estudo: erro na execução do caso")
+        self._monitores.pop(monitor.id_caso, None)
         await self.callback_evento(TransicaoEstudo.ERRO)
 
     async def __sintetiza_estudo(self):
@@ -1,34 +1,106 @@
 from abc import abstractmethod
+from os import listdir
 from os.path import join
-from typing import List, Optional
+import re
+from typing import Awaitable, Callable, List, Optional, TYPE_CHECKING
 
 from encadeador.modelos.caso import Caso
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.programa import Programa
 
 from encadeador.services.unitofwork.newave import factory as nw_factory
+from encadeador.services.unitofwork.newave import NEWAVE_OUT_ZIP_PATTERN
 from encadeador.services.unitofwork.decomp import factory as dc_factory
+from encadeador.services.unitofwork.etapapreparacao import (
+    AbstractEtapaPreparacaoUnitOfWork,
+)
+import encadeador.services.handlers.etapapreparacao as etapa_handlers
+import encadeador.domain.commands as commands
 from encadeador.domain.programs import ProgramRules
 from encadeador.utils.log import Log
-from inewave.newave import Dger, Cvar  # type: ignore
-from idecomp.decomp.dadger import Dadger
-from idecomp.decomp.modelos.dadger import RT, FC
+from encadeador.utils.fases import mede_fase
+
+if TYPE_CHECKING:
+    from inewave.newave import Dger, Cvar  # type: ignore
+    from idecomp.decomp.dadger import Dadger
 
 
 class PreparadorCaso:
-    def __init__(self, caso: Caso, casos_anteriores: List[Caso]) -> None:
+    def __init__(
+        self,
+        caso: Caso,
+        casos_anteriores: List[Caso],
+        etapa_uow: Optional[AbstractEtapaPreparacaoUnitOfWork] = None,
+    ) -> None:
         self._caso = caso
         self._casos_anteriores = casos_anteriores
+        self._etapa_uow = etapa_uow
+        self._cadeia: Optional[str] = None
 
     @staticmethod
-    def factory(caso: Caso, casos_anteriores: List[Caso]) -> "PreparadorCaso":
+    def factory(
+        caso: Caso,
+        casos_anteriores: List[Caso],
+        etapa_uow: Optional[AbstractEtapaPreparacaoUnitOfWork] = None,
+    ) -> "PreparadorCaso":
         if caso.programa == Programa.NEWAVE:
-            return PreparadorNEWAVE(caso, casos_anteriores)
+            return PreparadorNEWAVE(caso, casos_anteriores, etapa_uow)
         elif caso.programa == Programa.DECOMP:
-            return PreparadorDECOMP(caso, casos_anteriores)
+            return PreparadorDECOMP(caso, casos_anteriores, etapa_uow)
         else:
             raise ValueError("Caso não suportado")
 
+    @property
+    @abstractmethod
+    def contexto(self) -> List[str]:
+        """
+        Parâmetros e casos anteriores dos quais a preparação
+        depende, além dos arquivos do deck.
+        """
+        pass
+
+    @property
+    def cadeia(self) -> Optional[str]:
+        """
+        Entrada da próxima etapa na cadeia de etapas que alteram
+        os arquivos do deck, quando a preparação faz parte de uma.
+        """
+        return self._cadeia
+
+    @cadeia.setter
+    def cadeia(self, cadeia: Optional[str]):
+        self._cadeia = cadeia
+
+    async def _executa_etapa(
+        self,
+        nome: str,
+        arquivos: List[str],
+        etapa: Callable[[], Awaitable[bool]],
+        contexto: Optional[List[str]] = None,
+        conteudo: bool = True,
+        encadeada: bool = False,
+    ) -> bool:
+        """
+        Executa uma etapa que altera os arquivos informados, a menos
+        que eles estejam no estado produzido pela última execução,
+        com o mesmo contexto. As etapas que alteram o deck seguem a
+        cadeia, se houver. Sem o registro das etapas, sempre executa.
+        """
+        if self._etapa_uow is None:
+            return await etapa()
+        comando = commands.ExecutaEtapaPreparacao(
+            self.caso.id,
+            nome,
+            arquivos,
+            contexto if contexto is not None else self.contexto,
+            conteudo=conteudo,
+            cadeia=self._cadeia if encadeada else None,
+        )
+        sucesso = await etapa_handlers.executa(comando, self._etapa_uow, etapa)
+        if comando.cadeia is not None:
+            self._cadeia = etapa_handlers.entrada(comando)
+        return sucesso
+
     @abstractmethod
     async def prepara(self) -> bool:
         pass
@@ -47,9 +119,23 @@ class PreparadorCaso:
 
 
 class PreparadorNEWAVE(PreparadorCaso):
-    def __init__(self, caso: Caso, casos_anteriores: List[Caso]) -> None:
-        super().__init__(caso, casos_anteriores)
+    def __init__(
+        self,
+        caso: Caso,
+        casos_anteriores: List[Caso],
+        etapa_uow: Optional[AbstractEtapaPreparacaoUnitOfWork] = None,
+    ) -> None:
+        super().__init__(caso, casos_anteriores, etapa_uow)
 
+    @property
+    def contexto(self) -> List[str]:
+        return [
+            str(Configuracoes().adequa_decks_newave),
+            ProgramRules.newave_case_name(self.caso.ano, self.caso.mes),
+            str(Configuracoes().cvar),
+        ]
+
+    @mede_fase("remocao_cortes")
     def __deleta_cortes_ultimo_newave(self):
         for c in reversed(self._casos_anteriores):
             if c.programa == Programa.NEWAVE:
@@ -62,12 +148,12 @@ class PreparadorNEWAVE(PreparadorCaso):
                     )
                     uow.deleta_cortes()
 
-    def __adequa_dger(self, dger: Dger):
+    def __adequa_dger(self, dger: "Dger"):
         ano = self.caso.ano
         mes = self.caso.mes
         dger.nome_caso = ProgramRules.newave_case_name(ano, mes)
 
-    def __adequa_cvar(self, cvar: Cvar):
+    def __adequa_cvar(self, cvar: "Cvar"):
         par_cvar = Configuracoes().cvar
         cvar.valores_constantes = par_cvar
         Log.log().info(f"Valores de Cvar alterados: {par_cvar}")
@@ -80,12 +166,27 @@ class PreparadorNEWAVE(PreparadorCaso):
         )
         with uow:
             if Configuracoes().adequa_decks_newave:
-                dger = await uow.newave.get_dger()
-                self.__adequa_dger(dger)
-                uow.newave.set_dger(dger)
-                cvar = uow.newave.get_cvar()
-                self.__adequa_cvar(cvar)
-                uow.newave.set_cvar(cvar)
+                arquivos = uow.newave.arquivos
+
+                async def adequa() -> bool:
+                    dger = await uow.newave.get_dger()
+                    self.__adequa_dger(dger)
+                    uow.newave.set_dger(dger)
+                    cvar = uow.newave.get_cvar()
+                    self.__adequa_cvar(cvar)
+                    uow.newave.set_cvar(cvar)
+                    return True
+
+                await self._executa_etapa(
+                    "adequacao_dger",
+                    [
+                        join(uow.newave.caminho, a)
+                        for a in [arquivos.dger, arquivos.cvar]
+                        if a is not None
+                    ],
+                    adequa,
+                    encadeada=True,
+                )
             Log.log().info("Adequação do caso concluída com sucesso")
             return True
 
@@ -105,8 +206,25 @@ class PreparadorNEWAVE(PreparadorCaso):
 
 
 class PreparadorDECOMP(PreparadorCaso):
-    def __init__(self, caso: Caso, casos_anteriores: List[Caso]) -> None:
-        super().__init__(caso, casos_anteriores)
+    def __init__(
+        self,
+        caso: Caso,
+        casos_anteriores: List[Caso],
+        etapa_uow: Optional[AbstractEtapaPreparacaoUnitOfWork] = None,
+    ) -> None:
+        super().__init__(caso, casos_anteriores, etapa_uow)
+
+    @property
+    def contexto(self) -> List[str]:
+        ultimo_newave = self.__ultimo_newave()
+        return [
+            str(Configuracoes().adequa_decks_decomp),
+            str(Configuracoes().maximo_iteracoes_decomp),
+            ProgramRules.decomp_case_name(
+                self.caso.ano, self.caso.mes, self.caso.revisao
+            ),
+            ultimo_newave.caminho if ultimo_newave is not None else "",
+        ]
 
     def __ultimo_newave(self) -> Optional[Caso]:
         for c in reversed(self._casos_anteriores):
@@ -114,20 +232,35 @@ class PreparadorDECOMP(PreparadorCaso):
                 return c
         return None
 
+    @mede_fase("extracao_cortes")
     async def __extrai_cortes_ultimo_newave(self, c: Optional[Caso]):
         if c is not None:
-            uow = nw_factory(
-                "FS", join(Configuracoes().caminho_base_estudo, c.caminho)
-            )
+            caminho = join(Configuracoes().caminho_base_estudo, c.caminho)
+            uow = nw_factory("FS", caminho)
             with uow:
                 Log.log().info(
                     "Extraindo cortes do último NEWAVE: " + f"{c.caminho}"
                 )
-                await uow.extrai_cortes()
+                arquivos = [
+                    join(caminho, a)
+                    for a in listdir(caminho)
+                    if re.match(NEWAVE_OUT_ZIP_PATTERN, a) is not None
+                ] + [join(caminho, "cortes.dat")]
+                cortesh = uow.newave.arquivos.cortesh
+                if cortesh is not None:
+                    arquivos.append(join(caminho, cortesh))
+                # Os arquivos de cortes são grandes e não são editados
+                await self._executa_etapa(
+                    "extracao_cortes",
+                    arquivos,
+                    uow.extrai_cortes,
+                    contexto=[c.caminho],
+                    conteudo=False,
+                )
+
+    async def __adequa_caminho_fcf(self, dadger: "Dadger", caso_cortes: Caso):
+        from idecomp.decomp.modelos.dadger import FC
 
-    async def __adequa_caminho_fcf(self, dadger: Dadger, caso_cortes: Caso):
-        # Verifica se é necessário e extrai os cortes
-        await self.__extrai_cortes_ultimo_newave(caso_cortes)
         # Altera os registros FC
         nw_uow = nw_factory(
             "FS",
@@ -167,7 +300,7 @@ class PreparadorDECOMP(PreparadorCaso):
             )
         return True
 
-    def __adequa_titulo_estudo(self, dadger: Dadger):
+    def __adequa_titulo_estudo(self, dadger: "Dadger"):
         ano = self.caso.ano
         mes = self.caso.mes
         rv = self.caso.revisao
@@ -177,14 +310,14 @@ class PreparadorDECOMP(PreparadorCaso):
         else:
             reg_te.titulo = ProgramRules.decomp_case_name(ano, mes, rv)
 
-    def __adequa_numero_iteracoes(self, dadger: Dadger):
+    def __adequa_numero_iteracoes(self, dadger: "Dadger"):
         reg_ni = dadger.ni
         if reg_ni is None:
             Log.log().warning("Caso não possui registro NI")
         else:
             reg_ni.iteracoes = Configuracoes().maximo_iteracoes_decomp
 
-    def __adequa_dadger(self, dadger: Dadger):
+    def __adequa_dadger(self, dadger: "Dadger"):
         Log.log().info(f"Adequando caso do DECOMP: {self.caso.nome}")
         self.__adequa_titulo_estudo(dadger)
         self.__adequa_numero_iteracoes(dadger)
@@ -195,7 +328,6 @@ class PreparadorDECOMP(PreparadorCaso):
             "FS", join(Configuracoes().caminho_base_estudo, self.caso.caminho)
         )
         with dc_uow:
-            dadger = await dc_uow.decomp.get_dadger()
             # Adequa os registros FC (cortes e cortesh)
             caso_cortes = self.__ultimo_newave()
             if (
@@ -204,15 +336,34 @@ class PreparadorDECOMP(PreparadorCaso):
             ):
                 Log.log().error("Erro na especificação dos cortes da FCF")
                 return False
-            await self.__adequa_caminho_fcf(dadger, caso_cortes)
-            if Configuracoes().adequa_decks_decomp:
-                self.__adequa_dadger(dadger)
+            # Verifica se é necessário e extrai os cortes
+            await self.__extrai_cortes_ultimo_newave(caso_cortes)
 
-            dc_uow.decomp.set_dadger(dadger)
+            async def adequa() -> bool:
+                dadger = await dc_uow.decomp.get_dadger()
+                await self.__adequa_caminho_fcf(dadger, caso_cortes)
+                if Configuracoes().adequa_decks_decomp:
+                    self.__adequa_dadger(dadger)
+                dc_uow.decomp.set_dadger(dadger)
+                return True
+
+            arquivo_dadger = dc_uow.decomp.arquivos.dadger
+            await self._executa_etapa(
+                "adequacao_dadger",
+                (
+                    [join(dc_uow.decomp.caminho, arquivo_dadger)]
+                    if arquivo_dadger is not None
+                    else []
+                ),
+                adequa,
+                encadeada=True,
+            )
             Log.log().info("Adequação do caso concluída com sucesso")
         return True
 
     async def corrige_erro_convergencia(self) -> bool:
+        from idecomp.decomp.modelos.dadger import RT
+
         Log.log().info(f"Previnindo gap negativo no DECOMP: {self.caso.nome}")
         dc_uow = dc_factory(
             "FS", join(Configuracoes().caminho_base_estudo, self.caso.caminho)
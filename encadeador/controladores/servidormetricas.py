@@ -0,0 +1,185 @@
+import asyncio
+from typing import Dict, List, Optional
+from aiohttp import web
+
+from encadeador.controladores.filasintese import FilaSintese
+from encadeador.internal.metricas import Metricas, exporta_medidor
+from encadeador.internal.perfilador import Perfilador
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.services.unitofwork.caso import AbstractCasoUnitOfWork
+from encadeador.services.unitofwork.rodada import AbstractRodadaUnitOfWork
+from encadeador.utils.log import Log
+
+TIPO_CONTEUDO_METRICAS = "text/plain; version=0.0.4"
+
+
+class ServidorMetricas:
+    """
+    Endpoint HTTP de métricas, no formato de texto do Prometheus,
+    e de saúde do encadeador, executado no mesmo loop de eventos
+    da aplicação. O estado dos casos e das rodadas só é consultado
+    quando as métricas são requisitadas. Quando recebe um perfilador,
+    também permite iniciar e encerrar janelas de perfilamento.
+    """
+
+    def __init__(
+        self,
+        _porta: int,
+        caso_uow: AbstractCasoUnitOfWork,
+        rodada_uow: AbstractRodadaUnitOfWork,
+        fila_sintese: FilaSintese,
+        perfilador: Optional[Perfilador] = None,
+        _intervalo_atraso: float = 1.0,
+        _endereco: Optional[str] = None,
+    ):
+        self._porta = _porta
+        self._endereco = _endereco
+        # As unidades de trabalho não devem ser compartilhadas com os
+        # monitores, que podem estar no meio de uma transação.
+        self._caso_uow = caso_uow
+        self._rodada_uow = rodada_uow
+        self._fila_sintese = fila_sintese
+        self._perfilador = perfilador
+        self._intervalo_atraso = _intervalo_atraso
+        self._ultimo_atraso = 0.0
+        self._runner: Optional[web.AppRunner] = None
+        self._tarefa_atraso: Optional[asyncio.Task] = None
+
+    @property
+    def porta(self) -> int:
+        """
+        Porta em que o endpoint está escutando, que é escolhida pelo
+        sistema quando a porta informada é 0.
+        """
+        if self._runner is not None and len(self._runner.addresses) > 0:
+            return self._runner.addresses[0][1]
+        return self._porta
+
+    async def inicia(self):
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/metrics", self.__metricas),
+                web.get("/health", self.__saude),
+            ]
+        )
+        if self._perfilador is not None:
+            app.add_routes(
+                [
+                    web.post("/perfil", self.__inicia_perfil),
+                    web.delete("/perfil", self.__encerra_perfil),
+                ]
+            )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(
+            self._runner, host=self._endereco, port=self._porta
+        ).start()
+        self._tarefa_atraso = asyncio.get_running_loop().create_task(
+            self.__mede_atraso_loop()
+        )
+        Log.log().info(f"Métricas disponíveis na porta {self.porta}")
+
+    async def encerra(self):
+        if self._tarefa_atraso is not None:
+            self._tarefa_atraso.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __mede_atraso_loop(self):
+        # O atraso é o tempo excedente, em relação ao agendado, até
+        # que o loop retome a tarefa após a espera.
+        loop = asyncio.get_running_loop()
+        while True:
+            inicio = loop.time()
+            await asyncio.sleep(self._intervalo_atraso)
+            atraso = max(0.0, loop.time() - inicio - self._intervalo_atraso)
+            self._ultimo_atraso = atraso
+            Metricas.registra_atraso_loop(atraso)
+
+    def __contagem_casos(self) -> Dict[str, float]:
+        contagem: Dict[str, float] = {e.value: 0 for e in EstadoCaso}
+        with self._caso_uow:
+            for c in self._caso_uow.casos.list():
+                contagem[c.estado.value] += 1
+        return contagem
+
+    def __rodadas_ativas(self) -> int:
+        with self._rodada_uow:
+            return len([r for r in self._rodada_uow.rodadas.list() if r.ativa])
+
+    def __texto_metricas(self) -> str:
+        linhas: List[str] = []
+        linhas += exporta_medidor(
+            "encadeador_casos",
+            "Número de casos em cada estado",
+            self.__contagem_casos(),
+            "estado",
+        )
+        linhas += exporta_medidor(
+            "encadeador_rodadas_ativas",
+            "Número de rodadas em execução ou aguardando na fila",
+            {"": self.__rodadas_ativas()},
+        )
+        linhas += exporta_medidor(
+            "encadeador_sintese_pendentes",
+            "Número de casos concluídos que aguardam a síntese",
+            {"": self._fila_sintese.pendentes},
+        )
+        linhas += exporta_medidor(
+            "encadeador_atraso_loop_ultimo_segundos",
+            "Último atraso medido do loop de eventos",
+            {"": self._ultimo_atraso},
+        )
+        linhas += Metricas.exporta()
+        return "\n".join(linhas) + "\n"
+
+    async def __metricas(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.__texto_metricas().encode("utf-8"),
+            headers={"Content-Type": TIPO_CONTEUDO_METRICAS},
+        )
+
+    async def __saude(self, request: web.Request) -> web.Response:
+        ativo = (
+            self._tarefa_atraso is not None and not self._tarefa_atraso.done()
+        )
+        return web.json_response(
+            {
+                "estado": "OK" if ativo else "ERRO",
+                "atraso_loop": self._ultimo_atraso,
+                "sintese_pendentes": self._fila_sintese.pendentes,
+            },
+            status=200 if ativo else 503,
+        )
+
+    async def __inicia_perfil(self, request: web.Request) -> web.Response:
+        assert self._perfilador is not None
+        if self._perfilador.ativo:
+            return web.json_response(
+                {"erro": "Perfilador já está ativo"}, status=409
+            )
+        try:
+            duracao = float(
+                request.query.get(
+                    "duracao", Configuracoes().duracao_perfilador
+                )
+            )
+            modo = request.query.get("modo", Configuracoes().modo_perfilador)
+            if duracao <= 0:
+                raise ValueError("Duração deve ser maior que 0")
+            arquivo = self._perfilador.inicia(duracao, modo)
+        except ValueError as e:
+            return web.json_response({"erro": str(e)}, status=400)
+        return web.json_response({"arquivo": arquivo}, status=202)
+
+    async def __encerra_perfil(self, request: web.Request) -> web.Response:
+        assert self._perfilador is not None
+        arquivo = self._perfilador.encerra()
+        if arquivo is None:
+            return web.json_response(
+                {"erro": "Perfilador não está ativo"}, status=409
+            )
+        return web.json_response({"arquivo": arquivo})
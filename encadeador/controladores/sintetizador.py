@@ -1,16 +1,27 @@
+import asyncio
+import atexit
+from concurrent.futures import ProcessPoolExecutor
 from os.path import join
 from os import makedirs
-from typing import List
-import pandas as pd  # type: ignore
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 from encadeador.modelos.caso import Caso
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.programa import Programa
 from encadeador.utils.log import Log
+from encadeador.utils.fases import mede_fase
 from encadeador.adapters.repository.synthesis import (
     factory as synthesis_factory,
 )
 from encadeador.adapters.repository.apis import ResultAPIRepository
+from encadeador.adapters.repository.decomp import factory as decomp_factory
+from encadeador.utils.processadordecomp import ProcessadorDecomp
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
+ARQUIVO_CONTROLE = "CONTROLE_SINTESE"
+VARIAVEL_GT_PERCENTUAL = "GT_PERCENTUAL"
 
 VARIAVEIS_GERAIS_NEWAVE = ["CONVERGENCIA", "TEMPO", "CUSTOS"]
 VARIAVEIS_GERAIS_DECOMP = ["CONVERGENCIA", "TEMPO", "CUSTOS", "INVIABILIDADES"]
@@ -154,6 +165,51 @@ VARIAVEIS_OPERACAO_DECOMP = [
 ]
 
 
+def le_gt_percentual_decomp(caminho: str) -> "pd.DataFrame":
+    """
+    Lê os arquivos relato e relgnl de um caso de DECOMP e calcula a
+    geração térmica percentual por estágio e submercado. É executada
+    em um processo separado, pois a leitura dos arquivos é custosa.
+    """
+    repo = decomp_factory("FS", caminho)
+    return ProcessadorDecomp.gt_estagios(repo.get_relato(), repo.get_relgnl())
+
+
+# Processos da leitura dos relatos, mantidos entre as sínteses
+_processos: Optional[ProcessPoolExecutor] = None
+
+
+def _executor_processos() -> ProcessPoolExecutor:
+    """
+    Retorna o executor de processos das sínteses, criado no primeiro
+    uso. Os processos são iniciados com spawn, pois o fork de um
+    processo com threads ativas, como a do logging, pode herdar locks
+    que nunca são liberados.
+    """
+    global _processos
+    if _processos is None:
+        import multiprocessing
+
+        _processos = ProcessPoolExecutor(
+            max_workers=Configuracoes().processos_sintese,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _processos
+
+
+def encerra_processos():
+    """
+    Encerra os processos das sínteses, se foram criados.
+    """
+    global _processos
+    if _processos is not None:
+        _processos.shutdown()
+        _processos = None
+
+
+atexit.register(encerra_processos)
+
+
 class Sintetizador:
     def __init__(self, casos_concluidos: List[Caso]) -> None:
         self.casos_concluidos = casos_concluidos
@@ -174,126 +230,288 @@ class Sintetizador:
         self.__repositorio_sintese = synthesis_factory(
             Configuracoes().formato_sintese
         )
+        self.__tarefas = asyncio.Semaphore(Configuracoes().tarefas_sintese)
         makedirs(self._diretorio_sintese, exist_ok=True)
 
-    async def sintetiza_newaves(self):
-        casos_newave = [
-            c for c in self.casos_concluidos if c.programa == Programa.NEWAVE
+    @staticmethod
+    def _ano_mes_rv(c: Caso) -> str:
+        return f"{c.ano}_{str(c.mes).zfill(2)}_rv{c.revisao}"
+
+    @staticmethod
+    def _ultima_rodada(c: Caso) -> int:
+        # A última rodada identifica a execução que gerou os resultados
+        # do caso. Se o caso for executado novamente, os dados
+        # sintetizados anteriormente são descartados.
+        ids = [r.id for r in c.rodadas if r.id is not None]
+        return max(ids) if len(ids) > 0 else 0
+
+    def __le_sintese(self, caminho: str) -> "Optional[pd.DataFrame]":
+        try:
+            return self.__repositorio_sintese.read(caminho)
+        except FileNotFoundError:
+            return None
+
+    def __le_controle(self, diretorio: str) -> Dict[str, Dict[str, int]]:
+        df = self.__le_sintese(join(diretorio, ARQUIVO_CONTROLE))
+        controle: Dict[str, Dict[str, int]] = {}
+        if df is not None:
+            for v, c, r in zip(df["variavel"], df["caso"], df["rodada"]):
+                controle.setdefault(str(v), {})[str(c)] = int(r)
+        return controle
+
+    def __escreve_controle(
+        self, diretorio: str, controle: Dict[str, Dict[str, int]]
+    ):
+        import pandas as pd  # type: ignore
+
+        linhas = [
+            (v, c, r)
+            for v, casos in controle.items()
+            for c, r in casos.items()
         ]
-        Log.log().info("Realizando síntese dos resultados de NEWAVE")
-        makedirs(self._diretorio_newave, exist_ok=True)
-        for v in VARIAVEIS_GERAIS_NEWAVE:
-            Log.log().info(f"Sintetizando {v}")
-            df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                casos_newave, v, filtros={}
+        df = pd.DataFrame(linhas, columns=["variavel", "caso", "rodada"])
+        self.__repositorio_sintese.write(df, join(diretorio, ARQUIVO_CONTROLE))
+
+    @staticmethod
+    def __controle_variavel(
+        rodadas_casos: Dict[str, int],
+        variavel: str,
+        controle: Dict[str, Dict[str, int]],
+        sintese_atual: "Optional[pd.DataFrame]",
+    ) -> Dict[str, int]:
+        # Sínteses anteriores ao controle são consideradas atualizadas
+        controle_variavel = controle.get(variavel)
+        if controle_variavel is None:
+            controle_variavel = {}
+            if sintese_atual is not None:
+                sintetizados = set(sintese_atual["caso"].unique())
+                controle_variavel = {
+                    a: r for a, r in rodadas_casos.items() if a in sintetizados
+                }
+        return controle_variavel
+
+    def __casos_faltantes(
+        self,
+        casos: List[Caso],
+        rodadas_casos: Dict[str, int],
+        controle_variavel: Dict[str, int],
+    ) -> List[Caso]:
+        return [
+            c
+            for c in casos
+            if controle_variavel.get(self._ano_mes_rv(c))
+            != rodadas_casos[self._ano_mes_rv(c)]
+        ]
+
+    async def __sintetiza_variavel(
+        self,
+        casos: List[Caso],
+        rodadas_casos: Dict[str, int],
+        variavel: str,
+        diretorio: str,
+        controle: Dict[str, Dict[str, int]],
+        filtros: Optional[dict] = None,
+    ):
+        async with self.__tarefas:
+            await self.__sintetiza_variavel_casos(
+                casos, rodadas_casos, variavel, diretorio, controle, filtros
+            )
+
+    async def __sintetiza_variavel_casos(
+        self,
+        casos: List[Caso],
+        rodadas_casos: Dict[str, int],
+        variavel: str,
+        diretorio: str,
+        controle: Dict[str, Dict[str, int]],
+        filtros: Optional[dict],
+    ):
+        import pandas as pd  # type: ignore
+
+        Log.log().info(f"Sintetizando {variavel}")
+        loop = asyncio.get_running_loop()
+        caminho_sintese = join(diretorio, variavel)
+        sintese_atual = await loop.run_in_executor(
+            None, self.__le_sintese, caminho_sintese
+        )
+        controle_variavel = self.__controle_variavel(
+            rodadas_casos, variavel, controle, sintese_atual
+        )
+        casos_faltantes = self.__casos_faltantes(
+            casos, rodadas_casos, controle_variavel
+        )
+        if len(casos_faltantes) == 0:
+            Log.log().info("Casos faltantes: nenhum")
+            controle[variavel] = controle_variavel
+            return
+        ano_mes_rv_faltantes = [self._ano_mes_rv(c) for c in casos_faltantes]
+        Log.log().info(f"Casos faltantes: {ano_mes_rv_faltantes}")
+        if filtros is None:
+            df_novos = await ResultAPIRepository.resultados_1o_estagio_casos(
+                casos_faltantes, variavel
+            )
+        else:
+            df_novos = await ResultAPIRepository.resultados_1o_estagio_casos(
+                casos_faltantes, variavel, filtros
             )
-            if df is None:
-                Log.log().info(f"Variável {v} não encontrada")
-            else:
-                self.__repositorio_sintese.write(
-                    df, join(self._diretorio_newave, v)
+        if df_novos is None:
+            if sintese_atual is None:
+                Log.log().info(f"Variável {variavel} não encontrada")
+            controle[variavel] = controle_variavel
+            return
+        if sintese_atual is not None:
+            # Descarta dados de casos que foram executados novamente
+            sintese_atual = sintese_atual.loc[
+                ~sintese_atual["caso"].isin(ano_mes_rv_faltantes)
+            ]
+            df = pd.concat([sintese_atual, df_novos], ignore_index=True)
+        else:
+            df = df_novos
+        await loop.run_in_executor(
+            None, self.__repositorio_sintese.write, df, caminho_sintese
+        )
+        for a in df_novos["caso"].unique():
+            controle_variavel[a] = rodadas_casos[a]
+        controle[variavel] = controle_variavel
+
+    async def __sintetiza_programa(
+        self,
+        casos: List[Caso],
+        diretorio: str,
+        variaveis_gerais: List[str],
+        variaveis_operacao: List[str],
+    ):
+        makedirs(diretorio, exist_ok=True)
+        controle = self.__le_controle(diretorio)
+        rodadas_casos = {
+            self._ano_mes_rv(c): self._ultima_rodada(c) for c in casos
+        }
+        # As variáveis são sintetizadas de forma concorrente, cada uma
+        # escrevendo no seu próprio arquivo e na sua chave do controle.
+        await asyncio.gather(
+            *[
+                self.__sintetiza_variavel(
+                    casos, rodadas_casos, v, diretorio, controle, filtros={}
                 )
-        for v in VARIAVEIS_OPERACAO_NEWAVE:
-            Log.log().info(f"Sintetizando {v}")
-            # Filtra quais casos ainda não foram sintetizados
-            caminho_sintese = join(self._diretorio_newave, v)
-            try:
-                sintese_atual = self.__repositorio_sintese.read(
-                    caminho_sintese
+                for v in dict.fromkeys(variaveis_gerais)
+            ],
+            *[
+                self.__sintetiza_variavel(
+                    casos, rodadas_casos, v, diretorio, controle
                 )
-            except FileNotFoundError:
-                sintese_atual = None
-            if sintese_atual is not None:
-                ano_mes_rv_sintetizados = sintese_atual["caso"].unique()
-                ano_mes_rv_casos = [
-                    f"{c.ano}_{str(c.mes).zfill(2)}_rv{c.revisao}"
-                    for c in casos_newave
-                ]
-                casos_faltantes = [
-                    c
-                    for a, c in zip(ano_mes_rv_casos, casos_newave)
-                    if a not in ano_mes_rv_sintetizados
-                ]
-                casos_faltantes_log = [
-                    a
-                    for a in ano_mes_rv_casos
-                    if a not in ano_mes_rv_sintetizados
-                ]
-                Log.log().info(f"Casos faltantes: {casos_faltantes_log}")
-                df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                    casos_faltantes, v
+                for v in dict.fromkeys(variaveis_operacao)
+                if v not in variaveis_gerais
+            ],
+        )
+        self.__escreve_controle(diretorio, controle)
+
+    async def __sintetiza_gt_percentual(
+        self,
+        casos: List[Caso],
+        diretorio: str,
+    ):
+        import pandas as pd  # type: ignore
+
+        Log.log().info(f"Sintetizando {VARIAVEL_GT_PERCENTUAL}")
+        makedirs(diretorio, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        controle = self.__le_controle(diretorio)
+        rodadas_casos = {
+            self._ano_mes_rv(c): self._ultima_rodada(c) for c in casos
+        }
+        caminho_sintese = join(diretorio, VARIAVEL_GT_PERCENTUAL)
+        sintese_atual = await loop.run_in_executor(
+            None, self.__le_sintese, caminho_sintese
+        )
+        controle_variavel = self.__controle_variavel(
+            rodadas_casos, VARIAVEL_GT_PERCENTUAL, controle, sintese_atual
+        )
+        casos_faltantes = self.__casos_faltantes(
+            casos, rodadas_casos, controle_variavel
+        )
+        ano_mes_rv_faltantes = [self._ano_mes_rv(c) for c in casos_faltantes]
+        Log.log().info(f"Casos faltantes: {ano_mes_rv_faltantes}")
+        if len(casos_faltantes) == 0:
+            return
+        # A leitura dos relatos é feita em paralelo, um caso por processo
+        executor = _executor_processos()
+        resultados = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    le_gt_percentual_decomp,
+                    join(Configuracoes().caminho_base_estudo, c.caminho),
                 )
-                df = pd.concat([sintese_atual, df], ignore_index=True)
-            else:
-                Log.log().info("Casos faltantes: todos.")
-                df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                    casos_newave, v
+                for c in casos_faltantes
+            ],
+            return_exceptions=True,
+        )
+        dfs_novos: List[pd.DataFrame] = []
+        for a, r in zip(ano_mes_rv_faltantes, resultados):
+            if isinstance(r, Exception):
+                Log.log().warning(
+                    f"Erro na síntese de {VARIAVEL_GT_PERCENTUAL}"
+                    + f" do caso {a}: {r}"
                 )
-            if df is None:
-                Log.log().info(f"Variável {v} não encontrada")
-            else:
-                self.__repositorio_sintese.write(df, caminho_sintese)
+                continue
+            r.insert(0, "caso", a)
+            dfs_novos.append(r)
+            controle_variavel[a] = rodadas_casos[a]
+        if len(dfs_novos) == 0:
+            return
+        # A tabela é mantida agrupada por caso, na ordem do estudo
+        df_novos = pd.concat(dfs_novos, ignore_index=True)
+        if sintese_atual is not None:
+            # Descarta dados de casos que foram executados novamente
+            sintese_atual = sintese_atual.loc[
+                ~sintese_atual["caso"].isin(ano_mes_rv_faltantes)
+            ]
+            df = pd.concat([sintese_atual, df_novos], ignore_index=True)
+        else:
+            df = df_novos
+        ordem = {a: i for i, a in enumerate(rodadas_casos.keys())}
+        df = df.sort_values(
+            "caso", key=lambda c: c.map(ordem), kind="stable"
+        ).reset_index(drop=True)
+        await loop.run_in_executor(
+            None, self.__repositorio_sintese.write, df, caminho_sintese
+        )
+        # Lê o controle novamente, pois pode ter sido alterado pela
+        # síntese das demais variáveis
+        controle = self.__le_controle(diretorio)
+        controle[VARIAVEL_GT_PERCENTUAL] = controle_variavel
+        self.__escreve_controle(diretorio, controle)
 
+    @mede_fase("sintese_newave")
+    async def sintetiza_newaves(self):
+        casos_newave = [
+            c for c in self.casos_concluidos if c.programa == Programa.NEWAVE
+        ]
+        Log.log().info("Realizando síntese dos resultados de NEWAVE")
+        await self.__sintetiza_programa(
+            casos_newave,
+            self._diretorio_newave,
+            VARIAVEIS_GERAIS_NEWAVE,
+            VARIAVEIS_OPERACAO_NEWAVE,
+        )
+
+    @mede_fase("sintese_decomp")
     async def sintetiza_decomps(self):
         casos_decomp = [
             c for c in self.casos_concluidos if c.programa == Programa.DECOMP
         ]
         Log.log().info("Realizando síntese dos resultados de DECOMP")
-        makedirs(self._diretorio_decomp, exist_ok=True)
-        for v in VARIAVEIS_GERAIS_DECOMP:
-            Log.log().info(f"Sintetizando {v}")
-            df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                casos_decomp, v, filtros={}
-            )
-            if df is None:
-                Log.log().info(f"Variável {v} não encontrada")
-            else:
-                self.__repositorio_sintese.write(
-                    df, join(self._diretorio_decomp, v)
-                )
-        for v in VARIAVEIS_OPERACAO_DECOMP:
-            Log.log().info(f"Sintetizando {v}")
-            # Filtra quais casos ainda não foram sintetizados
-            caminho_sintese = join(self._diretorio_decomp, v)
-            try:
-                sintese_atual = self.__repositorio_sintese.read(
-                    caminho_sintese
-                )
-            except FileNotFoundError:
-                sintese_atual = None
-            if sintese_atual is not None:
-                ano_mes_rv_sintetizados = sintese_atual["caso"].unique()
-                ano_mes_rv_casos = [
-                    f"{c.ano}_{str(c.mes).zfill(2)}_rv{c.revisao}"
-                    for c in casos_decomp
-                ]
-                casos_faltantes = [
-                    c
-                    for a, c in zip(ano_mes_rv_casos, casos_decomp)
-                    if a not in ano_mes_rv_sintetizados
-                ]
-                casos_faltantes_log = [
-                    a
-                    for a in ano_mes_rv_casos
-                    if a not in ano_mes_rv_sintetizados
-                ]
-                Log.log().info(f"Casos faltantes: {casos_faltantes_log}")
-                df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                    casos_faltantes, v
-                )
-                df = pd.concat([sintese_atual, df], ignore_index=True)
-            else:
-                Log.log().info("Casos faltantes: todos")
-                df = await ResultAPIRepository.resultados_1o_estagio_casos(
-                    casos_decomp, v
-                )
-            if df is None:
-                Log.log().info(f"Variável {v} não encontrada")
-            else:
-                self.__repositorio_sintese.write(
-                    df, join(self._diretorio_decomp, v)
-                )
+        await self.__sintetiza_programa(
+            casos_decomp,
+            self._diretorio_decomp,
+            VARIAVEIS_GERAIS_DECOMP,
+            VARIAVEIS_OPERACAO_DECOMP,
+        )
+        await self.__sintetiza_gt_percentual(
+            casos_decomp, self._diretorio_decomp
+        )
 
+    @mede_fase("sintese_resultados")
     async def sintetiza_resultados(self):
         Log.log().info("Sintetizando resultados do estudo encadeado")
         await self.sintetiza_newaves()
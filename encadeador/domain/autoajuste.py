@@ -0,0 +1,131 @@
+from itertools import combinations
+from math import gcd
+from typing import List, Optional, Tuple
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+
+# Número mínimo de quantidades distintas de processadores no
+# histórico para que a curva seja ajustada
+MINIMO_PROCESSADORES_DISTINTOS = 3
+# Até quantas vezes o maior número de processadores já usado a
+# curva é extrapolada na escolha
+FATOR_EXTRAPOLACAO = 2
+# Frações da quantidade padrão de processadores experimentadas
+# enquanto o histórico não permite ajustar a curva
+EXPLORACAO = [1.0, 0.5, 2.0]
+
+
+class CurvaEscalabilidade:
+    """
+    Tempo de execução esperado de um modelo em função do número
+    de processadores, na forma t(p) = a + b / p + c * p: a parcela
+    serial, a paralelizável e o custo de comunicação entre os
+    processos. Os coeficientes são ajustados por mínimos quadrados
+    sobre as rodadas concluídas, restritos a valores não negativos.
+    """
+
+    def __init__(
+        self, a: float, b: float, c: float, processadores: List[int]
+    ) -> None:
+        self.a = a
+        self.b = b
+        self.c = c
+        self.processadores = sorted(set(processadores))
+
+    def tempo(self, processadores: int) -> float:
+        return self.a + self.b / processadores + self.c * processadores
+
+    @staticmethod
+    def amostras(rodadas: List[Rodada]) -> List[Tuple[int, float]]:
+        return [
+            (r.numero_processadores, r.tempo_execucao)
+            for r in rodadas
+            if r.estado == RunStatus.SUCCESS
+            and r.instante_fim_execucao is not None
+            and r.numero_processadores > 0
+        ]
+
+    @classmethod
+    def ajusta(cls, rodadas: List[Rodada]) -> Optional["CurvaEscalabilidade"]:
+        """
+        Ajusta a curva às rodadas concluídas com sucesso. Retorna
+        None se o histórico não tem quantidades de processadores
+        distintas o suficiente.
+        """
+        amostras = CurvaEscalabilidade.amostras(rodadas)
+        processadores = [p for p, _ in amostras]
+        if len(set(processadores)) < MINIMO_PROCESSADORES_DISTINTOS:
+            return None
+        import numpy as np
+
+        x = np.array([[1.0, 1.0 / p, float(p)] for p in processadores])
+        y = np.array([t for _, t in amostras])
+        # Mínimos quadrados não negativos: entre os ajustes com
+        # cada subconjunto de termos, o de menor resíduo dentre os
+        # que têm todos os coeficientes não negativos.
+        melhor: Optional[Tuple[float, List[float]]] = None
+        for n in range(1, 4):
+            for termos in combinations(range(3), n):
+                coef = np.linalg.lstsq(x[:, termos], y, rcond=None)[0]
+                if any(c < 0 for c in coef):
+                    continue
+                residuo = float(np.sum((x[:, termos] @ coef - y) ** 2))
+                if melhor is None or residuo < melhor[0]:
+                    completos = [0.0, 0.0, 0.0]
+                    for i, c in zip(termos, coef):
+                        completos[i] = float(c)
+                    melhor = (residuo, completos)
+        if melhor is None:
+            return None
+        a, b, c = melhor[1]
+        return cls(a, b, c, processadores)
+
+    def passo(self, padrao: int) -> int:
+        """
+        Maior divisor comum das quantidades de processadores já
+        usadas e da quantidade padrão.
+        """
+        passo = padrao
+        for p in self.processadores:
+            passo = gcd(passo, p)
+        return passo
+
+    def escolhe(
+        self, padrao: int, limite: Optional[int]
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Escolhe o número de processadores com o menor tempo esperado,
+        entre os múltiplos do passo até o limite disponível. Em caso
+        de empate, prefere menos processadores. Retorna None se o
+        limite não comporta nem o passo.
+        """
+        passo = self.passo(padrao)
+        maximo = FATOR_EXTRAPOLACAO * max(self.processadores + [padrao])
+        if limite is not None:
+            maximo = min(maximo, limite)
+        candidatos = list(range(passo, maximo + 1, passo))
+        if len(candidatos) == 0:
+            return None
+        escolhido = candidatos[0]
+        for p in candidatos[1:]:
+            if self.tempo(p) < self.tempo(escolhido):
+                escolhido = p
+        return escolhido, self.tempo(escolhido)
+
+
+def explora(
+    rodadas: List[Rodada], padrao: int, limite: Optional[int]
+) -> Optional[int]:
+    """
+    Escolhe o número de processadores enquanto o histórico não
+    permite ajustar a curva: a primeira das frações da quantidade
+    padrão em EXPLORACAO ainda não usada por nenhuma rodada e que
+    cabe no limite. Esgotadas as frações, mantém a padrão. Retorna
+    None se a escolha não cabe no limite.
+    """
+    usados = {r.numero_processadores for r in rodadas}
+    for f in EXPLORACAO:
+        p = max(1, int(padrao * f))
+        if p not in usados and (limite is None or p <= limite):
+            return p
+    return padrao if limite is None or padrao <= limite else None
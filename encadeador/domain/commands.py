@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from encadeador.modelos.estadocaso import EstadoCaso
 from encadeador.modelos.estadoestudo import EstadoEstudo
-from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
 
 
 class Command:
@@ -28,6 +30,29 @@ class DeletaRodada(Command):
     id: int
 
 
+@dataclass
+class CancelaRodada(Command):
+    id: int
+
+
+@dataclass
+class ReconciliaRodadas(Command):
+    id_caso: int
+    caminho: str
+
+
+@dataclass
+class AjustaProcessadores(Command):
+    programa: str
+    versao: str
+    padrao: int
+
+
+@dataclass
+class ComparaTempoPrevisto(Command):
+    id: int
+
+
 @dataclass
 class CriaCaso(Command):
     caminho: str
@@ -43,7 +68,18 @@ class InicializaCaso(Command):
 class PreparaCaso(Command):
     id_caso: int
     # TODO - não passar mais por aqui. Está ruim.
-    regras_reservatorios: List[RegraReservatorio]
+    regras_reservatorios: IndiceRegrasReservatorios
+
+
+@dataclass
+class ExecutaEtapaPreparacao(Command):
+    id_caso: int
+    nome: str
+    arquivos: List[str]
+    contexto: List[str]
+    diretorio: Optional[str] = None
+    conteudo: bool = True
+    cadeia: Optional[str] = None
 
 
 @dataclass
@@ -68,6 +104,11 @@ class AvaliaCaso(Command):
     id_caso: int
 
 
+@dataclass
+class ContaRessubmissoes(Command):
+    id_caso: int
+
+
 @dataclass
 class FlexibilizaCaso(Command):
     id_caso: int
@@ -112,6 +153,13 @@ class MonitoraEstudo(Command):
     id_caso: int
 
 
+@dataclass
+class EscalonaEstudo(Command):
+    id_estudo: int
+    em_execucao: List[int]
+    limite: int
+
+
 @dataclass
 class AtualizaEstudo(Command):
     id_estudo: int
@@ -0,0 +1,60 @@
+from typing import Dict, List, Set
+from encadeador.domain.programs import ProgramRules
+from encadeador.modelos.caso import Caso
+
+# Duração esperada dos casos de programas sem histórico de rodadas
+DURACAO_PADRAO = 1.0
+
+
+class GrafoCasos:
+    """
+    Grafo de dependências entre os casos de um estudo, construído a
+    partir da ordem dos casos e das regras de encadeamento de cada
+    programa. A prioridade de um caso é a duração esperada do maior
+    caminho entre ele e o fim do estudo, de modo que os casos do
+    caminho crítico são iniciados primeiro.
+    """
+
+    def __init__(self, casos: List[Caso], duracoes: Dict[str, float]):
+        ordenados = sorted(casos)
+        self.ids = [c.id for c in ordenados]
+        self.dependencias: Dict[int, List[int]] = {}
+        for c in ordenados:
+            anteriores = [o for o in ordenados if o < c]
+            self.dependencias[c.id] = [
+                d.id for d in ProgramRules.case_dependencies(c, anteriores)
+            ]
+        self.prioridades = self.__prioridades(
+            {
+                c.id: duracoes.get(c.programa.value, DURACAO_PADRAO)
+                for c in ordenados
+            }
+        )
+
+    def __prioridades(self, duracoes: Dict[int, float]) -> Dict[int, float]:
+        sucessores: Dict[int, List[int]] = {i: [] for i in self.ids}
+        for i, dependencias in self.dependencias.items():
+            for d in dependencias:
+                sucessores[d].append(i)
+        # As dependências de um caso sempre o antecedem na ordem
+        prioridades: Dict[int, float] = {}
+        for i in reversed(self.ids):
+            prioridades[i] = duracoes[i] + max(
+                [prioridades[s] for s in sucessores[i]], default=0.0
+            )
+        return prioridades
+
+    def prontos(self, concluidos: Set[int], ocupados: Set[int]) -> List[int]:
+        """
+        Casos não concluídos e fora de execução cujas dependências
+        estão concluídas, do mais prioritário para o menos. Casos de
+        mesma prioridade mantêm a ordem do estudo.
+        """
+        prontos = [
+            i
+            for i in self.ids
+            if i not in concluidos
+            and i not in ocupados
+            and all(d in concluidos for d in self.dependencias[i])
+        ]
+        return sorted(prontos, key=lambda i: -self.prioridades[i])
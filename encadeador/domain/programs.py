@@ -1,7 +1,10 @@
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.programa import Programa
+from encadeador.modelos.caso import Caso
 from pathlib import Path
-from typing import Tuple, Dict, Optional, List
+from typing import Callable, Tuple, Dict, Optional, List
+
+ALL_FILES = "*"
 
 
 class ProgramRules:
@@ -61,6 +64,97 @@ class ProgramRules:
         }
         return mapping.get(program)
 
+    @staticmethod
+    def newave_chaining_variable_files(variable: str) -> List[str]:
+        mapping: Dict[str, List[str]] = {
+            "VARM": ["confhd"],
+            "GNL": ["adterm"],
+            "ENA": ["eafpast", "vazpast"],
+        }
+        return mapping.get(variable, [ALL_FILES])
+
+    @staticmethod
+    def decomp_chaining_variable_files(variable: str) -> List[str]:
+        mapping: Dict[str, List[str]] = {
+            "VARM": ["dadger"],
+            "TVIAGEM": ["dadger"],
+            "GNL": ["dadgnl"],
+        }
+        return mapping.get(variable, [ALL_FILES])
+
+    @staticmethod
+    def chaining_variable_files(program: Programa, variable: str) -> List[str]:
+        # PREMISSA: arquivos do deck de destino escritos pelo
+        # encadeamento de cada variável. Variáveis desconhecidas
+        # são consideradas como escrevendo em todos os arquivos.
+        mapping: Dict[Programa, Callable[[str], List[str]]] = {
+            Programa.NEWAVE: ProgramRules.newave_chaining_variable_files,
+            Programa.DECOMP: ProgramRules.decomp_chaining_variable_files,
+        }
+        return mapping[program](variable)
+
+    @staticmethod
+    def chaining_variable_decomp_count(variable: str) -> Optional[int]:
+        # PREMISSA: número de DECOMPs anteriores necessários para o
+        # encadeamento de cada variável. None indica que são
+        # necessários todos os DECOMPs anteriores.
+        mapping: Dict[str, Optional[int]] = {
+            "VARM": 1,
+            "TVIAGEM": 2,
+            "GNL": None,
+            "ENA": None,
+        }
+        return mapping.get(variable)
+
+    @staticmethod
+    def chaining_sources(
+        previous_cases: List[Caso], variable: str
+    ) -> List[Caso]:
+        window = Configuracoes().janela_encadeamento
+        if window == "ULTIMOS":
+            decomp_count: Optional[int] = (
+                Configuracoes().decomps_janela_encadeamento
+            )
+        elif window == "VARIAVEL":
+            decomp_count = ProgramRules.chaining_variable_decomp_count(
+                variable
+            )
+        else:
+            return previous_cases
+        cases = sorted(previous_cases)
+        newaves = [c for c in cases if c.programa == Programa.NEWAVE]
+        decomps = [c for c in cases if c.programa == Programa.DECOMP]
+        if decomp_count is not None:
+            decomps = decomps[-decomp_count:]
+        selected = set(id(c) for c in newaves[-1:] + decomps)
+        return [c for c in cases if id(c) in selected]
+
+    @staticmethod
+    def case_dependencies(
+        case: Caso, previous_cases: List[Caso]
+    ) -> List[Caso]:
+        # PREMISSA: a preparação de um caso lê as fontes do
+        # encadeamento de cada variável e das regras de reservatórios,
+        # que só existem se houver DECOMPs anteriores. O DECOMP usa os
+        # cortes do último NEWAVE e o NEWAVE remove os cortes dos
+        # NEWAVEs anteriores, usados pelos DECOMPs anteriores.
+        cases = sorted(previous_cases)
+        newaves = [c for c in cases if c.programa == Programa.NEWAVE]
+        decomps = [c for c in cases if c.programa == Programa.DECOMP]
+        dependencies: List[Caso] = []
+        if len(decomps) > 0:
+            variables = ProgramRules.program_chaining_variables(case.programa)
+            for v in variables if variables is not None else []:
+                if len(v) > 0:
+                    dependencies += ProgramRules.chaining_sources(cases, v)
+            dependencies += ProgramRules.chaining_sources(decomps, "VARM")
+        if case.programa == Programa.DECOMP:
+            dependencies += newaves[-1:]
+        elif case.programa == Programa.NEWAVE:
+            dependencies += decomps
+        selected = set(id(c) for c in dependencies)
+        return [c for c in cases if id(c) in selected]
+
     @staticmethod
     def newave_processor_count() -> int:
         return Configuracoes().processadores_newave
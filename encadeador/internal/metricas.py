@@ -0,0 +1,195 @@
+import bisect
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import event  # type: ignore
+from sqlalchemy.orm import Session  # type: ignore
+
+# Limites, em segundos, dos intervalos dos histogramas de latência
+LIMITES_LATENCIA = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histograma:
+    """
+    Histograma cumulativo de observações, no formato dos
+    histogramas do Prometheus, separado por um rótulo.
+    """
+
+    def __init__(
+        self,
+        _nome: str,
+        _descricao: str,
+        _rotulo: str,
+        _limites: Tuple[float, ...] = LIMITES_LATENCIA,
+    ):
+        self._nome = _nome
+        self._descricao = _descricao
+        self._rotulo = _rotulo
+        self._limites = _limites
+        self._contagens: Dict[str, List[int]] = {}
+        self._somas: Dict[str, float] = {}
+
+    def observa(self, valor_rotulo: str, valor: float):
+        if valor_rotulo not in self._contagens:
+            self._contagens[valor_rotulo] = [0] * (len(self._limites) + 1)
+            self._somas[valor_rotulo] = 0.0
+        indice = bisect.bisect_left(self._limites, valor)
+        self._contagens[valor_rotulo][indice] += 1
+        self._somas[valor_rotulo] += valor
+
+    def contagem(self, valor_rotulo: str) -> int:
+        return sum(self._contagens.get(valor_rotulo, []))
+
+    def exporta(self) -> Iterable[str]:
+        yield f"# HELP {self._nome} {self._descricao}"
+        yield f"# TYPE {self._nome} histogram"
+        for valor_rotulo, contagens in sorted(self._contagens.items()):
+            rotulo = f'{self._rotulo}="{valor_rotulo}"'
+            acumulado = 0
+            for limite, n in zip(self._limites, contagens):
+                acumulado += n
+                yield (
+                    f'{self._nome}_bucket{{{rotulo},le="{limite}"}}'
+                    + f" {acumulado}"
+                )
+            acumulado += contagens[-1]
+            yield f'{self._nome}_bucket{{{rotulo},le="+Inf"}} {acumulado}'
+            yield f"{self._nome}_sum{{{rotulo}}} {self._somas[valor_rotulo]}"
+            yield f"{self._nome}_count{{{rotulo}}} {acumulado}"
+
+
+class Contador:
+    """
+    Contador monotônico, separado por um rótulo.
+    """
+
+    def __init__(self, _nome: str, _descricao: str, _rotulo: str):
+        self._nome = _nome
+        self._descricao = _descricao
+        self._rotulo = _rotulo
+        self._valores: Dict[str, int] = {}
+
+    def incrementa(self, valor_rotulo: str):
+        self._valores[valor_rotulo] = self._valores.get(valor_rotulo, 0) + 1
+
+    def valor(self, valor_rotulo: str) -> int:
+        return self._valores.get(valor_rotulo, 0)
+
+    def exporta(self) -> Iterable[str]:
+        yield f"# HELP {self._nome} {self._descricao}"
+        yield f"# TYPE {self._nome} counter"
+        for valor_rotulo, valor in sorted(self._valores.items()):
+            yield f'{self._nome}{{{self._rotulo}="{valor_rotulo}"}} {valor}'
+
+
+def exporta_medidor(
+    nome: str, descricao: str, valores: Dict[str, float], rotulo: str = ""
+) -> Iterable[str]:
+    """
+    Exporta um medidor, com um valor por rótulo, ou um valor
+    único associado à chave vazia quando não há rótulo.
+    """
+    yield f"# HELP {nome} {descricao}"
+    yield f"# TYPE {nome} gauge"
+    for valor_rotulo, valor in valores.items():
+        if len(rotulo) == 0:
+            yield f"{nome} {valor}"
+        else:
+            yield f'{nome}{{{rotulo}="{valor_rotulo}"}} {valor}'
+
+
+class Metricas:
+    """
+    Registro das métricas coletadas durante a execução, exportadas
+    no formato de texto do Prometheus. A coleta consiste somente em
+    incrementar contadores em memória.
+    """
+
+    LATENCIA_REQUISICOES = Histograma(
+        "encadeador_requisicoes_segundos",
+        "Latência das requisições aos serviços externos",
+        "servico",
+    )
+    REQUISICOES = Contador(
+        "encadeador_requisicoes_total",
+        "Requisições realizadas aos serviços externos",
+        "servico",
+    )
+    ERROS_REQUISICOES = Contador(
+        "encadeador_requisicoes_erros_total",
+        "Requisições aos serviços externos com resposta de erro",
+        "servico",
+    )
+    LATENCIA_TRANSACOES = Histograma(
+        "encadeador_transacoes_segundos",
+        "Duração das transações no banco de dados",
+        "desfecho",
+    )
+    ATRASO_LOOP = Histograma(
+        "encadeador_atraso_loop_segundos",
+        "Atraso do loop de eventos em relação ao agendado",
+        "loop",
+    )
+
+    @classmethod
+    def registra_requisicao(cls, servico: str, duracao: float, erro: bool):
+        cls.REQUISICOES.incrementa(servico)
+        cls.LATENCIA_REQUISICOES.observa(servico, duracao)
+        if erro:
+            cls.ERROS_REQUISICOES.incrementa(servico)
+
+    @classmethod
+    def registra_transacao(cls, desfecho: str, duracao: float):
+        cls.LATENCIA_TRANSACOES.observa(desfecho, duracao)
+
+    @classmethod
+    def registra_atraso_loop(cls, atraso: float):
+        cls.ATRASO_LOOP.observa("principal", atraso)
+
+    @classmethod
+    def exporta(cls) -> Iterable[str]:
+        for m in [
+            cls.REQUISICOES,
+            cls.ERROS_REQUISICOES,
+            cls.LATENCIA_REQUISICOES,
+            cls.LATENCIA_TRANSACOES,
+            cls.ATRASO_LOOP,
+        ]:
+            yield from m.exporta()
+
+
+CHAVE_INICIO_TRANSACAO = "metricas_inicio_transacao"
+
+
+@event.listens_for(Session, "after_begin")
+def _inicio_transacao(session, transaction, connection):
+    session.info[CHAVE_INICIO_TRANSACAO] = time.perf_counter()
+
+
+def _fim_transacao(session, desfecho: str):
+    inicio = session.info.pop(CHAVE_INICIO_TRANSACAO, None)
+    if inicio is not None:
+        Metricas.registra_transacao(desfecho, time.perf_counter() - inicio)
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_transacao(session):
+    _fim_transacao(session, "commit")
+
+
+@event.listens_for(Session, "after_rollback")
+def _rollback_transacao(session):
+    _fim_transacao(session, "rollback")
@@ -0,0 +1,190 @@
+import asyncio
+import cProfile
+import inspect
+import marshal
+import signal
+from collections import Counter
+from datetime import datetime
+from os import makedirs
+from os.path import basename, join
+from types import CodeType, FrameType
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from encadeador.utils.contexto import CASO_ATUAL
+from encadeador.utils.log import Log
+
+F = TypeVar("F", bound=Callable)
+
+MODOS_PERFILADOR = ["AMOSTRAGEM", "CPROFILE"]
+# Intervalo, em segundos de CPU, entre as amostras da pilha
+INTERVALO_AMOSTRAGEM = 0.01
+
+# Nomes legíveis das funções anotadas, indexados pelo código
+_nomes: Dict[CodeType, str] = {}
+
+
+def perfilado(nome: str) -> Callable[[F], F]:
+    """
+    Anota a função com um nome legível, que a identifica nos
+    perfis de execução. A função não é modificada, então a
+    anotação não tem custo quando o perfilador está inativo.
+    """
+
+    def decorador(f):
+        _nomes[inspect.unwrap(f).__code__] = nome
+        return f
+
+    return decorador
+
+
+def nome_codigo(codigo: CodeType) -> str:
+    nome = _nomes.get(codigo)
+    if nome is not None:
+        return nome
+    funcao = getattr(codigo, "co_qualname", codigo.co_name)
+    arquivo = basename(codigo.co_filename)
+    return f"{funcao} ({arquivo}:{codigo.co_firstlineno})"
+
+
+def renomeia_estatisticas(estatisticas: Dict) -> Dict:
+    """
+    Substitui, nas estatísticas do cProfile, os nomes das funções
+    anotadas pelos seus nomes legíveis.
+    """
+    nomes = {
+        (c.co_filename, c.co_firstlineno, c.co_name): nome
+        for c, nome in _nomes.items()
+    }
+
+    def renomeia(chave: Tuple[str, int, str]) -> Tuple[str, int, str]:
+        return chave[:2] + (nomes[chave],) if chave in nomes else chave
+
+    return {
+        renomeia(chave): (
+            cc,
+            nc,
+            tt,
+            ct,
+            {renomeia(k): v for k, v in chamadores.items()},
+        )
+        for chave, (cc, nc, tt, ct, chamadores) in estatisticas.items()
+    }
+
+
+class Perfilador:
+    """
+    Perfilador do loop de eventos, ativado durante uma janela de
+    tempo com a aplicação em execução. No modo AMOSTRAGEM, a pilha
+    da thread principal é amostrada periodicamente e o resultado é
+    escrito como pilhas colapsadas, com o caso de cada amostra na
+    base da pilha. No modo CPROFILE, é escrito um arquivo do pstats.
+    """
+
+    def __init__(
+        self,
+        _diretorio: str,
+        _intervalo_amostragem: float = INTERVALO_AMOSTRAGEM,
+    ):
+        self._diretorio = _diretorio
+        self._intervalo_amostragem = _intervalo_amostragem
+        self._modo: Optional[str] = None
+        self._arquivo: Optional[str] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._amostras: Counter = Counter()
+        self._fim: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._modo is not None
+
+    def inicia(self, duracao: float, modo: str = "AMOSTRAGEM") -> str:
+        """
+        Inicia uma janela de perfilamento, encerrada após `duracao`
+        segundos, e retorna o arquivo em que o perfil será escrito.
+        Deve ser chamado a partir do loop de eventos.
+        """
+        if self.ativo:
+            raise ValueError("Perfilador já está ativo")
+        if modo not in MODOS_PERFILADOR:
+            raise ValueError(f"Modo de perfilador inválido: {modo}")
+        if modo == "AMOSTRAGEM" and not hasattr(signal, "setitimer"):
+            Log.log().warning(
+                "Amostragem indisponível no sistema. Usando cProfile."
+            )
+            modo = "CPROFILE"
+        id_caso = CASO_ATUAL.get()
+        rotulo = "estudo" if id_caso is None else f"caso{id_caso}"
+        extensao = "pstats" if modo == "CPROFILE" else "collapsed"
+        instante = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._arquivo = join(
+            self._diretorio, f"perfil_{instante}_{rotulo}.{extensao}"
+        )
+        self._modo = modo
+        if modo == "CPROFILE":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            self._amostras.clear()
+            signal.signal(signal.SIGPROF, self.__amostra)
+            signal.setitimer(
+                signal.ITIMER_PROF,
+                self._intervalo_amostragem,
+                self._intervalo_amostragem,
+            )
+        self._fim = asyncio.get_running_loop().call_later(
+            duracao, self.encerra
+        )
+        Log.log().info(f"Perfilador iniciado por {duracao} s ({modo})")
+        return self._arquivo
+
+    def encerra(self) -> Optional[str]:
+        """
+        Encerra a janela de perfilamento, caso ativa, e escreve o
+        perfil, retornando o arquivo escrito.
+        """
+        if not self.ativo or self._arquivo is None:
+            return None
+        if self._fim is not None:
+            self._fim.cancel()
+            self._fim = None
+        makedirs(self._diretorio, exist_ok=True)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.create_stats()
+            with open(self._arquivo, "wb") as arq:
+                estatisticas = renomeia_estatisticas(self._cprofile.stats)
+                marshal.dump(estatisticas, arq)
+            self._cprofile = None
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+            with open(self._arquivo, "w") as arq:
+                for pilha, n in sorted(self._amostras.items()):
+                    arq.write(f"{pilha} {n}\n")
+        arquivo = self._arquivo
+        self._modo = None
+        self._arquivo = None
+        Log.log().info(f"Perfil escrito em {arquivo}")
+        return arquivo
+
+    def alterna(self, duracao: float, modo: str = "AMOSTRAGEM"):
+        """
+        Inicia uma janela de perfilamento ou encerra a que está
+        ativa, para uso como tratador de sinal.
+        """
+        if self.ativo:
+            self.encerra()
+        else:
+            self.inicia(duracao, modo)
+
+    def __amostra(self, signum: int, frame: Optional[FrameType]):
+        # O tratador é executado na thread principal, entre duas
+        # instruções do código interrompido, então o caso do
+        # contexto é o do código amostrado.
+        id_caso = CASO_ATUAL.get()
+        pilha: List[str] = []
+        while frame is not None:
+            pilha.append(nome_codigo(frame.f_code))
+            frame = frame.f_back
+        pilha.append("estudo" if id_caso is None else f"caso{id_caso}")
+        self._amostras[";".join(reversed(pilha))] += 1
@@ -0,0 +1,270 @@
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.internal.metricas import Metricas
+from encadeador.utils.log import Log
+
+T = TypeVar("T")
+
+# Códigos de resposta que indicam falhas transitórias do serviço
+CODIGOS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+CODIGO_INDISPONIVEL = 503
+
+
+def erros_comunicacao() -> Tuple[Type[BaseException], ...]:
+    """
+    Exceções que indicam falhas de comunicação com o serviço. O
+    aiohttp é importado somente quando uma exceção é tratada.
+    """
+    import aiohttp
+
+    return (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+class PoliticaResiliencia:
+    """
+    Parâmetros de resiliência das requisições a um serviço externo.
+    """
+
+    def __init__(
+        self,
+        _tentativas: int = 5,
+        _espera_base: float = 1.0,
+        _espera_maxima: float = 30.0,
+        _limite_falhas: int = 5,
+        _tempo_abertura: float = 60.0,
+        _atraso_hedge: Optional[float] = None,
+    ):
+        self._tentativas = _tentativas
+        self._espera_base = _espera_base
+        self._espera_maxima = _espera_maxima
+        self._limite_falhas = _limite_falhas
+        self._tempo_abertura = _tempo_abertura
+        self._atraso_hedge = _atraso_hedge
+
+    @property
+    def tentativas(self) -> int:
+        """
+        Número máximo de tentativas de uma chamada idempotente.
+        """
+        return self._tentativas
+
+    @property
+    def limite_falhas(self) -> int:
+        """
+        Número de falhas consecutivas que abre o circuito.
+        """
+        return self._limite_falhas
+
+    @property
+    def tempo_abertura(self) -> float:
+        """
+        Tempo, em segundos, que o circuito permanece aberto antes
+        de permitir uma nova tentativa.
+        """
+        return self._tempo_abertura
+
+    @property
+    def atraso_hedge(self) -> Optional[float]:
+        """
+        Tempo, em segundos, após o qual uma leitura sem resposta é
+        repetida em paralelo. `None` desabilita as leituras paralelas.
+        """
+        return self._atraso_hedge
+
+    def espera(self, tentativa: int) -> float:
+        """
+        Espera antes da próxima tentativa, com crescimento
+        exponencial e variação aleatória (full jitter).
+        """
+        limite = min(self._espera_maxima, self._espera_base * 2**tentativa)
+        return random.uniform(0, limite)
+
+
+class EstadoCircuito(Enum):
+    FECHADO = "FECHADO"
+    ABERTO = "ABERTO"
+    SEMIABERTO = "SEMIABERTO"
+
+
+class Circuito:
+    """
+    Disjuntor que interrompe as requisições a um serviço após
+    falhas consecutivas, liberando uma única requisição de teste
+    após o tempo de abertura.
+    """
+
+    def __init__(self, _politica: PoliticaResiliencia):
+        self._politica = _politica
+        self._estado = EstadoCircuito.FECHADO
+        self._falhas = 0
+        self._instante_abertura = 0.0
+
+    @property
+    def estado(self) -> EstadoCircuito:
+        return self._estado
+
+    def permite(self) -> bool:
+        if self._estado == EstadoCircuito.FECHADO:
+            return True
+        if self._estado == EstadoCircuito.ABERTO:
+            decorrido = time.monotonic() - self._instante_abertura
+            if decorrido >= self._politica.tempo_abertura:
+                self._estado = EstadoCircuito.SEMIABERTO
+                return True
+        return False
+
+    def registra_sucesso(self):
+        self._estado = EstadoCircuito.FECHADO
+        self._falhas = 0
+
+    def registra_falha(self):
+        self._falhas += 1
+        if (
+            self._estado == EstadoCircuito.SEMIABERTO
+            or self._falhas >= self._politica.limite_falhas
+        ):
+            self._estado = EstadoCircuito.ABERTO
+            self._instante_abertura = time.monotonic()
+
+
+class ClienteResiliente:
+    """
+    Aplica as políticas de repetição com espera exponencial,
+    disjuntor e leituras paralelas às chamadas a um serviço.
+    As chamadas retornam o resultado ou um :class:`HTTPResponse`
+    em caso de erro.
+    """
+
+    _clientes: Dict[str, "ClienteResiliente"] = {}
+
+    def __init__(self, _nome: str, _politica: PoliticaResiliencia):
+        self._nome = _nome
+        self._politica = _politica
+        self._circuito = Circuito(_politica)
+
+    @classmethod
+    def servico(
+        cls, nome: str, politica: Callable[[], PoliticaResiliencia]
+    ) -> "ClienteResiliente":
+        """
+        Obtém o cliente de um serviço, compartilhado por todas as
+        requisições, criando-o com a política informada se necessário.
+        """
+        if nome not in cls._clientes:
+            cls._clientes[nome] = ClienteResiliente(nome, politica())
+        return cls._clientes[nome]
+
+    @property
+    def circuito(self) -> Circuito:
+        return self._circuito
+
+    @staticmethod
+    def transitorio(res: object) -> bool:
+        return (
+            isinstance(res, HTTPResponse) and res.code in CODIGOS_TRANSITORIOS
+        )
+
+    async def __chama(
+        self, chamada: Callable[[], Awaitable[Union[T, HTTPResponse]]]
+    ) -> Union[T, HTTPResponse]:
+        inicio = time.perf_counter()
+        try:
+            res = await chamada()
+        except erros_comunicacao() as e:
+            res = HTTPResponse(
+                code=CODIGO_INDISPONIVEL,
+                detail=f"Erro de comunicação: {type(e).__name__} {e}",
+            )
+        Metricas.registra_requisicao(
+            self._nome,
+            time.perf_counter() - inicio,
+            isinstance(res, HTTPResponse) and res.code >= 400,
+        )
+        return res
+
+    async def __chama_hedge(
+        self, chamada: Callable[[], Awaitable[Union[T, HTTPResponse]]]
+    ) -> Union[T, HTTPResponse]:
+        atraso = self._politica.atraso_hedge
+        primeira = asyncio.ensure_future(self.__chama(chamada))
+        if atraso is None:
+            return await primeira
+        concluidas, _ = await asyncio.wait({primeira}, timeout=atraso)
+        if len(concluidas) > 0:
+            return primeira.result()
+        Log.log().info(f"{self._nome}: repetindo leitura em paralelo")
+        pendentes = {primeira, asyncio.ensure_future(self.__chama(chamada))}
+        res: Union[T, HTTPResponse] = HTTPResponse(
+            code=CODIGO_INDISPONIVEL, detail="Sem resposta"
+        )
+        try:
+            while len(pendentes) > 0:
+                concluidas, pendentes = await asyncio.wait(
+                    pendentes, return_when=asyncio.FIRST_COMPLETED
+                )
+                for t in concluidas:
+                    res = t.result()
+                    if not isinstance(res, HTTPResponse):
+                        return res
+            return res
+        finally:
+            for p in pendentes:
+                p.cancel()
+
+    async def executa(
+        self,
+        chamada: Callable[[], Awaitable[Union[T, HTTPResponse]]],
+        idempotente: bool = True,
+        hedge: bool = False,
+    ) -> Union[T, HTTPResponse]:
+        """
+        Executa uma chamada ao serviço. Somente chamadas idempotentes
+        são repetidas em caso de falha transitória. Uma exceção que não
+        é de comunicação, como a de uma resposta mal formada, é
+        repassada e também conta como falha, de modo que o circuito
+        semiaberto não fique aguardando o resultado da chamada de teste.
+        """
+        tentativas = self._politica.tentativas if idempotente else 1
+        res: Union[T, HTTPResponse] = HTTPResponse(
+            code=CODIGO_INDISPONIVEL, detail="Nenhuma tentativa realizada"
+        )
+        for tentativa in range(tentativas):
+            if not self._circuito.permite():
+                return HTTPResponse(
+                    code=CODIGO_INDISPONIVEL,
+                    detail=f"{self._nome}: circuito aberto",
+                )
+            try:
+                if hedge:
+                    res = await self.__chama_hedge(chamada)
+                else:
+                    res = await self.__chama(chamada)
+            except BaseException:
+                self._circuito.registra_falha()
+                raise
+            if not self.transitorio(res):
+                self._circuito.registra_sucesso()
+                return res
+            self._circuito.registra_falha()
+            if tentativa < tentativas - 1:
+                espera = self._politica.espera(tentativa)
+                Log.log().warning(
+                    f"{self._nome}: falha transitória [{res.code}]"  # type: ignore
+                    + f" - nova tentativa em {espera:.1f} s"
+                )
+                await asyncio.sleep(espera)
+        return res
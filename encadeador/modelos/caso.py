@@ -103,6 +103,11 @@ class Caso:
     def tempo_execucao(self) -> float:
         return sum([j.tempo_execucao for j in self.rodadas])
 
+    @property
+    def numero_ressubmissoes(self) -> int:
+        return len([r for r in self.rodadas if r.interrompida])
+
     @property
     def numero_flexibilizacoes(self) -> int:
-        return len(self.rodadas) - 1
+        # As rodadas interrompidas são ressubmetidas sem flexibilização
+        return max(0, len(self.rodadas) - self.numero_ressubmissoes - 1)
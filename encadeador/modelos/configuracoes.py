@@ -26,8 +26,14 @@ class Configuracoes(metaclass=Singleton):
         self._versao_decomp = None
         self._processadores_newave = None
         self._processadores_decomp = None
+        self._autoajuste_processadores = None
+        self._orcamento_processadores = None
+        self._casos_simultaneos = None
         self._variaveis_encadeadas_newave = None
         self._variaveis_encadeadas_decomp = None
+        self._janela_encadeamento = None
+        self._decomps_janela_encadeamento = None
+        self._tarefas_encadeamento = None
         self._maximo_flexibilizacoes_revisao = None
         self._adequa_decks_newave = None
         self._cvar = None
@@ -37,6 +43,8 @@ class Configuracoes(metaclass=Singleton):
         self._formato_armazenamento_dados = None
         self._diretorio_sintese = None
         self._formato_sintese = None
+        self._tarefas_sintese = None
+        self._processos_sintese = None
         self._script_converte_codificacao = None
         self._arquivo_regras_operacao_reservatorios = None
         self._arquivo_regras_flexibilizacao_inviabilidades = None
@@ -45,6 +53,20 @@ class Configuracoes(metaclass=Singleton):
         self._encadeador_service = None
         self._flexibilizador_service = None
         self._regras_reservatorios_service = None
+        self._cache_regras_reservatorios = None
+        self._tentativas_requisicoes = None
+        self._atraso_hedge_leitura_rodadas = None
+        self._maximo_ressubmissoes = None
+        self._tempo_limite_estado = None
+        self._atraso_ressubmissao = None
+        self._porta_metricas = None
+        self._tamanho_maximo_log = None
+        self._backups_log = None
+        self._intervalo_rotacao_log = None
+        self._formato_log = None
+        self._modo_perfilador = None
+        self._duracao_perfilador = None
+        self._perfila_inicio = None
 
     @classmethod
     def le_variaveis_ambiente(cls) -> "Configuracoes":
@@ -58,8 +80,14 @@ class Configuracoes(metaclass=Singleton):
             .versao_decomp("VERSAO_DECOMP")
             .processadores_newave("PROCESSADORES_NEWAVE")
             .processadores_decomp("PROCESSADORES_DECOMP")
+            .autoajuste_processadores("AUTOAJUSTE_PROCESSADORES")
+            .orcamento_processadores("ORCAMENTO_PROCESSADORES")
+            .casos_simultaneos("CASOS_SIMULTANEOS")
             .variaveis_encadeadas_newave("VARIAVEIS_ENCADEADAS_NEWAVE")
             .variaveis_encadeadas_decomp("VARIAVEIS_ENCADEADAS_DECOMP")
+            .janela_encadeamento("JANELA_ENCADEAMENTO")
+            .decomps_janela_encadeamento("DECOMPS_JANELA_ENCADEAMENTO")
+            .tarefas_encadeamento("TAREFAS_ENCADEAMENTO")
             .maximo_flexibilizacoes_revisao("MAXIMO_FLEXIBILIZACOES_REVISAO")
             .adequa_decks_newave("ADEQUA_DECKS_NEWAVE")
             .cvar("CVAR")
@@ -70,6 +98,8 @@ class Configuracoes(metaclass=Singleton):
             .formato_armazenamento_dados("FORMATO_ARMAZENAMENTO_DADOS")
             .diretorio_sintese("DIRETORIO_SINTESE")
             .formato_sintese("FORMATO_SINTESE")
+            .tarefas_sintese("TAREFAS_SINTESE")
+            .processos_sintese("PROCESSOS_SINTESE")
             .arquivo_lista_casos("ARQUIVO_LISTA_CASOS")
             .arquivo_regras_operacao_reservatorios(
                 "ARQUIVO_REGRAS_OPERACAO_RESERVATORIOS"
@@ -82,6 +112,20 @@ class Configuracoes(metaclass=Singleton):
             .encadeador_service("ENCADEADOR_SERVICE")
             .flexibilizador_service("FLEXIBILIZADOR_SERVICE")
             .regras_reservatorios_service("REGRAS_RESERVATORIOS_SERVICE")
+            .cache_regras_reservatorios("CACHE_REGRAS_RESERVATORIOS")
+            .tentativas_requisicoes("TENTATIVAS_REQUISICOES")
+            .atraso_hedge_leitura_rodadas("ATRASO_HEDGE_LEITURA_RODADAS")
+            .maximo_ressubmissoes("MAXIMO_RESSUBMISSOES")
+            .tempo_limite_estado("TEMPO_LIMITE_ESTADO")
+            .atraso_ressubmissao("ATRASO_RESSUBMISSAO")
+            .porta_metricas("PORTA_METRICAS")
+            .tamanho_maximo_log("TAMANHO_MAXIMO_LOG")
+            .backups_log("BACKUPS_LOG")
+            .intervalo_rotacao_log("INTERVALO_ROTACAO_LOG")
+            .formato_log("FORMATO_LOG")
+            .modo_perfilador("MODO_PERFILADOR")
+            .duracao_perfilador("DURACAO_PERFILADOR")
+            .perfila_inicio("PERFILA_INICIO")
             .build()
         )
         return c
@@ -150,6 +194,32 @@ class Configuracoes(metaclass=Singleton):
         """
         return self._processadores_decomp
 
+    @property
+    def autoajuste_processadores(self) -> bool:
+        """
+        Se o número de processadores de cada rodada é escolhido a
+        partir do histórico de tempos de execução, em vez de usar
+        os valores fixos de cada modelo.
+        """
+        return self._autoajuste_processadores
+
+    @property
+    def orcamento_processadores(self) -> int:
+        """
+        Número máximo de processadores ocupados ao mesmo tempo pelas
+        rodadas do estudo, considerado no autoajuste. O valor 0
+        desabilita o limite.
+        """
+        return self._orcamento_processadores
+
+    @property
+    def casos_simultaneos(self) -> int:
+        """
+        Número máximo de casos em execução ao mesmo tempo, entre os
+        que já têm as suas dependências concluídas.
+        """
+        return self._casos_simultaneos
+
     @property
     def variaveis_encadeadas_newave(self) -> List[str]:
         """
@@ -173,6 +243,37 @@ class Configuracoes(metaclass=Singleton):
         """
         return self._variaveis_encadeadas_decomp
 
+    @property
+    def janela_encadeamento(self) -> str:
+        """
+        Política de seleção dos casos anteriores usados como origem
+        no encadeamento e na aplicação das regras de reservatórios:
+
+            - TODOS (todos os casos anteriores),
+            - ULTIMOS (último NEWAVE e últimos DECOMPs, em número
+              dado por `decomps_janela_encadeamento`),
+            - VARIAVEL (último NEWAVE e os DECOMPs necessários para
+              cada variável encadeada).
+
+        """
+        return self._janela_encadeamento
+
+    @property
+    def decomps_janela_encadeamento(self) -> int:
+        """
+        Número de DECOMPs anteriores usados como origem no
+        encadeamento quando a janela é ULTIMOS.
+        """
+        return self._decomps_janela_encadeamento
+
+    @property
+    def tarefas_encadeamento(self) -> int:
+        """
+        Número máximo de grupos de variáveis encadeados
+        simultaneamente em um caso.
+        """
+        return self._tarefas_encadeamento
+
     @property
     def maximo_flexibilizacoes_revisao(self) -> int:
         """
@@ -260,6 +361,22 @@ class Configuracoes(metaclass=Singleton):
         """
         return self._formato_sintese
 
+    @property
+    def tarefas_sintese(self) -> int:
+        """
+        Número máximo de variáveis sintetizadas simultaneamente
+        pela fila de síntese executada em segundo plano.
+        """
+        return self._tarefas_sintese
+
+    @property
+    def processos_sintese(self) -> int:
+        """
+        Número de processos utilizados na síntese de dados que
+        dependem da leitura dos arquivos de saída dos casos.
+        """
+        return self._processos_sintese
+
     @property
     def arquivo_regras_operacao_reservatorios(self) -> str:
         """
@@ -309,6 +426,122 @@ class Configuracoes(metaclass=Singleton):
         """
         return self._regras_reservatorios_service
 
+    @property
+    def cache_regras_reservatorios(self) -> bool:
+        """
+        Se o serviço de regras de reservatórios mantém em cache os
+        conjuntos de regras recebidos, de modo que um conjunto já
+        enviado é identificado somente pelo hash nas requisições.
+        """
+        return self._cache_regras_reservatorios
+
+    @property
+    def tentativas_requisicoes(self) -> int:
+        """
+        Número máximo de tentativas das requisições idempotentes
+        aos serviços externos em caso de falhas transitórias.
+        """
+        return self._tentativas_requisicoes
+
+    @property
+    def atraso_hedge_leitura_rodadas(self) -> float:
+        """
+        Tempo, em segundos, após o qual uma leitura de rodada sem
+        resposta é repetida em paralelo. O valor 0 desabilita as
+        leituras paralelas.
+        """
+        return self._atraso_hedge_leitura_rodadas
+
+    @property
+    def maximo_ressubmissoes(self) -> int:
+        """
+        Número máximo de vezes que um caso é ressubmetido após erros
+        de comunicação ou rodadas paradas em um mesmo estado. O valor
+        0 desabilita as ressubmissões.
+        """
+        return self._maximo_ressubmissoes
+
+    @property
+    def tempo_limite_estado(self) -> float:
+        """
+        Tempo mínimo, em segundos, que uma rodada pode permanecer
+        submetida, iniciando ou encerrando antes de ser considerada
+        parada. O limite cresce com as durações já observadas de
+        cada estado. O valor 0 desabilita a verificação.
+        """
+        return self._tempo_limite_estado
+
+    @property
+    def atraso_ressubmissao(self) -> float:
+        """
+        Tempo, em segundos, de espera antes da primeira ressubmissão
+        de um caso, dobrado a cada nova tentativa.
+        """
+        return self._atraso_ressubmissao
+
+    @property
+    def porta_metricas(self) -> int:
+        """
+        Porta TCP do endpoint de métricas e saúde do encadeador.
+        O valor 0 desabilita o endpoint.
+        """
+        return self._porta_metricas
+
+    @property
+    def tamanho_maximo_log(self) -> int:
+        """
+        Tamanho, em MB, a partir do qual o arquivo de log é
+        rotacionado.
+        """
+        return self._tamanho_maximo_log
+
+    @property
+    def backups_log(self) -> int:
+        """
+        Número de cópias compactadas do arquivo de log mantidas
+        após as rotações.
+        """
+        return self._backups_log
+
+    @property
+    def intervalo_rotacao_log(self) -> float:
+        """
+        Intervalo, em horas, entre as rotações do arquivo de log.
+        O valor 0 desabilita a rotação por tempo.
+        """
+        return self._intervalo_rotacao_log
+
+    @property
+    def formato_log(self) -> str:
+        """
+        Formato dos registros no arquivo de log: TEXTO ou JSON,
+        com um objeto por linha contendo o caso e a rodada.
+        """
+        return self._formato_log
+
+    @property
+    def modo_perfilador(self) -> str:
+        """
+        Perfilador usado nas janelas de perfilamento: AMOSTRAGEM,
+        da pilha do loop de eventos, ou CPROFILE.
+        """
+        return self._modo_perfilador
+
+    @property
+    def duracao_perfilador(self) -> float:
+        """
+        Duração, em segundos, de cada janela de perfilamento.
+        """
+        return self._duracao_perfilador
+
+    @property
+    def perfila_inicio(self) -> bool:
+        """
+        Se uma janela de perfilamento é iniciada junto com a
+        execução do estudo.
+        """
+        return self._perfila_inicio
+
 
 class BuilderConfiguracoes:
     """ """
@@ -351,6 +584,18 @@ class BuilderConfiguracoes:
     def processadores_decomp(self, variavel: str):
         raise NotImplementedError()
 
+    @abstractmethod
+    def autoajuste_processadores(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def orcamento_processadores(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def casos_simultaneos(self, variavel: str):
+        raise NotImplementedError()
+
     @abstractmethod
     def variaveis_encadeadas_newave(self, variavel: str):
         raise NotImplementedError()
@@ -359,6 +604,18 @@ class BuilderConfiguracoes:
     def variaveis_encadeadas_decomp(self, variavel: str):
         raise NotImplementedError()
 
+    @abstractmethod
+    def janela_encadeamento(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def decomps_janela_encadeamento(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def tarefas_encadeamento(self, variavel: str):
+        raise NotImplementedError()
+
     @abstractmethod
     def maximo_flexibilizacoes_revisao(self, variavel: str):
         raise NotImplementedError()
@@ -399,6 +656,14 @@ class BuilderConfiguracoes:
     def formato_sintese(self, variavel: str):
         raise NotImplementedError()
 
+    @abstractmethod
+    def tarefas_sintese(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def processos_sintese(self, variavel: str):
+        raise NotImplementedError()
+
     @abstractmethod
     def arquivo_lista_casos(self, variavel: str):
         raise NotImplementedError()
@@ -431,6 +696,62 @@ class BuilderConfiguracoes:
     def regras_reservatorios_service(self, variavel: str):
         raise NotImplementedError()
 
+    @abstractmethod
+    def cache_regras_reservatorios(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def tentativas_requisicoes(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def atraso_hedge_leitura_rodadas(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def maximo_ressubmissoes(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def tempo_limite_estado(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def atraso_ressubmissao(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def porta_metricas(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def tamanho_maximo_log(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def backups_log(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def intervalo_rotacao_log(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def formato_log(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def modo_perfilador(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def duracao_perfilador(self, variavel: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def perfila_inicio(self, variavel: str):
+        raise NotImplementedError()
+
 
 class BuilderConfiguracoesENV(BuilderConfiguracoes):
     """ """
@@ -550,6 +871,39 @@ class BuilderConfiguracoesENV(BuilderConfiguracoes):
         # Fluent method
         return self
 
+    def autoajuste_processadores(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_bool(valor)
+        self._configuracoes._autoajuste_processadores = valor
+        # Fluent method
+        return self
+
+    def orcamento_processadores(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 0."
+            )
+        self._configuracoes._orcamento_processadores = valor
+        # Fluent method
+        return self
+
+    def casos_simultaneos(self, variavel: str):
+        valor = getenv(variavel, "1")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._casos_simultaneos = valor
+        # Fluent method
+        return self
+
     def variaveis_encadeadas_newave(self, variavel: str):
         valor = BuilderConfiguracoesENV.__le_e_confere_variavel(variavel)
         # Confere se as variáveis está dentro das: GNL, TVIAGEM, VARM, ENA
@@ -580,6 +934,46 @@ class BuilderConfiguracoesENV(BuilderConfiguracoes):
         # Fluent method
         return self
 
+    def janela_encadeamento(self, variavel: str):
+        valor = getenv(variavel, "TODOS")
+        # Confere se a política é válida
+        variaveis_validas = set(["TODOS", "ULTIMOS", "VARIAVEL"])
+        if valor not in variaveis_validas:
+            raise ValueError(
+                f"Janela de encadeamento informada {valor}"
+                + " é inválida. "
+                + " Válidas: TODOS, ULTIMOS, VARIAVEL"
+            )
+        self._configuracoes._janela_encadeamento = valor
+        # Fluent method
+        return self
+
+    def decomps_janela_encadeamento(self, variavel: str):
+        valor = getenv(variavel, "1")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._decomps_janela_encadeamento = valor
+        # Fluent method
+        return self
+
+    def tarefas_encadeamento(self, variavel: str):
+        valor = getenv(variavel, "4")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._tarefas_encadeamento = valor
+        # Fluent method
+        return self
+
     def maximo_flexibilizacoes_revisao(self, variavel: str):
         valor = BuilderConfiguracoesENV.__le_e_confere_variavel(variavel)
         valor = BuilderConfiguracoesENV.__valida_int(valor)
@@ -697,6 +1091,32 @@ class BuilderConfiguracoesENV(BuilderConfiguracoes):
         # Fluent method
         return self
 
+    def tarefas_sintese(self, variavel: str):
+        valor = getenv(variavel, "4")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._tarefas_sintese = valor
+        # Fluent method
+        return self
+
+    def processos_sintese(self, variavel: str):
+        valor = getenv(variavel, "4")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._processos_sintese = valor
+        # Fluent method
+        return self
+
     def arquivo_lista_casos(self, variavel: str):
         valor = BuilderConfiguracoesENV.__le_e_confere_variavel(variavel)
         # Confere se existe o arquivo no diretorio raiz de encadeamento
@@ -780,3 +1200,175 @@ class BuilderConfiguracoesENV(BuilderConfiguracoes):
         self._configuracoes._regras_reservatorios_service = valor
         # Fluent method
         return self
+
+    def cache_regras_reservatorios(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_bool(valor)
+        self._configuracoes._cache_regras_reservatorios = valor
+        # Fluent method
+        return self
+
+    def tentativas_requisicoes(self, variavel: str):
+        valor = getenv(variavel, "5")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._tentativas_requisicoes = valor
+        # Fluent method
+        return self
+
+    def atraso_hedge_leitura_rodadas(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_float(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser real maior ou igual a 0."
+            )
+        self._configuracoes._atraso_hedge_leitura_rodadas = valor
+        # Fluent method
+        return self
+
+    def maximo_ressubmissoes(self, variavel: str):
+        valor = getenv(variavel, "3")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 0."
+            )
+        self._configuracoes._maximo_ressubmissoes = valor
+        # Fluent method
+        return self
+
+    def tempo_limite_estado(self, variavel: str):
+        valor = getenv(variavel, "3600")
+        valor = BuilderConfiguracoesENV.__valida_float(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser real maior ou igual a 0."
+            )
+        self._configuracoes._tempo_limite_estado = valor
+        # Fluent method
+        return self
+
+    def atraso_ressubmissao(self, variavel: str):
+        valor = getenv(variavel, "60")
+        valor = BuilderConfiguracoesENV.__valida_float(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser real maior ou igual a 0."
+            )
+        self._configuracoes._atraso_ressubmissao = valor
+        # Fluent method
+        return self
+
+    def porta_metricas(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é uma porta válida
+        if valor < 0 or valor > 65535:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro entre 0 e 65535."
+            )
+        self._configuracoes._porta_metricas = valor
+        # Fluent method
+        return self
+
+    def tamanho_maximo_log(self, variavel: str):
+        valor = getenv(variavel, "10")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._tamanho_maximo_log = valor
+        # Fluent method
+        return self
+
+    def backups_log(self, variavel: str):
+        valor = getenv(variavel, "5")
+        valor = BuilderConfiguracoesENV.__valida_int(valor)
+        # Conferir se é >= 1
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser inteiro maior ou igual a 1."
+            )
+        self._configuracoes._backups_log = valor
+        # Fluent method
+        return self
+
+    def intervalo_rotacao_log(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_float(valor)
+        # Conferir se é >= 0
+        if valor < 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser real maior ou igual a 0."
+            )
+        self._configuracoes._intervalo_rotacao_log = valor
+        # Fluent method
+        return self
+
+    def formato_log(self, variavel: str):
+        valor = getenv(variavel, "TEXTO")
+        # Confere se a variável é válida
+        variaveis_validas = set(["TEXTO", "JSON"])
+        if valor not in variaveis_validas:
+            raise ValueError(
+                f"Formato de log informado {valor}"
+                + " é inválido. "
+                + " Válidos: TEXTO, JSON"
+            )
+        self._configuracoes._formato_log = valor
+        # Fluent method
+        return self
+
+    def modo_perfilador(self, variavel: str):
+        valor = getenv(variavel, "AMOSTRAGEM")
+        # Confere se a variável é válida
+        variaveis_validas = set(["AMOSTRAGEM", "CPROFILE"])
+        if valor not in variaveis_validas:
+            raise ValueError(
+                f"Modo de perfilador informado {valor}"
+                + " é inválido. "
+                + " Válidos: AMOSTRAGEM, CPROFILE"
+            )
+        self._configuracoes._modo_perfilador = valor
+        # Fluent method
+        return self
+
+    def duracao_perfilador(self, variavel: str):
+        valor = getenv(variavel, "60")
+        valor = BuilderConfiguracoesENV.__valida_float(valor)
+        # Conferir se é > 0
+        if valor <= 0:
+            raise ValueError(
+                f"Valor da variável {variavel} informada"
+                + " deve ser real maior que 0."
+            )
+        self._configuracoes._duracao_perfilador = valor
+        # Fluent method
+        return self
+
+    def perfila_inicio(self, variavel: str):
+        valor = getenv(variavel, "0")
+        valor = BuilderConfiguracoesENV.__valida_bool(valor)
+        self._configuracoes._perfila_inicio = valor
+        # Fluent method
+        return self
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+
+class EtapaPreparacao:
+    """
+    Classe que registra uma etapa concluída da preparação de um
+    caso, com as assinaturas dos arquivos do deck antes e depois
+    da etapa. A assinatura de saída permite identificar, ao retomar
+    o estudo, que o deck já foi preparado e não foi alterado desde
+    então.
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        id_caso: int,
+        assinatura_entrada: str,
+        assinatura_saida: str,
+        instante: datetime,
+    ) -> None:
+        self.id: int = None  # type: ignore
+        self.nome = nome
+        self.id_caso = id_caso
+        self.assinatura_entrada = assinatura_entrada
+        self.assinatura_saida = assinatura_saida
+        self.instante = instante
+
+    def __eq__(self, o: object):
+        if not isinstance(o, EtapaPreparacao):
+            return False
+        return all(
+            [
+                self.id == o.id,
+                self.nome == o.nome,
+                self.id_caso == o.id_caso,
+                self.assinatura_entrada == o.assinatura_entrada,
+                self.assinatura_saida == o.assinatura_saida,
+                self.instante == o.instante,
+            ]
+        )
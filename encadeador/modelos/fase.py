@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+
+class Fase:
+    """
+    Classe que define o intervalo de tempo gasto em uma fase do
+    processamento de um caso, fora da execução do modelo, como a
+    preparação dos decks ou as chamadas aos serviços externos.
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        instante_inicio: datetime,
+        instante_fim: datetime,
+        duracao: float,
+        sucesso: bool,
+        id_caso: Optional[int],
+    ) -> None:
+        self.id: int = None  # type: ignore
+        self.nome = nome
+        self.instante_inicio = instante_inicio
+        self.instante_fim = instante_fim
+        self.duracao = duracao
+        self.sucesso = sucesso
+        self.id_caso = id_caso
+
+    def __eq__(self, o: object):
+        if not isinstance(o, Fase):
+            return False
+        return all(
+            [
+                self.id == o.id,
+                self.nome == o.nome,
+                self.instante_inicio == o.instante_inicio,
+                self.instante_fim == o.instante_fim,
+                self.duracao == o.duracao,
+                self.sucesso == o.sucesso,
+                self.id_caso == o.id_caso,
+            ]
+        )
@@ -0,0 +1,201 @@
+from bisect import bisect_right
+import hashlib
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.reservoirrule import ReservoirRule
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd  # type: ignore
+
+MES_MINIMO = -(2**62)
+MES_MAXIMO = 2**62
+
+
+class JanelaRegrasReservatorios:
+    """
+    Conjunto de regras de operação de reservatórios vigentes em
+    um intervalo de meses. As regras só são convertidas para o
+    formato utilizado nas requisições ao serviço de regras no
+    primeiro uso da janela.
+    """
+
+    def __init__(
+        self,
+        _inicio: int,
+        _fim: int,
+        _indices: List[int],
+        _converte: Callable[[int], ReservoirRule],
+    ):
+        self._inicio = _inicio
+        self._fim = _fim
+        self._indices = _indices
+        self._converte = _converte
+        self._regras: Optional[List[ReservoirRule]] = None
+        self._payload: Optional[List[Dict[str, Any]]] = None
+        self._identificador: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @property
+    def inicio(self) -> int:
+        """
+        Primeiro mês da janela, no formato `ano * 12 + mes - 1`.
+        """
+        return self._inicio
+
+    @property
+    def fim(self) -> int:
+        """
+        Último mês da janela, no formato `ano * 12 + mes - 1`.
+        """
+        return self._fim
+
+    @property
+    def regras(self) -> List[ReservoirRule]:
+        if self._regras is None:
+            self._regras = [self._converte(k) for k in self._indices]
+        return self._regras
+
+    @property
+    def identificador(self) -> str:
+        """
+        Hash do conjunto de regras, que o identifica no serviço
+        de regras de reservatórios.
+        """
+        if self._identificador is None:
+            self._identificador = hashlib.sha256(
+                json.dumps(
+                    self.payload, sort_keys=True, separators=(",", ":")
+                ).encode("utf-8")
+            ).hexdigest()
+        return self._identificador
+
+    @property
+    def payload(self) -> List[Dict[str, Any]]:
+        """
+        Regras serializadas para o corpo da requisição.
+        """
+        if self._payload is None:
+            self._payload = [json.loads(r.json()) for r in self.regras]
+        return self._payload
+
+
+class IndiceRegrasReservatorios:
+    """
+    Índice das regras de operação de reservatórios por mês de
+    vigência. As regras são agrupadas uma única vez em janelas
+    de meses nas quais o conjunto de regras vigentes não muda,
+    de modo que a seleção das regras de um caso é uma busca.
+    """
+
+    def __init__(self, regras: Sequence[RegraReservatorio]):
+        self._regras = regras
+        self._numero_regras = len(regras)
+        self._convertidas: Dict[int, ReservoirRule] = {}
+        self._inicios: List[int] = []
+        self._janelas: List[JanelaRegrasReservatorios] = []
+        self.__constroi()
+
+    @staticmethod
+    def mes(ano: int, mes: int) -> int:
+        return ano * 12 + mes - 1
+
+    @staticmethod
+    def __meses(datas: "pd.Series") -> "pd.Series":
+        return datas.dt.year * 12 + datas.dt.month - 1
+
+    def __intervalos(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        import numpy as np
+        import pandas as pd  # type: ignore
+        from encadeador.modelos.tabelaregrasreservatorios import (
+            TabelaRegrasReservatorios,
+        )
+
+        # PREMISSA: a regra é vigente para um caso se o primeiro dia
+        # do mês do caso está no período de vigência.
+        if isinstance(self._regras, TabelaRegrasReservatorios):
+            inicios = self._regras.df["inicio_vigencia"]
+            fins = self._regras.df["fim_vigencia"]
+        else:
+            inicios = pd.to_datetime(
+                pd.Series(
+                    [r.inicio_vigencia for r in self._regras], dtype=object
+                )
+            )
+            fins = pd.to_datetime(
+                pd.Series([r.fim_vigencia for r in self._regras], dtype=object)
+            )
+        meses_inicio = self.__meses(inicios)
+        primeiro_dia = (inicios.dt.day == 1) & (
+            inicios == inicios.dt.normalize()
+        )
+        meses_inicio = meses_inicio + (~primeiro_dia).astype(int)
+        meses_fim = self.__meses(fins)
+        return (
+            meses_inicio.where(inicios.notna(), MES_MINIMO)
+            .to_numpy()
+            .astype(np.int64),
+            meses_fim.where(fins.notna(), MES_MAXIMO)
+            .to_numpy()
+            .astype(np.int64),
+        )
+
+    def __converte(self, k: int) -> ReservoirRule:
+        if k not in self._convertidas:
+            self._convertidas[k] = ReservoirRule.from_regra(self._regras[k])
+        return self._convertidas[k]
+
+    def __constroi(self):
+        import numpy as np
+
+        inicios, fins = self.__intervalos()
+        validas = inicios <= fins
+        limites = sorted(
+            {MES_MINIMO}
+            | set(inicios[validas].tolist())
+            | set((fins[validas & (fins < MES_MAXIMO)] + 1).tolist())
+        )
+        vigentes_anteriores: Optional["np.ndarray"] = None
+        for j, inicio in enumerate(limites):
+            fim = limites[j + 1] - 1 if j + 1 < len(limites) else MES_MAXIMO
+            vigentes = np.flatnonzero((inicios <= inicio) & (inicio <= fins))
+            if vigentes_anteriores is not None and np.array_equal(
+                vigentes, vigentes_anteriores
+            ):
+                # Mesmo conjunto de regras: estende a janela anterior
+                self._janelas[-1]._fim = fim
+                continue
+            self._inicios.append(inicio)
+            self._janelas.append(
+                JanelaRegrasReservatorios(
+                    inicio, fim, vigentes.tolist(), self.__converte
+                )
+            )
+            vigentes_anteriores = vigentes
+
+    def __len__(self) -> int:
+        return self._numero_regras
+
+    @property
+    def janelas(self) -> List[JanelaRegrasReservatorios]:
+        return self._janelas
+
+    def janela(self, ano: int, mes: int) -> JanelaRegrasReservatorios:
+        """
+        Obtém as regras vigentes em um mês.
+        """
+        j = bisect_right(self._inicios, self.mes(ano, mes)) - 1
+        return self._janelas[j]
@@ -1,4 +1,3 @@
-import pandas as pd  # type: ignore
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -62,35 +61,11 @@ class RegraReservatorio:
 
     @staticmethod
     def from_csv(caminho: str) -> List["RegraReservatorio"]:
-        df = pd.read_csv(caminho, index_col=None, sep=";")
-        df = df.loc[~df["INICIO_VIGENCIA"].str.contains("&")]
-        regras: List[RegraReservatorio] = []
-        for _, linha in df.iterrows():
-            regras.append(
-                RegraReservatorio(
-                    None
-                    if linha["INICIO_VIGENCIA"] == "-"
-                    else linha["INICIO_VIGENCIA"],
-                    None
-                    if linha["FIM_VIGENCIA"] == "-"
-                    else linha["FIM_VIGENCIA"],
-                    int(linha["COD_RESERVATORIO_VOL"]),
-                    int(linha["CODIGO_USINA_RESTRICAO"]),
-                    linha["TIPO_REST"],
-                    int(linha["MES"]),
-                    float(linha["VOL_MIN"]),
-                    float(linha["VOL_MAX"]),
-                    None
-                    if linha["LIM_MIN"] == "-"
-                    else float(linha["LIM_MIN"]),
-                    None
-                    if linha["LIM_MAX"] == "-"
-                    else float(linha["LIM_MAX"]),
-                    linha["PERIOD"],
-                    linha["LEGENDA_FAIXA"],
-                )
-            )
-        return regras
+        from encadeador.modelos.tabelaregrasreservatorios import (
+            TabelaRegrasReservatorios,
+        )
+
+        return list(TabelaRegrasReservatorios.from_csv(caminho))
 
     @staticmethod
     def from_json(json_dict: Dict[str, Any]) -> "RegraReservatorio":
@@ -39,30 +39,34 @@ class RegraReservatorioEquivalente:
 
     @staticmethod
     def to_csv(regras: List["RegraReservatorioEquivalente"], caminho: str):
-        codigos_reservatorios = [str(r.codigos_reservatorios) for r in regras]
-        codigo_usina = [r.codigo_usina for r in regras]
-        tipo_restricao = [r.tipo_restricao for r in regras]
-        mes = [r.mes for r in regras]
-        volume_minimo = [r.volume_minimo for r in regras]
-        volume_maximo = [r.volume_maximo for r in regras]
-        limite_minimo = [r.limite_minimo for r in regras]
-        limite_maximo = [r.limite_maximo for r in regras]
-        periodicidade = [r.periodicidade for r in regras]
-        legenda_faixa = [r._legenda_faixa for r in regras]
-
-        df = pd.DataFrame(
-            data={
-                "COD_RESERVATORIO_VOL": codigos_reservatorios,
-                "CODIGO_USINA_RESTRICAO": codigo_usina,
-                "TIPO_REST": tipo_restricao,
-                "MES": mes,
-                "VOL_MIN": volume_minimo,
-                "VOL_MAX": volume_maximo,
-                "LIM_MIN": limite_minimo,
-                "LIM_MAX": limite_maximo,
-                "PERIOD": periodicidade,
-                "LEGENDA_FAIXA": legenda_faixa,
-            }
+        df = pd.DataFrame.from_records(
+            [
+                (
+                    str(r._codigos_reservatorios),
+                    r._codigo_usina,
+                    r._tipo_restricao,
+                    r._mes,
+                    r._volume_minimo,
+                    r._volume_maximo,
+                    r._limite_minimo,
+                    r._limite_maximo,
+                    r._periodicidade,
+                    r._legenda_faixa,
+                )
+                for r in regras
+            ],
+            columns=[
+                "COD_RESERVATORIO_VOL",
+                "CODIGO_USINA_RESTRICAO",
+                "TIPO_REST",
+                "MES",
+                "VOL_MIN",
+                "VOL_MAX",
+                "LIM_MIN",
+                "LIM_MAX",
+                "PERIOD",
+                "LEGENDA_FAIXA",
+            ],
         )
         df.to_csv(caminho, sep=";")
 
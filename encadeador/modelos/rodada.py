@@ -22,6 +22,7 @@ class Rodada:
         nome_programa: str,
         versao_programa: str,
         id_caso: int,
+        instante_entrada_estado: Optional[datetime] = None,
     ) -> None:
         self.id: int = None  # type: ignore
         self.nome = nome
@@ -34,6 +35,8 @@ class Rodada:
         self.nome_programa = nome_programa
         self.versao_programa = versao_programa
         self.id_caso = id_caso
+        # Instante em que a rodada foi observada no seu estado atual
+        self.instante_entrada_estado = instante_entrada_estado
 
     def __eq__(self, o: object):
         if not isinstance(o, Rodada):
@@ -70,6 +73,17 @@ class Rodada:
             RunStatus.UNKNOWN,
         ]
 
+    @property
+    def interrompida(self) -> bool:
+        """
+        A rodada foi cancelada ou perdeu a comunicação com o serviço
+        de modelos, e o caso é submetido novamente sem alterações.
+        """
+        return self.estado in [
+            RunStatus.COMMUNICATION_ERROR,
+            RunStatus.UNKNOWN,
+        ]
+
     @property
     def tempo_execucao(self) -> float:
         tempo_fim = (
@@ -0,0 +1,151 @@
+from typing import Dict, Iterator, Optional
+import numpy as np
+import pandas as pd  # type: ignore
+
+from encadeador.modelos.regrareservatorio import RegraReservatorio
+
+SENTINELA = "-"
+FILTRO = "&"
+
+COLUNAS_CSV: Dict[str, str] = {
+    "INICIO_VIGENCIA": "inicio_vigencia",
+    "FIM_VIGENCIA": "fim_vigencia",
+    "COD_RESERVATORIO_VOL": "codigo_reservatorio",
+    "CODIGO_USINA_RESTRICAO": "codigo_usina",
+    "TIPO_REST": "tipo_restricao",
+    "MES": "mes",
+    "VOL_MIN": "volume_minimo",
+    "VOL_MAX": "volume_maximo",
+    "LIM_MIN": "limite_minimo",
+    "LIM_MAX": "limite_maximo",
+    "PERIOD": "periodicidade",
+    "LEGENDA_FAIXA": "legenda_faixa",
+}
+
+COLUNAS_DATA = ["inicio_vigencia", "fim_vigencia"]
+COLUNAS_INT = ["codigo_reservatorio", "codigo_usina", "mes"]
+COLUNAS_FLOAT = ["volume_minimo", "volume_maximo"]
+COLUNAS_FLOAT_OPCIONAL = ["limite_minimo", "limite_maximo"]
+COLUNAS_STR = ["tipo_restricao", "periodicidade", "legenda_faixa"]
+
+
+class TabelaRegrasReservatorios:
+    """
+    Armazena as regras de operação de reservatórios em colunas,
+    com os tipos já convertidos. Cada regra é acessada como um
+    objeto :class:`RegraReservatorio`, construído somente quando
+    requisitado.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = TabelaRegrasReservatorios.__converte_tipos(df)
+        self._colunas = {c: self._df[c].to_numpy() for c in self._df.columns}
+
+    @staticmethod
+    def __converte_tipos(df: pd.DataFrame) -> pd.DataFrame:
+        df = df[list(COLUNAS_CSV.values())].reset_index(drop=True)
+        convertido = pd.DataFrame(index=df.index)
+        for c in COLUNAS_DATA:
+            convertido[c] = pd.to_datetime(df[c], format="ISO8601")
+        for c in COLUNAS_INT:
+            convertido[c] = df[c].astype(np.int64)
+        for c in COLUNAS_FLOAT:
+            convertido[c] = df[c].astype(np.float64)
+        for c in COLUNAS_FLOAT_OPCIONAL:
+            convertido[c] = df[c].astype(np.float64)
+        for c in COLUNAS_STR:
+            convertido[c] = df[c].astype(str)
+        return convertido[list(COLUNAS_CSV.values())]
+
+    @staticmethod
+    def vazia() -> "TabelaRegrasReservatorios":
+        return TabelaRegrasReservatorios(
+            pd.DataFrame(columns=list(COLUNAS_CSV.values()))
+        )
+
+    @staticmethod
+    def from_csv(caminho: str) -> "TabelaRegrasReservatorios":
+        # Somente as datas e os limites são opcionais, lidos como
+        # ausentes. Nas demais colunas o sentinela é um valor válido.
+        # Os tipos são convertidos somente após o filtro.
+        ausentes = {
+            k: [SENTINELA, ""] if v in COLUNAS_FLOAT_OPCIONAL else [SENTINELA]
+            for k, v in COLUNAS_CSV.items()
+            if v in COLUNAS_DATA + COLUNAS_FLOAT_OPCIONAL
+        }
+        df = pd.read_csv(
+            caminho,
+            index_col=None,
+            sep=";",
+            na_values=ausentes,
+            keep_default_na=False,
+        )
+        filtradas = (
+            df["INICIO_VIGENCIA"].astype(str).str.contains(FILTRO, regex=False)
+        )
+        df = df.loc[~filtradas]
+        return TabelaRegrasReservatorios(df.rename(columns=COLUNAS_CSV))
+
+    def to_csv(self, caminho: str):
+        df = self._df.copy()
+        for c in COLUNAS_DATA:
+            datas = df[c]
+            meia_noite = datas == datas.dt.normalize()
+            df[c] = np.where(
+                meia_noite,
+                datas.dt.strftime("%Y-%m-%d"),
+                datas.dt.strftime("%Y-%m-%dT%H:%M:%S"),
+            )
+            df.loc[datas.isna(), c] = SENTINELA
+        for c in COLUNAS_FLOAT_OPCIONAL:
+            df[c] = df[c].astype(object).where(df[c].notna(), SENTINELA)
+        df = df.rename(columns={v: k for k, v in COLUNAS_CSV.items()})
+        df.to_csv(caminho, sep=";", index=False)
+
+    @staticmethod
+    def from_parquet(caminho: str) -> "TabelaRegrasReservatorios":
+        return TabelaRegrasReservatorios(pd.read_parquet(caminho))
+
+    def to_parquet(self, caminho: str):
+        self._df.to_parquet(caminho, compression="gzip")
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def __iter__(self) -> Iterator[RegraReservatorio]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> RegraReservatorio:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Regra {i} não existe")
+        col = self._colunas
+
+        def data(c: str) -> Optional[str]:
+            d = col[c][i]
+            return None if pd.isna(d) else pd.Timestamp(d).isoformat()
+
+        def opcional(c: str) -> Optional[float]:
+            v = col[c][i]
+            return None if np.isnan(v) else float(v)
+
+        return RegraReservatorio(
+            data("inicio_vigencia"),
+            data("fim_vigencia"),
+            int(col["codigo_reservatorio"][i]),
+            int(col["codigo_usina"][i]),
+            str(col["tipo_restricao"][i]),
+            int(col["mes"][i]),
+            float(col["volume_minimo"][i]),
+            float(col["volume_maximo"][i]),
+            opcional("limite_minimo"),
+            opcional("limite_maximo"),
+            str(col["periodicidade"][i]),
+            str(col["legenda_faixa"][i]),
+        )
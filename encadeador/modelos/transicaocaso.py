@@ -20,3 +20,5 @@ class TransicaoCaso(Enum):
     ERRO_DADOS = auto()
     ERRO_CONVERGENCIA = auto()
     NAO_CONVERGIU = auto()
+    RESSUBMISSAO_SOLICITADA = auto()
+    PROCESSADORES_INDISPONIVEIS = auto()
@@ -1,11 +1,12 @@
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple, Union
 import pandas as pd  # type: ignore
 import pathlib
-from datetime import datetime
 from os.path import join
 from encadeador.controladores.preparadorcaso import PreparadorCaso
+from encadeador.controladores.executorencadeamento import (
+    ExecutorEncadeamento,
+)
 from encadeador.adapters.repository.apis import (
-    EncadeadorAPIRepository,
     RegrasReservatoriosAPIRepository,
     FlexibilizadorAPIRepository,
 )
@@ -13,22 +14,42 @@ from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.estadocaso import EstadoCaso
 from encadeador.modelos.transicaocaso import TransicaoCaso
 from encadeador.modelos.caso import Caso
+from encadeador.modelos.rodada import Rodada
 from encadeador.modelos.runstatus import RunStatus
 from encadeador.modelos.programa import Programa
-from encadeador.modelos.reservoirrule import ReservoirRule
 from encadeador.internal.httpresponse import HTTPResponse
 import encadeador.domain.commands as commands
 from encadeador.domain.programs import ProgramRules
 from encadeador.services.unitofwork.caso import AbstractCasoUnitOfWork
 from encadeador.services.unitofwork.rodada import AbstractRodadaUnitOfWork
+from encadeador.services.unitofwork.fase import AbstractFaseUnitOfWork
+from encadeador.services.unitofwork.etapapreparacao import (
+    AbstractEtapaPreparacaoUnitOfWork,
+)
 import encadeador.services.handlers.rodada as rodada_handlers
+import encadeador.services.handlers.fase as fase_handlers
+import encadeador.services.handlers.etapapreparacao as etapa_handlers
 from encadeador.utils.log import Log
+from encadeador.utils.contexto import atribui_caso, atribui_rodada
+from encadeador.utils.fases import fase
+from encadeador.internal.perfilador import perfilado
 
 # TODO - no futuro, quando toda a aplicação for
 # orientada a eventos, o logging deve ser praticamente
 # restrito aos handlers?
 
+# Múltiplo da maior permanência já registrada em um estado a partir
+# do qual uma rodada é considerada parada
+FATOR_LIMITE_ESTADO = 3.0
+
+# Nome da etapa que registra a preparação completa do caso
+ETAPA_PREPARACAO = "preparacao"
+# Nome da etapa que registra a entrada da cadeia de etapas que
+# alteram o deck e o estado em que a cadeia o deixou
+ETAPA_CADEIA = "cadeia_preparacao"
 
+
+@perfilado("handlers.caso.cria")
 def cria(
     command: commands.CriaCaso, uow: AbstractCasoUnitOfWork
 ) -> Optional[Caso]:
@@ -63,117 +84,192 @@ def cria(
         return caso
 
 
-def inicializa(
+@perfilado("handlers.caso.inicializa")
+async def inicializa(
     command: commands.InicializaCaso,
     caso_uow: AbstractCasoUnitOfWork,
     rodada_uow: AbstractRodadaUnitOfWork,
-) -> Optional[Caso]:
-    with rodada_uow:
-        # Limpa rodadas do caso que estão ativas
-        rodadas_caso = rodada_uow.rodadas.list_by_caso(command.id_caso)
-        rodadas_ativas = [r for r in rodadas_caso if r.ativa]
-        for r in rodadas_ativas:
-            rodada_uow.rodadas.delete(r.id)
-        rodada_uow.commit()
+) -> Tuple[Optional[Caso], Optional[int]]:
+    """
+    Inicializa o caso, retornando também a rodada a ser retomada,
+    quando o caso já havia sido submetido antes de o encadeador
+    ser interrompido.
+    """
+    with caso_uow:
+        caso = caso_uow.casos.read(command.id_caso)
+        if caso is None:
+            return None, None
+        caminho = join(Configuracoes().caminho_base_estudo, caso.caminho)
+        executando = caso.estado == EstadoCaso.EXECUTANDO
+    # As rodadas ativas podem ter continuado no cluster, ou terminado,
+    # enquanto o encadeador estava parado. Em vez de descartá-las,
+    # o que levaria a uma nova submissão, reconcilia com o serviço.
+    cmd = commands.ReconciliaRodadas(command.id_caso, caminho)
+    id_rodada = await rodada_handlers.reconcilia(cmd, rodada_uow)
+    if id_rodada is None and executando:
+        # A rodada terminou, mas o resultado não chegou a ser tratado
+        with rodada_uow:
+            rodadas = rodada_uow.rodadas.list_by_caso(command.id_caso)
+            if len(rodadas) > 0:
+                id_rodada = max(rodadas).id
     with caso_uow:
         caso = caso_uow.casos.read(command.id_caso)
         if caso is not None:
-            caso.estado = EstadoCaso.INICIADO
+            if id_rodada is not None:
+                Log.log().info(
+                    f"Caso {caso.nome}: retomando rodada {id_rodada}"
+                )
+                caso.estado = EstadoCaso.EXECUTANDO
+            else:
+                caso.estado = EstadoCaso.INICIADO
+            caso_uow.casos.update(caso)
             caso_uow.commit()
-        return caso
+        return caso, id_rodada
+
 
+def identifica_casos(casos: List[Caso]) -> List[str]:
+    """
+    Identifica os casos e as últimas rodadas de cada um, das quais
+    vêm os resultados usados na preparação de outro caso.
+    """
+    return [
+        f"{c.caminho}:{max((r.id for r in c.rodadas), default=None)}"
+        for c in casos
+    ]
 
+
+@perfilado("handlers.caso.prepara")
 async def prepara(
-    command: commands.PreparaCaso, uow: AbstractCasoUnitOfWork
+    command: commands.PreparaCaso,
+    uow: AbstractCasoUnitOfWork,
+    etapa_uow: AbstractEtapaPreparacaoUnitOfWork,
 ) -> bool:
-    with uow:
+    with uow, fase("preparacao", command.id_caso):
         # Lista os casos anteriores
         caso = uow.casos.read(command.id_caso)
         if caso is None:
             Log.log().error(f"Caso {command.id_caso}: não encontrado")
             return False
-        Log.log().info(f"Caso {caso.nome}: preparando")
         casos_anteriores = [
             c for c in uow.casos.list_by_estudo(caso.id_estudo) if c < caso
         ]
-        preparador = PreparadorCaso.factory(caso, casos_anteriores)
-        sucesso_prepara = await preparador.prepara()
-        sucesso_encadeia = True
-        sucesso_regras = True
+        caminho = join(Configuracoes().caminho_base_estudo, caso.caminho)
+        preparador = PreparadorCaso.factory(caso, casos_anteriores, etapa_uow)
         # PREMISSA: só encadeia se tiver decomps anteriores.
         decomps_anteriores = [
             c for c in casos_anteriores if c.programa == Programa.DECOMP
         ]
-        if len(decomps_anteriores) > 0:
+        variaveis = ProgramRules.program_chaining_variables(caso.programa)
+        # PREMISSA: só aplica regras de reservatórios
+        # se tiver decomps anteriores, e somente as regras cujo
+        # período de vigência compreende o caso sendo preparado
+        janela = command.regras_reservatorios.janela(caso.ano, caso.mes)
+        fontes_regras = ProgramRules.chaining_sources(
+            decomps_anteriores, "VARM"
+        )
+        contexto_encadeamento = [
+            str(variaveis),
+            Configuracoes().janela_encadeamento,
+        ] + identifica_casos(casos_anteriores)
+        contexto_regras = [janela.identificador] + identifica_casos(
+            fontes_regras
+        )
+
+        async def encadeia() -> bool:
             Log.log().info(f"Caso {caso.nome}: encadeando")
-            variaveis = ProgramRules.program_chaining_variables(caso.programa)
-            if variaveis is not None:
-                for v in variaveis:
-                    if len(v) == 0:
-                        continue
-                    chain_reponse = await EncadeadorAPIRepository.encadeia(
-                        casos_anteriores, caso, v
-                    )
-                    if isinstance(chain_reponse, HTTPResponse):
-                        Log.log().warning(
-                            "Erro no encadeamento:"
-                            + f" [{chain_reponse.code}] {chain_reponse.detail}"
-                        )
-                        sucesso_encadeia = False
-                    else:
-                        Log.log().info(f"Encadeamento de {v}:")
-                        for chain in chain_reponse:
-                            Log.log().info(str(chain))
-            # PREMISSA: filtra as regras cujo período de vigência
-            # compreende o caso sendo preparado
-            data_caso = datetime(caso.ano, caso.mes, 1)
-            regras_vigentes = []
-            for r in command.regras_reservatorios:
-                vigente = True
-                inicio = r.inicio_vigencia
-                fim = r.fim_vigencia
-                if inicio:
-                    if data_caso < inicio:
-                        vigente = False
-                elif fim:
-                    if data_caso > fim:
-                        vigente = False
-                if vigente:
-                    regras_vigentes.append(r)
-
-            # PREMISSA: só aplica regras de reservatórios
-            # se tiver decomps anteriores
-            regras_convertidas = [
-                ReservoirRule.from_regra(r) for r in regras_vigentes
-            ]
-            if len(regras_convertidas) > 0:
-                Log.log().info(
-                    f"Caso {caso.nome}: aplicando regras de reservatórios"
-                )
+            executor = ExecutorEncadeamento(caso, casos_anteriores)
+            with fase("encadeamento"):
+                return await executor.encadeia(variaveis)
+
+        async def aplica_regras() -> bool:
+            Log.log().info(
+                f"Caso {caso.nome}: aplicando regras de reservatórios"
+            )
+            with fase("regras_reservatorios"):
                 rules_reponse = (
                     await RegrasReservatoriosAPIRepository.aplica_regras(
-                        decomps_anteriores, caso, regras_convertidas
+                        fontes_regras,
+                        caso,
+                        janela,
                     )
                 )
-                if isinstance(rules_reponse, HTTPResponse):
-                    Log.log().warning(
-                        "Erro da aplicação de regras de reservatórios:"
-                        + f" [{rules_reponse.code}] {rules_reponse.detail}"
+            if isinstance(rules_reponse, HTTPResponse):
+                Log.log().warning(
+                    "Erro da aplicação de regras de reservatórios:"
+                    + f" [{rules_reponse.code}] {rules_reponse.detail}"
+                )
+                return False
+            Log.log().info("Regras de reservatórios aplicadas:")
+            for rule in rules_reponse:
+                Log.log().info(str(rule))
+            return True
+
+        async def prepara_caso() -> bool:
+            Log.log().info(f"Caso {caso.nome}: preparando")
+            # As etapas alteram os mesmos arquivos do deck, e cada uma
+            # recebe como entrada a da anterior, combinada ao contexto
+            cadeia = commands.ExecutaEtapaPreparacao(
+                caso.id, ETAPA_CADEIA, [], [], diretorio=caminho
+            )
+            base = etapa_handlers.base_cadeia(cadeia, etapa_uow)
+            preparador.cadeia = base
+            with fase("adequacao_decks"):
+                sucesso_prepara = await preparador.prepara()
+            entrada = preparador.cadeia
+            sucesso_encadeia = True
+            sucesso_regras = True
+            if len(decomps_anteriores) > 0:
+                if variaveis is not None:
+                    comando = commands.ExecutaEtapaPreparacao(
+                        caso.id,
+                        "encadeamento",
+                        [],
+                        contexto_encadeamento,
+                        diretorio=caminho,
+                        cadeia=entrada,
                     )
-                    sucesso_regras = False
-                else:
-                    Log.log().info("Regras de reservatórios aplicadas:")
-                    for rule in rules_reponse:
-                        Log.log().info(str(rule))
+                    sucesso_encadeia = await etapa_handlers.executa(
+                        comando, etapa_uow, encadeia
+                    )
+                    entrada = etapa_handlers.entrada(comando)
+                if len(janela) > 0:
+                    comando = commands.ExecutaEtapaPreparacao(
+                        caso.id,
+                        "regras_reservatorios",
+                        [],
+                        contexto_regras,
+                        diretorio=caminho,
+                        cadeia=entrada,
+                    )
+                    sucesso_regras = await etapa_handlers.executa(
+                        comando, etapa_uow, aplica_regras
+                    )
+            sucesso = all([sucesso_prepara, sucesso_encadeia, sucesso_regras])
+            if sucesso:
+                etapa_handlers.registra(cadeia, etapa_uow, base)
+            return sucesso
 
-        return all([sucesso_prepara, sucesso_encadeia, sucesso_regras])
+        # A preparação completa não é repetida se o deck não foi
+        # alterado desde então e nenhuma das entradas mudou
+        return await etapa_handlers.executa(
+            commands.ExecutaEtapaPreparacao(
+                caso.id,
+                ETAPA_PREPARACAO,
+                [],
+                preparador.contexto + contexto_encadeamento + contexto_regras,
+                diretorio=caminho,
+            ),
+            etapa_uow,
+            prepara_caso,
+        )
 
 
+@perfilado("handlers.caso.submete")
 async def submete(
     command: commands.SubmeteCaso,
     caso_uow: AbstractCasoUnitOfWork,
     rodada_uow: AbstractRodadaUnitOfWork,
-) -> Optional[int]:
+) -> Union[int, TransicaoCaso, None]:
     with caso_uow:
         # Extrai o caso
         caso = caso_uow.casos.read(command.id_caso)
@@ -192,6 +288,16 @@ async def submete(
                 f"Num. processadores não encontrado para {caso.programa.value}"
             )
             return None
+        if Configuracoes().autoajuste_processadores:
+            ajustados = rodada_handlers.ajusta_processadores(
+                commands.AjustaProcessadores(
+                    caso.programa.value, versao, processadores
+                ),
+                rodada_uow,
+            )
+            if ajustados is None:
+                return TransicaoCaso.PROCESSADORES_INDISPONIVEIS
+            processadores = ajustados
         cmd = commands.CriaRodada(
             caso.programa.value,
             versao,
@@ -200,7 +306,8 @@ async def submete(
             command.id_caso,
         )
         Log.log().info(f"Caso {caso.nome}: submetendo")
-        rodada = await rodada_handlers.submete(cmd, rodada_uow)
+        with fase("submissao", command.id_caso):
+            rodada = await rodada_handlers.submete(cmd, rodada_uow)
         if rodada is not None:
             caso.estado = EstadoCaso.EXECUTANDO
             caso_uow.casos.update(caso)
@@ -209,10 +316,12 @@ async def submete(
         return None
 
 
+@perfilado("handlers.caso.monitora")
 async def monitora(
     command: commands.MonitoraCaso,
     caso_uow: AbstractCasoUnitOfWork,
     rodada_uow: AbstractRodadaUnitOfWork,
+    fase_uow: AbstractFaseUnitOfWork,
 ) -> Optional[TransicaoCaso]:
     cmd = commands.MonitoraRodada(command.id_rodada)
     with caso_uow:
@@ -223,7 +332,8 @@ async def monitora(
             )
             return None
         nome = caso.nome
-    rodada = await rodada_handlers.monitora(cmd, rodada_uow)
+    with atribui_caso(command.id_caso), atribui_rodada(command.id_rodada):
+        rodada = await rodada_handlers.monitora(cmd, rodada_uow)
     if rodada is None:
         Log.log().error(
             f"Monitorando caso {nome}:"
@@ -232,6 +342,22 @@ async def monitora(
         return None
     else:
         Log.log().info(f"Monitorando caso {nome}: {rodada.estado.value}")
+        if Configuracoes().maximo_ressubmissoes > 0:
+            if rodada.estado == RunStatus.COMMUNICATION_ERROR:
+                return TransicaoCaso.RESSUBMISSAO_SOLICITADA
+            if rodada_parada(rodada, fase_uow):
+                Log.log().warning(
+                    f"Monitorando caso {nome}: rodada parada em"
+                    + f" {rodada.estado.value}"
+                )
+                return TransicaoCaso.RESSUBMISSAO_SOLICITADA
+        if (
+            rodada.estado == RunStatus.SUCCESS
+            and Configuracoes().autoajuste_processadores
+        ):
+            rodada_handlers.compara_tempo_previsto(
+                commands.ComparaTempoPrevisto(command.id_rodada), rodada_uow
+            )
         MAPA_ESTADO_TRANSICAO: Dict[RunStatus, TransicaoCaso] = {
             RunStatus.SUCCESS: TransicaoCaso.CONCLUIDO,
             RunStatus.INFEASIBLE: TransicaoCaso.INVIAVEL,
@@ -242,6 +368,26 @@ async def monitora(
         return MAPA_ESTADO_TRANSICAO.get(rodada.estado)
 
 
+def rodada_parada(rodada: Rodada, fase_uow: AbstractFaseUnitOfWork) -> bool:
+    """
+    Verifica se a rodada está há mais tempo no estado do que o
+    limite, que é o maior entre o tempo mínimo configurado e um
+    múltiplo da maior permanência já registrada no mesmo estado.
+    """
+    minimo = Configuracoes().tempo_limite_estado
+    if minimo == 0 or rodada.estado not in rodada_handlers.ESTADOS_VIGIADOS:
+        return False
+    tempo = rodada_handlers.tempo_no_estado(rodada)
+    if tempo <= minimo:
+        return False
+    maximo = fase_handlers.duracao_maxima(
+        rodada_handlers.fase_estado(rodada.estado), fase_uow
+    )
+    limite = max(minimo, FATOR_LIMITE_ESTADO * (maximo or 0.0))
+    return tempo > limite
+
+
+@perfilado("handlers.caso.atualiza")
 def atualiza(
     command: commands.AtualizaCaso, uow: AbstractCasoUnitOfWork
 ) -> bool:
@@ -255,6 +401,21 @@ def atualiza(
         return caso is not None
 
 
+@perfilado("handlers.caso.conta_ressubmissoes")
+def conta_ressubmissoes(
+    command: commands.ContaRessubmissoes, uow: AbstractCasoUnitOfWork
+) -> int:
+    """
+    Número de rodadas interrompidas do caso, cada uma seguida de uma
+    ressubmissão. É obtido das rodadas registradas, para que o limite
+    de ressubmissões se mantenha quando o estudo é retomado.
+    """
+    with uow:
+        caso = uow.casos.read(command.id_caso)
+        return caso.numero_ressubmissoes if caso is not None else 0
+
+
+@perfilado("handlers.caso.flexibiliza")
 async def flexibiliza(
     command: commands.FlexibilizaCaso, uow: AbstractCasoUnitOfWork
 ) -> Optional[TransicaoCaso]:
@@ -263,7 +424,8 @@ async def flexibiliza(
         if caso is not None:
             if caso.numero_flexibilizacoes < command.max_flex:
                 Log.log().info(f"Caso {caso.nome}: flexibilizando")
-                res = await FlexibilizadorAPIRepository.flexibiliza(caso)
+                with fase("flexibilizacao", command.id_caso):
+                    res = await FlexibilizadorAPIRepository.flexibiliza(caso)
                 if isinstance(res, HTTPResponse):
                     Log.log().error(
                         "Erro na flexibilização: "
@@ -280,10 +442,19 @@ async def flexibiliza(
         return None
 
 
+@perfilado("handlers.caso.sintetiza_casos_rodadas")
 async def sintetiza_casos_rodadas(
-    caso_uow: AbstractCasoUnitOfWork, rodada_uow: AbstractRodadaUnitOfWork
-) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    Log.log().info("Sintetizando casos e rodadas")
+    caso_uow: AbstractCasoUnitOfWork,
+    rodada_uow: AbstractRodadaUnitOfWork,
+    fase_uow: AbstractFaseUnitOfWork,
+    ultima_fase: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Sintetiza os casos, com os tempos totais de cada fase, e as
+    rodadas. Das fases, retorna somente as registradas após a
+    fase de id informado.
+    """
+    Log.log().info("Sintetizando casos, rodadas e fases")
     with caso_uow:
         casos = caso_uow.casos.list()
         df_casos = pd.DataFrame(
@@ -303,9 +474,15 @@ async def sintetiza_casos_rodadas(
             }
         )
     df_rodadas = await rodada_handlers.sintetiza_rodadas(rodada_uow)
-    return df_casos, df_rodadas
+    df_fases = await fase_handlers.sintetiza_fases(fase_uow, ultima_fase)
+    df_tempos = fase_handlers.sintetiza_tempos_casos(fase_uow)
+    df_casos = df_casos.merge(
+        df_tempos, how="left", left_on="id", right_index=True
+    )
+    return df_casos, df_rodadas, df_fases
 
 
+@perfilado("handlers.caso.corrige_erro_convergencia")
 async def corrige_erro_convergencia(
     command: commands.CorrigeErroConvergenciaCaso, uow: AbstractCasoUnitOfWork
 ) -> bool:
@@ -318,9 +495,11 @@ async def corrige_erro_convergencia(
             return False
         else:
             preparador = PreparadorCaso.factory(caso, [])
-            return await preparador.corrige_erro_convergencia()
+            with fase("correcao_convergencia", command.id_caso):
+                return await preparador.corrige_erro_convergencia()
 
 
+@perfilado("handlers.caso.flexibiliza_criterio_convergencia")
 async def flexibiliza_criterio_convergencia(
     command: commands.FlexibilizaCriterioConvergenciaCaso,
     uow: AbstractCasoUnitOfWork,
@@ -332,4 +511,5 @@ async def flexibiliza_criterio_convergencia(
             return False
         else:
             preparador = PreparadorCaso.factory(caso, [])
-            return await preparador.flexibiliza_criterio_convergencia()
+            with fase("flexibilizacao_convergencia", command.id_caso):
+                return await preparador.flexibiliza_criterio_convergencia()
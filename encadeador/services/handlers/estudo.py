@@ -1,20 +1,26 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd  # type: ignore
+from encadeador.modelos.estadocaso import EstadoCaso
 from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.runstatus import RunStatus
+from encadeador.domain.escalonamento import GrafoCasos
 from encadeador.modelos.estudo import Estudo
 from encadeador.controladores.monitorcaso import MonitorCaso
 from encadeador.controladores.sintetizador import Sintetizador
 from encadeador.services.unitofwork.caso import AbstractCasoUnitOfWork
 from encadeador.services.unitofwork.estudo import AbstractEstudoUnitOfWork
+from encadeador.services.unitofwork.rodada import AbstractRodadaUnitOfWork
 import encadeador.services.handlers.caso as handlers_caso
 import encadeador.domain.commands as commands
 from encadeador.utils.log import Log
+from encadeador.internal.perfilador import perfilado
 
 # TODO - no futuro, quando toda a aplicação for
 # orientada a eventos, o logging deve ser praticamente
 # restrito aos handlers?
 
 
+@perfilado("handlers.estudo.cria")
 def cria(
     command: commands.CriaEstudo, uow: AbstractEstudoUnitOfWork
 ) -> Optional[Estudo]:
@@ -31,6 +37,7 @@ def cria(
         return estudo
 
 
+@perfilado("handlers.estudo.inicializa")
 def inicializa(
     command: commands.InicializaEstudo,
     estudo_uow: AbstractEstudoUnitOfWork,
@@ -50,6 +57,40 @@ def inicializa(
         return estudo
 
 
+@perfilado("handlers.estudo.escalona")
+def escalona(
+    command: commands.EscalonaEstudo,
+    estudo_uow: AbstractEstudoUnitOfWork,
+    rodada_uow: AbstractRodadaUnitOfWork,
+) -> Optional[List[Tuple[int, str]]]:
+    """
+    Escolhe os casos a serem iniciados, entre os prontos, até o
+    limite de casos em execução. A duração esperada de cada caso,
+    usada para encontrar o caminho crítico, é a média das rodadas
+    concluídas do mesmo programa.
+    """
+    with rodada_uow:
+        tempos: Dict[str, List[float]] = {}
+        for r in rodada_uow.rodadas.list():
+            if r.estado == RunStatus.SUCCESS:
+                tempos.setdefault(r.nome_programa, []).append(r.tempo_execucao)
+    duracoes = {p: sum(t) / len(t) for p, t in tempos.items()}
+    with estudo_uow:
+        estudo = estudo_uow.estudos.read(command.id_estudo)
+        if estudo is None:
+            Log.log().error("Erro ao acessar estudo")
+            return None
+        grafo = GrafoCasos(estudo.casos, duracoes)
+        concluidos = set(
+            c.id for c in estudo.casos if c.estado == EstadoCaso.CONCLUIDO
+        )
+        nomes = {c.id: c.nome for c in estudo.casos}
+    vagas = command.limite - len(command.em_execucao)
+    prontos = grafo.prontos(concluidos, set(command.em_execucao))
+    return [(i, nomes[i]) for i in prontos[: max(vagas, 0)]]
+
+
+@perfilado("handlers.estudo.monitora")
 async def monitora(
     command: commands.MonitoraEstudo,
     monitor: MonitorCaso,
@@ -57,6 +98,7 @@ async def monitora(
     await monitor.monitora()
 
 
+@perfilado("handlers.estudo.atualiza")
 def atualiza(
     command: commands.AtualizaEstudo, uow: AbstractEstudoUnitOfWork
 ) -> bool:
@@ -68,6 +110,7 @@ def atualiza(
         return estudo is not None
 
 
+@perfilado("handlers.estudo.sintetiza_estudo")
 async def sintetiza_estudo(uow: AbstractEstudoUnitOfWork) -> pd.DataFrame:
     with uow:
         estudos = uow.estudos.list()
@@ -81,6 +124,7 @@ async def sintetiza_estudo(uow: AbstractEstudoUnitOfWork) -> pd.DataFrame:
         )
 
 
+@perfilado("handlers.estudo.sintetiza_resultados")
 async def sintetiza_resultados(
     command: commands.SintetizaEstudo, uow: AbstractEstudoUnitOfWork
 ):
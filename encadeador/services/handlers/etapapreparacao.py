@@ -0,0 +1,104 @@
+from datetime import datetime
+from os import scandir
+from typing import Awaitable, Callable
+from encadeador.modelos.etapapreparacao import EtapaPreparacao
+from encadeador.services.unitofwork.etapapreparacao import (
+    AbstractEtapaPreparacaoUnitOfWork,
+)
+from encadeador.utils.assinatura import assinatura_arquivos, combina
+from encadeador.utils.log import Log
+import encadeador.domain.commands as commands
+from encadeador.internal.perfilador import perfilado
+
+
+def assinatura(command: commands.ExecutaEtapaPreparacao) -> str:
+    """
+    Assinatura dos arquivos afetados pela etapa, no estado atual,
+    combinada com o contexto em que a etapa é executada.
+    """
+    arquivos = list(command.arquivos)
+    if command.diretorio is not None:
+        arquivos += [e.path for e in scandir(command.diretorio) if e.is_file()]
+    return combina(
+        assinatura_arquivos(arquivos, command.conteudo), *command.contexto
+    )
+
+
+def entrada(command: commands.ExecutaEtapaPreparacao) -> str:
+    """
+    Assinatura de entrada da etapa. Em uma cadeia de etapas que
+    alteram os mesmos arquivos, combina a entrada da etapa anterior
+    com o contexto, sem depender dos arquivos, que também são
+    alterados pelas etapas seguintes.
+    """
+    if command.cadeia is not None:
+        return combina(command.cadeia, *command.contexto)
+    return assinatura(command)
+
+
+@perfilado("handlers.etapapreparacao.executa")
+async def executa(
+    command: commands.ExecutaEtapaPreparacao,
+    uow: AbstractEtapaPreparacaoUnitOfWork,
+    etapa: Callable[[], Awaitable[bool]],
+) -> bool:
+    """
+    Executa uma etapa da preparação de um caso, registrando as
+    assinaturas de entrada e de saída. A etapa não é executada se
+    os arquivos estão no estado produzido pela sua última execução,
+    com o mesmo contexto. Em uma cadeia, não é executada se a
+    entrada é a mesma da última execução.
+    """
+    atual = entrada(command)
+    with uow:
+        ultima = uow.etapas.read_last_by_caso(command.id_caso, command.nome)
+        if ultima is None:
+            executada = False
+        elif command.cadeia is not None:
+            executada = ultima.assinatura_entrada == atual
+        else:
+            executada = ultima.assinatura_saida == atual
+    if executada:
+        Log.log().info(f"Etapa {command.nome}: inalterada")
+        return True
+    sucesso = await etapa()
+    if sucesso:
+        registra(command, uow, atual)
+    return sucesso
+
+
+def registra(
+    command: commands.ExecutaEtapaPreparacao,
+    uow: AbstractEtapaPreparacaoUnitOfWork,
+    entrada: str,
+):
+    with uow:
+        uow.etapas.create(
+            EtapaPreparacao(
+                command.nome,
+                command.id_caso,
+                entrada,
+                assinatura(command),
+                datetime.now(),
+            )
+        )
+        uow.commit()
+
+
+def base_cadeia(
+    command: commands.ExecutaEtapaPreparacao,
+    uow: AbstractEtapaPreparacaoUnitOfWork,
+) -> str:
+    """
+    Entrada da primeira etapa de uma cadeia. Se os arquivos estão
+    no estado deixado pela última execução completa da cadeia,
+    registrada com o nome do comando, é a mesma daquela execução,
+    e somente as etapas com o contexto alterado, e as seguintes,
+    são executadas novamente. Senão, é a assinatura dos arquivos.
+    """
+    atual = assinatura(command)
+    with uow:
+        ultima = uow.etapas.read_last_by_caso(command.id_caso, command.nome)
+        if ultima is not None and ultima.assinatura_saida == atual:
+            return ultima.assinatura_entrada
+    return atual
@@ -0,0 +1,70 @@
+from typing import Optional
+import pandas as pd  # type: ignore
+from encadeador.services.unitofwork.fase import AbstractFaseUnitOfWork
+import encadeador.utils.fases as fases
+from encadeador.internal.perfilador import perfilado
+
+
+@perfilado("handlers.fase.registra")
+def registra(uow: AbstractFaseUnitOfWork) -> int:
+    """
+    Persiste as fases medidas desde o último registro.
+    """
+    pendentes = fases.descarrega()
+    if len(pendentes) == 0:
+        return 0
+    with uow:
+        for f in pendentes:
+            uow.fases.create(f)
+        uow.commit()
+    return len(pendentes)
+
+
+@perfilado("handlers.fase.duracao_maxima")
+def duracao_maxima(nome: str, uow: AbstractFaseUnitOfWork) -> Optional[float]:
+    """
+    Maior duração já registrada das fases com o nome informado.
+    """
+    with uow:
+        return uow.fases.max_duracao(nome)
+
+
+@perfilado("handlers.fase.sintetiza_fases")
+async def sintetiza_fases(
+    uow: AbstractFaseUnitOfWork, ultima: int = 0
+) -> pd.DataFrame:
+    """
+    Fases registradas após a fase de id informado, que são as que
+    ainda não foram sintetizadas.
+    """
+    with uow:
+        lista = uow.fases.list_after(ultima)
+        return pd.DataFrame(
+            data={
+                "id": [f.id for f in lista],
+                "nome": [f.nome for f in lista],
+                "id_caso": [f.id_caso for f in lista],
+                "instante_inicio": [f.instante_inicio for f in lista],
+                "instante_fim": [f.instante_fim for f in lista],
+                "duracao": [f.duracao for f in lista],
+                "sucesso": [f.sucesso for f in lista],
+            }
+        )
+
+
+@perfilado("handlers.fase.sintetiza_tempos_casos")
+def sintetiza_tempos_casos(uow: AbstractFaseUnitOfWork) -> pd.DataFrame:
+    """
+    Tempo total de cada fase por caso, em colunas tempo_<fase>,
+    indexadas pelo id do caso.
+    """
+    with uow:
+        totais = uow.fases.total_by_caso()
+    df = pd.DataFrame(totais, columns=["id_caso", "nome", "duracao"])
+    df_tempos = (
+        df.pivot(index="id_caso", columns="nome", values="duracao")
+        .add_prefix("tempo_")
+        .rename_axis(columns=None)
+    )
+    df_tempos.index = df_tempos.index.astype(int)
+    return df_tempos
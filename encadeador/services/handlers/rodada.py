@@ -1,14 +1,73 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 import pandas as pd  # type: ignore
 from encadeador.adapters.repository.apis import ModelAPIRepository
 from encadeador.services.unitofwork.rodada import AbstractRodadaUnitOfWork
+from encadeador.domain.autoajuste import CurvaEscalabilidade, explora
+from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.modelos.run import Run
 from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
 from encadeador.internal.httpresponse import HTTPResponse
 from encadeador.utils.log import Log
+import encadeador.utils.fases as fases
 import encadeador.domain.commands as commands
+from encadeador.internal.perfilador import perfilado
 
+# Estados em que a rodada aguarda o início da execução
+ESTADOS_FILA = [RunStatus.SUBMITTED, RunStatus.STARTING]
+# Estados em que a rodada pode ficar parada sem que o serviço de
+# modelos informe um erro
+ESTADOS_VIGIADOS = [
+    RunStatus.SUBMITTED,
+    RunStatus.STARTING,
+    RunStatus.STOPPING,
+]
 
+
+def fase_estado(estado: RunStatus) -> str:
+    """
+    Nome da fase que registra a permanência de uma rodada no estado.
+    """
+    return f"estado_{estado.value}"
+
+
+def tempo_no_estado(rodada: Rodada) -> float:
+    """
+    Tempo, em segundos, desde que a rodada foi observada no seu
+    estado atual.
+    """
+    entrada = rodada.instante_entrada_estado
+    if entrada is None:
+        return 0.0
+    return (datetime.now(tz=entrada.tzinfo) - entrada).total_seconds()
+
+
+def _acompanha_estado(rodada: Rodada, atual: Rodada):
+    """
+    Atualiza o instante de entrada da rodada no estado atual e
+    registra a duração dos estados vigiados que foram deixados. O
+    instante é persistido com a rodada, de modo que o tempo no
+    estado se mantém quando o estudo é retomado.
+    """
+    inicio = rodada.instante_inicio_execucao
+    agora = datetime.now(tz=inicio.tzinfo)
+    entrada = rodada.instante_entrada_estado
+    if entrada is None and rodada.estado == RunStatus.SUBMITTED:
+        entrada = inicio
+    if atual.estado == rodada.estado:
+        atual.instante_entrada_estado = (
+            entrada if entrada is not None else agora
+        )
+        return
+    if entrada is not None and rodada.estado in ESTADOS_VIGIADOS:
+        fases.registra(
+            fase_estado(rodada.estado), entrada, agora, id_caso=rodada.id_caso
+        )
+    atual.instante_entrada_estado = agora if atual.ativa else None
+
+
+@perfilado("handlers.rodada.submete")
 async def submete(
     command: commands.CriaRodada, uow: AbstractRodadaUnitOfWork
 ) -> Optional[int]:
@@ -42,11 +101,13 @@ async def submete(
             return None
         Log.log().info(f"Criada rodada {str(createdRun)}")
         rodada = Rodada.from_run(createdRun, command.id_caso)
+        rodada.instante_entrada_estado = rodada.instante_inicio_execucao
         uow.rodadas.create(rodada)
         uow.commit()
         return createdRun.runId
 
 
+@perfilado("handlers.rodada.monitora")
 async def monitora(
     command: commands.MonitoraRodada,
     uow: AbstractRodadaUnitOfWork,
@@ -62,6 +123,20 @@ async def monitora(
         rodada = uow.rodadas.read(command.id)
         if rodada is not None:
             rodada_from_api = Rodada.from_run(res, rodada.id_caso)
+            if (
+                rodada.estado in ESTADOS_FILA
+                and rodada_from_api.estado not in ESTADOS_FILA
+            ):
+                # A espera é medida da submissão até o primeiro
+                # monitoramento em que a rodada deixa a fila.
+                inicio = rodada.instante_inicio_execucao
+                fases.registra(
+                    "fila",
+                    inicio,
+                    datetime.now(tz=inicio.tzinfo),
+                    id_caso=rodada.id_caso,
+                )
+            _acompanha_estado(rodada, rodada_from_api)
             uow.rodadas.update(rodada_from_api)
             uow.commit()
             return rodada_from_api
@@ -72,6 +147,204 @@ async def monitora(
             return None
 
 
+@perfilado("handlers.rodada.cancela")
+async def cancela(
+    command: commands.CancelaRodada, uow: AbstractRodadaUnitOfWork
+) -> bool:
+    """
+    Cancela uma rodada no serviço de modelos, se ainda ativa. O
+    registro da rodada é mantido, em um estado final, como histórico
+    da tentativa.
+    """
+    with uow:
+        rodada = uow.rodadas.read(command.id)
+        if rodada is None:
+            Log.log().warning(
+                f"Erro no cancelamento: rodada {command.id} não encontrada"
+            )
+            return False
+        if rodada.ativa:
+            res = await ModelAPIRepository.delete_run(command.id)
+            if res.code not in [202, 404]:
+                Log.log().warning(
+                    f"Erro no cancelamento [rodada {command.id}]:"
+                    + f" [{res.code}] {res.detail}"
+                )
+                return False
+            inicio = rodada.instante_inicio_execucao
+            rodada.estado = RunStatus.UNKNOWN
+            rodada.instante_fim_execucao = datetime.now(tz=inicio.tzinfo)
+            uow.rodadas.update(rodada)
+            uow.commit()
+        Log.log().info(f"Rodada {command.id} cancelada")
+        return True
+
+
+@perfilado("handlers.rodada.reconcilia")
+async def reconcilia(
+    command: commands.ReconciliaRodadas, uow: AbstractRodadaUnitOfWork
+) -> Optional[int]:
+    """
+    Atualiza as rodadas ativas do caso com o estado informado pelo
+    serviço de modelos, ao retomar o estudo. As rodadas criadas no
+    serviço e que não chegaram a ser registradas também são
+    incorporadas. Retorna a mais recente das rodadas reconciliadas,
+    que continuam em execução ou terminaram enquanto o encadeador
+    estava parado.
+    """
+    with uow:
+        rodadas = uow.rodadas.list_by_caso(command.id_caso)
+        ativas = [r for r in rodadas if r.ativa]
+        reconciliadas: List[Rodada] = []
+        runs = await ModelAPIRepository.list_runs()
+        if isinstance(runs, HTTPResponse):
+            Log.log().warning(
+                "Erro na listagem das rodadas:"
+                + f" [{runs.code}] {runs.detail}"
+            )
+        else:
+            ids = [r.id for r in rodadas]
+            for run in runs:
+                if (
+                    run.jobWorkingDirectory == command.caminho
+                    and run.active
+                    and run.runId not in ids
+                ):
+                    Log.log().info(f"Incorporando rodada {run.runId}")
+                    rodada = Rodada.from_run(run, command.id_caso)
+                    uow.rodadas.create(rodada)
+                    reconciliadas.append(rodada)
+        for r in ativas:
+            res = await ModelAPIRepository.read_run(r.id)
+            if isinstance(res, HTTPResponse):
+                if res.code == 404:
+                    # A rodada não existe mais no serviço
+                    Log.log().warning(f"Descartando rodada {r.id}")
+                    uow.rodadas.delete(r.id)
+                    continue
+                # Mantém o estado registrado, que é atualizado
+                # no monitoramento
+                Log.log().warning(
+                    f"Erro na reconciliação [rodada {r.id}]:"
+                    + f" [{res.code}] {res.detail}"
+                )
+                reconciliadas.append(r)
+                continue
+            rodada = Rodada.from_run(res, r.id_caso)
+            Log.log().info(
+                f"Rodada {r.id}: {r.estado.value} -> {rodada.estado.value}"
+            )
+            _acompanha_estado(r, rodada)
+            uow.rodadas.update(rodada)
+            reconciliadas.append(rodada)
+        id_rodada = max(reconciliadas).id if len(reconciliadas) > 0 else None
+        uow.commit()
+        return id_rodada
+
+
+@perfilado("handlers.rodada.ajusta_processadores")
+def ajusta_processadores(
+    command: commands.AjustaProcessadores, uow: AbstractRodadaUnitOfWork
+) -> Optional[int]:
+    """
+    Escolhe o número de processadores de uma nova rodada a partir
+    do histórico de tempos de execução do programa e versão, sem
+    ultrapassar os processadores ainda disponíveis no orçamento.
+    Sem histórico suficiente, experimenta outras quantidades além
+    da padrão. Retorna None se o orçamento está esgotado e a
+    submissão deve aguardar o fim de outras rodadas.
+    """
+    with uow:
+        rodadas = uow.rodadas.list()
+        historico = [
+            r
+            for r in rodadas
+            if r.nome_programa == command.programa
+            and r.versao_programa == command.versao
+        ]
+        ocupados = sum(r.numero_processadores for r in rodadas if r.ativa)
+        orcamento = Configuracoes().orcamento_processadores
+        limite = max(orcamento - ocupados, 0) if orcamento > 0 else None
+        curva = CurvaEscalabilidade.ajusta(historico)
+        explorado = (
+            explora(historico, command.padrao, limite)
+            if curva is None
+            else None
+        )
+    prefixo = f"Autoajuste {command.programa} {command.versao}"
+    if curva is None:
+        processadores = explorado
+        if processadores is not None:
+            Log.log().info(
+                f"{prefixo}: histórico insuficiente,"
+                + f" usando {processadores} processadores"
+            )
+    else:
+        escolha = curva.escolhe(command.padrao, limite)
+        processadores = escolha[0] if escolha is not None else None
+        if escolha is not None:
+            Log.log().info(
+                f"{prefixo}: {escolha[0]} processadores,"
+                + f" tempo previsto {escolha[1]:.0f} s"
+            )
+    if processadores is None:
+        if ocupados > 0:
+            Log.log().info(
+                f"{prefixo}: orçamento esgotado, aguardando processadores"
+            )
+            return None
+        # Nenhuma rodada em execução vai liberar processadores
+        processadores = (
+            curva.passo(command.padrao)
+            if curva is not None
+            else command.padrao
+        )
+        Log.log().warning(
+            f"{prefixo}: orçamento de {orcamento} processadores"
+            + f" insuficiente, usando {processadores}"
+        )
+    return processadores
+
+
+@perfilado("handlers.rodada.compara_tempo_previsto")
+def compara_tempo_previsto(
+    command: commands.ComparaTempoPrevisto, uow: AbstractRodadaUnitOfWork
+) -> Optional[float]:
+    """
+    Compara o tempo de execução de uma rodada concluída com o
+    previsto pela curva ajustada às demais rodadas do programa e
+    versão, para validação do autoajuste. Retorna o tempo previsto,
+    se houver histórico suficiente.
+    """
+    with uow:
+        rodada = uow.rodadas.read(command.id)
+        if rodada is None:
+            return None
+        historico = [
+            r
+            for r in uow.rodadas.list()
+            if r.nome_programa == rodada.nome_programa
+            and r.versao_programa == rodada.versao_programa
+            and r.id != rodada.id
+        ]
+        prefixo = (
+            f"Autoajuste {rodada.nome_programa}" + f" {rodada.versao_programa}"
+        )
+        processadores = rodada.numero_processadores
+        real = rodada.tempo_execucao
+        curva = CurvaEscalabilidade.ajusta(historico)
+    if curva is None:
+        return None
+    previsto = curva.tempo(processadores)
+    Log.log().info(
+        f"{prefixo}: rodada {command.id} com {processadores}"
+        + f" processadores, tempo previsto {previsto:.0f} s,"
+        + f" real {real:.0f} s"
+    )
+    return previsto
+
+
+@perfilado("handlers.rodada.deleta")
 async def deleta(
     command: commands.DeletaRodada, uow: AbstractRodadaUnitOfWork
 ) -> bool:
@@ -90,6 +363,7 @@ async def deleta(
         return True
 
 
+@perfilado("handlers.rodada.sintetiza_rodadas")
 async def sintetiza_rodadas(uow: AbstractRodadaUnitOfWork) -> pd.DataFrame:
     with uow:
         rodadas = uow.rodadas.list()
@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+from sqlalchemy.orm import Session  # type: ignore
+from typing import Dict, Type
+from config import default_session_factory
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.adapters.repository.fase import (
+    AbstractFaseRepository,
+    JSONFaseRepository,
+    SQLFaseRepository,
+)
+
+
+class AbstractFaseUnitOfWork(ABC):
+    def __enter__(self) -> "AbstractFaseUnitOfWork":
+        return self
+
+    def __exit__(self, *args):
+        self.rollback()
+
+    def commit(self):
+        self._commit()
+
+    @property
+    @abstractmethod
+    def fases(self) -> AbstractFaseRepository:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _commit(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def rollback(self):
+        raise NotImplementedError
+
+
+class JSONFaseUnitOfWork(AbstractFaseUnitOfWork):
+    def __init__(self, path: str = Configuracoes().caminho_base_estudo):
+        self._path = path
+
+    def __enter__(self) -> "AbstractFaseUnitOfWork":
+        self._fases = JSONFaseRepository(self._path)
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        super().__exit__(*args)
+
+    @property
+    def fases(self) -> AbstractFaseRepository:
+        return self._fases
+
+    def commit(self):
+        self._commit()
+
+    def _commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class SQLFaseUnitOfWork(AbstractFaseUnitOfWork):
+    def __init__(self, session_factory=default_session_factory):
+        self._session_factory = session_factory()
+
+    def __enter__(self) -> "AbstractFaseUnitOfWork":
+        self._session: Session = self._session_factory()
+        self._fases = SQLFaseRepository(self._session)
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        super().__exit__(*args)
+        self._session.close()
+
+    @property
+    def fases(self) -> AbstractFaseRepository:
+        return self._fases
+
+    def commit(self):
+        self._commit()
+
+    def _commit(self):
+        self._session.commit()
+
+    def rollback(self):
+        self._session.rollback()
+
+
+def factory(kind: str, *args, **kwargs) -> AbstractFaseUnitOfWork:
+    mappings: Dict[str, Type[AbstractFaseUnitOfWork]] = {
+        "SQL": SQLFaseUnitOfWork,
+        "JSON": JSONFaseUnitOfWork,
+    }
+    return mappings[kind](*args, **kwargs)
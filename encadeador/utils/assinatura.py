@@ -0,0 +1,75 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Tuple
+
+TAMANHO_BLOCO = 1 << 20
+MAXIMO_RESUMOS = 10000
+
+# Resumos do conteúdo de cada arquivo, identificados pelo caminho,
+# tamanho e instante de modificação, para que arquivos inalterados
+# não sejam lidos novamente.
+_resumos: Dict[Tuple[str, int, int], str] = {}
+
+
+def resumo_arquivo(caminho: str) -> str:
+    """
+    Resumo SHA-256 do conteúdo do arquivo.
+    """
+    estado = os.stat(caminho)
+    chave = (os.path.abspath(caminho), estado.st_size, estado.st_mtime_ns)
+    resumo = _resumos.get(chave)
+    if resumo is None:
+        h = hashlib.sha256()
+        with open(caminho, "rb") as arq:
+            for bloco in iter(lambda: arq.read(TAMANHO_BLOCO), b""):
+                h.update(bloco)
+        resumo = h.hexdigest()
+        if len(_resumos) >= MAXIMO_RESUMOS:
+            _resumos.clear()
+        _resumos[chave] = resumo
+    return resumo
+
+
+def assinatura_arquivos(caminhos: Iterable[str], conteudo: bool = True) -> str:
+    """
+    Assinatura de um conjunto de arquivos, que depende dos nomes e
+    do conteúdo de cada um, mas não da ordem em que são informados.
+    Arquivos inexistentes também fazem parte da assinatura. Sem o
+    conteúdo, são usados o tamanho e o instante de modificação, o
+    que é suficiente para os arquivos grandes produzidos pelos
+    modelos, que não são editados.
+    """
+    h = hashlib.sha256()
+    for caminho in sorted(set(caminhos)):
+        nome = os.path.basename(caminho)
+        if not os.path.isfile(caminho):
+            h.update(f"{nome}:-\n".encode())
+        elif conteudo:
+            h.update(f"{nome}:{resumo_arquivo(caminho)}\n".encode())
+        else:
+            estado = os.stat(caminho)
+            h.update(
+                f"{nome}:{estado.st_size}:{estado.st_mtime_ns}\n".encode()
+            )
+    return h.hexdigest()
+
+
+def assinatura_diretorio(diretorio: str) -> str:
+    """
+    Assinatura dos arquivos de um diretório, sem considerar os
+    subdiretórios.
+    """
+    return assinatura_arquivos(
+        e.path for e in os.scandir(diretorio) if e.is_file()
+    )
+
+
+def combina(*partes: str) -> str:
+    """
+    Combina assinaturas e outros valores dos quais um resultado
+    depende, como parâmetros de configuração, em uma assinatura.
+    """
+    h = hashlib.sha256()
+    for p in partes:
+        h.update(f"{len(p)}:{p}".encode())
+    return h.hexdigest()
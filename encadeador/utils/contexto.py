@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Caso e rodada em processamento no contexto atual. São herdados pelas
+# tarefas criadas a partir do contexto, de modo que as fases medidas e
+# os registros de log nas chamadas aos serviços são atribuídos ao caso
+# que as originou.
+CASO_ATUAL: ContextVar[Optional[int]] = ContextVar("caso_atual", default=None)
+RODADA_ATUAL: ContextVar[Optional[int]] = ContextVar(
+    "rodada_atual", default=None
+)
+
+
+@contextmanager
+def atribui_caso(id_caso: Optional[int]) -> Iterator[None]:
+    """
+    Atribui ao caso informado o processamento realizado no bloco.
+    """
+    token = CASO_ATUAL.set(id_caso)
+    try:
+        yield
+    finally:
+        CASO_ATUAL.reset(token)
+
+
+@contextmanager
+def atribui_rodada(id_rodada: Optional[int]) -> Iterator[None]:
+    """
+    Atribui à rodada informada o processamento realizado no bloco.
+    """
+    token = RODADA_ATUAL.set(id_rodada)
+    try:
+        yield
+    finally:
+        RODADA_ATUAL.reset(token)
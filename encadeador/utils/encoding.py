@@ -1,9 +1,10 @@
 from encadeador.utils.terminal import run_terminal_retry
-
+from encadeador.utils.fases import mede_fase
 
 TIMEOUT_DEFAULT = 10.0
 
 
+@mede_fase("conversao_codificacao")
 async def converte_codificacao(path: str, script: str):
     _, out = await run_terminal_retry([f"file -i {path}"])
     cod = out.split("charset=")[1].strip()
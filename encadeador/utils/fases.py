@@ -0,0 +1,104 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+from encadeador.modelos.fase import Fase
+from encadeador.utils.contexto import CASO_ATUAL
+
+F = TypeVar("F", bound=Callable)
+
+# Fases medidas e ainda não persistidas
+_pendentes: List[Fase] = []
+
+
+def registra(
+    nome: str,
+    instante_inicio: datetime,
+    instante_fim: datetime,
+    sucesso: bool = True,
+    id_caso: Optional[int] = None,
+):
+    """
+    Registra uma fase cujo intervalo foi obtido externamente, como
+    o tempo de espera na fila informado pelo serviço de modelos.
+    """
+    _pendentes.append(
+        Fase(
+            nome,
+            instante_inicio,
+            instante_fim,
+            (instante_fim - instante_inicio).total_seconds(),
+            sucesso,
+            id_caso if id_caso is not None else CASO_ATUAL.get(),
+        )
+    )
+
+
+@contextmanager
+def fase(nome: str, id_caso: Optional[int] = None) -> Iterator[None]:
+    """
+    Mede o tempo gasto no bloco, atribuindo a fase ao caso
+    informado ou ao caso do contexto atual. Quando o caso é
+    informado, as fases medidas dentro do bloco também são
+    atribuídas a ele.
+    """
+    token = CASO_ATUAL.set(id_caso) if id_caso is not None else None
+    instante_inicio = datetime.now()
+    inicio = time.perf_counter()
+    sucesso = False
+    try:
+        yield
+        sucesso = True
+    finally:
+        duracao = time.perf_counter() - inicio
+        _pendentes.append(
+            Fase(
+                nome,
+                instante_inicio,
+                datetime.now(),
+                duracao,
+                sucesso,
+                CASO_ATUAL.get(),
+            )
+        )
+        if token is not None:
+            CASO_ATUAL.reset(token)
+
+
+def mede_fase(nome: str) -> Callable[[F], F]:
+    """
+    Decorador que mede cada chamada da função, síncrona ou
+    assíncrona, como uma fase do caso do contexto atual.
+    """
+
+    def decorador(f):
+        if asyncio.iscoroutinefunction(f):
+
+            @wraps(f)
+            async def envoltorio_async(*args, **kwargs):
+                with fase(nome):
+                    return await f(*args, **kwargs)
+
+            return envoltorio_async
+
+        @wraps(f)
+        def envoltorio(*args, **kwargs):
+            with fase(nome):
+                return f(*args, **kwargs)
+
+        return envoltorio
+
+    return decorador
+
+
+def descarrega() -> List[Fase]:
+    """
+    Retorna as fases medidas desde a última chamada, para
+    que sejam persistidas.
+    """
+    fases = list(_pendentes)
+    _pendentes.clear()
+    return fases
@@ -0,0 +1,49 @@
+import ast
+import json
+from typing import Any, List, Optional, Type, TypeVar, Union
+from pydantic import BaseModel
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def carrega(dados: Union[bytes, str]) -> Any:
+    """
+    Decodifica um conteúdo JSON, usando o orjson quando instalado.
+    Conteúdos no formato de literais Python, como retornados por
+    alguns serviços, são aceitos como alternativa.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(dados)
+        return json.loads(dados)
+    except ValueError:
+        if isinstance(dados, bytes):
+            dados = dados.decode("utf-8")
+        return ast.literal_eval(dados)
+
+
+def serializa(obj: Any) -> bytes:
+    """
+    Serializa um objeto para JSON, usando o orjson quando instalado.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def carrega_modelos(
+    dados: Union[bytes, str], modelo: Type[T], chave: Optional[str] = None
+) -> List[T]:
+    """
+    Decodifica uma lista de objetos JSON, opcionalmente contida em
+    uma chave do objeto raiz, validando cada um no modelo.
+    """
+    objetos = carrega(dados)
+    if chave is not None:
+        objetos = objetos[chave]
+    return [modelo.parse_obj(o) for o in objetos]
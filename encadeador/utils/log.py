@@ -1,33 +1,169 @@
+import atexit
+import gzip
+import json
 import logging
 import logging.handlers
+import os
+import queue
+import shutil
+import time
+from datetime import datetime
 from os.path import join
+from typing import Optional
 
+from encadeador.utils.contexto import CASO_ATUAL, RODADA_ATUAL
 from encadeador.utils.singleton import Singleton
 
 
+class FiltroContexto(logging.Filter):
+    """
+    Anota os registros com o caso e a rodada do contexto em que
+    foram emitidos, antes de serem enviados para a fila.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.id_caso = CASO_ATUAL.get()
+        record.id_rodada = RODADA_ATUAL.get()
+        return True
+
+
+class FormatadorJSON(logging.Formatter):
+    """
+    Formata cada registro como um objeto JSON em uma linha.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "instante": datetime.fromtimestamp(record.created).isoformat(),
+            "nivel": record.levelname,
+            "mensagem": record.getMessage(),
+            "id_caso": getattr(record, "id_caso", None),
+            "id_rodada": getattr(record, "id_rodada", None),
+        }
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False)
+
+
+class ArquivoRotativo(logging.handlers.RotatingFileHandler):
+    """
+    Arquivo de log rotacionado por tamanho e, opcionalmente, por
+    tempo, com as cópias anteriores compactadas.
+    """
+
+    def __init__(
+        self,
+        arquivo: str,
+        tamanho_maximo: int,
+        backups: int,
+        intervalo_rotacao: float = 0.0,
+    ):
+        super().__init__(
+            arquivo, "a", tamanho_maximo, backups, "utf-8", delay=True
+        )
+        self.namer = lambda nome: nome + ".gz"
+        self.rotator = ArquivoRotativo.compacta
+        self._intervalo_rotacao = intervalo_rotacao
+        self._proxima_rotacao = self.__calcula_proxima_rotacao()
+
+    def __calcula_proxima_rotacao(self) -> Optional[float]:
+        if self._intervalo_rotacao <= 0:
+            return None
+        return time.time() + self._intervalo_rotacao
+
+    @staticmethod
+    def compacta(origem: str, destino: str):
+        with open(origem, "rb") as arq_origem:
+            with gzip.open(destino, "wb") as arq_destino:
+                shutil.copyfileobj(arq_origem, arq_destino)
+        os.remove(origem)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if (
+            self._proxima_rotacao is not None
+            and time.time() >= self._proxima_rotacao
+        ):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self._proxima_rotacao = self.__calcula_proxima_rotacao()
+
+
 class Log(metaclass=Singleton):
 
     ARQUIVO = "encadeia.log"
     LOGGER = None
+    LISTENER: Optional[logging.handlers.QueueListener] = None
 
     @classmethod
-    def configura_logging(cls, diretorio: str):
+    def configura_logging(
+        cls,
+        diretorio: str,
+        tamanho_maximo: int = 10 * 1024 * 1024,
+        backups: int = 5,
+        intervalo_rotacao: float = 0.0,
+        formato: str = "TEXTO",
+    ):
+        """
+        Configura o logging da aplicação. Os registros são colocados
+        em uma fila e escritos no arquivo e na saída padrão por uma
+        thread dedicada, sem bloquear o loop de eventos. Pode ser
+        chamado novamente para alterar a configuração.
+
+        :param tamanho_maximo: Tamanho, em bytes, que rotaciona o arquivo
+        :param backups: Número de cópias compactadas mantidas
+        :param intervalo_rotacao: Intervalo, em segundos, que rotaciona
+            o arquivo. O valor 0 desabilita a rotação por tempo.
+        :param formato: TEXTO ou JSON, somente para o arquivo
+        """
         root = logging.getLogger("main")
-        h = logging.handlers.RotatingFileHandler(
-            join(diretorio, cls.ARQUIVO), "a", 10000, 0, "utf-8"
-        )
+        cls.__encerra_listener()
+        for h in list(root.handlers):
+            root.removeHandler(h)
         f = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
-        h.setFormatter(f)
+        h = ArquivoRotativo(
+            join(diretorio, cls.ARQUIVO),
+            tamanho_maximo,
+            backups,
+            intervalo_rotacao,
+        )
+        h.setFormatter(FormatadorJSON() if formato == "JSON" else f)
         # Logger para STDOUT
         std_h = logging.StreamHandler()
         std_h.setFormatter(f)
-        root.addHandler(h)
-        root.addHandler(std_h)
+        fila: queue.SimpleQueue = queue.SimpleQueue()
+        fila_h = logging.handlers.QueueHandler(fila)
+        fila_h.addFilter(FiltroContexto())
+        cls.LISTENER = logging.handlers.QueueListener(
+            fila, h, std_h, respect_handler_level=True
+        )
+        cls.LISTENER.start()
+        root.addHandler(fila_h)
         root.setLevel(logging.INFO)
         cls.LOGGER = root
 
+    @classmethod
+    def __encerra_listener(cls):
+        if cls.LISTENER is not None:
+            cls.LISTENER.stop()
+            for h in cls.LISTENER.handlers:
+                h.close()
+            cls.LISTENER = None
+
+    @classmethod
+    def encerra(cls):
+        """
+        Escreve os registros pendentes na fila e encerra o logging.
+        """
+        cls.__encerra_listener()
+
     @classmethod
     def log(cls) -> logging.Logger:
         if cls.LOGGER is None:
             raise ValueError("Logger não configurado!")
         return cls.LOGGER
+
+
+atexit.register(Log.encerra)
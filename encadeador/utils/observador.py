@@ -0,0 +1,138 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from os.path import getmtime, isfile, join
+from typing import Dict, List, Optional
+
+# Eventos do inotify (sys/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+EVENTOS_OBSERVADOS = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+FORMATO_EVENTO = "iIII"
+TAMANHO_EVENTO = struct.calcsize(FORMATO_EVENTO)
+
+# Tempo, em segundos, em que as alterações seguintes à primeira
+# são agrupadas em uma única notificação
+INTERVALO_AGRUPAMENTO = 0.2
+
+
+def _inicia_inotify(diretorio: str) -> Optional[int]:
+    nome_libc = ctypes.util.find_library("c")
+    if nome_libc is None:
+        return None
+    try:
+        libc = ctypes.CDLL(nome_libc, use_errno=True)
+        inicia = libc.inotify_init1
+        adiciona = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = inicia(IN_CLOEXEC)
+    if fd < 0:
+        return None
+    if adiciona(fd, os.fsencode(diretorio), EVENTOS_OBSERVADOS) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class ObservadorArquivos:
+    """
+    Espera por alterações nos arquivos de um diretório cujos nomes
+    começam com um dos prefixos informados. Usa as notificações do
+    inotify, quando disponível, e, caso contrário, consulta a data
+    de modificação dos arquivos periodicamente.
+    """
+
+    def __init__(
+        self,
+        _diretorio: str,
+        _prefixos: List[str],
+        _intervalo_consulta: float = 1.0,
+    ):
+        self._diretorio = _diretorio
+        self._prefixos = tuple(_prefixos)
+        self._intervalo_consulta = _intervalo_consulta
+        self._fd = _inicia_inotify(_diretorio)
+        self._modificacoes = self.__modificacoes()
+
+    @property
+    def notificacoes(self) -> bool:
+        """
+        Se as alterações são recebidas do inotify, sem consultas
+        periódicas aos arquivos.
+        """
+        return self._fd is not None
+
+    def __modificacoes(self) -> Dict[str, float]:
+        modificacoes: Dict[str, float] = {}
+        for nome in os.listdir(self._diretorio):
+            caminho = join(self._diretorio, nome)
+            if nome.startswith(self._prefixos) and isfile(caminho):
+                modificacoes[nome] = getmtime(caminho)
+        return modificacoes
+
+    def __le_eventos(self, timeout: Optional[float]) -> bool:
+        assert self._fd is not None
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if len(prontos) == 0:
+            return False
+        dados = os.read(self._fd, 64 * TAMANHO_EVENTO + 4096)
+        alterado = False
+        i = 0
+        while i + TAMANHO_EVENTO <= len(dados):
+            _, _, _, tamanho = struct.unpack_from(FORMATO_EVENTO, dados, i)
+            inicio_nome = i + TAMANHO_EVENTO
+            nome = dados[inicio_nome : inicio_nome + tamanho].rstrip(b"\0")
+            if os.fsdecode(nome).startswith(self._prefixos):
+                alterado = True
+            i = inicio_nome + tamanho
+        return alterado
+
+    def __espera_inotify(self, timeout: Optional[float]) -> bool:
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            restante = (
+                None if limite is None else max(0.0, limite - time.monotonic())
+            )
+            if self.__le_eventos(restante):
+                break
+            if limite is not None and time.monotonic() >= limite:
+                return False
+        # Uma transação escreve várias vezes no banco
+        while self.__le_eventos(INTERVALO_AGRUPAMENTO):
+            pass
+        return True
+
+    def __espera_consulta(self, timeout: Optional[float]) -> bool:
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            modificacoes = self.__modificacoes()
+            if modificacoes != self._modificacoes:
+                self._modificacoes = modificacoes
+                return True
+            if limite is not None and time.monotonic() >= limite:
+                return False
+            time.sleep(self._intervalo_consulta)
+
+    def espera(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloqueia até que um dos arquivos observados seja alterado,
+        retornando False se o tempo limite for atingido antes.
+        """
+        if self._fd is not None:
+            return self.__espera_inotify(timeout)
+        return self.__espera_consulta(timeout)
+
+    def encerra(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -1,9 +1,10 @@
+import argparse
 import pathlib
 import asyncio
+import sys
 from os.path import join
+from typing import List, Optional
 from dotenv import load_dotenv
-from config import start_db
-from encadeador.app import App
 from encadeador.modelos.configuracoes import Configuracoes
 from encadeador.utils.log import Log
 
@@ -15,9 +16,98 @@ DIR_BASE = pathlib.Path().resolve()
 load_dotenv(join(DIR_BASE, "encadeia.cfg"), override=True)
 
 
-def main():
+def le_argumentos(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="encadeia",
+        description="Encadeador de casos de NEWAVE e DECOMP. Sem"
+        + " subcomandos, executa o estudo do diretório atual.",
+    )
+    subparsers = parser.add_subparsers(dest="comando")
+    consultas = {
+        "status": "Estado dos casos, rodada atual, flexibilizações"
+        + " e tempos das fases",
+        "runs": "Rodadas dos casos, com a duração da execução",
+    }
+    for comando, ajuda in consultas.items():
+        p = subparsers.add_parser(comando, help=ajuda, description=ajuda)
+        p.add_argument("--caso", type=int, help="ID do caso consultado")
+        p.add_argument(
+            "--armazenamento",
+            choices=["SQL", "JSON"],
+            default="SQL",
+            help="Armazenamento do estado do estudo (padrão SQL)",
+        )
+        p.add_argument(
+            "--watch",
+            action="store_true",
+            help="Atualiza a consulta a cada alteração do estudo",
+        )
+        if comando == "runs":
+            p.add_argument(
+                "--ativas",
+                action="store_true",
+                help="Somente as rodadas em execução ou na fila",
+            )
+    return parser.parse_args(argv)
+
+
+def consulta(args: argparse.Namespace) -> int:
+    # As consultas não importam os módulos que leem os decks ou
+    # acessam os serviços, nem escrevem no diretório do estudo.
+    from encadeador.adapters.orm.util import start_mappers
+    from encadeador.controladores.consultaestudo import ConsultaEstudo
+    from encadeador.utils.observador import ObservadorArquivos
+
+    estudo = ConsultaEstudo(args.armazenamento, str(DIR_BASE))
+    if not estudo.existe:
+        print(f"Estudo não encontrado em {DIR_BASE}", file=sys.stderr)
+        return 1
+    if args.armazenamento == "SQL":
+        start_mappers()
+    observador = (
+        ObservadorArquivos(str(DIR_BASE), estudo.arquivos)
+        if args.watch
+        else None
+    )
+    try:
+        while True:
+            with estudo:
+                if args.comando == "status":
+                    texto = estudo.status(args.caso)
+                else:
+                    texto = estudo.rodadas(args.caso, args.ativas)
+            if observador is None:
+                print(texto)
+                return 0
+            # Limpa o terminal antes de cada atualização
+            print("\033[2J\033[H" + texto, flush=True)
+            observador.espera()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if observador is not None:
+            observador.encerra()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = le_argumentos(argv)
+    if args.comando is not None:
+        sys.exit(consulta(args))
+
     Log.configura_logging(DIR_BASE)
-    Configuracoes.le_variaveis_ambiente()
+    c = Configuracoes.le_variaveis_ambiente()
+    Log.configura_logging(
+        DIR_BASE,
+        c.tamanho_maximo_log * 1024 * 1024,
+        c.backups_log,
+        c.intervalo_rotacao_log * 3600,
+        c.formato_log,
+    )
+    # A aplicação e o banco são importados somente quando necessários,
+    # pois trazem as dependências mais pesadas.
+    from config import start_db
+    from encadeador.app import App
+
     start_db()
 
     app = App()
@@ -26,5 +26,6 @@ setup(
     entry_points="""
         [console_scripts]
         encadeador-pem=main:main
+        encadeia=main:main
     """,
 )
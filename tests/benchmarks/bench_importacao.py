@@ -0,0 +1,94 @@
+"""
+Benchmark do tempo de importação dos módulos do encadeador, medido
+em um novo interpretador com `python -X importtime`. Também verifica
+que as bibliotecas pesadas só são importadas no primeiro uso, e não
+na importação dos módulos. Executar com:
+
+    $ python -m pytest tests/benchmarks/bench_importacao.py \\
+        --benchmark-json=resultados.json
+    $ python -m tests.benchmarks.regressao resultados.json
+"""
+
+import re
+import subprocess
+import sys
+from os.path import dirname
+from typing import Dict, Set
+import pytest
+
+DIRETORIO_RAIZ = dirname(dirname(dirname(__file__)))
+
+REGEX_IMPORTTIME = re.compile(
+    r"^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)\s*$"
+)
+
+# Bibliotecas que não devem ser importadas junto com cada módulo
+PROIBIDAS: Dict[str, Set[str]] = {
+    "main": {
+        "aiohttp",
+        "idecomp",
+        "inewave",
+        "numpy",
+        "pandas",
+        "pyarrow",
+        "pydantic",
+        "sqlalchemy",
+    },
+    "encadeador.app": {"aiohttp", "idecomp", "inewave"},
+    "encadeador.controladores.preparadorcaso": {
+        "aiohttp",
+        "idecomp",
+        "inewave",
+        "pandas",
+    },
+    "encadeador.controladores.sintetizador": {
+        "aiohttp",
+        "idecomp",
+        "pandas",
+    },
+    "encadeador.utils.processadordecomp": {"idecomp", "pandas"},
+    "encadeador.adapters.repository.apis": {"aiohttp", "pandas"},
+    "encadeador.adapters.repository.newave": {"inewave"},
+    "encadeador.adapters.repository.decomp": {"idecomp"},
+    "encadeador.adapters.repository.synthesis": {"pandas"},
+    "encadeador.controladores.consultaestudo": {
+        "aiohttp",
+        "idecomp",
+        "inewave",
+        "pandas",
+    },
+}
+
+
+def tempos_importacao(modulo: str) -> Dict[str, int]:
+    """
+    Importa o módulo em um novo interpretador e retorna o tempo
+    acumulado, em microssegundos, de cada módulo importado.
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=DIRETORIO_RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tempos: Dict[str, int] = {}
+    for linha in processo.stderr.splitlines():
+        m = REGEX_IMPORTTIME.match(linha)
+        if m is not None:
+            tempos[m.group(3)] = int(m.group(2))
+    return tempos
+
+
+@pytest.mark.parametrize("modulo", list(PROIBIDAS.keys()))
+def test_importacao_tardia(modulo):
+    pacotes = {nome.split(".")[0] for nome in tempos_importacao(modulo)}
+    assert pacotes & PROIBIDAS[modulo] == set()
+
+
+@pytest.mark.parametrize("modulo", list(PROIBIDAS.keys()))
+def test_bench_importacao(benchmark, modulo):
+    tempos = benchmark.pedantic(
+        tempos_importacao, args=(modulo,), rounds=5, iterations=1
+    )
+    benchmark.extra_info["importacao_us"] = tempos[modulo]
@@ -0,0 +1,45 @@
+"""
+Benchmark da decodificação das respostas do serviço de
+encadeamento, comparando a decodificação anterior (literal_eval,
+json.dumps e parse_raw por item) com a decodificação em uma
+única passagem. Executar com:
+
+    $ python -m pytest tests/benchmarks/bench_jsonparser.py
+"""
+
+import ast
+import json
+import pytest
+
+from encadeador.modelos.chainingresult import ChainingResult
+from encadeador.utils.jsonparser import carrega_modelos
+
+TAMANHOS = [1000, 10000, 100000]
+
+
+def resposta_encadeamento(n: int) -> bytes:
+    return json.dumps(
+        {"result": [{"id": f"UHE {i}", "value": i * 0.5} for i in range(n)]}
+    ).encode("utf-8")
+
+
+def decodifica_referencia(conteudo: bytes):
+    chainData = ast.literal_eval(conteudo.decode("utf-8"))
+    return [
+        ChainingResult.parse_raw(json.dumps(j)) for j in chainData["result"]
+    ]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_bench_decodifica_referencia(benchmark, n):
+    conteudo = resposta_encadeamento(n)
+    benchmark.pedantic(
+        decodifica_referencia, args=(conteudo,), rounds=3, iterations=1
+    )
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_bench_decodifica_uma_passagem(benchmark, n):
+    conteudo = resposta_encadeamento(n)
+    modelos = benchmark(carrega_modelos, conteudo, ChainingResult, "result")
+    assert modelos == decodifica_referencia(conteudo)
@@ -0,0 +1,152 @@
+"""
+Benchmark do cálculo da geração térmica percentual do DECOMP.
+
+Compara a implementação vetorizada de :class:`ProcessadorDecomp`
+com a implementação anterior, linha a linha, mantida aqui como
+referência. Executar com:
+
+    $ python -m pytest tests/benchmarks/bench_processadordecomp.py
+"""
+
+import pandas as pd  # type: ignore
+import pytest
+
+from encadeador.utils.processadordecomp import ProcessadorDecomp
+from tests.benchmarks.dados import relato_relgnl_sinteticos
+
+TAMANHOS = [(50, 5), (500, 50), (5000, 500)]
+N_SEMANAS = 6
+
+
+def gt_percentual_referencia(relato, relgnl, col: str) -> pd.DataFrame:
+    def extrai_gts_semana(relato, semana: int) -> pd.DataFrame:
+        gt: pd.DataFrame = relato.geracao_termica_submercado
+        gt = gt[["nome_submercado", f"estagio_{semana}"]]
+        gt = gt.set_index("nome_submercado")
+        gt = gt.drop(index="FC")
+        return gt
+
+    def extrai_gts_min_max_semana(relato, relgnl, semana: int):
+        merc: pd.DataFrame = relato.dados_mercado
+        term: pd.DataFrame = relato.dados_termicas
+        termg: pd.DataFrame = relgnl.usinas_termicas
+        disp: pd.DataFrame = relato.disponibilidades_termicas
+        term_1s = term.loc[term["estagio"] == semana, :].copy()
+        term_1s_gnl = termg.loc[termg["estagio"] == semana, :].copy()
+        term_1s_gnl.columns = term_1s.columns
+        term_1s = pd.concat([term_1s, term_1s_gnl], ignore_index=True)
+        merc_1s = merc.loc[merc["estagio"] == semana, :].copy()
+        for idx, lin in term_1s.iterrows():
+            filtro = disp["codigo_usina"] == int(lin["codigo_usina"])
+            taxa_disp = (
+                float(disp.loc[filtro, f"estagio_{semana}"].iloc[0]) / 100.0
+            )
+            for pat in [1, 2, 3]:
+                c_min = f"geracao_minima_patamar_{pat}"
+                c_max = f"geracao_maxima_patamar_{pat}"
+                gt_min = term_1s.loc[idx, c_min]
+                gt_max = term_1s.loc[idx, c_max]
+                term_1s.loc[idx, c_min] = taxa_disp * float(gt_min)
+                term_1s.loc[idx, c_max] = taxa_disp * float(gt_max)
+        cmi = "geracao_minima"
+        cma = "geracao_maxima"
+        for s in term_1s["nome_submercado"].unique():
+            fil = term_1s["nome_submercado"] == s
+            fil_merc = merc_1s["nome_submercado"] == s
+            dp1 = float(merc_1s.loc[fil_merc, "patamar_1"].iloc[0])
+            dp2 = float(merc_1s.loc[fil_merc, "patamar_2"].iloc[0])
+            dp3 = float(merc_1s.loc[fil_merc, "patamar_3"].iloc[0])
+            dur_total = dp1 + dp2 + dp3
+            dp1 /= dur_total
+            dp2 /= dur_total
+            dp3 /= dur_total
+            term_1s.loc[fil, cmi] = (
+                term_1s.loc[fil, "geracao_minima_patamar_1"] * dp1
+                + term_1s.loc[fil, "geracao_minima_patamar_2"] * dp2
+                + term_1s.loc[fil, "geracao_minima_patamar_3"] * dp3
+            )
+            term_1s.loc[fil, cma] = (
+                term_1s.loc[fil, "geracao_maxima_patamar_1"] * dp1
+                + term_1s.loc[fil, "geracao_maxima_patamar_2"] * dp2
+                + term_1s.loc[fil, "geracao_maxima_patamar_3"] * dp3
+            )
+        return term_1s.groupby("nome_submercado")[[cmi, cma]].sum()
+
+    def extrai_gt_percentual_semana(relato, relgnl, semana: int):
+        df_gt = extrai_gts_semana(relato, semana)
+        df_gt_min_max = extrai_gts_min_max_semana(relato, relgnl, semana)
+        df_gt_min_max["geracao"] = df_gt[f"estagio_{semana}"].copy()
+        df_gt_min_max["nome_submercado"] = df_gt_min_max.index
+        df_gt_min_max = df_gt_min_max[
+            ["nome_submercado", "geracao_minima", "geracao", "geracao_maxima"]
+        ]
+        df_gt_min_max = df_gt_min_max.reset_index(drop=True)
+        soma_gt = df_gt_min_max.sum(axis=0)
+        df_gt_min_max.loc[4, "nome_submercado"] = "SIN"
+        for c in ["geracao_minima", "geracao", "geracao_maxima"]:
+            df_gt_min_max.loc[4, c] = float(soma_gt.loc[c])
+        return df_gt_min_max
+
+    df_completo = pd.DataFrame()
+    vols: pd.DataFrame = relato.volume_util_reservatorios
+    n_semanas = len(list(vols.columns)) - 3
+    for i in range(1, n_semanas + 1):
+        df = extrai_gt_percentual_semana(relato, relgnl, i)
+        df["estagio"] = i
+        if df_completo.empty:
+            df_completo = df
+        else:
+            df_completo = pd.concat([df_completo, df], ignore_index=True)
+    cols_sem_estagio = [c for c in df_completo.columns if c != "estagio"]
+    dfc = df_completo[["estagio"] + cols_sem_estagio].copy()
+    dfc.loc[:, "geracao_percentual_maxima"] = (
+        100 * dfc["geracao"] / dfc["geracao_maxima"]
+    )
+    dfc.loc[:, "geracao_percentual_flexivel"] = 100 * (
+        (dfc["geracao"] - dfc["geracao_minima"])
+        / (dfc["geracao_maxima"] - dfc["geracao_minima"])
+    )
+    estagios = dfc["estagio"].unique()
+    subsistemas = dfc["nome_submercado"].unique()
+    cols = ["nome_submercado"] + [f"estagio_{e}" for e in estagios]
+    df_final = pd.DataFrame(columns=cols)
+    for i, s in enumerate(subsistemas):
+        df_final.loc[i, "nome_submercado"] = s
+        gt = dfc.loc[dfc["nome_submercado"] == s, col].to_numpy()
+        df_final.loc[i, [f"estagio_{e}" for e in estagios]] = gt
+    return df_final
+
+
+@pytest.mark.parametrize("col", ["geracao_percentual_maxima"])
+@pytest.mark.parametrize("n_usinas,n_usinas_gnl", TAMANHOS[:2])
+def test_gt_percentual_igual_referencia(n_usinas, n_usinas_gnl, col):
+    relato, relgnl = relato_relgnl_sinteticos(
+        n_usinas, n_usinas_gnl, N_SEMANAS
+    )
+    pd.testing.assert_frame_equal(
+        ProcessadorDecomp.gt_percentual(relato, relgnl, col),
+        gt_percentual_referencia(relato, relgnl, col),
+        check_dtype=False,
+        check_index_type=False,
+    )
+
+
+@pytest.mark.parametrize("n_usinas,n_usinas_gnl", TAMANHOS)
+def test_bench_gt_percentual_vetorizado(benchmark, n_usinas, n_usinas_gnl):
+    relato, relgnl = relato_relgnl_sinteticos(
+        n_usinas, n_usinas_gnl, N_SEMANAS
+    )
+    benchmark(ProcessadorDecomp.gt_percentual_maxima, relato, relgnl)
+
+
+@pytest.mark.parametrize("n_usinas,n_usinas_gnl", TAMANHOS[:2])
+def test_bench_gt_percentual_referencia(benchmark, n_usinas, n_usinas_gnl):
+    relato, relgnl = relato_relgnl_sinteticos(
+        n_usinas, n_usinas_gnl, N_SEMANAS
+    )
+    benchmark.pedantic(
+        gt_percentual_referencia,
+        args=(relato, relgnl, "geracao_percentual_maxima"),
+        rounds=1,
+        iterations=1,
+    )
@@ -0,0 +1,50 @@
+"""
+Benchmark da leitura do arquivo de regras de operação de
+reservatórios. Executar com:
+
+    $ python -m pytest tests/benchmarks/bench_regrasreservatorios.py
+"""
+
+from os.path import join
+import numpy as np
+import pandas as pd  # type: ignore
+import pytest
+
+from encadeador.modelos.tabelaregrasreservatorios import (
+    COLUNAS_CSV,
+    TabelaRegrasReservatorios,
+)
+
+
+def escreve_regras_sinteticas(caminho: str, n_usinas: int):
+    # Todas as usinas x meses x 3 faixas de volume
+    n = n_usinas * 12 * 3
+    rng = np.random.default_rng(0)
+    usinas = np.repeat(np.arange(1, n_usinas + 1), 36)
+    df = pd.DataFrame(
+        data={
+            "INICIO_VIGENCIA": np.where(
+                rng.random(n) < 0.5, "-", "2021-01-01"
+            ),
+            "FIM_VIGENCIA": np.where(rng.random(n) < 0.5, "-", "2023-12-31"),
+            "COD_RESERVATORIO_VOL": usinas,
+            "CODIGO_USINA_RESTRICAO": usinas,
+            "TIPO_REST": "QDEF",
+            "MES": np.tile(np.repeat(np.arange(1, 13), 3), n_usinas),
+            "VOL_MIN": np.tile([0.0, 30.0, 70.0], n_usinas * 12),
+            "VOL_MAX": np.tile([30.0, 70.0, 100.0], n_usinas * 12),
+            "LIM_MIN": np.where(rng.random(n) < 0.5, "-", "100.0"),
+            "LIM_MAX": np.where(rng.random(n) < 0.5, "-", "2000.0"),
+            "PERIOD": "SEMANAL",
+            "LEGENDA_FAIXA": np.tile(["A", "B", "C"], n_usinas * 12),
+        }
+    )
+    df[list(COLUNAS_CSV.keys())].to_csv(caminho, sep=";", index=False)
+
+
+@pytest.mark.parametrize("n_usinas", [100, 1000])
+def test_bench_le_csv_regras(benchmark, tmp_path, n_usinas):
+    caminho = join(str(tmp_path), "regras.csv")
+    escreve_regras_sinteticas(caminho, n_usinas)
+    tabela = benchmark(TabelaRegrasReservatorios.from_csv, caminho)
+    assert len(tabela) == n_usinas * 36
@@ -0,0 +1,358 @@
+"""
+Benchmark das operações dos repositórios de casos e rodadas, nas
+implementações SQL e JSON, e do custo de abertura e confirmação das
+unidades de trabalho. Executar com:
+
+    $ python -m pytest tests/benchmarks/bench_repositorios.py \\
+        --benchmark-json=resultados.json
+    $ python -m tests.benchmarks.regressao resultados.json
+
+Os repositórios JSON reescrevem o arquivo inteiro a cada operação
+e leem as rodadas de cada caso separadamente, portanto os tamanhos
+acima de BENCH_TAMANHO_MAXIMO_JSON (padrão 1000) são ignorados.
+"""
+
+from datetime import datetime
+from json import dump
+import os
+from os.path import join
+import random
+import pytest
+from sqlalchemy import create_engine, insert  # type: ignore
+from sqlalchemy.orm import clear_mappers, sessionmaker  # type: ignore
+
+from encadeador.adapters.orm import registry
+from encadeador.adapters.orm.caso import tabela_casos
+from encadeador.adapters.orm.estudo import tabela_estudos
+from encadeador.adapters.orm.rodada import tabela_rodadas
+from encadeador.adapters.orm.util import start_mappers
+from encadeador.adapters.repository.caso import (
+    JSONCasoRepository,
+    SQLCasoRepository,
+)
+from encadeador.adapters.repository.rodada import (
+    JSONRodadaRepository,
+    SQLRodadaRepository,
+)
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+from encadeador.services.unitofwork.caso import SQLCasoUnitOfWork
+from encadeador.services.unitofwork.rodada import SQLRodadaUnitOfWork
+
+TAMANHOS = [1000, 10000, 100000]
+TAMANHO_MAXIMO_JSON = int(os.getenv("BENCH_TAMANHO_MAXIMO_JSON", "1000"))
+INICIO = datetime(2021, 1, 1)
+
+
+def dados_caso(i: int) -> dict:
+    return {
+        "id": i,
+        "caminho": f"{2021 + i // 12}_{str(i % 12 + 1).zfill(2)}_rv0/decomp",
+        "nome": f"Caso {i}",
+        "ano": 2021 + i // 12,
+        "mes": i % 12 + 1,
+        "revisao": 0,
+        "programa": Programa.DECOMP,
+        "estado": EstadoCaso.CONCLUIDO,
+        "id_estudo": 1,
+    }
+
+
+def dados_rodada(i: int) -> dict:
+    return {
+        "id": i,
+        "nome": f"Rodada {i}",
+        "estado": RunStatus.SUCCESS,
+        "id_job": str(i),
+        "caminho": f"/estudo/{i}",
+        "instante_inicio_execucao": INICIO,
+        "instante_fim_execucao": INICIO,
+        "numero_processadores": 72,
+        "nome_programa": "DECOMP",
+        "versao_programa": "v31",
+        "id_caso": i,
+    }
+
+
+def novo_caso() -> Caso:
+    return Caso(
+        "2099_01_rv0/decomp",
+        "Novo",
+        2099,
+        1,
+        0,
+        Programa.DECOMP,
+        EstadoCaso.NAO_INICIADO,
+        1,
+    )
+
+
+def nova_rodada(id_caso: int) -> Rodada:
+    return Rodada(
+        "Nova",
+        RunStatus.RUNNING,
+        "0",
+        "/estudo/novo",
+        INICIO,
+        None,
+        72,
+        "DECOMP",
+        "v31",
+        id_caso,
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mapeamento():
+    start_mappers()
+    yield
+    clear_mappers()
+
+
+@pytest.fixture(scope="module", params=TAMANHOS)
+def banco(request, tmp_path_factory):
+    """
+    Banco SQLite em arquivo com `n` casos de um estudo, cada um
+    com uma rodada.
+    """
+    n = request.param
+    caminho = tmp_path_factory.mktemp(f"sql{n}")
+    engine = create_engine(f"sqlite:///{join(caminho, 'data.db')}")
+    registry.metadata.create_all(engine)
+    with engine.begin() as conexao:
+        conexao.execute(
+            insert(tabela_estudos),
+            [
+                {
+                    "id": 1,
+                    "caminho": str(caminho),
+                    "nome": "estudo",
+                    "estado": EstadoEstudo.EXECUTANDO,
+                }
+            ],
+        )
+        conexao.execute(
+            insert(tabela_casos), [dados_caso(i) for i in range(1, n + 1)]
+        )
+        conexao.execute(
+            insert(tabela_rodadas), [dados_rodada(i) for i in range(1, n + 1)]
+        )
+    yield n, sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="module", params=TAMANHOS)
+def arquivos_json(request, tmp_path_factory):
+    n = request.param
+    if n > TAMANHO_MAXIMO_JSON:
+        pytest.skip(
+            f"{n} linhas excede o tamanho máximo dos repositórios JSON"
+        )
+    caminho = tmp_path_factory.mktemp(f"json{n}")
+
+    def serializa(d: dict) -> dict:
+        return {
+            k: (
+                v.value
+                if hasattr(v, "value")
+                else (v.isoformat() if isinstance(v, datetime) else v)
+            )
+            for k, v in d.items()
+        }
+
+    with open(join(caminho, "casos.json"), "w") as arq:
+        dump([serializa(dados_caso(i)) for i in range(1, n + 1)], arq)
+    with open(join(caminho, "rodadas.json"), "w") as arq:
+        dump([serializa(dados_rodada(i)) for i in range(1, n + 1)], arq)
+    return n, str(caminho)
+
+
+def ids_aleatorios(n: int):
+    rng = random.Random(0)
+    return lambda: ((rng.randint(1, n),), {})
+
+
+# SQL - casos
+
+
+def test_bench_sql_caso_create(benchmark, banco):
+    _, sessao = banco
+    s = sessao()
+    repo = SQLCasoRepository(s)
+
+    def create():
+        repo.create(novo_caso())
+        s.flush()
+
+    benchmark(create)
+    s.rollback()
+
+
+def test_bench_sql_caso_read(benchmark, banco):
+    n, sessao = banco
+    repo = SQLCasoRepository(sessao())
+    benchmark.pedantic(repo.read, setup=ids_aleatorios(n), rounds=200)
+
+
+def test_bench_sql_caso_update(benchmark, banco):
+    n, sessao = banco
+    s = sessao()
+    repo = SQLCasoRepository(s)
+    caso = repo.read(n // 2)
+    benchmark(repo.update, caso)
+    s.rollback()
+
+
+def test_bench_sql_caso_list_by_estudo(benchmark, banco):
+    n, sessao = banco
+
+    # Uma sessão nova por rodada, sem objetos no mapa de identidade
+    def setup():
+        return (SQLCasoRepository(sessao()),), {}
+
+    casos = benchmark.pedantic(
+        lambda repo: repo.list_by_estudo(1), setup=setup, rounds=3
+    )
+    assert len(casos) == n
+
+
+# SQL - rodadas
+
+
+def test_bench_sql_rodada_create(benchmark, banco):
+    n, sessao = banco
+    s = sessao()
+    repo = SQLRodadaRepository(s)
+
+    def create():
+        repo.create(nova_rodada(n))
+        s.flush()
+
+    benchmark(create)
+    s.rollback()
+
+
+def test_bench_sql_rodada_read(benchmark, banco):
+    n, sessao = banco
+    repo = SQLRodadaRepository(sessao())
+    benchmark.pedantic(repo.read, setup=ids_aleatorios(n), rounds=200)
+
+
+def test_bench_sql_rodada_update(benchmark, banco):
+    n, sessao = banco
+    s = sessao()
+    repo = SQLRodadaRepository(s)
+    rodada = repo.read(n // 2)
+    benchmark(repo.update, rodada)
+    s.rollback()
+
+
+def test_bench_sql_rodada_list_by_caso(benchmark, banco):
+    n, sessao = banco
+    repo = SQLRodadaRepository(sessao())
+    benchmark.pedantic(repo.list_by_caso, setup=ids_aleatorios(n), rounds=50)
+
+
+# JSON - casos
+
+
+def test_bench_json_caso_create(benchmark, arquivos_json):
+    _, caminho = arquivos_json
+    repo = JSONCasoRepository(caminho)
+    benchmark.pedantic(lambda: repo.create(novo_caso()), rounds=3)
+
+
+def test_bench_json_caso_read(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONCasoRepository(caminho)
+    benchmark.pedantic(repo.read, setup=ids_aleatorios(n), rounds=3)
+
+
+def test_bench_json_caso_update(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONCasoRepository(caminho)
+    caso = repo.read(n // 2)
+    benchmark.pedantic(repo.update, args=(caso,), rounds=3)
+
+
+def test_bench_json_caso_list_by_estudo(benchmark, arquivos_json):
+    _, caminho = arquivos_json
+    repo = JSONCasoRepository(caminho)
+    benchmark.pedantic(repo.list_by_estudo, args=(1,), rounds=3)
+
+
+# JSON - rodadas
+
+
+def test_bench_json_rodada_create(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONRodadaRepository(caminho)
+    benchmark.pedantic(lambda: repo.create(nova_rodada(n)), rounds=5)
+
+
+def test_bench_json_rodada_read(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONRodadaRepository(caminho)
+    benchmark.pedantic(repo.read, setup=ids_aleatorios(n), rounds=5)
+
+
+def test_bench_json_rodada_update(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONRodadaRepository(caminho)
+    rodada = repo.read(n // 2)
+    benchmark.pedantic(repo.update, args=(rodada,), rounds=5)
+
+
+def test_bench_json_rodada_list_by_caso(benchmark, arquivos_json):
+    n, caminho = arquivos_json
+    repo = JSONRodadaRepository(caminho)
+    benchmark.pedantic(repo.list_by_caso, setup=ids_aleatorios(n), rounds=5)
+
+
+# Unidades de trabalho
+
+
+def test_bench_uow_caso_abre(benchmark, banco):
+    _, sessao = banco
+    uow = SQLCasoUnitOfWork(lambda: sessao)
+
+    def abre():
+        with uow:
+            pass
+
+    benchmark(abre)
+
+
+def test_bench_uow_caso_commit(benchmark, banco):
+    n, sessao = banco
+    uow = SQLCasoUnitOfWork(lambda: sessao)
+
+    def commit():
+        with uow:
+            caso = uow.casos.read(n // 2)
+            uow.casos.update(caso)
+            uow.commit()
+
+    benchmark(commit)
+
+
+def test_bench_uow_rodada_commit(benchmark, banco):
+    n, sessao = banco
+    uow = SQLRodadaUnitOfWork(lambda: sessao)
+
+    def commit():
+        with uow:
+            rodada = uow.rodadas.read(n // 2)
+            uow.rodadas.update(rodada)
+            uow.commit()
+
+    benchmark(commit)
+
+
+def test_bench_uow_caso_cria(benchmark, configuracoes):
+    # Com a fábrica padrão, cada unidade de trabalho cria um engine
+    benchmark(SQLCasoUnitOfWork)
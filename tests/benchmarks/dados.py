@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from typing import Tuple
+import numpy as np
+import pandas as pd  # type: ignore
+
+SUBMERCADOS = ["SE", "S", "NE", "N"]
+
+
+def relato_relgnl_sinteticos(
+    n_usinas: int, n_usinas_gnl: int, n_semanas: int, semente: int = 0
+) -> Tuple[SimpleNamespace, SimpleNamespace]:
+    """
+    Constrói objetos com as mesmas tabelas usadas de
+    :class:`Relato` e :class:`Relgnl` para avaliar o
+    processamento de resultados do DECOMP.
+    """
+    rng = np.random.default_rng(semente)
+    codigos = np.arange(1, n_usinas + n_usinas_gnl + 1)
+    submercados = rng.choice(SUBMERCADOS, size=len(codigos))
+    cols_estagios = [f"estagio_{s}" for s in range(1, n_semanas + 1)]
+
+    def termicas(codigos_usinas: np.ndarray) -> pd.DataFrame:
+        n = len(codigos_usinas) * n_semanas
+        df = pd.DataFrame(
+            data={
+                "codigo_usina": np.repeat(codigos_usinas, n_semanas),
+                "nome_usina": np.repeat(
+                    [f"UTE {c}" for c in codigos_usinas], n_semanas
+                ),
+                "nome_submercado": np.repeat(
+                    submercados[codigos_usinas - 1], n_semanas
+                ),
+                "estagio": np.tile(
+                    np.arange(1, n_semanas + 1), len(codigos_usinas)
+                ),
+            }
+        )
+        for pat in [1, 2, 3]:
+            gmin = rng.uniform(0, 100, n)
+            df[f"geracao_minima_patamar_{pat}"] = gmin
+            df[f"geracao_maxima_patamar_{pat}"] = gmin + rng.uniform(0, 500, n)
+            df[f"custo_patamar_{pat}"] = rng.uniform(0, 1000, n)
+        return df
+
+    disp = pd.DataFrame(
+        data={
+            "codigo_usina": codigos,
+            "nome_usina": [f"UTE {c}" for c in codigos],
+        }
+    )
+    for c in cols_estagios:
+        disp[c] = rng.uniform(50, 100, len(codigos))
+
+    merc = pd.DataFrame(
+        data={
+            "estagio": np.repeat(
+                np.arange(1, n_semanas + 1), len(SUBMERCADOS)
+            ),
+            "nome_submercado": SUBMERCADOS * n_semanas,
+        }
+    )
+    for pat in [1, 2, 3]:
+        merc[f"patamar_{pat}"] = rng.uniform(10, 100, len(merc))
+        merc[f"mercado_{pat}"] = rng.uniform(1000, 50000, len(merc))
+
+    gt = pd.DataFrame(data={"nome_submercado": SUBMERCADOS + ["FC"]})
+    for c in cols_estagios:
+        gt[c] = rng.uniform(1000, 20000, len(gt))
+
+    vols = pd.DataFrame(
+        data={"codigo_usina": [1], "nome_usina": ["UHE"], "inicial": [50.0]}
+    )
+    for c in cols_estagios:
+        vols[c] = [50.0]
+
+    relato = SimpleNamespace(
+        volume_util_reservatorios=vols,
+        dados_termicas=termicas(codigos[:n_usinas]),
+        disponibilidades_termicas=disp,
+        dados_mercado=merc,
+        geracao_termica_submercado=gt,
+    )
+    relgnl = SimpleNamespace(usinas_termicas=termicas(codigos[n_usinas:]))
+    return relato, relgnl
@@ -0,0 +1,369 @@
+"""
+Benchmark de ponta a ponta da execução de um estudo encadeado.
+
+Constrói um estudo sintético com N casos mensais de NEWAVE e DECOMP,
+com decks mínimos, e executa o :class:`App` contra os serviços fake,
+com o intervalo de monitoramento e a duração das rodadas comprimidos.
+Cada tamanho de estudo é executado em um processo novo, de modo que
+o pico de memória e o estado dos singletons não são compartilhados.
+
+Uso, a partir da raiz do repositório:
+
+    python -m tests.benchmarks.e2e --casos 10 100 1000
+"""
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import multiprocessing
+import os
+from os.path import join
+import resource
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd  # type: ignore
+
+from encadeador.modelos.tabelaregrasreservatorios import (
+    TabelaRegrasReservatorios,
+)
+from encadeador.modelos.transicaocaso import TransicaoCaso
+
+TAMANHOS_PADRAO = [10, 100, 1000]
+ANO_INICIAL = 2021
+ARQUIVO_LISTA_CASOS = "lista_casos.txt"
+ARQUIVO_REGRAS = "regras_reservatorios.csv"
+
+# Fase do caso iniciada por cada transição observada no monitor
+FASES_TRANSICOES: Dict[TransicaoCaso, str] = {
+    TransicaoCaso.INICIALIZADO: "preparacao",
+    TransicaoCaso.PREPARA_EXECUCAO_SOLICITADA: "preparacao",
+    TransicaoCaso.PREPARA_EXECUCAO_SUCESSO: "submissao",
+    TransicaoCaso.INICIO_EXECUCAO_SOLICITADA: "submissao",
+    TransicaoCaso.INICIO_EXECUCAO_SUCESSO: "execucao",
+    TransicaoCaso.INVIAVEL: "flexibilizacao",
+    TransicaoCaso.FLEXIBILIZACAO_SUCESSO: "submissao",
+}
+FASE_ESPERA = "execucao"
+
+LINHAS_DGER = [
+    "ESTUDO SINTETICO",
+    "TIPO EXECUCAO          1",
+    "DURACAO DO PERIODO     1",
+    "No. DE ANOS DO EST     5",
+    "MES INICIO PRE-EST     0",
+    "MES INICIO DO ESTUDO{mes:>4}",
+    "ANO INICIO DO ESTUDO{ano:>4}",
+]
+ARQUIVOS_NEWAVE = {0: "dger.dat", 10: "cortes.dat", 11: "cortesh.dat"}
+NUMERO_ARQUIVOS_NEWAVE = 46
+ARQUIVOS_DECOMP = [
+    "dadger.rv0",
+    "vazoes.rv0",
+    "hidr.dat",
+    "mlt.dat",
+    "perdas.dat",
+    "dadgnl.rv0",
+    "./",
+]
+LINHAS_DADGER = [
+    "TE  ESTUDO SINTETICO",
+    "NI  100   0",
+    "GP  0.001",
+    "FC  NEWV21    cortesh.dat",
+    "FC  NEWCUT    cortes.dat",
+]
+
+
+def escreve(caminho: str, linhas: List[str]):
+    with open(caminho, "w") as arq:
+        arq.write("\n".join(linhas) + "\n")
+
+
+def cria_deck_newave(diretorio: str, ano: int, mes: int):
+    os.makedirs(diretorio)
+    escreve(join(diretorio, "caso.dat"), ["arquivos.dat"])
+    escreve(
+        join(diretorio, "arquivos.dat"),
+        [
+            f"{'ARQUIVO ' + str(i):<30}"
+            + ARQUIVOS_NEWAVE.get(i, f"arquivo{i}.dat")
+            for i in range(NUMERO_ARQUIVOS_NEWAVE)
+        ],
+    )
+    escreve(
+        join(diretorio, "dger.dat"),
+        [linha.format(ano=ano, mes=mes) for linha in LINHAS_DGER],
+    )
+
+
+def cria_deck_decomp(diretorio: str):
+    os.makedirs(diretorio)
+    escreve(join(diretorio, "caso.dat"), ["rv0"])
+    escreve(join(diretorio, "rv0"), ARQUIVOS_DECOMP)
+    escreve(join(diretorio, "dadger.rv0"), LINHAS_DADGER)
+
+
+def cria_regras(caminho: str):
+    TabelaRegrasReservatorios(
+        pd.DataFrame(
+            data={
+                "inicio_vigencia": [None, None],
+                "fim_vigencia": [None, None],
+                "codigo_reservatorio": [6, 17],
+                "codigo_usina": [6, 17],
+                "tipo_restricao": ["QDEF", "QDEF"],
+                "mes": [1, 1],
+                "volume_minimo": [0.0, 0.0],
+                "volume_maximo": [100.0, 100.0],
+                "limite_minimo": [None, None],
+                "limite_maximo": [500.0, 800.0],
+                "periodicidade": ["SEMANAL", "SEMANAL"],
+                "legenda_faixa": ["A", "A"],
+            }
+        )
+    ).to_csv(caminho)
+
+
+def cria_estudo(diretorio: str, n_casos: int) -> List[str]:
+    """
+    Cria um estudo com `n_casos` casos, alternando NEWAVE e DECOMP
+    em meses consecutivos, e retorna os diretórios mensais.
+    """
+    meses: List[str] = []
+    for i in range((n_casos + 1) // 2):
+        ano, mes = ANO_INICIAL + i // 12, i % 12 + 1
+        nome = f"{ano}_{str(mes).zfill(2)}_rv0"
+        cria_deck_newave(join(diretorio, nome, "newave"), ano, mes)
+        if 2 * i + 1 < n_casos:
+            cria_deck_decomp(join(diretorio, nome, "decomp"))
+        meses.append(nome)
+    escreve(join(diretorio, ARQUIVO_LISTA_CASOS), meses)
+    cria_regras(join(diretorio, ARQUIVO_REGRAS))
+    return meses
+
+
+def variaveis_ambiente(ambiente: Any) -> Dict[str, str]:
+    return {
+        "NOME_ESTUDO": "Benchmark",
+        "NOME_DIRETORIO_NEWAVE": "newave",
+        "NOME_DIRETORIO_DECOMP": "decomp",
+        "VERSAO_NEWAVE": "v28",
+        "VERSAO_DECOMP": "v31",
+        "MAXIMO_FLEXIBILIZACOES_REVISAO": "50",
+        "ADEQUA_DECKS_NEWAVE": "0",
+        "CVAR": "25,35",
+        "ADEQUA_DECKS_DECOMP": "1",
+        "MAXIMO_ITERACOES_DECOMP": "500",
+        "GAP_MAXIMO_DECOMP": "0.1",
+        "PROCESSADORES_NEWAVE": "64",
+        "PROCESSADORES_DECOMP": "64",
+        "VARIAVEIS_ENCADEADAS_NEWAVE": "VARM",
+        "VARIAVEIS_ENCADEADAS_DECOMP": "VARM,TVIAGEM",
+        "FORMATO_ARMAZENAMENTO_DADOS": "SQL",
+        "DIRETORIO_SINTESE": "sintese",
+        "FORMATO_SINTESE": "PARQUET",
+        "SCRIPT_CONVERTE_CODIFICACAO": "converte.sh",
+        "ARQUIVO_LISTA_CASOS": ARQUIVO_LISTA_CASOS,
+        "ARQUIVO_REGRAS_OPERACAO_RESERVATORIOS": ARQUIVO_REGRAS,
+        "MODEL_API": ambiente.model_api.url,
+        "RESULT_API": ambiente.result_api.url.rstrip("/"),
+        "ENCADEADOR_SERVICE": ambiente.encadeador.url,
+        "FLEXIBILIZADOR_SERVICE": ambiente.flexibilizador.url,
+        "REGRAS_RESERVATORIOS_SERVICE": ambiente.regras.url,
+    }
+
+
+def fases_casos(
+    transicoes: List[Tuple[int, TransicaoCaso, float]],
+) -> Dict[str, float]:
+    """
+    Soma o tempo dos casos em cada fase, a partir dos instantes das
+    transições observadas, até a conclusão de cada caso.
+    """
+    por_caso: Dict[int, List[Tuple[TransicaoCaso, float]]] = defaultdict(list)
+    for id_caso, transicao, instante in transicoes:
+        por_caso[id_caso].append((transicao, instante))
+    fases: Dict[str, float] = defaultdict(float)
+    for eventos in por_caso.values():
+        for (transicao, inicio), (_, fim) in zip(eventos, eventos[1:]):
+            fase = FASES_TRANSICOES.get(transicao)
+            if fase is not None:
+                fases[fase] += fim - inicio
+    return dict(fases)
+
+
+async def executa_app(
+    diretorio: str, intervalo: float, duracao_rodada: float, taxa: float
+) -> Dict[str, Any]:
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    import encadeador.app as app_module
+    from encadeador.controladores.monitorcaso import MonitorCaso
+    from encadeador.modelos.configuracoes import Configuracoes
+    from encadeador.modelos.runstatus import RunStatus
+    from encadeador.utils.log import Log
+    from config import start_db
+    from tests.fakes.ambiente import AmbienteFake
+    from tests.fakes.modelapi import LinhaTempo, ServicoModelAPIFake
+
+    Log.LOGGER = logging.getLogger("benchmark")
+    Log.LOGGER.setLevel(logging.ERROR)
+    app_module.INTERVALO_POLL = intervalo
+
+    consultas = Counter()
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def conta_consulta(conn, cursor, statement, *args):
+        consultas[statement.split(None, 1)[0].upper()] += 1
+
+    transicoes: List[Tuple[int, TransicaoCaso, float]] = []
+    callback_original = MonitorCaso.callback_evento
+
+    async def callback_evento(self, evento: TransicaoCaso):
+        transicoes.append((self.id_caso, evento, time.perf_counter()))
+        await callback_original(self, evento)
+
+    MonitorCaso.callback_evento = callback_evento  # type: ignore
+
+    model_api = ServicoModelAPIFake(
+        LinhaTempo(
+            [(RunStatus.SUBMITTED, 0.0), (RunStatus.RUNNING, duracao_rodada)]
+        ),
+        taxa_inviabilidade=taxa,
+    )
+    codigo = None
+    async with AmbienteFake(model_api=model_api) as ambiente:
+        os.environ.update(variaveis_ambiente(ambiente))
+        os.chdir(diretorio)
+        Configuracoes.le_variaveis_ambiente()
+        start_db()
+        inicio = time.perf_counter()
+        app = app_module.App()
+        try:
+            await app.inicializa()
+            inicio_casos = time.perf_counter()
+            await app.executa()
+        except SystemExit as e:
+            codigo = e.code
+        fim = time.perf_counter()
+        requisicoes = {
+            nome: sum(s.contagem.values())
+            for nome, s in zip(
+                [
+                    "model_api",
+                    "result_api",
+                    "encadeador",
+                    "flexibilizador",
+                    "regras",
+                ],
+                ambiente.servicos,
+            )
+        }
+    fases = fases_casos(transicoes)
+    return {
+        "codigo_saida": codigo,
+        "tempo_total": fim - inicio,
+        "tempo_inicializacao": inicio_casos - inicio,
+        # Aguarda a síntese dos resultados após o último caso
+        "tempo_conclusao": fim - max(t for _, _, t in transicoes),
+        "fases": fases,
+        "sobrecarga": fim - inicio - fases.get(FASE_ESPERA, 0.0),
+        "requisicoes": requisicoes,
+        "consultas": dict(consultas),
+        "pico_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / 1024,
+    }
+
+
+def executa_tamanho(
+    n_casos: int, intervalo: float, duracao_rodada: float, taxa: float
+) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as diretorio:
+        cria_estudo(diretorio, n_casos)
+        resultado = asyncio.run(
+            executa_app(diretorio, intervalo, duracao_rodada, taxa)
+        )
+    resultado["casos"] = n_casos
+    return resultado
+
+
+def relatorio(resultados: List[Dict[str, Any]]) -> pd.DataFrame:
+    linhas = []
+    for r in resultados:
+        n = r["casos"]
+        linha = {
+            "casos": n,
+            "saida": r["codigo_saida"],
+            "total_s": r["tempo_total"],
+            "inicializacao_s": r["tempo_inicializacao"],
+            "conclusao_s": r["tempo_conclusao"],
+            "sobrecarga_s": r["sobrecarga"],
+            "sobrecarga_caso_ms": 1000 * r["sobrecarga"] / n,
+        }
+        for fase, tempo in sorted(r["fases"].items()):
+            linha[f"{fase}_caso_ms"] = 1000 * tempo / n
+        for servico, total in r["requisicoes"].items():
+            linha[f"http_{servico}"] = total
+        linha["consultas_db"] = sum(r["consultas"].values())
+        linha["consultas_caso"] = linha["consultas_db"] / n
+        linha["pico_rss_mb"] = r["pico_rss_mb"]
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--casos", type=int, nargs="+", default=TAMANHOS_PADRAO
+    )
+    parser.add_argument(
+        "--intervalo",
+        type=float,
+        default=0.01,
+        help="Intervalo de monitoramento do App, em segundos",
+    )
+    parser.add_argument(
+        "--duracao-rodada",
+        type=float,
+        default=0.0,
+        help="Duração das rodadas no serviço de modelos, em segundos",
+    )
+    parser.add_argument(
+        "--taxa-inviabilidade",
+        type=float,
+        default=0.0,
+        help="Fração das rodadas que terminam inviáveis",
+    )
+    parser.add_argument("--saida", help="Arquivo JSON com as medições")
+    args = parser.parse_args()
+
+    resultados = []
+    contexto = multiprocessing.get_context("spawn")
+    for n in args.casos:
+        with ProcessPoolExecutor(1, mp_context=contexto) as executor:
+            resultados.append(
+                executor.submit(
+                    executa_tamanho,
+                    n,
+                    args.intervalo,
+                    args.duracao_rodada,
+                    args.taxa_inviabilidade,
+                ).result()
+            )
+        print(relatorio(resultados[-1:]).T.to_string(header=False))
+        print()
+    if args.saida:
+        with open(args.saida, "w") as arq:
+            json.dump(resultados, arq, indent=2)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(relatorio(resultados).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compara os resultados de uma execução dos benchmarks, no formato
+JSON do pytest-benchmark, com a referência registrada no
+repositório, indicando os benchmarks mais lentos que o limite.
+
+    $ python -m tests.benchmarks.regressao resultados.json
+    $ python -m tests.benchmarks.regressao resultados.json --atualiza
+
+A referência guarda somente a mediana de cada benchmark, em segundos.
+"""
+
+import argparse
+import json
+from os.path import dirname, join
+import sys
+from typing import Dict, List, Tuple
+
+REFERENCIA_PADRAO = join(dirname(__file__), "referencias.json")
+LIMITE_PADRAO = 0.5
+
+
+def medianas(caminho: str) -> Dict[str, float]:
+    with open(caminho, "r") as arq:
+        resultados = json.load(arq)
+    return {
+        b["fullname"].split("::", 1)[-1]: b["stats"]["median"]
+        for b in resultados["benchmarks"]
+    }
+
+
+def regressoes(
+    referencia: Dict[str, float], atual: Dict[str, float], limite: float
+) -> List[Tuple[str, float, float]]:
+    """
+    Benchmarks cuja mediana atual excede a referência em mais
+    do que a fração `limite`.
+    """
+    return [
+        (nome, referencia[nome], tempo)
+        for nome, tempo in sorted(atual.items())
+        if nome in referencia and tempo > referencia[nome] * (1 + limite)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("resultados", help="JSON do --benchmark-json")
+    parser.add_argument("--referencia", default=REFERENCIA_PADRAO)
+    parser.add_argument(
+        "--limite",
+        type=float,
+        default=LIMITE_PADRAO,
+        help="Fração de aumento da mediana tolerada (padrão 0.5)",
+    )
+    parser.add_argument(
+        "--atualiza",
+        action="store_true",
+        help="Registra os resultados na referência",
+    )
+    args = parser.parse_args()
+
+    atual = medianas(args.resultados)
+    try:
+        with open(args.referencia, "r") as arq:
+            referencia: Dict[str, float] = json.load(arq)
+    except FileNotFoundError:
+        referencia = {}
+
+    if args.atualiza:
+        referencia.update(atual)
+        with open(args.referencia, "w") as arq:
+            json.dump(dict(sorted(referencia.items())), arq, indent=2)
+            arq.write("\n")
+        print(f"{len(atual)} benchmarks registrados em {args.referencia}")
+        return 0
+
+    sem_referencia = sorted(set(atual) - set(referencia))
+    for nome in sem_referencia:
+        print(f"Sem referência: {nome}")
+    lentos = regressoes(referencia, atual, args.limite)
+    for nome, antes, depois in lentos:
+        print(
+            f"Regressão: {nome} {1000 * antes:.3f} ms -> "
+            + f"{1000 * depois:.3f} ms ({depois / antes:.2f}x)"
+        )
+    print(
+        f"{len(atual)} benchmarks comparados, {len(lentos)} regressões"
+        + f" acima de {100 * args.limite:.0f}%"
+    )
+    return 1 if len(lentos) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
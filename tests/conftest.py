@@ -4,7 +4,8 @@ from sqlalchemy.orm import sessionmaker, clear_mappers
 
 from encadeador.adapters.orm import registry
 from encadeador.adapters.orm.util import start_mappers
-
+from encadeador.modelos.configuracoes import Configuracoes
+from encadeador.internal.resiliencia import ClienteResiliente
 
 JSON_WRITING_FIRST_INDEX = 6
 
@@ -26,3 +27,32 @@ def mappers():
     start_mappers()
     yield
     clear_mappers()
+
+
+@pytest.fixture
+def configuracoes(tmp_path):
+    c = Configuracoes()
+    c._caminho_base_estudo = str(tmp_path)
+    c._nome_diretorio_newave = "newave"
+    c._nome_diretorio_decomp = "decomp"
+    c._diretorio_sintese = "sintese"
+    c._formato_sintese = "CSV"
+    c._tarefas_sintese = 4
+    c._processos_sintese = 2
+    c._janela_encadeamento = "TODOS"
+    c._tarefas_encadeamento = 4
+    c._tentativas_requisicoes = 3
+    c._atraso_hedge_leitura_rodadas = 0.0
+    c._maximo_ressubmissoes = 3
+    c._tempo_limite_estado = 0.0
+    c._atraso_ressubmissao = 0.0
+    c._porta_metricas = 0
+    c._cache_regras_reservatorios = False
+    c._autoajuste_processadores = False
+    c._orcamento_processadores = 0
+    c._casos_simultaneos = 1
+    c._modo_perfilador = "AMOSTRAGEM"
+    c._duracao_perfilador = 60.0
+    c._perfila_inicio = False
+    ClienteResiliente._clientes.clear()
+    yield c
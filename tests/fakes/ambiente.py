@@ -0,0 +1,64 @@
+from typing import List, Optional
+
+from encadeador.modelos.configuracoes import Configuracoes
+from tests.fakes.encadeador import ServicoEncadeadorFake
+from tests.fakes.flexibilizador import ServicoFlexibilizadorFake
+from tests.fakes.modelapi import ServicoModelAPIFake
+from tests.fakes.regras import ServicoRegrasReservatoriosFake
+from tests.fakes.resultados import ServicoResultadosFake
+from tests.fakes.servico import ServicoFake
+
+
+class AmbienteFake:
+    """
+    Conjunto dos serviços externos utilizados pelo encadeador,
+    iniciados localmente e configurados em :class:`Configuracoes`.
+    """
+
+    def __init__(
+        self,
+        model_api: Optional[ServicoModelAPIFake] = None,
+        result_api: Optional[ServicoResultadosFake] = None,
+        encadeador: Optional[ServicoEncadeadorFake] = None,
+        flexibilizador: Optional[ServicoFlexibilizadorFake] = None,
+        regras: Optional[ServicoRegrasReservatoriosFake] = None,
+    ):
+        self.model_api = model_api or ServicoModelAPIFake()
+        self.result_api = result_api or ServicoResultadosFake()
+        self.encadeador = encadeador or ServicoEncadeadorFake()
+        self.flexibilizador = flexibilizador or ServicoFlexibilizadorFake()
+        self.regras = regras or ServicoRegrasReservatoriosFake()
+
+    @property
+    def servicos(self) -> List[ServicoFake]:
+        return [
+            self.model_api,
+            self.result_api,
+            self.encadeador,
+            self.flexibilizador,
+            self.regras,
+        ]
+
+    def requisicoes(self) -> int:
+        return sum(sum(s.contagem.values()) for s in self.servicos)
+
+    async def inicia(self):
+        for s in self.servicos:
+            await s.inicia()
+        c = Configuracoes()
+        c._model_api = self.model_api.url
+        c._result_api = self.result_api.url.rstrip("/")
+        c._encadeador_service = self.encadeador.url
+        c._flexibilizador_service = self.flexibilizador.url
+        c._regras_reservatorios_service = self.regras.url
+
+    async def encerra(self):
+        for s in self.servicos:
+            await s.encerra()
+
+    async def __aenter__(self) -> "AmbienteFake":
+        await self.inicia()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.encerra()
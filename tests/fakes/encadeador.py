@@ -0,0 +1,37 @@
+import random
+from typing import Dict, List
+from aiohttp import web
+
+from tests.fakes.servico import ServicoFake
+
+
+class ServicoEncadeadorFake(ServicoFake):
+    """
+    Serviço de encadeamento que responde com um número fixo de
+    valores encadeados por variável.
+    """
+
+    def __init__(self, *args, valores_por_variavel: int = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.valores_por_variavel = valores_por_variavel
+        # Variáveis cujo encadeamento é recusado pelo serviço
+        self.variaveis_recusadas: Dict[str, int] = {}
+        self._rng = random.Random(0)
+
+    def rotas(self) -> List[web.RouteDef]:
+        return [web.post("/", self.encadeia)]
+
+    async def encadeia(self, request: web.Request) -> web.Response:
+        req = await request.json()
+        self.requisicoes.append(req)
+        variavel = req["variable"]
+        if variavel in self.variaveis_recusadas:
+            return web.Response(
+                status=self.variaveis_recusadas[variavel],
+                text=f"Encadeamento de {variavel} recusado",
+            )
+        resultado = [
+            {"id": f"{variavel}_{i}", "value": self._rng.uniform(0, 100)}
+            for i in range(1, self.valores_por_variavel + 1)
+        ]
+        return web.json_response({"result": resultado})
@@ -0,0 +1,35 @@
+from typing import List
+from aiohttp import web
+
+from tests.fakes.servico import ServicoFake
+
+
+class ServicoFlexibilizadorFake(ServicoFake):
+    """
+    Serviço de flexibilização que responde com um número fixo de
+    restrições flexibilizadas por requisição.
+    """
+
+    def __init__(self, *args, flexibilizacoes: int = 1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flexibilizacoes = flexibilizacoes
+
+    def rotas(self) -> List[web.RouteDef]:
+        return [web.post("/", self.flexibiliza)]
+
+    async def flexibiliza(self, request: web.Request) -> web.Response:
+        req = await request.json()
+        self.requisicoes.append(req)
+        resultado = [
+            {
+                "flexType": "RHQ",
+                "flexStage": 1,
+                "flexCode": i,
+                "flexPatamar": "1",
+                "flexLimit": "L",
+                "flexSubsystem": None,
+                "flexAmount": 1.0,
+            }
+            for i in range(1, self.flexibilizacoes + 1)
+        ]
+        return web.json_response({"result": resultado})
@@ -0,0 +1,172 @@
+from datetime import datetime
+from os.path import basename
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from aiohttp import web
+
+from encadeador.modelos.runstatus import RunStatus
+from tests.fakes.servico import Perturbacoes, ServicoFake
+
+ETAPAS_PADRAO: Tuple[Tuple[RunStatus, float], ...] = (
+    (RunStatus.SUBMITTED, 0.0),
+    (RunStatus.STARTING, 0.0),
+    (RunStatus.RUNNING, 0.0),
+)
+
+
+class LinhaTempo:
+    """
+    Sequência de estados ativos de uma rodada, com a duração de
+    cada um, em segundos, até o estado final.
+    """
+
+    def __init__(
+        self, etapas: Sequence[Tuple[RunStatus, float]] = ETAPAS_PADRAO
+    ):
+        self.etapas = list(etapas)
+
+    @property
+    def duracao(self) -> float:
+        return sum(d for _, d in self.etapas)
+
+    def estado(self, decorrido: float) -> Optional[RunStatus]:
+        """
+        Estado da rodada após o tempo decorrido desde a submissão,
+        ou `None` se a rodada já terminou.
+        """
+        for estado, duracao in self.etapas:
+            if decorrido < duracao:
+                return estado
+            decorrido -= duracao
+        return None
+
+
+class RodadaFake:
+    def __init__(
+        self,
+        run_id: int,
+        dados: Dict[str, Any],
+        desfecho: RunStatus,
+        linha_tempo: LinhaTempo,
+    ):
+        self.run_id = run_id
+        self.dados = dados
+        self.desfecho = desfecho
+        self.linha_tempo = linha_tempo
+        self.criacao = time.monotonic()
+        self.inicio = datetime.now()
+        self.fim: Optional[datetime] = None
+        self.cancelada = False
+
+    def estado(self) -> RunStatus:
+        if self.cancelada:
+            return RunStatus.RUNTIME_ERROR
+        estado = self.linha_tempo.estado(time.monotonic() - self.criacao)
+        if estado is not None:
+            return estado
+        if self.fim is None:
+            self.fim = datetime.now()
+        return self.desfecho
+
+    def to_json(self) -> Dict[str, Any]:
+        estado = self.estado()
+        return {
+            **self.dados,
+            "runId": self.run_id,
+            "status": estado.value,
+            "name": basename(str(self.dados["jobWorkingDirectory"])),
+            "jobId": str(1000 + self.run_id),
+            "jobStartTime": self.inicio.isoformat(),
+            "jobEndTime": self.fim.isoformat() if self.fim else None,
+        }
+
+
+class ServicoModelAPIFake(ServicoFake):
+    """
+    API de execução de modelos em que as rodadas avançam pelos
+    estados de uma linha do tempo. O estado final é sucesso, exceto
+    para os diretórios com inviabilidades programadas ou conforme
+    a taxa de inviabilidade, e pode ser definido por uma função.
+    """
+
+    def __init__(
+        self,
+        linha_tempo: Optional[LinhaTempo] = None,
+        taxa_inviabilidade: float = 0.0,
+        desfecho: Optional[Callable[[Dict[str, Any], int], RunStatus]] = None,
+        perturbacoes: Optional[Perturbacoes] = None,
+        semente: int = 0,
+    ):
+        super().__init__(perturbacoes)
+        self.linha_tempo = (
+            linha_tempo if linha_tempo is not None else LinhaTempo()
+        )
+        self.taxa_inviabilidade = taxa_inviabilidade
+        self.desfecho = desfecho
+        # Número de rodadas inviáveis de cada diretório antes do sucesso
+        self.inviabilidades: Dict[str, int] = {}
+        self.rodadas: Dict[int, RodadaFake] = {}
+        self._submissoes: Dict[str, int] = {}
+        self._chaves_idempotencia: Dict[str, int] = {}
+        self._rng = random.Random(semente)
+
+    def rotas(self) -> List[web.RouteDef]:
+        return [
+            web.get("/runs/", self.list_runs),
+            web.post("/runs/", self.create_run),
+            web.get("/runs/{runId}", self.read_run),
+            web.delete("/runs/{runId}", self.delete_run),
+        ]
+
+    def __desfecho(self, dados: Dict[str, Any]) -> RunStatus:
+        diretorio = str(dados["jobWorkingDirectory"])
+        n = self._submissoes.get(diretorio, 0)
+        self._submissoes[diretorio] = n + 1
+        if self.desfecho is not None:
+            return self.desfecho(dados, n)
+        if n < self.inviabilidades.get(diretorio, 0):
+            return RunStatus.INFEASIBLE
+        if self._rng.random() < self.taxa_inviabilidade:
+            return RunStatus.INFEASIBLE
+        return RunStatus.SUCCESS
+
+    def __rodada(self, request: web.Request) -> Optional[RodadaFake]:
+        try:
+            return self.rodadas.get(int(request.match_info["runId"]))
+        except ValueError:
+            return None
+
+    async def list_runs(self, request: web.Request) -> web.Response:
+        return web.json_response([r.to_json() for r in self.rodadas.values()])
+
+    async def create_run(self, request: web.Request) -> web.Response:
+        dados = await request.json()
+        self.requisicoes.append(dados)
+        chave = request.headers.get("Idempotency-Key")
+        if chave is not None and chave in self._chaves_idempotencia:
+            run_id = self._chaves_idempotencia[chave]
+            return web.json_response({"runId": run_id}, status=201)
+        if not dados.get("jobWorkingDirectory"):
+            return web.Response(status=400, text="Diretório não informado")
+        run_id = len(self.rodadas) + 1
+        self.rodadas[run_id] = RodadaFake(
+            run_id, dados, self.__desfecho(dados), self.linha_tempo
+        )
+        if chave is not None:
+            self._chaves_idempotencia[chave] = run_id
+        return web.json_response({"runId": run_id}, status=201)
+
+    async def read_run(self, request: web.Request) -> web.Response:
+        rodada = self.__rodada(request)
+        if rodada is None:
+            return web.Response(status=404, text="Rodada não encontrada")
+        return web.json_response(rodada.to_json())
+
+    async def delete_run(self, request: web.Request) -> web.Response:
+        rodada = self.__rodada(request)
+        if rodada is None:
+            return web.Response(status=404, text="Rodada não encontrada")
+        rodada.cancelada = True
+        rodada.fim = datetime.now()
+        return web.Response(status=202, text="Rodada cancelada")
@@ -0,0 +1,65 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+from aiohttp import web
+
+from tests.fakes.servico import ServicoFake
+
+# Código de resposta quando o conjunto de regras identificado não
+# está em cache
+CODIGO_CONJUNTO_REGRAS_DESCONHECIDO = 409
+
+
+class ServicoRegrasReservatoriosFake(ServicoFake):
+    """
+    Serviço de regras de reservatórios que mantém em cache os
+    conjuntos de regras recebidos, identificados pelo hash. Sem o
+    cache, exige as regras em todas as requisições.
+    """
+
+    def __init__(self, *args, com_cache: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.com_cache = com_cache
+        self.cache: Dict[str, List[Dict[str, Any]]] = {}
+
+    def rotas(self) -> List[web.RouteDef]:
+        return [web.post("/", self.aplica_regras)]
+
+    def limpa_cache(self):
+        self.cache.clear()
+
+    @staticmethod
+    def identificador(regras: List[Dict[str, Any]]) -> str:
+        return hashlib.sha256(
+            json.dumps(regras, sort_keys=True, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+
+    async def aplica_regras(self, request: web.Request) -> web.Response:
+        req = await request.json()
+        self.requisicoes.append(req)
+        identificador = req.get("rulesId")
+        if "rules" in req:
+            regras = req["rules"]
+            if self.com_cache and identificador is not None:
+                if identificador != self.identificador(regras):
+                    return web.Response(status=400, text="rulesId inválido")
+                self.cache[identificador] = regras
+        elif not self.com_cache:
+            return web.Response(status=422, text="rules obrigatório")
+        elif identificador not in self.cache:
+            return web.Response(
+                status=CODIGO_CONJUNTO_REGRAS_DESCONHECIDO,
+                text=f"Conjunto {identificador} desconhecido",
+            )
+        else:
+            regras = self.cache[identificador]
+        resultado = [
+            {
+                "reservoirCodes": [r["reservoirCode"]],
+                **{k: v for k, v in r.items() if k != "reservoirCode"},
+            }
+            for r in regras
+        ]
+        return web.json_response({"result": resultado})
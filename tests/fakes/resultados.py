@@ -0,0 +1,77 @@
+import io
+from typing import List, Set
+from zlib import crc32
+import numpy as np
+import pandas as pd  # type: ignore
+from aiohttp import web
+
+from tests.benchmarks.dados import SUBMERCADOS
+from tests.fakes.servico import ServicoFake
+
+N_ESTAGIOS = 5
+N_ENTIDADES = 10
+PATAMARES = ["1", "2", "3"]
+
+
+def resultados_sinteticos(identificador: str, variavel: str) -> pd.DataFrame:
+    """
+    Constrói uma tabela de resultados determinística para um caso e
+    uma variável, com as colunas de entidades e de estágios ou
+    patamares indicadas pelo nome da variável.
+    """
+    rng = np.random.default_rng(
+        crc32(f"{identificador}/{variavel}".encode("utf-8"))
+    )
+    partes = variavel.split("_")
+    dados = {"estagio": np.arange(1, N_ESTAGIOS + 1)}
+    df = pd.DataFrame(data=dados)
+    if "SBM" in partes:
+        df = df.merge(pd.DataFrame({"submercado": SUBMERCADOS}), how="cross")
+    elif "REE" in partes:
+        df = df.merge(
+            pd.DataFrame({"ree": np.arange(1, N_ENTIDADES + 1)}), how="cross"
+        )
+    elif "UHE" in partes or "UTE" in partes:
+        df = df.merge(
+            pd.DataFrame({"usina": np.arange(1, N_ENTIDADES + 1)}),
+            how="cross",
+        )
+    if "PAT" in partes:
+        df = df.merge(pd.DataFrame({"patamar": PATAMARES}), how="cross")
+    df["valor"] = rng.uniform(0, 1000, len(df))
+    return df
+
+
+class ServicoResultadosFake(ServicoFake):
+    """
+    API de resultados que responde com tabelas sintéticas em
+    parquet para qualquer caso e variável, exceto as ausentes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.variaveis_ausentes: Set[str] = set()
+
+    def rotas(self) -> List[web.RouteDef]:
+        return [web.get("/{identificador}/{variavel}", self.resultados)]
+
+    async def resultados(self, request: web.Request) -> web.Response:
+        identificador = request.match_info["identificador"]
+        variavel = request.match_info["variavel"]
+        self.requisicoes.append(
+            {
+                "id": identificador,
+                "variable": variavel,
+                **dict(request.query),
+            }
+        )
+        if variavel in self.variaveis_ausentes:
+            return web.Response(status=404, text="Variável não encontrada")
+        df = resultados_sinteticos(identificador, variavel)
+        if "estagio" in request.query:
+            df = df.loc[df["estagio"] == int(request.query["estagio"])]
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        return web.Response(
+            body=buffer.getvalue(), content_type="application/octet-stream"
+        )
@@ -0,0 +1,101 @@
+import asyncio
+from collections import Counter
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from aiohttp import web
+
+
+class Perturbacoes:
+    """
+    Latência e falhas injetadas nas respostas de um serviço fake.
+    As falhas podem ser programadas, com os códigos das próximas
+    respostas, ou sorteadas com uma taxa de erros.
+    """
+
+    def __init__(
+        self,
+        latencia: float = 0.0,
+        variacao_latencia: float = 0.0,
+        taxa_erros: float = 0.0,
+        codigo_erro: int = 503,
+        semente: int = 0,
+    ):
+        self.latencia = latencia
+        self.variacao_latencia = variacao_latencia
+        self.taxa_erros = taxa_erros
+        self.codigo_erro = codigo_erro
+        self.erros_programados: List[int] = []
+        self._rng = random.Random(semente)
+
+    def programa_erros(self, *codigos: int):
+        self.erros_programados.extend(codigos)
+
+    def atraso(self) -> float:
+        variacao = self._rng.uniform(0, self.variacao_latencia)
+        return self.latencia + variacao
+
+    def erro(self) -> Optional[int]:
+        if len(self.erros_programados) > 0:
+            return self.erros_programados.pop(0)
+        if self.taxa_erros > 0 and self._rng.random() < self.taxa_erros:
+            return self.codigo_erro
+        return None
+
+
+class ServicoFake:
+    """
+    Servidor HTTP local que substitui um serviço externo nos testes,
+    registrando as requisições recebidas.
+    """
+
+    def __init__(self, perturbacoes: Optional[Perturbacoes] = None):
+        self.requisicoes: List[Dict[str, Any]] = []
+        self.contagem: Counter = Counter()
+        self.perturbacoes = (
+            perturbacoes if perturbacoes is not None else Perturbacoes()
+        )
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    def rotas(self) -> List[web.RouteDef]:
+        raise NotImplementedError
+
+    @web.middleware
+    async def _perturba(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        rota = request.match_info.route.resource
+        nome = rota.canonical if rota is not None else request.path
+        self.contagem[f"{request.method} {nome}"] += 1
+        atraso = self.perturbacoes.atraso()
+        if atraso > 0:
+            await asyncio.sleep(atraso)
+        codigo = self.perturbacoes.erro()
+        if codigo is not None:
+            return web.Response(status=codigo, text="Falha injetada")
+        return await handler(request)
+
+    async def inicia(self) -> str:
+        app = web.Application(middlewares=[self._perturba])
+        app.add_routes(self.rotas())
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        porta = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{porta}/"
+        return self.url
+
+    async def encerra(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "ServicoFake":
+        await self.inicia()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.encerra()
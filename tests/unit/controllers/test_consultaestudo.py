@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from os.path import join
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from encadeador.adapters.orm import registry
+from encadeador.adapters.repository.caso import (
+    JSONCasoRepository,
+    SQLCasoRepository,
+)
+from encadeador.adapters.repository.estudo import SQLEstudoRepository
+from encadeador.adapters.repository.fase import (
+    JSONFaseRepository,
+    SQLFaseRepository,
+)
+from encadeador.adapters.repository.rodada import (
+    JSONRodadaRepository,
+    SQLRodadaRepository,
+)
+from encadeador.controladores.consultaestudo import ConsultaEstudo
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.fase import Fase
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+
+INICIO = datetime(2023, 1, 1, 12, 0, 0)
+
+
+def cria_dados(casos_repo, rodadas_repo, fases_repo):
+    for i, estado in enumerate([EstadoCaso.CONCLUIDO, EstadoCaso.EXECUTANDO]):
+        casos_repo.create(
+            Caso(
+                f"caso{i}",
+                f"Caso {i}",
+                2023,
+                i + 1,
+                0,
+                Programa.DECOMP,
+                estado,
+                1,
+            )
+        )
+    for id_job, estado, id_caso in [
+        ("10", RunStatus.SUCCESS, 1),
+        ("11", RunStatus.INFEASIBLE, 2),
+        ("12", RunStatus.RUNNING, 2),
+    ]:
+        rodadas_repo.create(
+            Rodada(
+                "rodada",
+                estado,
+                id_job,
+                f"caso{id_caso}",
+                INICIO,
+                INICIO + timedelta(seconds=3),
+                72,
+                "DECOMP",
+                "v31",
+                id_caso,
+            )
+        )
+    for nome, duracao, id_caso in [
+        ("preparacao", 0.25, 1),
+        ("preparacao", 0.75, 2),
+        ("submissao", 0.1, 2),
+    ]:
+        fases_repo.create(
+            Fase(
+                nome,
+                INICIO,
+                INICIO + timedelta(seconds=duracao),
+                duracao,
+                True,
+                id_caso,
+            )
+        )
+
+
+def confere_consultas(consulta: ConsultaEstudo):
+    with consulta:
+        status = consulta.status().splitlines()
+        status_caso = consulta.status(1).splitlines()
+        rodadas = consulta.rodadas().splitlines()
+        ativas = consulta.rodadas(ativas=True).splitlines()
+    assert status[0] == "Casos: 2 (EXECUTANDO 1, CONCLUIDO 1)"
+    assert status[3].split() == [
+        "1",
+        "Caso",
+        "0",
+        "DECOMP",
+        "CONCLUIDO",
+        "10",
+        "SUCCESS",
+        "0",
+    ]
+    assert status[4].split()[-3:] == ["12", "RUNNING", "1"]
+    assert status[7].split() == ["preparacao", "2", "1000", "500", "750"]
+    assert status[8].split() == ["submissao", "1", "100", "100", "100"]
+    assert status_caso[-1].split() == [
+        "preparacao",
+        "1",
+        "250",
+        "250",
+        "250",
+    ]
+    assert len(rodadas) == 4
+    assert rodadas[1].split()[-2:] == ["3000", "72"]
+    assert len(ativas) == 2
+    assert ativas[1].split()[3:5] == ["12", "RUNNING"]
+
+
+def test_consulta_estudo_sql(mappers, tmp_path):
+    engine = create_engine(f"sqlite:///{join(tmp_path, 'data.db')}")
+    registry.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    SQLEstudoRepository(session).create(
+        Estudo(str(tmp_path), "estudo", EstadoEstudo.EXECUTANDO)
+    )
+    cria_dados(
+        SQLCasoRepository(session),
+        SQLRodadaRepository(session),
+        SQLFaseRepository(session),
+    )
+    session.commit()
+    session.close()
+
+    consulta = ConsultaEstudo("SQL", str(tmp_path))
+    assert consulta.existe
+    confere_consultas(consulta)
+    with consulta:
+        with pytest.raises(OperationalError):
+            consulta._session.execute(text("DELETE FROM casos"))
+
+
+def test_consulta_estudo_json(tmp_path):
+    consulta = ConsultaEstudo("JSON", str(tmp_path))
+    assert not consulta.existe
+    cria_dados(
+        JSONCasoRepository(str(tmp_path)),
+        JSONRodadaRepository(str(tmp_path)),
+        JSONFaseRepository(str(tmp_path)),
+    )
+    assert consulta.existe
+    confere_consultas(consulta)
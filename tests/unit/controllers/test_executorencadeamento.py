@@ -0,0 +1,91 @@
+import asyncio
+from typing import Dict
+from unittest.mock import MagicMock, patch
+
+from encadeador.controladores.executorencadeamento import (
+    ExecutorEncadeamento,
+)
+from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.programa import Programa
+
+
+def cria_caso(programa: Programa) -> Caso:
+    return Caso(
+        f"2021_01_rv0/{programa.value.lower()}",
+        "teste",
+        2021,
+        1,
+        0,
+        programa,
+        EstadoCaso.NAO_INICIADO,
+        1,
+    )
+
+
+def test_agrupa_variaveis_arquivos_comuns(configuracoes):
+    decomp = ExecutorEncadeamento(cria_caso(Programa.DECOMP), [])
+    assert decomp.agrupa(["VARM", "GNL", "TVIAGEM"]) == [
+        ["VARM", "TVIAGEM"],
+        ["GNL"],
+    ]
+    newave = ExecutorEncadeamento(cria_caso(Programa.NEWAVE), [])
+    assert newave.agrupa(["VARM", "GNL", "ENA"]) == [
+        ["VARM"],
+        ["GNL"],
+        ["ENA"],
+    ]
+    # Variáveis desconhecidas conflitam com todas as demais
+    assert newave.agrupa(["VARM", "GNL", "OUTRA"]) == [
+        ["VARM", "GNL", "OUTRA"]
+    ]
+
+
+def test_encadeia_grupos_concorrentes(configuracoes):
+    ativos = []
+    maximo_ativos = []
+    ordem = []
+
+    async def encadeia(casos_anteriores, caso, variavel):
+        ativos.append(variavel)
+        maximo_ativos.append(len(ativos))
+        await asyncio.sleep(0.01)
+        ativos.remove(variavel)
+        ordem.append(variavel)
+        if variavel == "GNL":
+            return HTTPResponse(code=500, detail="erro")
+        return []
+
+    executor = ExecutorEncadeamento(cria_caso(Programa.DECOMP), [])
+    with patch(
+        "encadeador.controladores.executorencadeamento"
+        + ".EncadeadorAPIRepository.encadeia",
+        encadeia,
+    ), patch("encadeador.controladores.executorencadeamento.Log", MagicMock()):
+        sucesso = asyncio.run(executor.encadeia(["VARM", "TVIAGEM", "GNL"]))
+    assert not sucesso
+    assert max(maximo_ativos) == 2
+    assert ordem.index("VARM") < ordem.index("TVIAGEM")
+
+
+def test_encadeia_variaveis_independentes_simultaneamente(configuracoes):
+    iniciadas: Dict[str, asyncio.Event] = {}
+    outra = {"VARM": "ENA", "ENA": "VARM"}
+
+    async def encadeia(casos_anteriores, caso, variavel):
+        # Cada variável só termina depois que a outra foi iniciada,
+        # o que não ocorre se forem encadeadas em sequência
+        for v in outra:
+            iniciadas.setdefault(v, asyncio.Event())
+        iniciadas[variavel].set()
+        await asyncio.wait_for(iniciadas[outra[variavel]].wait(), 1.0)
+        return []
+
+    executor = ExecutorEncadeamento(cria_caso(Programa.NEWAVE), [])
+    with patch(
+        "encadeador.controladores.executorencadeamento"
+        + ".EncadeadorAPIRepository.encadeia",
+        encadeia,
+    ), patch("encadeador.controladores.executorencadeamento.Log", MagicMock()):
+        assert asyncio.run(executor.encadeia(["VARM", "ENA"]))
@@ -0,0 +1,51 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from encadeador.controladores.filasintese import FilaSintese
+
+
+def test_fila_sintese_nao_bloqueia_e_persiste(configuracoes):
+    liberada = asyncio.Event()
+
+    async def sintetiza(*args):
+        await liberada.wait()
+
+    m = AsyncMock(side_effect=sintetiza)
+
+    async def executa():
+        fila = FilaSintese(1, MagicMock())
+        fila.solicita(1)
+        fila.solicita(2)
+        await asyncio.sleep(0)
+        assert fila.pendentes == 2
+        assert FilaSintese(1, MagicMock()).pendentes == 2
+        liberada.set()
+        await fila.aguarda()
+        assert fila.pendentes == 0
+        assert FilaSintese(1, MagicMock()).pendentes == 0
+
+    with patch(
+        "encadeador.controladores.filasintese.handlers.sintetiza_resultados",
+        m,
+    ), patch("encadeador.controladores.filasintese.Log", MagicMock()):
+        asyncio.run(executa())
+    assert m.await_count == 1
+
+
+def test_fila_sintese_retoma_apos_erro(configuracoes):
+    m = AsyncMock(side_effect=[ValueError(), None])
+
+    async def executa():
+        fila = FilaSintese(1, MagicMock())
+        fila.solicita(1)
+        await asyncio.sleep(0)
+        assert fila.pendentes == 1
+        await fila.aguarda()
+        assert fila.pendentes == 0
+
+    with patch(
+        "encadeador.controladores.filasintese.handlers.sintetiza_resultados",
+        m,
+    ), patch("encadeador.controladores.filasintese.Log", MagicMock()):
+        asyncio.run(executa())
+    assert m.await_count == 2
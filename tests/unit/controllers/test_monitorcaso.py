@@ -0,0 +1,426 @@
+import asyncio
+from datetime import datetime
+from os import makedirs
+from os.path import join
+from unittest.mock import MagicMock, patch
+import pandas as pd  # type: ignore
+
+from encadeador.adapters.repository.apis import ModelAPIRepository
+from encadeador.adapters.repository.fase import SQLFaseRepository
+from encadeador.controladores.monitorcaso import MonitorCaso
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+from encadeador.modelos.transicaocaso import TransicaoCaso
+from encadeador.services.handlers.caso import ETAPA_PREPARACAO
+import encadeador.utils.fases as fases
+from encadeador.utils.fases import fase
+from encadeador.services.unitofwork.caso import SQLCasoUnitOfWork
+from encadeador.services.unitofwork.estudo import SQLEstudoUnitOfWork
+from encadeador.services.unitofwork.etapapreparacao import (
+    SQLEtapaPreparacaoUnitOfWork,
+)
+from encadeador.services.unitofwork.fase import SQLFaseUnitOfWork
+from encadeador.services.unitofwork.rodada import SQLRodadaUnitOfWork
+from tests.fakes.ambiente import AmbienteFake
+from tests.fakes.modelapi import LinhaTempo, ServicoModelAPIFake
+from tests.unit.repository.test_apis_fakes import cria_run
+
+CAMINHO_CASO = "2021_01_rv0/decomp"
+
+
+def cria_caso(session_factory, estado: EstadoCaso) -> int:
+    with SQLEstudoUnitOfWork(lambda: session_factory) as uow:
+        uow.estudos.create(Estudo("/estudo", "estudo", EstadoEstudo.INICIADO))
+        uow.commit()
+    with SQLCasoUnitOfWork(lambda: session_factory) as uow:
+        caso = Caso(
+            CAMINHO_CASO,
+            "teste",
+            2021,
+            1,
+            0,
+            Programa.DECOMP,
+            estado,
+            1,
+        )
+        uow.casos.create(caso)
+        uow.commit()
+        return caso.id
+
+
+def cria_monitor(session_factory, id_caso: int) -> MonitorCaso:
+    return MonitorCaso(
+        id_caso,
+        SQLCasoUnitOfWork(lambda: session_factory),
+        SQLRodadaUnitOfWork(lambda: session_factory),
+        SQLFaseUnitOfWork(lambda: session_factory),
+        SQLEtapaPreparacaoUnitOfWork(lambda: session_factory),
+    )
+
+
+def executa(model_api: ServicoModelAPIFake, f):
+    async def roda():
+        async with AmbienteFake(model_api=model_api):
+            return await f()
+
+    # Descarta o estado mantido entre os testes
+    fases.descarrega()
+    with patch("encadeador.adapters.repository.apis.Log", MagicMock()), patch(
+        "encadeador.controladores.monitorcaso.Log", MagicMock()
+    ), patch("encadeador.services.handlers.caso.Log", MagicMock()), patch(
+        "encadeador.services.handlers.rodada.Log", MagicMock()
+    ), patch(
+        "encadeador.services.handlers.etapapreparacao.Log", MagicMock()
+    ):
+        return asyncio.run(roda())
+
+
+def test_retoma_rodada_ativa(mappers, sqlite_session_factory, configuracoes):
+    caminho = join(configuracoes.caminho_base_estudo, CAMINHO_CASO)
+    makedirs(caminho)
+    model_api = ServicoModelAPIFake(
+        LinhaTempo([(RunStatus.SUBMITTED, 0.0), (RunStatus.RUNNING, 0.2)])
+    )
+    id_caso = cria_caso(sqlite_session_factory, EstadoCaso.EXECUTANDO)
+
+    async def f():
+        # Rodada submetida antes da interrupção do encadeador
+        id_rodada = await ModelAPIRepository.create_run(cria_run(caminho))
+        run = await ModelAPIRepository.read_run(id_rodada)
+        # Rodada ativa que o serviço não conhece mais
+        perdida = Rodada.from_run(run, id_caso)
+        perdida.id = 99
+        with SQLRodadaUnitOfWork(lambda: sqlite_session_factory) as uow:
+            uow.rodadas.create(Rodada.from_run(run, id_caso))
+            uow.rodadas.create(perdida)
+            uow.commit()
+        # Rodada criada no serviço, mas não registrada
+        id_nao_registrada = await ModelAPIRepository.create_run(
+            cria_run(caminho)
+        )
+
+        monitor = cria_monitor(sqlite_session_factory, id_caso)
+        transicoes = []
+
+        async def observa(t):
+            transicoes.append(t)
+
+        monitor.observa(observa)
+        await monitor.inicializa()
+        retomada = monitor._rodada_id
+        await asyncio.sleep(0.3)
+        await monitor.monitora()
+        return id_rodada, id_nao_registrada, retomada, transicoes
+
+    id_rodada, id_nao_registrada, retomada, transicoes = executa(model_api, f)
+    # Nenhuma nova submissão
+    assert len(model_api.rodadas) == 2
+    assert retomada == id_nao_registrada
+    assert transicoes == [
+        TransicaoCaso.INICIO_EXECUCAO_SUCESSO,
+        TransicaoCaso.CONCLUIDO,
+    ]
+    with SQLRodadaUnitOfWork(lambda: sqlite_session_factory) as uow:
+        rodadas = uow.rodadas.list_by_caso(id_caso)
+        assert sorted(r.id for r in rodadas) == [id_rodada, id_nao_registrada]
+        estados = {r.id: r.estado for r in rodadas}
+        assert estados[id_rodada] == RunStatus.RUNNING
+        assert estados[id_nao_registrada] == RunStatus.SUCCESS
+
+
+def test_inicializa_caso_sem_rodadas(
+    mappers, sqlite_session_factory, configuracoes
+):
+    makedirs(join(configuracoes.caminho_base_estudo, CAMINHO_CASO))
+    id_caso = cria_caso(sqlite_session_factory, EstadoCaso.PREPARADO)
+    monitor = cria_monitor(sqlite_session_factory, id_caso)
+    transicoes = []
+
+    async def observa(t):
+        transicoes.append(t)
+
+    async def f():
+        monitor.observa(observa)
+        await monitor.inicializa()
+
+    executa(ServicoModelAPIFake(), f)
+    assert monitor._rodada_id is None
+    assert transicoes == [TransicaoCaso.INICIALIZADO]
+    with SQLCasoUnitOfWork(lambda: sqlite_session_factory) as uow:
+        assert uow.casos.read(id_caso).estado == EstadoCaso.INICIADO
+
+
+def test_prepara_deck_ja_preparado(
+    mappers, sqlite_session_factory, configuracoes
+):
+    caminho = join(configuracoes.caminho_base_estudo, CAMINHO_CASO)
+    makedirs(caminho)
+    arquivo = join(caminho, "dadger.rv0")
+    with open(arquivo, "w") as arq:
+        arq.write("TE  ESTUDO\n")
+    id_caso = cria_caso(sqlite_session_factory, EstadoCaso.INICIADO)
+    monitor = cria_monitor(sqlite_session_factory, id_caso)
+    preparador = MagicMock()
+    preparador.contexto = []
+    regras = MagicMock()
+
+    async def prepara():
+        with open(arquivo, "a") as arq:
+            arq.write("NI  100\n")
+        return True
+
+    preparador.prepara = MagicMock(side_effect=prepara)
+    transicoes = []
+
+    async def observa(t):
+        transicoes.append(t)
+
+    async def f():
+        monitor.observa(observa)
+        with patch(
+            "encadeador.services.handlers.caso.PreparadorCaso.factory",
+            return_value=preparador,
+        ), patch.object(MonitorCaso, "_MonitorCaso__sintetiza_casos_rodadas"):
+            for _ in range(2):
+                await monitor.prepara(regras)
+            # Uma alteração no deck exige uma nova preparação
+            with open(arquivo, "a") as arq:
+                arq.write("GP  0.001\n")
+            await monitor.prepara(regras)
+
+    executa(ServicoModelAPIFake(), f)
+    assert preparador.prepara.call_count == 2
+    assert transicoes.count(TransicaoCaso.PREPARA_EXECUCAO_SUCESSO) == 3
+    with SQLEtapaPreparacaoUnitOfWork(lambda: sqlite_session_factory) as uow:
+        etapas = [e.nome for e in uow.etapas.list_by_caso(id_caso)]
+        assert etapas.count(ETAPA_PREPARACAO) == 2
+
+
+def test_sintese_fases_incremental(
+    mappers, sqlite_session_factory, configuracoes
+):
+    id_caso = cria_caso(sqlite_session_factory, EstadoCaso.EXECUTANDO)
+    monitor = cria_monitor(sqlite_session_factory, id_caso)
+    sintetiza = monitor._MonitorCaso__sintetiza_casos_rodadas
+
+    async def f():
+        with fase("preparacao", id_caso):
+            pass
+        await sintetiza()
+        with fase("submissao", id_caso):
+            pass
+        await sintetiza()
+
+    with patch.object(
+        SQLFaseRepository,
+        "list_after",
+        autospec=True,
+        side_effect=SQLFaseRepository.list_after,
+    ) as list_after:
+        executa(ServicoModelAPIFake(), f)
+    # Cada síntese lê somente as fases ainda não sintetizadas
+    assert [c.args[1] for c in list_after.call_args_list] == [0, 1]
+    caminho = join(configuracoes.caminho_base_estudo, "sintese")
+    df_fases = pd.read_csv(join(caminho, "FASES.csv"))
+    assert df_fases["id"].tolist() == [1, 2, 3]
+    assert df_fases["nome"].tolist() == [
+        "preparacao",
+        "sintese_casos",
+        "submissao",
+    ]
+    df_casos = pd.read_csv(join(caminho, "CASOS.csv"))
+    assert {"tempo_preparacao", "tempo_submissao"} <= set(df_casos.columns)
+
+
+def executa_caso(session_factory, configuracoes, model_api, monitoramentos):
+    """
+    Submete um caso preparado e o monitora, retornando as transições
+    observadas e as rodadas registradas.
+    """
+    makedirs(join(configuracoes.caminho_base_estudo, CAMINHO_CASO))
+    configuracoes._versao_decomp = "v31"
+    configuracoes._processadores_decomp = 72
+    id_caso = cria_caso(session_factory, EstadoCaso.PREPARADO)
+    monitor = cria_monitor(session_factory, id_caso)
+    transicoes = []
+
+    async def observa(t):
+        transicoes.append(t)
+
+    async def f():
+        monitor.observa(observa)
+        await monitor.inicia_execucao()
+        for _ in range(monitoramentos):
+            await asyncio.sleep(0.06)
+            await monitor.monitora()
+
+    executa(model_api, f)
+    with SQLRodadaUnitOfWork(lambda: session_factory) as uow:
+        rodadas = sorted(uow.rodadas.list_by_caso(id_caso), key=lambda r: r.id)
+        estados = [r.estado for r in rodadas]
+    return transicoes, estados
+
+
+def test_ressubmete_erro_comunicacao(
+    mappers, sqlite_session_factory, configuracoes
+):
+    model_api = ServicoModelAPIFake(
+        desfecho=lambda dados, n: (
+            RunStatus.COMMUNICATION_ERROR if n == 0 else RunStatus.SUCCESS
+        )
+    )
+    transicoes, estados = executa_caso(
+        sqlite_session_factory, configuracoes, model_api, 3
+    )
+    assert estados == [RunStatus.COMMUNICATION_ERROR, RunStatus.SUCCESS]
+    assert transicoes[-1] == TransicaoCaso.CONCLUIDO
+    assert transicoes.count(TransicaoCaso.INICIO_EXECUCAO_SUCESSO) == 2
+
+
+def test_ressubmete_rodada_parada(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._maximo_ressubmissoes = 1
+    configuracoes._tempo_limite_estado = 0.05
+    model_api = ServicoModelAPIFake(LinhaTempo([(RunStatus.SUBMITTED, 10.0)]))
+    transicoes, estados = executa_caso(
+        sqlite_session_factory, configuracoes, model_api, 4
+    )
+    # Cada tentativa é cancelada e mantida no histórico
+    assert estados == [RunStatus.UNKNOWN, RunStatus.UNKNOWN]
+    assert all(r.cancelada for r in model_api.rodadas.values())
+    assert transicoes[-1] == TransicaoCaso.ERRO
+    assert transicoes.count(TransicaoCaso.INICIO_EXECUCAO_SUCESSO) == 2
+
+
+def test_rodada_parada_apos_retomada(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._maximo_ressubmissoes = 1
+    configuracoes._tempo_limite_estado = 0.5
+    model_api = ServicoModelAPIFake(
+        LinhaTempo([(RunStatus.SUBMITTED, 0.0), (RunStatus.STARTING, 10.0)])
+    )
+    _, estados = executa_caso(
+        sqlite_session_factory, configuracoes, model_api, 1
+    )
+    assert estados == [RunStatus.STARTING]
+    with SQLRodadaUnitOfWork(lambda: sqlite_session_factory) as uow:
+        entrada = uow.rodadas.list()[0].instante_entrada_estado
+    assert entrada is not None
+    # Após reiniciar o encadeador, o tempo no estado é contado a
+    # partir da entrada registrada, e não da retomada
+    monitor = cria_monitor(sqlite_session_factory, 1)
+
+    async def f():
+        await asyncio.sleep(0.5)
+        await monitor.inicializa()
+        await monitor.monitora()
+
+    executa(model_api, f)
+    with SQLRodadaUnitOfWork(lambda: sqlite_session_factory) as uow:
+        rodadas = sorted(uow.rodadas.list(), key=lambda r: r.id)
+        assert rodadas[0].estado == RunStatus.UNKNOWN
+
+
+def test_flexibiliza_apos_ressubmissao(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._maximo_flexibilizacoes_revisao = 1
+    desfechos = [
+        RunStatus.COMMUNICATION_ERROR,
+        RunStatus.INFEASIBLE,
+        RunStatus.SUCCESS,
+    ]
+    model_api = ServicoModelAPIFake(desfecho=lambda dados, n: desfechos[n])
+    with patch.object(MonitorCaso, "_MonitorCaso__sintetiza_casos_rodadas"):
+        transicoes, estados = executa_caso(
+            sqlite_session_factory, configuracoes, model_api, 5
+        )
+    # A ressubmissão não consome o limite de flexibilizações
+    assert estados == desfechos
+    assert transicoes[-1] == TransicaoCaso.CONCLUIDO
+    with SQLCasoUnitOfWork(lambda: sqlite_session_factory) as uow:
+        caso = uow.casos.list()[0]
+        assert caso.numero_ressubmissoes == 1
+        assert caso.numero_flexibilizacoes == 1
+
+
+def test_limite_ressubmissoes_apos_retomada(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._maximo_ressubmissoes = 1
+    configuracoes._tempo_limite_estado = 0.05
+    model_api = ServicoModelAPIFake(LinhaTempo([(RunStatus.SUBMITTED, 10.0)]))
+    transicoes, estados = executa_caso(
+        sqlite_session_factory, configuracoes, model_api, 1
+    )
+    assert estados == [RunStatus.UNKNOWN]
+    # Um novo monitor, como após reiniciar o encadeador, mantém a
+    # contagem das ressubmissões já feitas
+    monitor = cria_monitor(sqlite_session_factory, 1)
+    transicoes = []
+
+    async def observa(t):
+        transicoes.append(t)
+
+    async def f():
+        monitor.observa(observa)
+        await monitor.inicia_execucao()
+        for _ in range(2):
+            await asyncio.sleep(0.06)
+            await monitor.monitora()
+
+    executa(model_api, f)
+    assert transicoes[-1] == TransicaoCaso.ERRO
+    assert transicoes.count(TransicaoCaso.INICIO_EXECUCAO_SUCESSO) == 1
+
+
+def test_aguarda_processadores(mappers, sqlite_session_factory, configuracoes):
+    makedirs(join(configuracoes.caminho_base_estudo, CAMINHO_CASO))
+    configuracoes._versao_decomp = "v31"
+    configuracoes._processadores_decomp = 72
+    configuracoes._autoajuste_processadores = True
+    configuracoes._orcamento_processadores = 60
+    id_caso = cria_caso(sqlite_session_factory, EstadoCaso.PREPARADO)
+    # Rodada de outro estudo ocupando parte do orçamento
+    ocupante = Rodada(
+        "outro",
+        RunStatus.RUNNING,
+        "1",
+        "/outro",
+        datetime(2023, 1, 1),
+        None,
+        48,
+        "NEWAVE",
+        "v28",
+        id_caso + 1,
+    )
+    ocupante.id = 99
+    rodada_uow = SQLRodadaUnitOfWork(lambda: sqlite_session_factory)
+    with rodada_uow:
+        rodada_uow.rodadas.create(ocupante)
+        rodada_uow.commit()
+        id_ocupante = ocupante.id
+    model_api = ServicoModelAPIFake()
+    monitor = cria_monitor(sqlite_session_factory, id_caso)
+
+    async def f():
+        await monitor.inicia_execucao()
+        submetidas = len(model_api.rodadas)
+        with rodada_uow:
+            r = rodada_uow.rodadas.read(id_ocupante)
+            r.estado = RunStatus.SUCCESS
+            rodada_uow.rodadas.update(r)
+            rodada_uow.commit()
+        await monitor.monitora()
+        return submetidas
+
+    assert executa(model_api, f) == 0
+    assert len(model_api.rodadas) == 1
+    assert monitor._rodada_id is not None
@@ -0,0 +1,185 @@
+import asyncio
+from os.path import join
+from unittest.mock import AsyncMock, MagicMock, patch
+from zipfile import ZipFile
+
+from encadeador.controladores.preparadorcaso import PreparadorCaso
+import encadeador.domain.commands as commands
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
+from encadeador.modelos.programa import Programa
+import encadeador.services.handlers.caso as handlers
+from encadeador.services.unitofwork.caso import SQLCasoUnitOfWork
+from encadeador.services.unitofwork.estudo import SQLEstudoUnitOfWork
+from encadeador.services.unitofwork.etapapreparacao import (
+    SQLEtapaPreparacaoUnitOfWork,
+)
+from tests.benchmarks.e2e import cria_deck_decomp, cria_deck_newave
+from tests.unit.model.test_indiceregrasreservatorios import cria_regra
+
+
+def cria_casos(session_factory):
+    with SQLEstudoUnitOfWork(lambda: session_factory) as uow:
+        uow.estudos.create(Estudo("/estudo", "estudo", EstadoEstudo.INICIADO))
+        uow.commit()
+    casos = []
+    for i, programa in enumerate([Programa.NEWAVE, Programa.DECOMP]):
+        nome = programa.value.lower()
+        args = (f"2021_01_rv0/{nome}", nome, 2021, 1, 0, programa)
+        with SQLCasoUnitOfWork(lambda: session_factory) as uow:
+            uow.casos.create(Caso(*args, EstadoCaso.INICIADO, 1))
+            uow.commit()
+        # Cópia desvinculada da sessão, para uso pelo preparador
+        caso = Caso(*args, EstadoCaso.INICIADO, 1)
+        caso.id = i + 1
+        casos.append(caso)
+    return casos
+
+
+def test_prepara_decomp_pula_etapas_inalteradas(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._adequa_decks_decomp = True
+    configuracoes._maximo_iteracoes_decomp = 500
+    configuracoes._script_converte_codificacao = "true"
+    base = configuracoes.caminho_base_estudo
+    caminho_newave = join(base, "2021_01_rv0", "newave")
+    caminho_decomp = join(base, "2021_01_rv0", "decomp")
+    cria_deck_newave(caminho_newave, 2021, 1)
+    cria_deck_decomp(caminho_decomp)
+    with ZipFile(join(caminho_newave, "cortes_1.zip"), "w") as arq:
+        arq.writestr("cortesh.dat", "cabecalho\n")
+        arq.writestr("cortes-002.dat", "cortes\n")
+    newave, decomp = cria_casos(sqlite_session_factory)
+    etapa_uow = SQLEtapaPreparacaoUnitOfWork(lambda: sqlite_session_factory)
+
+    def prepara():
+        preparador = PreparadorCaso.factory(decomp, [newave], etapa_uow)
+        return asyncio.run(preparador.prepara())
+
+    def etapas():
+        with etapa_uow:
+            return [e.nome for e in etapa_uow.etapas.list_by_caso(2)]
+
+    with patch(
+        "encadeador.controladores.preparadorcaso.Log", MagicMock()
+    ), patch("encadeador.services.handlers.etapapreparacao.Log", MagicMock()):
+        assert prepara()
+        assert etapas() == ["extracao_cortes", "adequacao_dadger"]
+        with open(join(caminho_decomp, "dadger.rv0")) as arq:
+            dadger = arq.read()
+        assert "500" in dadger
+        # Sem alterações, nenhuma etapa é executada novamente
+        assert prepara()
+        assert len(etapas()) == 2
+        # Um novo parâmetro só refaz a etapa que depende dele
+        configuracoes._maximo_iteracoes_decomp = 600
+        assert prepara()
+        assert etapas() == [
+            "extracao_cortes",
+            "adequacao_dadger",
+            "adequacao_dadger",
+        ]
+
+
+def test_prepara_caso_refaz_etapas_da_cadeia(
+    mappers, sqlite_session_factory, configuracoes
+):
+    configuracoes._adequa_decks_decomp = True
+    configuracoes._maximo_iteracoes_decomp = 500
+    configuracoes._script_converte_codificacao = "true"
+    configuracoes._variaveis_encadeadas_decomp = ["VARM"]
+    base = configuracoes.caminho_base_estudo
+    caminho_newave = join(base, "2021_01_rv0", "newave")
+    caminho_decomp = join(base, "2021_01_rv0", "decomp")
+    cria_deck_newave(caminho_newave, 2021, 1)
+    cria_deck_decomp(caminho_decomp)
+    with ZipFile(join(caminho_newave, "cortes_1.zip"), "w") as arq:
+        arq.writestr("cortesh.dat", "cabecalho\n")
+        arq.writestr("cortes-002.dat", "cortes\n")
+    cria_casos(sqlite_session_factory)
+    # DECOMP anterior, fonte do encadeamento
+    with SQLCasoUnitOfWork(lambda: sqlite_session_factory) as uow:
+        uow.casos.create(
+            Caso(
+                "2020_12_rv4/decomp",
+                "anterior",
+                2020,
+                12,
+                4,
+                Programa.DECOMP,
+                EstadoCaso.CONCLUIDO,
+                1,
+            )
+        )
+        uow.commit()
+    etapa_uow = SQLEtapaPreparacaoUnitOfWork(lambda: sqlite_session_factory)
+    executadas = []
+
+    def altera_dadger(nome: str):
+        async def altera(*args):
+            executadas.append(nome)
+            with open(join(caminho_decomp, "dadger.rv0"), "a") as arq:
+                arq.write(f"& {nome}\n")
+            return [] if nome == "regras" else True
+
+        return altera
+
+    executor = MagicMock()
+    executor.return_value.encadeia = AsyncMock(
+        side_effect=altera_dadger("encadeamento")
+    )
+    aplica_regras = AsyncMock(side_effect=altera_dadger("regras"))
+
+    def prepara(regras):
+        comando = commands.PreparaCaso(2, IndiceRegrasReservatorios(regras))
+        caso_uow = SQLCasoUnitOfWork(lambda: sqlite_session_factory)
+        return asyncio.run(handlers.prepara(comando, caso_uow, etapa_uow))
+
+    def etapas():
+        with etapa_uow:
+            return [e.nome for e in etapa_uow.etapas.list_by_caso(2)]
+
+    with patch(
+        "encadeador.controladores.preparadorcaso.Log", MagicMock()
+    ), patch(
+        "encadeador.services.handlers.etapapreparacao.Log", MagicMock()
+    ), patch(
+        "encadeador.services.handlers.caso.Log", MagicMock()
+    ), patch(
+        "encadeador.services.handlers.caso.ExecutorEncadeamento", executor
+    ), patch(
+        "encadeador.services.handlers.caso.RegrasReservatoriosAPIRepository"
+        + ".aplica_regras",
+        aplica_regras,
+    ):
+        assert prepara([cria_regra(6, None, None)])
+        assert executadas == ["encadeamento", "regras"]
+        assert etapas().count("adequacao_dadger") == 1
+        # Outras regras refazem somente a aplicação das regras, embora
+        # as etapas anteriores tenham arquivos alterados pelas seguintes
+        assert prepara([cria_regra(6, None, None), cria_regra(7, None, None)])
+        assert executadas == ["encadeamento", "regras", "regras"]
+        assert etapas().count("adequacao_dadger") == 1
+        # Um novo parâmetro da adequação refaz as etapas seguintes
+        configuracoes._maximo_iteracoes_decomp = 600
+        assert prepara([cria_regra(6, None, None), cria_regra(7, None, None)])
+        assert executadas == [
+            "encadeamento",
+            "regras",
+            "regras",
+            "encadeamento",
+            "regras",
+        ]
+        assert etapas().count("adequacao_dadger") == 2
+        # Um deck alterado fora da cadeia refaz todas as etapas
+        with open(join(caminho_decomp, "dadger.rv0"), "a") as arq:
+            arq.write("& editado\n")
+        assert prepara([cria_regra(6, None, None), cria_regra(7, None, None)])
+        assert etapas().count("adequacao_dadger") == 3
+        assert executadas[-2:] == ["encadeamento", "regras"]
@@ -0,0 +1,156 @@
+import asyncio
+import os
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+import aiohttp
+import pytest
+
+from encadeador.controladores.filasintese import FilaSintese
+from encadeador.controladores.servidormetricas import ServidorMetricas
+from encadeador.internal.metricas import Histograma, Metricas
+from encadeador.internal.perfilador import Perfilador
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+from encadeador.services.unitofwork.caso import SQLCasoUnitOfWork
+from encadeador.services.unitofwork.rodada import SQLRodadaUnitOfWork
+from encadeador.adapters.repository.estudo import SQLEstudoRepository
+
+pytestmark = pytest.mark.usefixtures("mappers")
+
+
+def test_histograma_cumulativo():
+    h = Histograma("teste_segundos", "Teste", "servico", (0.1, 1.0))
+    for v in [0.05, 0.5, 0.7, 5.0]:
+        h.observa("a", v)
+    linhas = list(h.exporta())
+    assert 'teste_segundos_bucket{servico="a",le="0.1"} 1' in linhas
+    assert 'teste_segundos_bucket{servico="a",le="1.0"} 3' in linhas
+    assert 'teste_segundos_bucket{servico="a",le="+Inf"} 4' in linhas
+    assert 'teste_segundos_count{servico="a"} 4' in linhas
+    assert h.contagem("a") == 4
+
+
+def cria_estudo(sessao):
+    s = sessao()
+    SQLEstudoRepository(s).create(
+        Estudo("/estudo", "estudo", EstadoEstudo.EXECUTANDO)
+    )
+    for i, estado in enumerate(
+        [EstadoCaso.CONCLUIDO, EstadoCaso.CONCLUIDO, EstadoCaso.EXECUTANDO]
+    ):
+        caso = Caso(
+            f"caso{i}", "caso", 2021, i + 1, 0, Programa.DECOMP, estado, 1
+        )
+        caso.rodadas.append(
+            Rodada(
+                "rodada",
+                RunStatus.RUNNING if i == 2 else RunStatus.SUCCESS,
+                str(i),
+                f"caso{i}",
+                datetime.now(),
+                None,
+                72,
+                "DECOMP",
+                "v31",
+                i + 1,
+            )
+        )
+        s.add(caso)
+    s.commit()
+
+
+def test_servidor_metricas(configuracoes, sqlite_session_factory):
+    cria_estudo(sqlite_session_factory)
+    fila = FilaSintese(1, MagicMock())
+    fila._pendentes = {1, 2}
+    Metricas.registra_requisicao("teste_servidor", 0.2, False)
+    Metricas.registra_requisicao("teste_servidor", 0.3, True)
+
+    async def executa():
+        servidor = ServidorMetricas(
+            0,
+            SQLCasoUnitOfWork(lambda: sqlite_session_factory),
+            SQLRodadaUnitOfWork(lambda: sqlite_session_factory),
+            fila,
+            _intervalo_atraso=0.01,
+            _endereco="127.0.0.1",
+        )
+        await servidor.inicia()
+        await asyncio.sleep(0.05)
+        url = f"http://127.0.0.1:{servidor.porta}"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url + "/metrics") as r:
+                assert r.status == 200
+                assert r.headers["Content-Type"].startswith("text/plain")
+                texto = await r.text()
+            async with session.get(url + "/health") as r:
+                assert r.status == 200
+                saude = await r.json()
+        await servidor.encerra()
+        return texto.splitlines(), saude
+
+    with patch("encadeador.controladores.servidormetricas.Log", MagicMock()):
+        linhas, saude = asyncio.run(executa())
+    assert 'encadeador_casos{estado="CONCLUIDO"} 2' in linhas
+    assert 'encadeador_casos{estado="EXECUTANDO"} 1' in linhas
+    assert 'encadeador_casos{estado="ERRO"} 0' in linhas
+    assert "encadeador_rodadas_ativas 1" in linhas
+    assert "encadeador_sintese_pendentes 2" in linhas
+    assert 'encadeador_requisicoes_total{servico="teste_servidor"} 2' in linhas
+    assert (
+        'encadeador_requisicoes_erros_total{servico="teste_servidor"} 1'
+        in linhas
+    )
+    assert any(
+        l.startswith('encadeador_transacoes_segundos_count{desfecho="commit"}')
+        for l in linhas
+    )
+    assert any(
+        l.startswith('encadeador_atraso_loop_segundos_count{loop="principal"}')
+        for l in linhas
+    )
+    assert saude["estado"] == "OK"
+    assert saude["sintese_pendentes"] == 2
+
+
+def test_servidor_metricas_perfil(configuracoes, tmp_path):
+    perfilador = Perfilador(str(tmp_path))
+
+    async def executa():
+        servidor = ServidorMetricas(
+            0,
+            MagicMock(),
+            MagicMock(),
+            FilaSintese(1, MagicMock()),
+            perfilador,
+            _endereco="127.0.0.1",
+        )
+        await servidor.inicia()
+        url = f"http://127.0.0.1:{servidor.porta}/perfil"
+        status = []
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, params={"modo": "OUTRO"}) as r:
+                status.append(r.status)
+            async with session.post(url, params={"duracao": "5"}) as r:
+                status.append(r.status)
+                arquivo = (await r.json())["arquivo"]
+            async with session.post(url) as r:
+                status.append(r.status)
+            async with session.delete(url) as r:
+                status.append(r.status)
+            async with session.delete(url) as r:
+                status.append(r.status)
+        await servidor.encerra()
+        return status, arquivo
+
+    with patch(
+        "encadeador.controladores.servidormetricas.Log", MagicMock()
+    ), patch("encadeador.internal.perfilador.Log", MagicMock()):
+        status, arquivo = asyncio.run(executa())
+    assert status == [400, 202, 409, 200, 409]
+    assert os.path.isfile(arquivo)
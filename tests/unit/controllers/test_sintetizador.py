@@ -0,0 +1,161 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from os.path import join
+from unittest.mock import AsyncMock, MagicMock, patch
+import pandas as pd  # type: ignore
+
+from encadeador.controladores.sintetizador import (
+    Sintetizador,
+    _executor_processos,
+    encerra_processos,
+    VARIAVEIS_GERAIS_DECOMP,
+    VARIAVEIS_OPERACAO_DECOMP,
+    VARIAVEL_GT_PERCENTUAL,
+)
+from encadeador.utils.processadordecomp import ProcessadorDecomp
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.runstatus import RunStatus
+from tests.benchmarks.dados import relato_relgnl_sinteticos
+
+
+def cria_caso(mes: int, id_rodada: int) -> Caso:
+    c = Caso(
+        f"2020_{str(mes).zfill(2)}_rv0/decomp",
+        "teste",
+        2020,
+        mes,
+        0,
+        Programa.DECOMP,
+        EstadoCaso.CONCLUIDO,
+        1,
+    )
+    r = Rodada(
+        "teste",
+        RunStatus.SUCCESS,
+        "1",
+        "/home/teste",
+        datetime.now(),
+        datetime.now(),
+        72,
+        "DECOMP",
+        "v31",
+        mes,
+    )
+    r.id = id_rodada
+    c.rodadas = [r]
+    return c
+
+
+def resultados(casos, variavel, *args):
+    return pd.DataFrame(
+        data={
+            "caso": [Sintetizador._ano_mes_rv(c) for c in casos],
+            "valor": [float(c.rodadas[0].id) for c in casos],
+        }
+    )
+
+
+def gt_percentual(caminho: str) -> pd.DataFrame:
+    if "erro" in caminho:
+        raise FileNotFoundError(caminho)
+    return ProcessadorDecomp.gt_estagios(*relato_relgnl_sinteticos(10, 2, 2))
+
+
+def sintetiza(casos) -> AsyncMock:
+    m = AsyncMock(side_effect=resultados)
+    m_gt = MagicMock(side_effect=gt_percentual)
+    with ThreadPoolExecutor() as executor, patch(
+        "encadeador.controladores.sintetizador.ResultAPIRepository"
+        + ".resultados_1o_estagio_casos",
+        m,
+    ), patch("encadeador.controladores.sintetizador.Log", MagicMock()), patch(
+        "encadeador.controladores.sintetizador._executor_processos",
+        MagicMock(return_value=executor),
+    ), patch(
+        "encadeador.controladores.sintetizador.le_gt_percentual_decomp",
+        m_gt,
+    ):
+        asyncio.run(Sintetizador(casos).sintetiza_decomps())
+    m.le_gt = m_gt
+    return m
+
+
+def test_sintese_incremental_variaveis_gerais(configuracoes):
+    casos = [cria_caso(1, 10)]
+    m = sintetiza(casos)
+    n_variaveis = len(set(VARIAVEIS_GERAIS_DECOMP + VARIAVEIS_OPERACAO_DECOMP))
+    assert m.await_count == n_variaveis
+    casos.append(cria_caso(2, 20))
+    m = sintetiza(casos)
+    assert m.await_count == n_variaveis
+    for chamada in m.await_args_list:
+        assert [c.mes for c in chamada.args[0]] == [2]
+    m = sintetiza(casos)
+    assert m.await_count == 0
+
+
+def test_sintese_caso_executado_novamente(configuracoes):
+    casos = [cria_caso(1, 10), cria_caso(2, 20)]
+    sintetiza(casos)
+    casos[0].rodadas[0].id = 11
+    m = sintetiza(casos)
+    for chamada in m.await_args_list:
+        assert [c.mes for c in chamada.args[0]] == [1]
+    df = pd.read_csv(
+        join(
+            configuracoes.caminho_base_estudo,
+            "sintese",
+            "decomp",
+            "sintese",
+            VARIAVEIS_GERAIS_DECOMP[0] + ".csv",
+        )
+    )
+    assert len(df) == 2
+    assert df.loc[df["caso"] == "2020_01_rv0", "valor"].iloc[0] == 11.0
+
+
+def test_sintese_gt_percentual_casos_faltantes(configuracoes):
+    casos = [cria_caso(1, 10), cria_caso(2, 20)]
+    casos[1].caminho = "erro"
+    m = sintetiza(casos)
+    assert m.le_gt.call_count == 2
+    casos[1].caminho = "2020_02_rv0/decomp"
+    casos.append(cria_caso(3, 30))
+    m = sintetiza(casos)
+    assert [c.args[0][-18:] for c in m.le_gt.call_args_list] == [
+        "2020_02_rv0/decomp",
+        "2020_03_rv0/decomp",
+    ]
+    df = pd.read_csv(
+        join(
+            configuracoes.caminho_base_estudo,
+            "sintese",
+            "decomp",
+            "sintese",
+            VARIAVEL_GT_PERCENTUAL + ".csv",
+        )
+    )
+    assert list(df["caso"].unique()) == [
+        "2020_01_rv0",
+        "2020_02_rv0",
+        "2020_03_rv0",
+    ]
+    m = sintetiza(casos)
+    assert m.le_gt.call_count == 0
+
+
+def test_executor_processos_unico(configuracoes):
+    executor = _executor_processos()
+    try:
+        # O mesmo executor é usado por todas as sínteses, com os
+        # processos iniciados por spawn
+        assert _executor_processos() is executor
+        assert executor._mp_context.get_start_method() == "spawn"
+    finally:
+        encerra_processos()
+    assert _executor_processos() is not executor
+    encerra_processos()
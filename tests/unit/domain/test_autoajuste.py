@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+import pytest
+
+from encadeador.domain.autoajuste import CurvaEscalabilidade, explora
+from encadeador.domain.commands import (
+    AjustaProcessadores,
+    ComparaTempoPrevisto,
+)
+from encadeador.modelos.rodada import Rodada
+from encadeador.modelos.runstatus import RunStatus
+from encadeador.services.handlers.rodada import (
+    ajusta_processadores,
+    compara_tempo_previsto,
+)
+from encadeador.services.unitofwork.rodada import SQLRodadaUnitOfWork
+
+INICIO = datetime(2023, 1, 1)
+
+
+def tempo(processadores: int) -> float:
+    return 100.0 + 7200.0 / processadores + 0.5 * processadores
+
+
+def cria_rodada(
+    processadores: int,
+    estado: RunStatus = RunStatus.SUCCESS,
+    versao: str = "v28",
+) -> Rodada:
+    return Rodada(
+        "Teste",
+        estado,
+        "1",
+        "/home/teste",
+        INICIO,
+        INICIO + timedelta(seconds=tempo(processadores)),
+        processadores,
+        "NEWAVE",
+        versao,
+        1,
+    )
+
+
+def test_curva_historico_insuficiente():
+    rodadas = [cria_rodada(p) for p in [72, 72, 144]]
+    rodadas.append(cria_rodada(216, RunStatus.RUNTIME_ERROR))
+    assert CurvaEscalabilidade.ajusta(rodadas) is None
+
+
+def test_curva_ajuste_e_escolha():
+    curva = CurvaEscalabilidade.ajusta(
+        [cria_rodada(p) for p in [24, 48, 72, 144]]
+    )
+    assert curva is not None
+    assert curva.tempo(96) == pytest.approx(tempo(96))
+    # O mínimo de t(p) está em p = 120, múltiplo de 24
+    assert curva.escolhe(72, None)[0] == 120
+    assert curva.escolhe(72, 100)[0] == 96
+    assert curva.escolhe(72, 24)[0] == 24
+    # O limite não comporta nem o menor passo
+    assert curva.escolhe(72, 20) is None
+    assert curva.escolhe(72, 0) is None
+
+
+def test_explora_processadores():
+    assert explora([], 72, None) == 72
+    assert explora([cria_rodada(72)], 72, None) == 36
+    # Rodadas com erro também contam como experimentadas
+    rodadas = [cria_rodada(72), cria_rodada(36, RunStatus.RUNTIME_ERROR)]
+    assert explora(rodadas, 72, None) == 144
+    assert explora(rodadas, 72, 100) == 72
+    rodadas.append(cria_rodada(144))
+    assert explora(rodadas, 72, None) == 72
+    assert explora(rodadas, 72, 50) is None
+
+
+def test_curva_coeficientes_nao_negativos():
+    # Tempos que crescem com os processadores não produzem
+    # coeficientes negativos na parcela paralelizável
+    rodadas = [cria_rodada(p) for p in [24, 48, 72]]
+    for r, t in zip(rodadas, [100.0, 110.0, 125.0]):
+        r.instante_fim_execucao = INICIO + timedelta(seconds=t)
+    curva = CurvaEscalabilidade.ajusta(rodadas)
+    assert curva is not None
+    assert min(curva.a, curva.b, curva.c) >= 0
+    assert curva.escolhe(72, None)[0] == 24
+
+
+def test_ajusta_processadores(mappers, sqlite_session_factory, configuracoes):
+    configuracoes._orcamento_processadores = 200
+    uow = SQLRodadaUnitOfWork(lambda: sqlite_session_factory)
+    with uow:
+        for p in [24, 48, 72, 144]:
+            uow.rodadas.create(cria_rodada(p))
+        uow.rodadas.create(cria_rodada(500, versao="v29"))
+        uow.commit()
+    with patch("encadeador.services.handlers.rodada.Log", MagicMock()):
+        cmd = AjustaProcessadores("NEWAVE", "v28", 72)
+        assert ajusta_processadores(cmd, uow) == 120
+        # Rodadas ativas ocupam parte do orçamento
+        with uow:
+            uow.rodadas.create(cria_rodada(104, RunStatus.RUNNING))
+            uow.commit()
+        assert ajusta_processadores(cmd, uow) == 96
+        # Outras versões não têm histórico suficiente e experimentam
+        # quantidades ainda não usadas
+        cmd = AjustaProcessadores("NEWAVE", "v29", 72)
+        assert ajusta_processadores(cmd, uow) == 72
+        # Sem processadores livres, a submissão aguarda
+        configuracoes._orcamento_processadores = 110
+        cmd = AjustaProcessadores("NEWAVE", "v28", 72)
+        assert ajusta_processadores(cmd, uow) is None
+        previsto = compara_tempo_previsto(ComparaTempoPrevisto(4), uow)
+        assert previsto == pytest.approx(tempo(144))
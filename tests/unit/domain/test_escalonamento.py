@@ -0,0 +1,87 @@
+from encadeador.domain.escalonamento import GrafoCasos
+from encadeador.domain.programs import ProgramRules
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.programa import Programa
+
+
+def cria_caso(id: int, mes: int, rv: int, programa: Programa) -> Caso:
+    caso = Caso(
+        f"2021_{str(mes).zfill(2)}_rv{rv}/{programa.value.lower()}",
+        "teste",
+        2021,
+        mes,
+        rv,
+        programa,
+        EstadoCaso.NAO_INICIADO,
+        1,
+    )
+    caso.id = id
+    return caso
+
+
+# Ids fora da ordem do estudo, para garantir que a ordem vem dos casos
+CASOS = [
+    cria_caso(1, 1, 0, Programa.NEWAVE),
+    cria_caso(2, 1, 0, Programa.DECOMP),
+    cria_caso(7, 1, 1, Programa.DECOMP),
+    cria_caso(3, 1, 2, Programa.DECOMP),
+    cria_caso(4, 2, 0, Programa.NEWAVE),
+    cria_caso(5, 2, 0, Programa.DECOMP),
+]
+
+
+def test_dependencias_sem_encadeamento(configuracoes):
+    configuracoes._variaveis_encadeadas_newave = []
+    configuracoes._variaveis_encadeadas_decomp = []
+    configuracoes._janela_encadeamento = "VARIAVEL"
+    grafo = GrafoCasos(list(reversed(CASOS)), {})
+    # Sem variáveis encadeadas, os DECOMPs dependem do NEWAVE do qual
+    # usam os cortes e das fontes das regras de reservatórios
+    assert grafo.dependencias == {
+        1: [],
+        2: [1],
+        7: [1, 2],
+        3: [1, 7],
+        4: [2, 7, 3],
+        5: [3, 4],
+    }
+
+
+def test_dependencias_encadeamento(configuracoes):
+    configuracoes._variaveis_encadeadas_newave = ["VARM"]
+    configuracoes._variaveis_encadeadas_decomp = ["VARM", "TVIAGEM"]
+    configuracoes._janela_encadeamento = "VARIAVEL"
+    anteriores = [c for c in CASOS if c < CASOS[3]]
+    assert [
+        c.id for c in ProgramRules.case_dependencies(CASOS[3], anteriores)
+    ] == [1, 2, 7]
+
+
+def test_casos_prontos_caminho_critico(configuracoes):
+    configuracoes._variaveis_encadeadas_newave = []
+    configuracoes._variaveis_encadeadas_decomp = []
+    configuracoes._janela_encadeamento = "TODOS"
+    grafo = GrafoCasos(CASOS, {"NEWAVE": 10.0, "DECOMP": 1.0})
+    assert grafo.prioridades[1] == 10.0 + 1.0 * 3 + 10.0 + 1.0
+    assert grafo.prontos(set(), set()) == [1]
+    assert grafo.prontos({1}, set()) == [2]
+    assert grafo.prontos({1, 2, 7, 3}, set()) == [4]
+    assert grafo.prontos({1, 2, 7, 3}, {4}) == []
+
+
+def test_casos_prontos_independentes(configuracoes):
+    configuracoes._variaveis_encadeadas_newave = []
+    configuracoes._variaveis_encadeadas_decomp = []
+    configuracoes._janela_encadeamento = "TODOS"
+    # Ramos do estudo com o mesmo mês e revisão não dependem um do
+    # outro, somente do NEWAVE do qual usam os cortes
+    casos = [
+        cria_caso(1, 1, 0, Programa.NEWAVE),
+        cria_caso(2, 1, 0, Programa.DECOMP),
+        cria_caso(3, 1, 0, Programa.DECOMP),
+    ]
+    casos[2].caminho = "2021_01_rv0/decomp_sensibilidade"
+    grafo = GrafoCasos(casos, {})
+    assert grafo.prontos({1}, set()) == [2, 3]
+    assert grafo.prontos({1}, {2}) == [3]
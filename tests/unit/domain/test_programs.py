@@ -0,0 +1,55 @@
+from encadeador.domain.programs import ProgramRules
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.programa import Programa
+
+
+def cria_caso(mes: int, rv: int, programa: Programa) -> Caso:
+    return Caso(
+        f"2021_{str(mes).zfill(2)}_rv{rv}/{programa.value.lower()}",
+        "teste",
+        2021,
+        mes,
+        rv,
+        programa,
+        EstadoCaso.CONCLUIDO,
+        1,
+    )
+
+
+CASOS = [
+    cria_caso(1, 0, Programa.NEWAVE),
+    cria_caso(1, 0, Programa.DECOMP),
+    cria_caso(1, 1, Programa.DECOMP),
+    cria_caso(2, 0, Programa.NEWAVE),
+    cria_caso(2, 0, Programa.DECOMP),
+    cria_caso(2, 1, Programa.DECOMP),
+    cria_caso(2, 2, Programa.DECOMP),
+]
+
+
+def nomes(casos):
+    return [c.caminho for c in casos]
+
+
+def test_janela_encadeamento_todos(configuracoes):
+    configuracoes._janela_encadeamento = "TODOS"
+    casos = list(reversed(CASOS))
+    assert ProgramRules.chaining_sources(casos, "VARM") == casos
+
+
+def test_janela_encadeamento_ultimos(configuracoes):
+    configuracoes._janela_encadeamento = "ULTIMOS"
+    configuracoes._decomps_janela_encadeamento = 2
+    fontes = ProgramRules.chaining_sources(list(reversed(CASOS)), "VARM")
+    assert nomes(fontes) == nomes([CASOS[3], CASOS[5], CASOS[6]])
+
+
+def test_janela_encadeamento_variavel(configuracoes):
+    configuracoes._janela_encadeamento = "VARIAVEL"
+    assert nomes(ProgramRules.chaining_sources(CASOS, "VARM")) == nomes(
+        [CASOS[3], CASOS[6]]
+    )
+    assert nomes(ProgramRules.chaining_sources(CASOS, "ENA")) == nomes(
+        [CASOS[1], CASOS[2], CASOS[3], CASOS[4], CASOS[5], CASOS[6]]
+    )
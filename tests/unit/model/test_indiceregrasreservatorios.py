@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Optional
+from unittest.mock import patch
+
+from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
+from encadeador.modelos.reservoirrule import ReservoirRule
+from encadeador.modelos.tabelaregrasreservatorios import (
+    TabelaRegrasReservatorios,
+)
+from tests.unit.model.test_tabelaregrasreservatorios import escreve_csv
+
+
+def cria_regra(
+    codigo: int, inicio: Optional[str], fim: Optional[str]
+) -> RegraReservatorio:
+    return RegraReservatorio(
+        inicio,
+        fim,
+        codigo,
+        codigo,
+        "QDEF",
+        1,
+        0.0,
+        100.0,
+        None,
+        500.0,
+        "SEMANAL",
+        "A",
+    )
+
+
+def vigentes_linear(regras, ano: int, mes: int):
+    data_caso = datetime(ano, mes, 1)
+    return [
+        r.codigo_reservatorio
+        for r in regras
+        if (r.inicio_vigencia is None or data_caso >= r.inicio_vigencia)
+        and (r.fim_vigencia is None or data_caso <= r.fim_vigencia)
+    ]
+
+
+REGRAS = [
+    cria_regra(1, None, None),
+    cria_regra(2, "2021-03-01", None),
+    cria_regra(3, None, "2021-06-30"),
+    cria_regra(4, "2021-02-15", "2021-04-01"),
+    cria_regra(5, "2022-01-01", "2021-01-01"),
+]
+
+
+def test_indice_regras_igual_filtro_linear():
+    indice = IndiceRegrasReservatorios(REGRAS)
+    assert len(indice) == len(REGRAS)
+    for ano in [2020, 2021, 2022]:
+        for mes in range(1, 13):
+            janela = indice.janela(ano, mes)
+            assert [r.reservoirCode for r in janela.regras] == vigentes_linear(
+                REGRAS, ano, mes
+            )
+            assert len(janela.payload) == len(janela)
+
+
+def test_indice_regras_ambos_limites():
+    indice = IndiceRegrasReservatorios(
+        [cria_regra(4, "2021-02-15", "2021-04-01")]
+    )
+    assert len(indice.janela(2021, 2)) == 0
+    assert len(indice.janela(2021, 3)) == 1
+    assert len(indice.janela(2021, 4)) == 1
+    assert len(indice.janela(2021, 5)) == 0
+    assert len(indice.janelas) == 3
+
+
+def test_indice_regras_vazio():
+    indice = IndiceRegrasReservatorios([])
+    assert len(indice.janela(2021, 1)) == 0
+
+
+def test_indice_regras_tabela(tmp_path):
+    tabela = TabelaRegrasReservatorios.from_csv(escreve_csv(tmp_path))
+    with patch.object(
+        ReservoirRule, "from_regra", wraps=ReservoirRule.from_regra
+    ) as from_regra:
+        indice = IndiceRegrasReservatorios(tabela)
+        # As regras só são convertidas no uso da janela
+        assert from_regra.call_count == 0
+        janela = indice.janela(2022, 7)
+        assert len(janela) == 2
+        assert from_regra.call_count == 0
+        assert [r.reservoirCode for r in janela.regras] == [6, 6]
+        assert from_regra.call_count == 2
+    lista = IndiceRegrasReservatorios(list(tabela))
+    for ano in [2021, 2022]:
+        for mes in range(1, 13):
+            assert (
+                indice.janela(ano, mes).identificador
+                == lista.janela(ano, mes).identificador
+            )
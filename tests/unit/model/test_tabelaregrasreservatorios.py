@@ -0,0 +1,83 @@
+from os.path import join
+
+from encadeador.modelos.regrareservatorio import RegraReservatorio
+from encadeador.modelos.tabelaregrasreservatorios import (
+    TabelaRegrasReservatorios,
+)
+
+CSV_REGRAS = """INICIO_VIGENCIA;FIM_VIGENCIA;COD_RESERVATORIO_VOL;CODIGO_USINA_RESTRICAO;TIPO_REST;MES;VOL_MIN;VOL_MAX;LIM_MIN;LIM_MAX;PERIOD;LEGENDA_FAIXA
+-;-;6;6;QDEF;1;0.0;30.5;-;1200;SEMANAL;A
+2021-03-01;-;6;6;QDEF;1;30.5;100.0;500.5;-;SEMANAL;B
+&2021-03-01;-;6;6;QDEF;2;30.5;100.0;500;-;SEMANAL;B
+-;2022-06-30T12:00:00;17;18;VMINT;12;0;100;10;20;MENSAL;C
+"""
+
+
+def escreve_csv(tmp_path) -> str:
+    caminho = join(str(tmp_path), "regras.csv")
+    with open(caminho, "w") as arq:
+        arq.write(CSV_REGRAS)
+    return caminho
+
+
+def compara_regras(r1: RegraReservatorio, r2: RegraReservatorio):
+    assert r1.to_json() == r2.to_json()
+    assert r1.codigo_reservatorio == r2.codigo_reservatorio
+    assert r1.codigo_usina == r2.codigo_usina
+
+
+def test_le_csv_regras(tmp_path):
+    tabela = TabelaRegrasReservatorios.from_csv(escreve_csv(tmp_path))
+    assert len(tabela) == 3
+    r = tabela[1]
+    assert r.inicio_vigencia.isoformat() == "2021-03-01T00:00:00"
+    assert r.fim_vigencia is None
+    assert r.limite_minimo == 500.5
+    assert r.limite_maximo is None
+    assert r.legenda_faixa == "B"
+    assert tabela[-1].fim_vigencia.hour == 12
+    assert tabela[0].limite_minimo is None
+    assert tabela[0].limite_maximo == 1200.0
+    assert [r.mes for r in tabela] == [1, 1, 12]
+    assert len(RegraReservatorio.from_csv(escreve_csv(tmp_path))) == 3
+
+
+def test_le_csv_regras_limite_vazio(tmp_path):
+    caminho = join(str(tmp_path), "regras.csv")
+    with open(caminho, "w") as arq:
+        arq.write(CSV_REGRAS.replace("500.5;-;", ";;"))
+    tabela = TabelaRegrasReservatorios.from_csv(caminho)
+    assert tabela[1].limite_minimo is None
+    assert tabela[1].limite_maximo is None
+    assert tabela[1].legenda_faixa == "B"
+
+
+def test_le_csv_regras_sentinela_texto(tmp_path):
+    caminho = join(str(tmp_path), "regras.csv")
+    with open(caminho, "w") as arq:
+        arq.write(CSV_REGRAS.replace("SEMANAL;B", "-;-"))
+    tabela = TabelaRegrasReservatorios.from_csv(caminho)
+    # Nas colunas de texto o sentinela é mantido
+    assert tabela[1].periodicidade == "-"
+    assert tabela[1].legenda_faixa == "-"
+    assert tabela[1].fim_vigencia is None
+
+
+def test_regras_ida_e_volta_csv_parquet(tmp_path):
+    tabela = TabelaRegrasReservatorios.from_csv(escreve_csv(tmp_path))
+    caminho_csv = join(str(tmp_path), "copia.csv")
+    caminho_parquet = join(str(tmp_path), "copia.parquet.gzip")
+    tabela.to_csv(caminho_csv)
+    tabela.to_parquet(caminho_parquet)
+    for copia in [
+        TabelaRegrasReservatorios.from_csv(caminho_csv),
+        TabelaRegrasReservatorios.from_parquet(caminho_parquet),
+    ]:
+        assert len(copia) == len(tabela)
+        for r1, r2 in zip(tabela, copia):
+            compara_regras(r1, r2)
+
+
+def test_tabela_regras_vazia():
+    assert len(TabelaRegrasReservatorios.vazia()) == 0
+    assert list(TabelaRegrasReservatorios.vazia()) == []
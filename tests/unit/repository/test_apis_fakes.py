@@ -0,0 +1,193 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from encadeador.adapters.repository.apis import (
+    EncadeadorAPIRepository,
+    FlexibilizadorAPIRepository,
+    ModelAPIRepository,
+    ResultAPIRepository,
+)
+from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.internal.resiliencia import PoliticaResiliencia
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.run import Run
+from encadeador.modelos.runstatus import RunStatus
+import encadeador.utils.fases as fases
+from tests.fakes.ambiente import AmbienteFake
+from tests.fakes.modelapi import LinhaTempo, ServicoModelAPIFake
+from tests.fakes.resultados import ServicoResultadosFake
+from tests.fakes.servico import Perturbacoes
+
+
+def cria_caso(mes: int) -> Caso:
+    return Caso(
+        f"2021_{str(mes).zfill(2)}_rv0/decomp",
+        "teste",
+        2021,
+        mes,
+        0,
+        Programa.DECOMP,
+        EstadoCaso.NAO_INICIADO,
+        1,
+    )
+
+
+def cria_run(caminho: str) -> Run:
+    return Run(
+        runId=None,
+        status=None,
+        name=None,
+        jobId=None,
+        jobWorkingDirectory=caminho,
+        jobStartTime=None,
+        jobEndTime=None,
+        jobReservedSlots=72,
+        jobArgs=["72"],
+        programName="DECOMP",
+        programVersion="v31",
+    )
+
+
+def executa(ambiente: AmbienteFake, f):
+    async def roda():
+        async with ambiente:
+            return await f()
+
+    with patch("encadeador.adapters.repository.apis.Log", MagicMock()), patch(
+        "encadeador.internal.resiliencia.Log", MagicMock()
+    ), patch.object(PoliticaResiliencia, "espera", return_value=0.0):
+        return asyncio.run(roda())
+
+
+def test_rodada_segue_linha_tempo(configuracoes):
+    model_api = ServicoModelAPIFake(
+        LinhaTempo([(RunStatus.SUBMITTED, 0.05), (RunStatus.RUNNING, 0.05)])
+    )
+    model_api.inviabilidades["/caso"] = 1
+
+    async def f():
+        estados = []
+        for _ in range(2):
+            run_id = await ModelAPIRepository.create_run(cria_run("/caso"))
+            while True:
+                run = await ModelAPIRepository.read_run(run_id)
+                if not estados or estados[-1] != run.status:
+                    estados.append(run.status)
+                if not run.active:
+                    break
+                await asyncio.sleep(0.01)
+        return estados, await ModelAPIRepository.list_runs()
+
+    fases.descarrega()
+    estados, runs = executa(AmbienteFake(model_api=model_api), f)
+    # As leituras repetidas das rodadas não são registradas como fases
+    medidas = [f.nome for f in fases.descarrega()]
+    assert medidas == ["api_modelos_cria_rodada"] * 2
+    assert estados == [
+        RunStatus.SUBMITTED,
+        RunStatus.RUNNING,
+        RunStatus.INFEASIBLE,
+        RunStatus.SUBMITTED,
+        RunStatus.RUNNING,
+        RunStatus.SUCCESS,
+    ]
+    assert [r.runId for r in runs] == [1, 2]
+    assert isinstance(runs[0].jobEndTime, datetime)
+
+
+def test_repete_submissao_sem_duplicar_rodada(configuracoes):
+    perturbacoes = Perturbacoes()
+    model_api = ServicoModelAPIFake(perturbacoes=perturbacoes)
+
+    async def f():
+        # A rodada é criada, mas a primeira resposta é perdida
+        perturbacoes.programa_erros(502)
+        return await ModelAPIRepository.create_run(cria_run("/caso"))
+
+    ambiente = AmbienteFake(model_api=model_api)
+    assert executa(ambiente, f) == 1
+    assert model_api.contagem["POST /runs/"] == 2
+    assert len(model_api.rodadas) == 1
+
+
+def test_cancela_rodada(configuracoes):
+    model_api = ServicoModelAPIFake(LinhaTempo([(RunStatus.RUNNING, 60.0)]))
+
+    async def f():
+        run_id = await ModelAPIRepository.create_run(cria_run("/caso"))
+        res = await ModelAPIRepository.delete_run(run_id)
+        return res, await ModelAPIRepository.read_run(run_id)
+
+    res, run = executa(AmbienteFake(model_api=model_api), f)
+    assert res.code == 202
+    assert run.status == RunStatus.RUNTIME_ERROR
+
+
+def test_servicos_encadeamento_flexibilizacao(configuracoes):
+    ambiente = AmbienteFake()
+    ambiente.flexibilizador.flexibilizacoes = 3
+    ambiente.encadeador.variaveis_recusadas["GNL"] = 500
+
+    async def f():
+        encadeados = await EncadeadorAPIRepository.encadeia(
+            [cria_caso(1)], cria_caso(2), "VARM"
+        )
+        recusado = await EncadeadorAPIRepository.encadeia(
+            [cria_caso(1)], cria_caso(2), "GNL"
+        )
+        flex = await FlexibilizadorAPIRepository.flexibiliza(cria_caso(2))
+        return encadeados, recusado, flex
+
+    encadeados, recusado, flex = executa(ambiente, f)
+    assert len(encadeados) == ambiente.encadeador.valores_por_variavel
+    assert isinstance(recusado, HTTPResponse)
+    assert ambiente.encadeador.contagem["POST /"] == 1 + 3
+    assert len(flex) == 3
+
+
+def test_resultados_sinteticos(configuracoes):
+    ambiente = AmbienteFake()
+    ambiente.result_api.variaveis_ausentes.add("GTER_UTE_EST")
+
+    async def f():
+        casos = [cria_caso(1), cria_caso(2)]
+        return (
+            await ResultAPIRepository.resultados_1o_estagio_casos(
+                casos, "CMO_SBM_PAT"
+            ),
+            await ResultAPIRepository.resultados_1o_estagio_casos(
+                casos, "GTER_UTE_EST"
+            ),
+        )
+
+    df, ausente = executa(ambiente, f)
+    assert ausente is None
+    assert list(df.columns) == [
+        "caso",
+        "estagio",
+        "submercado",
+        "patamar",
+        "valor",
+    ]
+    assert len(df) == 2 * 4 * 3
+    assert df["estagio"].unique().tolist() == [1]
+
+
+def test_repete_leitura_resultados(configuracoes):
+    perturbacoes = Perturbacoes()
+    ambiente = AmbienteFake(
+        result_api=ServicoResultadosFake(perturbacoes=perturbacoes)
+    )
+
+    async def f():
+        perturbacoes.programa_erros(503)
+        return await ResultAPIRepository.resultados_1o_estagio_casos(
+            [cria_caso(1)], "CMO_SBM_EST"
+        )
+
+    df = executa(ambiente, f)
+    assert df is not None
+    assert ambiente.result_api.contagem["GET /{identificador}/{variavel}"] == 2
@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime
+
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.etapapreparacao import EtapaPreparacao
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.adapters.repository.etapapreparacao import (
+    SQLEtapaPreparacaoRepository,
+)
+from encadeador.adapters.repository.caso import SQLCasoRepository
+from encadeador.adapters.repository.estudo import SQLEstudoRepository
+
+pytestmark = pytest.mark.usefixtures("mappers")
+
+
+def test_read_last_etapa_by_caso(sqlite_session_factory):
+    session = sqlite_session_factory()
+    etapa_repo = SQLEtapaPreparacaoRepository(session)
+    caso_repo = SQLCasoRepository(session)
+    estudo_repo = SQLEstudoRepository(session)
+    estudo_repo.create(Estudo("/home/teste", "teste", EstadoEstudo.CONCLUIDO))
+    for mes in [1, 2]:
+        caso_repo.create(
+            Caso(
+                f"/home/teste/{mes}",
+                "teste",
+                2020,
+                mes,
+                0,
+                Programa.NEWAVE,
+                EstadoCaso.CONCLUIDO,
+                1,
+            )
+        )
+    etapas = [
+        EtapaPreparacao("preparacao", 1, "a", "b", datetime.now()),
+        EtapaPreparacao("preparacao", 2, "c", "d", datetime.now()),
+        EtapaPreparacao("preparacao", 1, "b", "e", datetime.now()),
+    ]
+    for e in etapas:
+        etapa_repo.create(e)
+    session.commit()
+    assert etapa_repo.list() == etapas
+    assert etapa_repo.list_by_caso(1) == [etapas[0], etapas[2]]
+    assert etapa_repo.read_last_by_caso(1, "preparacao") == etapas[2]
+    assert etapa_repo.read_last_by_caso(1, "encadeamento") is None
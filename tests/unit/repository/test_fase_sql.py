@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime, timedelta
+
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estudo import Estudo
+from encadeador.modelos.fase import Fase
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.estadoestudo import EstadoEstudo
+from encadeador.adapters.repository.fase import SQLFaseRepository
+from encadeador.adapters.repository.caso import SQLCasoRepository
+from encadeador.adapters.repository.estudo import SQLEstudoRepository
+
+pytestmark = pytest.mark.usefixtures("mappers")
+
+
+def cria_fase(nome: str, id_caso) -> Fase:
+    inicio = datetime.now()
+    return Fase(
+        nome, inicio, inicio + timedelta(seconds=2), 2.0, True, id_caso
+    )
+
+
+def test_list_fases_by_caso(sqlite_session_factory):
+    session = sqlite_session_factory()
+    fase_repo = SQLFaseRepository(session)
+    caso_repo = SQLCasoRepository(session)
+    estudo_repo = SQLEstudoRepository(session)
+    estudo_repo.create(Estudo("/home/teste", "teste", EstadoEstudo.CONCLUIDO))
+    caso_repo.create(
+        Caso(
+            "/home/teste",
+            "teste",
+            2020,
+            1,
+            0,
+            Programa.NEWAVE,
+            EstadoCaso.CONCLUIDO,
+            1,
+        )
+    )
+    fases = [
+        cria_fase("preparacao", 1),
+        cria_fase("submissao", 1),
+        cria_fase("sintese_resultados", None),
+    ]
+    for f in fases:
+        fase_repo.create(f)
+    session.commit()
+    assert fase_repo.list() == fases
+    assert fase_repo.list_by_caso(1) == fases[:2]
+    assert [f.id for f in fase_repo.list()] == [1, 2, 3]
+    assert fase_repo.list_after(1) == fases[1:]
+    fase_repo.create(cria_fase("preparacao", 1))
+    session.commit()
+    assert sorted(fase_repo.total_by_caso()) == [
+        (1, "preparacao", 4.0),
+        (1, "submissao", 2.0),
+    ]
+    assert fase_repo.max_duracao("preparacao") == 2.0
+    assert fase_repo.max_duracao("estado_STARTING") is None
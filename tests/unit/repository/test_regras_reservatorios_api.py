@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from encadeador.adapters.repository.apis import (
+    RegrasReservatoriosAPIRepository,
+)
+from encadeador.modelos.caso import Caso
+from encadeador.modelos.estadocaso import EstadoCaso
+from encadeador.modelos.programa import Programa
+from encadeador.modelos.indiceregrasreservatorios import (
+    IndiceRegrasReservatorios,
+)
+from encadeador.modelos.regrareservatorio import RegraReservatorio
+from tests.fakes.regras import ServicoRegrasReservatoriosFake
+
+
+def cria_caso(mes: int) -> Caso:
+    return Caso(
+        f"2021_{str(mes).zfill(2)}_rv0/decomp",
+        "teste",
+        2021,
+        mes,
+        0,
+        Programa.DECOMP,
+        EstadoCaso.NAO_INICIADO,
+        1,
+    )
+
+
+def cria_indice() -> IndiceRegrasReservatorios:
+    return IndiceRegrasReservatorios(
+        [
+            RegraReservatorio(
+                None,
+                None,
+                c,
+                c,
+                "QDEF",
+                1,
+                0.0,
+                100.0,
+                None,
+                500.0,
+                "SEMANAL",
+                "A",
+            )
+            for c in [6, 17]
+        ]
+        + [
+            RegraReservatorio(
+                "2021-03-01",
+                None,
+                18,
+                18,
+                "QDEF",
+                1,
+                0.0,
+                100.0,
+                10.0,
+                None,
+                "SEMANAL",
+                "B",
+            )
+        ]
+    )
+
+
+def aplica_regras(configuracoes, servico, indice, meses, log=None):
+    async def aplica():
+        respostas = []
+        async with servico:
+            configuracoes._regras_reservatorios_service = servico.url
+            for mes in meses:
+                respostas.append(
+                    await RegrasReservatoriosAPIRepository.aplica_regras(
+                        [cria_caso(mes - 1)],
+                        cria_caso(mes),
+                        indice.janela(2021, mes),
+                    )
+                )
+        return respostas
+
+    log = log if log is not None else MagicMock()
+    with patch("encadeador.adapters.repository.apis.Log", log):
+        return asyncio.run(aplica())
+
+
+def test_envia_regras_completas_sem_cache(configuracoes):
+    RegrasReservatoriosAPIRepository._conjuntos_enviados.clear()
+    servico = ServicoRegrasReservatoriosFake(com_cache=False)
+    respostas = aplica_regras(configuracoes, servico, cria_indice(), [1, 2])
+    assert [len(r) for r in respostas] == [2, 2]
+    assert all("rules" in r for r in servico.requisicoes)
+    assert all("rulesId" not in r for r in servico.requisicoes)
+
+
+def test_envia_somente_identificador_regras_repetidas(configuracoes):
+    configuracoes._cache_regras_reservatorios = True
+    RegrasReservatoriosAPIRepository._conjuntos_enviados.clear()
+    servico = ServicoRegrasReservatoriosFake()
+    respostas = aplica_regras(configuracoes, servico, cria_indice(), [1, 2, 3])
+    assert [len(r) for r in respostas] == [2, 2, 3]
+    assert ["rules" in r for r in servico.requisicoes] == [
+        True,
+        False,
+        True,
+    ]
+    assert respostas[1][1].reservoirCodes == [17]
+
+
+def test_reenvia_regras_servico_sem_cache(configuracoes):
+    configuracoes._cache_regras_reservatorios = True
+    RegrasReservatoriosAPIRepository._conjuntos_enviados.clear()
+    indice = cria_indice()
+    aplica_regras(configuracoes, ServicoRegrasReservatoriosFake(), indice, [1])
+    # Um novo serviço não possui os conjuntos em cache
+    servico = ServicoRegrasReservatoriosFake()
+    respostas = aplica_regras(configuracoes, servico, indice, [2])
+    assert len(respostas[0]) == 2
+    assert ["rules" in r for r in servico.requisicoes] == [False, True]
+
+
+def test_reenvia_regras_servico_recusa_identificador(configuracoes):
+    configuracoes._cache_regras_reservatorios = True
+    RegrasReservatoriosAPIRepository._conjuntos_enviados.clear()
+    # Serviço que não implementa o cache recusa a requisição sem as
+    # regras com outro código
+    servico = ServicoRegrasReservatoriosFake(com_cache=False)
+    respostas = aplica_regras(configuracoes, servico, cria_indice(), [1, 2])
+    assert [len(r) for r in respostas] == [2, 2]
+    assert ["rules" in r for r in servico.requisicoes] == [True, False, True]
+
+
+def test_registra_tamanho_requisicao_sem_regras(configuracoes):
+    configuracoes._cache_regras_reservatorios = True
+    RegrasReservatoriosAPIRepository._conjuntos_enviados.clear()
+    log = MagicMock()
+    indice = cria_indice()
+    aplica_regras(
+        configuracoes, ServicoRegrasReservatoriosFake(), indice, [1], log
+    )
+    mensagens = [c.args[0] for c in log.log().info.call_args_list]
+    requisicoes = [m for m in mensagens if m.startswith("Requisição")]
+    assert len(requisicoes) == 1
+    assert "bytes" in requisicoes[0]
+    assert indice.janela(2021, 1).identificador in requisicoes[0]
+    assert not any("QDEF" in m for m in mensagens)
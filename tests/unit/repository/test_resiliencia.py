@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import aiohttp
+
+from encadeador.internal.httpresponse import HTTPResponse
+from encadeador.internal.resiliencia import (
+    ClienteResiliente,
+    EstadoCircuito,
+    PoliticaResiliencia,
+)
+
+
+def executa(cliente: ClienteResiliente, chamada, **kwargs):
+    with patch.object(PoliticaResiliencia, "espera", return_value=0.0), patch(
+        "encadeador.internal.resiliencia.Log", MagicMock()
+    ):
+        return asyncio.run(cliente.executa(chamada, **kwargs))
+
+
+def chamada_com_falhas(respostas: list) -> AsyncMock:
+    def responde():
+        r = respostas.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    return AsyncMock(side_effect=responde)
+
+
+def test_repete_falhas_transitorias():
+    cliente = ClienteResiliente("teste", PoliticaResiliencia(3))
+    chamada = chamada_com_falhas(
+        [
+            HTTPResponse(code=503, detail=""),
+            aiohttp.ClientConnectionError(),
+            "ok",
+        ]
+    )
+    assert executa(cliente, chamada) == "ok"
+    assert chamada.await_count == 3
+    assert cliente.circuito.estado == EstadoCircuito.FECHADO
+
+
+def test_nao_repete_erros_definitivos():
+    cliente = ClienteResiliente("teste", PoliticaResiliencia(3))
+    chamada = chamada_com_falhas([HTTPResponse(code=404, detail="")])
+    res = executa(cliente, chamada)
+    assert isinstance(res, HTTPResponse)
+    assert res.code == 404
+    assert chamada.await_count == 1
+
+
+def test_nao_repete_chamadas_nao_idempotentes():
+    cliente = ClienteResiliente("teste", PoliticaResiliencia(3))
+    chamada = chamada_com_falhas([HTTPResponse(code=502, detail=""), "ok"])
+    res = executa(cliente, chamada, idempotente=False)
+    assert isinstance(res, HTTPResponse)
+    assert chamada.await_count == 1
+
+
+def test_circuito_abre_apos_falhas_consecutivas():
+    cliente = ClienteResiliente(
+        "teste", PoliticaResiliencia(2, _limite_falhas=2)
+    )
+    chamada = chamada_com_falhas([HTTPResponse(code=500, detail="")] * 2)
+    executa(cliente, chamada)
+    assert cliente.circuito.estado == EstadoCircuito.ABERTO
+    res = executa(cliente, chamada)
+    assert isinstance(res, HTTPResponse)
+    assert "circuito aberto" in res.detail
+    assert chamada.await_count == 2
+
+
+def test_circuito_semiaberto_libera_uma_tentativa():
+    cliente = ClienteResiliente(
+        "teste", PoliticaResiliencia(1, _limite_falhas=1, _tempo_abertura=0)
+    )
+    executa(cliente, chamada_com_falhas([HTTPResponse(code=500, detail="")]))
+    assert cliente.circuito.estado == EstadoCircuito.ABERTO
+    assert executa(cliente, chamada_com_falhas(["ok"])) == "ok"
+    assert cliente.circuito.estado == EstadoCircuito.FECHADO
+
+
+def test_excecao_libera_circuito_semiaberto():
+    cliente = ClienteResiliente(
+        "teste", PoliticaResiliencia(1, _limite_falhas=1, _tempo_abertura=0)
+    )
+    executa(cliente, chamada_com_falhas([HTTPResponse(code=500, detail="")]))
+    # A chamada de teste falha com uma resposta mal formada
+    try:
+        executa(cliente, chamada_com_falhas([KeyError("result")]))
+        assert False
+    except KeyError:
+        pass
+    assert cliente.circuito.estado == EstadoCircuito.ABERTO
+    assert executa(cliente, chamada_com_falhas(["ok"])) == "ok"
+    assert cliente.circuito.estado == EstadoCircuito.FECHADO
+
+
+def test_leitura_paralela_retorna_primeira_resposta():
+    cliente = ClienteResiliente(
+        "teste", PoliticaResiliencia(1, _atraso_hedge=0.01)
+    )
+    atrasos = [1.0, 0.0]
+    iniciadas = []
+
+    async def chamada():
+        atraso = atrasos.pop(0)
+        iniciadas.append(atraso)
+        await asyncio.sleep(atraso)
+        return atraso
+
+    with patch("encadeador.internal.resiliencia.Log", MagicMock()):
+        res = asyncio.run(cliente.executa(chamada, hedge=True))
+    assert res == 0.0
+    assert iniciadas == [1.0, 0.0]
@@ -130,3 +130,21 @@ def test_delete_rodada(mock_exists):
     with patch("builtins.open", m):
         rodada_repo.delete(1)
         assert m.mock_calls[JSON_WRITING_FIRST_INDEX].args[0] == "[]"
+
+
+def test_get_rodada_ativa(tmp_path):
+    rodada_repo = JSONRodadaRepository(str(tmp_path))
+    rodada_teste = Rodada(
+        "teste",
+        RunStatus.RUNNING,
+        1,
+        "/home/teste",
+        datetime.now(),
+        None,
+        72,
+        "NEWAVE",
+        "v28",
+        1,
+    )
+    rodada_repo.create(rodada_teste)
+    assert rodada_repo.read(1).instante_fim_execucao is None
@@ -1,5 +1,9 @@
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from sqlalchemy import inspect, text
+
+from config import atualiza_db
 
 from encadeador.modelos.rodada import Rodada
 from encadeador.modelos.caso import Caso
@@ -130,3 +134,20 @@ def test_delete_rodada(sqlite_session_factory):
     assert rodada_repo.read(1) == rodada_teste
     rodada_repo.delete(1)
     assert rodada_repo.read(1) is None
+
+
+def test_atualiza_db_existente(in_memory_sqlite_db):
+    # Banco de um estudo criado antes do registro da entrada no estado
+    with in_memory_sqlite_db.begin() as conexao:
+        conexao.execute(text("DROP INDEX ix_fases_nome"))
+        conexao.execute(
+            text("ALTER TABLE rodadas DROP COLUMN instante_entrada_estado")
+        )
+    with patch("config.Log", MagicMock()):
+        atualiza_db(in_memory_sqlite_db)
+        atualiza_db(in_memory_sqlite_db)
+    inspetor = inspect(in_memory_sqlite_db)
+    colunas = [c["name"] for c in inspetor.get_columns("rodadas")]
+    assert "instante_entrada_estado" in colunas
+    indices = [i["name"] for i in inspetor.get_indexes("fases")]
+    assert "ix_fases_nome" in indices
@@ -0,0 +1,33 @@
+import os
+from os.path import join
+
+from encadeador.utils.assinatura import (
+    assinatura_arquivos,
+    assinatura_diretorio,
+)
+
+
+def escreve(caminho: str, conteudo: str):
+    with open(caminho, "w") as arq:
+        arq.write(conteudo)
+
+
+def test_assinatura_diretorio(tmp_path):
+    escreve(join(tmp_path, "dadger.rv0"), "TE  ESTUDO\n")
+    escreve(join(tmp_path, "vazoes.rv0"), "0 1 2\n")
+    os.makedirs(join(tmp_path, "saidas"))
+    escreve(join(tmp_path, "saidas", "relato.rv0"), "relato\n")
+    inicial = assinatura_diretorio(str(tmp_path))
+    assert inicial == assinatura_arquivos(
+        [join(tmp_path, "vazoes.rv0"), join(tmp_path, "dadger.rv0")]
+    )
+    # Subdiretórios não fazem parte da assinatura
+    escreve(join(tmp_path, "saidas", "relato.rv0"), "outro relato\n")
+    assert assinatura_diretorio(str(tmp_path)) == inicial
+    escreve(join(tmp_path, "dadger.rv0"), "TE  ESTUDO ALTERADO\n")
+    alterada = assinatura_diretorio(str(tmp_path))
+    assert alterada != inicial
+    escreve(join(tmp_path, "dadger.rv0"), "TE  ESTUDO\n")
+    assert assinatura_diretorio(str(tmp_path)) == inicial
+    os.remove(join(tmp_path, "vazoes.rv0"))
+    assert assinatura_diretorio(str(tmp_path)) != inicial
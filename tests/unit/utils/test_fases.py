@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+
+from encadeador.adapters.repository.fase import JSONFaseRepository
+import encadeador.utils.fases as fases
+from encadeador.utils.contexto import atribui_caso
+from encadeador.utils.fases import fase, mede_fase
+
+
+@pytest.fixture(autouse=True)
+def limpa_fases():
+    fases.descarrega()
+    yield
+    fases.descarrega()
+
+
+def test_fase_atribui_caso_as_fases_internas():
+    with fase("preparacao", 3):
+        with fase("encadeamento"):
+            pass
+    with fase("sintese_resultados"):
+        pass
+    medidas = fases.descarrega()
+    assert [(f.nome, f.id_caso) for f in medidas] == [
+        ("encadeamento", 3),
+        ("preparacao", 3),
+        ("sintese_resultados", None),
+    ]
+    assert all(f.sucesso and f.duracao >= 0 for f in medidas)
+    assert fases.descarrega() == []
+
+
+def test_fase_com_erro():
+    with pytest.raises(ValueError):
+        with fase("submissao", 1):
+            raise ValueError()
+    (medida,) = fases.descarrega()
+    assert not medida.sucesso
+    assert fases.CASO_ATUAL.get() is None
+
+
+def test_mede_fase_em_tarefas_concorrentes():
+    @mede_fase("api_encadeador")
+    async def chamada(espera: float) -> float:
+        await asyncio.sleep(espera)
+        return espera
+
+    @mede_fase("conversao")
+    def conversao():
+        return 1
+
+    async def caso(id_caso: int, espera: float):
+        with atribui_caso(id_caso):
+            return await asyncio.gather(
+                asyncio.ensure_future(chamada(espera)), chamada(espera)
+            )
+
+    async def executa():
+        return await asyncio.gather(caso(1, 0.02), caso(2, 0.01))
+
+    assert asyncio.run(executa()) == [[0.02, 0.02], [0.01, 0.01]]
+    assert conversao() == 1
+    medidas = fases.descarrega()
+    assert sorted((f.nome, f.id_caso) for f in medidas) == [
+        ("api_encadeador", 1),
+        ("api_encadeador", 1),
+        ("api_encadeador", 2),
+        ("api_encadeador", 2),
+        ("conversao", None),
+    ]
+    assert chamada.__name__ == "chamada"
+
+
+def test_repositorio_json(tmp_path):
+    with fase("preparacao", 1):
+        pass
+    with fase("preparacao", 2):
+        pass
+    repo = JSONFaseRepository(str(tmp_path))
+    medidas = fases.descarrega()
+    for f in medidas:
+        repo.create(f)
+    assert repo.list() == medidas
+    assert repo.list_by_caso(2) == medidas[1:]
+    assert repo.list_after(medidas[0].id) == medidas[1:]
+    assert sorted(c for c, _, _ in repo.total_by_caso()) == [1, 2]
+    assert repo.max_duracao("preparacao") == max(f.duracao for f in medidas)
+    assert repo.max_duracao("submissao") is None
@@ -0,0 +1,22 @@
+from unittest.mock import patch
+
+from encadeador.modelos.chainingresult import ChainingResult
+from encadeador.utils.jsonparser import carrega, carrega_modelos, serializa
+
+
+def test_carrega_json_e_literal_python():
+    assert carrega(b'{"result": [{"id": "1", "value": 2.0}]}') == {
+        "result": [{"id": "1", "value": 2.0}]
+    }
+    assert carrega("{'result': [{'id': None, 'value': 1}]}") == {
+        "result": [{"id": None, "value": 1}]
+    }
+
+
+def test_carrega_modelos_sem_orjson():
+    dados = serializa({"result": [{"id": "a", "value": 1.5}]})
+    with patch("encadeador.utils.jsonparser.orjson", None):
+        modelos = carrega_modelos(dados, ChainingResult, "result")
+        assert serializa([1]) == b"[1]"
+    assert modelos == [ChainingResult(id="a", value=1.5)]
+    assert carrega_modelos(dados, ChainingResult, "result") == modelos
@@ -0,0 +1,64 @@
+import gzip
+import json
+import logging
+from os import listdir
+from os.path import join
+import pytest
+
+from encadeador.utils.contexto import atribui_caso, atribui_rodada
+from encadeador.utils.log import ArquivoRotativo, Log
+
+
+@pytest.fixture
+def log_temporario(tmp_path):
+    logger = Log.LOGGER
+    yield tmp_path
+    Log.encerra()
+    root = logging.getLogger("main")
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    Log.LOGGER = logger
+
+
+def test_log_json_anota_caso_e_rodada(log_temporario):
+    Log.configura_logging(str(log_temporario), formato="JSON")
+    Log.log().info("fora de caso")
+    with atribui_caso(2), atribui_rodada(15):
+        Log.log().info("monitorando")
+    Log.encerra()
+    with open(join(log_temporario, Log.ARQUIVO), "r") as arq:
+        registros = [json.loads(linha) for linha in arq]
+    assert [
+        (r["mensagem"], r["id_caso"], r["id_rodada"]) for r in registros
+    ] == [("fora de caso", None, None), ("monitorando", 2, 15)]
+    assert registros[0]["nivel"] == "INFO"
+
+
+def test_arquivo_rotativo_compacta_copias(tmp_path):
+    arquivo = join(tmp_path, "teste.log")
+    h = ArquivoRotativo(arquivo, 100, 2)
+    h.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(10):
+        h.emit(logging.makeLogRecord({"msg": f"registro {i:02d} " * 4}))
+    h.close()
+    assert sorted(listdir(tmp_path)) == [
+        "teste.log",
+        "teste.log.1.gz",
+        "teste.log.2.gz",
+    ]
+    with gzip.open(join(tmp_path, "teste.log.1.gz"), "rt") as arq:
+        assert arq.read().startswith("registro 06")
+
+
+def test_arquivo_rotativo_por_tempo(tmp_path):
+    arquivo = join(tmp_path, "teste.log")
+    h = ArquivoRotativo(arquivo, 0, 1, intervalo_rotacao=60.0)
+    h.setFormatter(logging.Formatter("%(message)s"))
+    h.emit(logging.makeLogRecord({"msg": "antes"}))
+    h._proxima_rotacao -= 120.0
+    h.emit(logging.makeLogRecord({"msg": "depois"}))
+    h.close()
+    with open(arquivo, "r") as arq:
+        assert arq.read() == "depois\n"
+    with gzip.open(arquivo + ".1.gz", "rt") as arq:
+        assert arq.read() == "antes\n"
@@ -0,0 +1,37 @@
+import threading
+import time
+from os.path import join
+import pytest
+
+from encadeador.utils.observador import ObservadorArquivos
+
+
+def escreve_depois(caminho: str, atraso: float):
+    def escreve():
+        time.sleep(atraso)
+        with open(caminho, "a") as arq:
+            arq.write("alteracao\n")
+
+    t = threading.Thread(target=escreve)
+    t.start()
+    return t
+
+
+@pytest.mark.parametrize("notificacoes", [True, False])
+def test_observador_arquivos(tmp_path, notificacoes):
+    with open(join(tmp_path, "data.db"), "w") as arq:
+        arq.write("inicio\n")
+    observador = ObservadorArquivos(
+        str(tmp_path), ["data.db"], _intervalo_consulta=0.02
+    )
+    if not notificacoes:
+        observador.encerra()
+    assert observador.notificacoes == notificacoes
+    assert not observador.espera(timeout=0.1)
+    # Arquivos com outros nomes são ignorados
+    escreve_depois(join(tmp_path, "outro.txt"), 0.0).join()
+    assert not observador.espera(timeout=0.1)
+    t = escreve_depois(join(tmp_path, "data.db"), 0.05)
+    assert observador.espera(timeout=5.0)
+    t.join()
+    observador.encerra()
@@ -0,0 +1,65 @@
+import asyncio
+import pstats
+import time
+from os.path import basename
+from unittest.mock import MagicMock, patch
+import pytest
+
+from encadeador.internal.perfilador import Perfilador, perfilado
+from encadeador.utils.contexto import atribui_caso
+
+
+@perfilado("teste.ocupa")
+def ocupa(duracao: float):
+    fim = time.process_time() + duracao
+    while time.process_time() < fim:
+        pass
+
+
+async def perfila(perfilador: Perfilador, modo: str) -> str:
+    arquivo = perfilador.inicia(0.2, modo)
+    with atribui_caso(7):
+        ocupa(0.1)
+    await asyncio.sleep(0.3)
+    assert not perfilador.ativo
+    return arquivo
+
+
+@pytest.fixture(autouse=True)
+def log():
+    with patch("encadeador.internal.perfilador.Log", MagicMock()):
+        yield
+
+
+def test_perfilador_amostragem(tmp_path):
+    perfilador = Perfilador(str(tmp_path), _intervalo_amostragem=0.001)
+    arquivo = asyncio.run(perfila(perfilador, "AMOSTRAGEM"))
+    assert basename(arquivo).startswith("perfil_")
+    assert arquivo.endswith("_estudo.collapsed")
+    with open(arquivo, "r") as arq:
+        pilhas = [linha.rsplit(" ", 1) for linha in arq.read().splitlines()]
+    assert len(pilhas) > 0
+    assert all(int(n) > 0 for _, n in pilhas)
+    assert any(
+        p.startswith("caso7;") and "teste.ocupa" in p.split(";")
+        for p, _ in pilhas
+    )
+
+
+def test_perfilador_cprofile(tmp_path):
+    perfilador = Perfilador(str(tmp_path))
+    arquivo = asyncio.run(perfila(perfilador, "CPROFILE"))
+    assert arquivo.endswith(".pstats")
+    estatisticas = pstats.Stats(arquivo).stats  # type: ignore
+    assert any(nome == "teste.ocupa" for _, _, nome in estatisticas)
+
+
+def test_perfilador_modo_invalido(tmp_path):
+    perfilador = Perfilador(str(tmp_path))
+
+    async def inicia():
+        perfilador.inicia(1.0, "OUTRO")
+
+    with pytest.raises(ValueError):
+        asyncio.run(inicia())
+    assert not perfilador.ativo
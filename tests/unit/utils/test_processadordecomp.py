@@ -0,0 +1,38 @@
+import numpy as np
+
+from encadeador.utils.processadordecomp import ProcessadorDecomp
+from tests.benchmarks.dados import SUBMERCADOS, relato_relgnl_sinteticos
+
+
+def test_gt_estagios_sin_soma_submercados():
+    relato, relgnl = relato_relgnl_sinteticos(20, 4, 3)
+    df = ProcessadorDecomp.gt_estagios(relato, relgnl)
+    assert list(df["estagio"].unique()) == [1, 2, 3]
+    assert list(df.loc[df["estagio"] == 1, "nome_submercado"]) == (
+        sorted(SUBMERCADOS) + ["SIN"]
+    )
+    for _, df_estagio in df.groupby("estagio"):
+        sin = df_estagio["nome_submercado"] == "SIN"
+        for c in ["geracao_minima", "geracao", "geracao_maxima"]:
+            assert np.isclose(
+                df_estagio.loc[sin, c].iloc[0],
+                df_estagio.loc[~sin, c].sum(),
+            )
+
+
+def test_gt_percentual_maxima_formato():
+    relato, relgnl = relato_relgnl_sinteticos(20, 4, 3)
+    df = ProcessadorDecomp.gt_percentual_maxima(relato, relgnl)
+    assert list(df.columns) == [
+        "nome_submercado",
+        "estagio_1",
+        "estagio_2",
+        "estagio_3",
+    ]
+    assert list(df["nome_submercado"]) == sorted(SUBMERCADOS) + ["SIN"]
+    gt = ProcessadorDecomp.gt_estagios(relato, relgnl)
+    esperado = gt.loc[
+        (gt["estagio"] == 2) & (gt["nome_submercado"] == "SIN"),
+        "geracao_percentual_maxima",
+    ].iloc[0]
+    assert np.isclose(df["estagio_2"].iloc[-1], esperado)